@@ -30,6 +30,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -46,7 +47,9 @@ def run_migrations_online():
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            # الترحيلات التي تنشئ فهارس CONCURRENTLY تخرج من المعاملة، فلكل ترحيل معاملته
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,72 @@
+"""
+فهارس مركبة (user_id, الزمن) لجداول المتابعة
+
+تُستعلم جداول المزاج والنوم والنشاط والمؤشرات الحيوية الرقمية ودرجات العافية
+والرؤى حسب user_id ونطاق زمني، ولم يكن عليها إلا فهرس المفتاح الأساسي. الأعمدة
+المضمّنة (INCLUDE) تجعل استعلامات الرسوم البيانية مسحاً من الفهرس فقط.
+
+في PostgreSQL تُنشأ الفهارس بـ CREATE INDEX CONCURRENTLY حتى لا تُقفل الجداول
+أمام الكتابة. الجداول غير الموجودة بعد (قاعدة جديدة تُنشأ من النماذج) تُتجاوز
+لأن النماذج تعرّف الفهارس نفسها.
+
+Revision ID: 0001_tracker_time_series_indexes
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_tracker_time_series_indexes"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (الجدول، أعمدة الفهرس، الأعمدة المضمّنة)
+TRACKER_INDEXES = [
+    ("mood_entries", ["user_id", "created_at"], ["mood_score"]),
+    ("sleep_entries", ["user_id", "created_at"], ["sleep_duration", "sleep_quality"]),
+    ("activity_entries", ["user_id", "created_at"], ["duration", "intensity"]),
+    ("digital_biomarkers", ["user_id", "timestamp"], ["biomarker_type", "value"]),
+    ("wellness_scores", ["user_id", "date"], ["score"]),
+    ("insights", ["user_id", "created_at"], []),
+]
+
+
+def index_name(table, columns):
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def existing_indexes():
+    """
+    فهارس الجداول الموجودة حسب اسم الجدول، أو None في وضع توليد SQL (--sql)
+    حيث لا يوجد اتصال يمكن فحصه
+    """
+    if op.get_context().as_sql:
+        return None
+    inspector = sa.inspect(op.get_bind())
+    return {table: {index["name"] for index in inspector.get_indexes(table)}
+            for table in inspector.get_table_names()}
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        existing = existing_indexes()
+        for table, columns, include in TRACKER_INDEXES:
+            name = index_name(table, columns)
+            if existing is not None and (table not in existing or name in existing[table]):
+                continue
+            op.create_index(name, table, columns, postgresql_include=include,
+                            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        existing = existing_indexes()
+        for table, columns, _ in TRACKER_INDEXES:
+            name = index_name(table, columns)
+            if existing is not None and name not in existing.get(table, ()):
+                continue
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,134 @@
+"""
+تقسيم digital_biomarkers إلى أقسام شهرية حسب timestamp
+
+يُعاد إنشاء الجدول كجدول مقسم (PARTITION BY RANGE) بمفتاح أساسي (id, timestamp)،
+وتُنشأ أقسام شهرية من أقدم قراءة حتى الأشهر القادمة، ثم تُنسخ القراءات إليها.
+بعد ذلك تُدار الأقسام الجديدة ومدة الاحتفاظ من app/core/biomarker_partitions.py.
+
+الترحيل خاص بـ PostgreSQL؛ في SQLite تُخزن القراءات في جداول شهرية تُنشأ عند
+أول كتابة فلا يوجد ما يُرحّل.
+
+Revision ID: 0002_partition_digital_biomarkers
+Revises: 0001_tracker_time_series_indexes
+Create Date: 2026-10-19
+"""
+
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_partition_digital_biomarkers"
+down_revision = "0001_tracker_time_series_indexes"
+branch_labels = None
+depends_on = None
+
+TABLE = "digital_biomarkers"
+LEGACY_TABLE = "digital_biomarkers_unpartitioned"
+SEQUENCE = "digital_biomarkers_id_seq"
+INDEX = "ix_digital_biomarkers_user_id_timestamp"
+# عدد الأشهر القادمة المنشأة مسبقاً (مثل biomarker_partitions_ahead)
+MONTHS_AHEAD = 2
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_table_kind(name, kind):
+    """
+    هل نوع الجدول في pg_class هو kind ("r" جدول عادي، "p" جدول مقسم)؛ في وضع
+    توليد SQL (--sql) لا يوجد اتصال يمكن فحصه فيُفترض ذلك
+    """
+    if op.get_context().as_sql:
+        return True
+    return op.get_bind().execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}).scalar() == kind
+
+
+def create_monthly_partitions(first_month, last_month):
+    month = first_month
+    while month <= last_month:
+        op.execute(f"CREATE TABLE {TABLE}_{month.year:04d}{month.month:02d} PARTITION OF {TABLE} "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')")
+        month = add_months(month, 1)
+
+
+def upgrade():
+    # الجدول المنشأ من النماذج في هذه المراجعة مقسم بالفعل
+    if op.get_bind().dialect.name != "postgresql" or not is_table_kind(TABLE, "r"):
+        return
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+    op.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {LEGACY_TABLE}_pkey")
+    op.execute(f"ALTER INDEX IF EXISTS ix_{TABLE}_id RENAME TO ix_{LEGACY_TABLE}_id")
+    op.execute(f"ALTER INDEX IF EXISTS {INDEX} RENAME TO ix_{LEGACY_TABLE}_user_id_timestamp")
+    # يبقى التسلسل بعد حذف الجدول القديم ليتابع الجدول المقسم من آخر معرف
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} AS BIGINT")
+
+    op.execute(f"""
+        CREATE TABLE {TABLE} (
+            id BIGINT NOT NULL DEFAULT nextval('{SEQUENCE}'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            biomarker_type VARCHAR NOT NULL,
+            value FLOAT NOT NULL,
+            "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            metadata VARCHAR,
+            PRIMARY KEY (id, "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    op.execute(f"CREATE INDEX ix_{TABLE}_id ON {TABLE} (id)")
+    op.execute(f'CREATE INDEX {INDEX} ON {TABLE} (user_id, "timestamp") INCLUDE (biomarker_type, value)')
+
+    today = datetime.now(timezone.utc).date()
+    first = date(today.year, today.month, 1)
+    last = add_months(first, MONTHS_AHEAD)
+    if not op.get_context().as_sql:
+        oldest, newest = op.get_bind().execute(
+            sa.text(f'SELECT min("timestamp"), max("timestamp") FROM {LEGACY_TABLE}')).one()
+        if oldest is not None:
+            oldest, newest = oldest.astimezone(timezone.utc), newest.astimezone(timezone.utc)
+            first = min(first, date(oldest.year, oldest.month, 1))
+            last = max(last, date(newest.year, newest.month, 1))
+    create_monthly_partitions(first, last)
+
+    # القراءات بلا timestamp تأخذ وقت الترحيل لأن مفتاح التقسيم لا يقبل NULL
+    op.execute(f'INSERT INTO {TABLE} (id, user_id, biomarker_type, value, "timestamp", metadata) '
+               f'SELECT id, user_id, biomarker_type, value, coalesce("timestamp", now()), metadata '
+               f"FROM {LEGACY_TABLE}")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    op.execute(f"DROP TABLE {LEGACY_TABLE}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql" or not is_table_kind(TABLE, "p"):
+        return
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+    op.execute(f"ALTER INDEX IF EXISTS ix_{TABLE}_id RENAME TO ix_{LEGACY_TABLE}_id")
+    op.execute(f"ALTER INDEX IF EXISTS {INDEX} RENAME TO ix_{LEGACY_TABLE}_user_id_timestamp")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+
+    op.execute(f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{SEQUENCE}'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            biomarker_type VARCHAR NOT NULL,
+            value FLOAT NOT NULL,
+            "timestamp" TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            metadata VARCHAR,
+            CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"CREATE INDEX ix_{TABLE}_id ON {TABLE} (id)")
+    op.execute(f'CREATE INDEX {INDEX} ON {TABLE} (user_id, "timestamp") INCLUDE (biomarker_type, value)')
+    op.execute(f'INSERT INTO {TABLE} (id, user_id, biomarker_type, value, "timestamp", metadata) '
+               f'SELECT id, user_id, biomarker_type, value, "timestamp", metadata FROM {LEGACY_TABLE}')
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} AS INTEGER")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    # حذف الجدول المقسم يحذف أقسامه
+    op.execute(f"DROP TABLE {LEGACY_TABLE}")
@@ -0,0 +1,54 @@
+"""
+جدول content_translations للترجمات المسبقة للمحتوى المنشور
+
+أُضيف النموذج ContentTranslation مع عامل الترجمة المسبقة، لكن create_all لا
+يعدّل قاعدة موجودة فلا يظهر الجدول فيها. القواعد الجديدة التي أنشأت الجدول من
+النماذج تُتجاوز.
+
+Revision ID: 0003_content_translations
+Revises: 0002_partition_digital_biomarkers
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_content_translations"
+down_revision = "0002_partition_digital_biomarkers"
+branch_labels = None
+depends_on = None
+
+TABLE = "content_translations"
+
+
+def table_exists(name):
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    if table_exists(TABLE):
+        return
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("content_type", sa.String, nullable=False),
+        sa.Column("content_id", sa.Integer, nullable=False),
+        sa.Column("locale", sa.String(10), nullable=False),
+        sa.Column("source_locale", sa.String(10), nullable=True),
+        sa.Column("source_hash", sa.String(64), nullable=False),
+        sa.Column("fields", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.UniqueConstraint("content_type", "content_id", "locale",
+                            name="uq_content_translations_content_locale"),
+    )
+    op.create_index("ix_content_translations_id", TABLE, ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_content_translations_id", table_name=TABLE)
+    op.drop_table(TABLE)
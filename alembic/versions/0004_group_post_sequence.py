@@ -0,0 +1,54 @@
+"""
+رقم تسلسل رسائل غرف المجموعات الحية في group_posts
+
+يضيف العمود sequence وقيد التفرد (group_id, sequence) اللذين تعتمد عليهما
+GroupPostRepository؛ create_all لا يضيفهما إلى جدول موجود. الرسائل القديمة تبقى
+بلا رقم تسلسل (NULL لا يخالف قيد التفرد).
+
+Revision ID: 0004_group_post_sequence
+Revises: 0003_content_translations
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_group_post_sequence"
+down_revision = "0003_content_translations"
+branch_labels = None
+depends_on = None
+
+TABLE = "group_posts"
+CONSTRAINT = "uq_group_posts_group_sequence"
+
+
+def has_sequence():
+    """
+    هل يضم group_posts العمود sequence؛ None إذا لم يوجد الجدول بعد (قاعدة جديدة
+    تُنشأ من النماذج). في وضع توليد SQL (--sql) يُفترض جدول بلا العمود.
+    """
+    if op.get_context().as_sql:
+        return False
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE):
+        return None
+    return "sequence" in {column["name"] for column in inspector.get_columns(TABLE)}
+
+
+def upgrade():
+    if has_sequence() is not False:
+        return
+    # batch يعيد إنشاء الجدول في SQLite الذي لا يدعم إضافة قيد إلى جدول موجود
+    with op.batch_alter_table(TABLE) as batch:
+        batch.add_column(sa.Column("sequence", sa.Integer, nullable=True))
+        batch.create_unique_constraint(CONSTRAINT, ["group_id", "sequence"])
+
+
+def downgrade():
+    if not op.get_context().as_sql and not has_sequence():
+        return
+    with op.batch_alter_table(TABLE) as batch:
+        batch.drop_constraint(CONSTRAINT, type_="unique")
+        batch.drop_column("sequence")
@@ -1,7 +1,7 @@
 # مسارات API الإصدار الأول
 
 from fastapi import APIRouter
-from app.api.api_v1.endpoints import auth, users, sessions, content, analytics, language, translations, auto_translate, websocket_translate, default_translations
+from app.api.api_v1.endpoints import auth, users, sessions, content, analytics, language, translations, auto_translate, websocket_translate, realtime_translation, group_rooms, default_translations
 
 api_router = APIRouter()
 
@@ -26,5 +26,9 @@ api_router.include_router(auto_translate.router,
                           prefix="/auto-translate", tags=["الترجمة التلقائية"])
 api_router.include_router(websocket_translate.router,
                           prefix="/websocket", tags=["WebSocket"])
+api_router.include_router(realtime_translation.router,
+                          prefix="/realtime", tags=["WebSocket"])
+api_router.include_router(group_rooms.router,
+                          prefix="/groups", tags=["WebSocket"])
 api_router.include_router(default_translations.router,
                           prefix="/default-translations", tags=["الترجمات الافتراضية"])
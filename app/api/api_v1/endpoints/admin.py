@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
 import re
 from pathlib import Path
@@ -8,6 +8,10 @@ from app import schemas
 from app import crud
 from app.core.database import get_db
 from app.core.security import get_current_user, PermissionChecker, invalidate_user_cache
+from app.core.llm_scheduler import llm_scheduler
+from app.core.auto_translator import auto_translator
+from app.core.presence import presence_registry
+from app.core.websocket_connections import connection_trackers
 
 router = APIRouter()
 
@@ -203,3 +207,59 @@ def remove_permission_from_role(
         db, role=role, permission=permission)
 
     return updated_role
+
+
+# --- LLM Scheduler Endpoints ---
+
+
+@router.get(
+    "/llm-scheduler",
+    dependencies=[Depends(PermissionChecker(["audit:read"]))],
+    summary="[Admin] إحصائيات مجدول طلبات النموذج اللغوي"
+)
+def read_llm_scheduler_stats() -> Dict[str, Any]:
+    """
+    عمق طابور الطلبات لكل أولوية وأزمنة الانتظار وعدد مرات إعادة المحاولة
+    وتجاوز حدود المعدل لدى مزود النموذج اللغوي.
+    """
+    return llm_scheduler.get_stats()
+
+
+@router.get(
+    "/llm-providers",
+    dependencies=[Depends(PermissionChecker(["audit:read"]))],
+    summary="[Admin] حالة مزودي الترجمة"
+)
+def read_llm_provider_stats() -> Dict[str, Any]:
+    """
+    زمن الاستجابة ومعدل الأخطاء وحالة قاطع الدائرة لكل مزود،
+    وعدد الطلبات التحوطية المرسلة والرابحة.
+    """
+    return auto_translator.router.get_stats()
+
+
+# --- WebSocket Connections Endpoints ---
+
+
+@router.get(
+    "/websocket-connections",
+    dependencies=[Depends(PermissionChecker(["audit:read"]))],
+    summary="[Admin] اتصالات WebSocket واستهلاك ذاكرة طوابير الإرسال"
+)
+async def read_websocket_connections(detail: bool = False) -> Dict[str, Any]:
+    """
+    عدد الاتصالات والمستخدمين والبايتات المنتظرة في طوابير الإرسال لكل نطاق
+    في هذه العملية، وعدد الاتصالات لكل عملية ونطاق في العنقود.
+
+    - **detail**: تضمين مدة الخمول والبايتات المنتظرة لكل اتصال.
+    """
+    cluster: Dict[str, Dict[str, int]] = {}
+    for record in await presence_registry.active_connections():
+        workers = cluster.setdefault(record.get("scope") or "unknown", {})
+        workers[record["worker_id"]] = workers.get(record["worker_id"], 0) + 1
+
+    return {
+        "worker_id": presence_registry.worker_id,
+        "scopes": [tracker.get_stats(detail) for tracker in connection_trackers],
+        "cluster": cluster,
+    }
@@ -3,11 +3,12 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app import crud, models, schemas
 from app.api import deps
 from app.core.security import get_current_user
+from app.core.biomarker_partitions import biomarker_partitions
 
 router = APIRouter()
 
@@ -160,14 +161,19 @@ def get_progress_report(
 
 @router.get("/digital-biomarkers-analysis", response_model=schemas.DigitalBiomarkersAnalysis)
 def get_digital_biomarkers_analysis(
-    db: Session = Depends(deps.get_db),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     current_user: models.User = Depends(get_current_user),
 ) -> Any:
     """
     الحصول على تحليل المؤشرات الحيوية الرقمية للمستخدم
+
+    النطاق الافتراضي آخر 30 يوماً، فلا تُقرأ إلا أقسام الأشهر المتقاطعة معه
     """
-    analysis = crud.get_digital_biomarkers_analysis(
-        db, user_id=current_user.id)
+    end_date = end_date or datetime.now(timezone.utc)
+    start_date = start_date or end_date - timedelta(days=30)
+    analysis = biomarker_partitions.analyze(
+        current_user.id, start=start_date, end=end_date)
     return analysis
 
 
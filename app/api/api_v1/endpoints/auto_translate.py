@@ -8,6 +8,12 @@ from app.core.database import get_db
 from app.core.i18n import translator, i18n_settings
 from app.core.translation_loader import translation_loader
 from app.core.auto_translator import auto_translator
+from app.core.content_pretranslation import (
+    PRETRANSLATED_CONTENT,
+    get_published_content,
+    get_translated_content,
+    get_translation_progress as pretranslation_progress,
+)
 from app.core.consent import consent_manager
 from app.core.geolocation import geolocation_service
 
@@ -191,16 +197,22 @@ async def suggest_translation(
 
 
 @router.post("/content-type")
-async def translate_content_type(
+def translate_content_type(
     content_type: str,
     content_id: int,
     target_language: str,
+    response: Response,
     source_language: str = None,
+    db: Session = Depends(get_db),
     current_user: UserInDB = Depends(verify_token)
 ) -> Dict[str, Any]:
     """
     ترجمة محتوى بنوع معين
 
+    تُقرأ الترجمة من جدول الترجمات المسبقة دون استدعاء النموذج اللغوي.
+    إذا لم تكن الترجمة جاهزة بعد يُضاف المحتوى إلى طابور الترجمة المسبقة
+    ويُعاد الرمز 202 مع الحالة "pending"، ولغة المحتوى الأصلية تُعاد بحقوله الأصلية.
+
     Args:
         content_type: نوع المحتوى (مثل "article", "exercise", "program")
         content_id: معرف المحتوى
@@ -224,39 +236,18 @@ async def translate_content_type(
             detail=f"Source language {source_language} is not supported"
         )
 
-    # في التطبيق الحقيقي، سيتم الحصول على المحتوى من قاعدة البيانات
-    # هنا سنقوم بإنشاء محتوى وهمي
-    content = {
-        "id": content_id,
-        "type": content_type,
-        "title": f"Sample {content_type.title()}",
-        "description": f"This is a sample {content_type} for translation.",
-        "content": f"This is the content of the sample {content_type}."
-    }
-
-    # ترجمة المحتوى
-    translated_content = auto_translator.translate_content(
-        content, target_language, source_language)
-
-    if translated_content is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Content translation failed"
-        )
-
-    return {
-        "content_type": content_type,
-        "content_id": content_id,
-        "original_content": content,
-        "translated_content": translated_content,
-        "source_language": source_language,
-        "target_language": target_language
-    }
+    obj = _get_pretranslated_content(db, content_type, content_id)
+    result = get_translated_content(db, content_type, obj, target_language)
+    if result["status"] == "pending":
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
 
 
 @router.get("/progress")
-async def get_translation_progress(
+def get_translation_progress(
     content_id: int,
+    content_type: str = "article",
+    db: Session = Depends(get_db),
     current_user: UserInDB = Depends(verify_token)
 ) -> Dict[str, Any]:
     """
@@ -264,31 +255,28 @@ async def get_translation_progress(
 
     Args:
         content_id: معرف المحتوى
+        content_type: نوع المحتوى
         current_user: المستخدم الحالي
 
     Returns:
-        تقدم الترجمة
+        تقدم الترجمة محسوباً من جدول الترجمات المسبقة
     """
-    # في التطبيق الحقيقي، سيتم الحصول على التقدم من قاعدة البيانات
-    # هنا سنقوم بإرجاع بيانات وهمية
-    progress = {
-        "content_id": content_id,
-        "total_languages": len(i18n_settings.supported_locales),
-        "translated_languages": 15,
-        "translation_percentage": 58.3,
-        "languages": [
-            {"language": "en", "translated": True},
-            {"language": "ar", "translated": True},
-            {"language": "fr", "translated": False},
-            {"language": "es", "translated": True},
-            {"language": "de", "translated": False},
-            {"language": "zh", "translated": True},
-            {"language": "ja", "translated": False},
-            {"language": "ko", "translated": True},
-            {"language": "ru", "translated": False},
-            {"language": "pt", "translated": True}
-        ]
-    }
+    obj = _get_pretranslated_content(db, content_type, content_id)
+    return pretranslation_progress(db, content_type, obj)
+
 
-    return progress
-   return progress
+def _get_pretranslated_content(db: Session, content_type: str, content_id: int) -> Any:
+    """الحصول على كائن المحتوى أو إرجاع خطأ مناسب"""
+    if content_type not in PRETRANSLATED_CONTENT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Content type {content_type} is not supported"
+        )
+
+    obj = get_published_content(db, content_type, content_id)
+    if obj is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{content_type} {content_id} not found"
+        )
+    return obj
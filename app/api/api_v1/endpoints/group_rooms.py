@@ -0,0 +1,70 @@
+
+# نقاط نهاية WebSocket لغرف مجموعات الدعم الحية
+
+from functools import partial
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from app.config import settings
+from app.core.group_rooms import group_rooms
+from app.core.security import authenticate_websocket
+from app.core.websocket_connections import ConnectionTracker
+from app.core.websocket_pipeline import Reply, WebSocketRequestPipeline
+from app.core.websocket_protocol import negotiate_protocol
+
+router = APIRouter()
+
+# نطاق اتصالات الغرف في سجل الحضور
+PRESENCE_SCOPE = "groups"
+
+# إنشاء مثيل من متتبع اتصالات الغرف
+room_connections = ConnectionTracker(PRESENCE_SCOPE)
+
+
+async def handle_room_message(group_id: int, user_id: int, request: Dict[str, Any], reply: Reply):
+    """معالجة رسالة عضو في الغرفة"""
+    if request.get("type") != "post":
+        await reply({"error": "Unknown message type", "status": "error"})
+        return
+
+    content = request.get("content")
+    if not isinstance(content, str) or not content.strip():
+        await reply({"error": "Invalid request format", "status": "error"})
+        return
+    if len(content) > settings.group_post_max_length:
+        await reply({"error": "Message too long", "status": "error"})
+        return
+
+    # تُسلم الرسالة نفسها إلى الكاتب مع بقية الأعضاء؛ الرد يؤكد رقم تسلسلها
+    sequence = await group_rooms.post(group_id, user_id, content.strip(), request.get("client_id"))
+    await reply({"status": "accepted", "seq": sequence})
+
+
+@router.websocket("/{group_id}/live")
+async def group_room(websocket: WebSocket, group_id: int, after_seq: Optional[int] = None):
+    """
+    غرفة مجموعة دعم حية
+
+    يرسل العضو {"type": "post", "content": ..., "client_id": ...} ويستلم كل
+    رسالة في الغرفة كـ {"type": "message", "seq": ...} بترتيب التسلسل. عند
+    إعادة الاتصال يمرر after_seq (آخر رقم استلمه) لتصله الرسائل الفائتة.
+    """
+    current_user = await authenticate_websocket(websocket)
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication failed")
+        return
+    if not await group_rooms.is_member(group_id, current_user.id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Not a group member")
+        return
+
+    connection = await room_connections.open(
+        websocket, current_user.id, {"group_id": group_id}, negotiate_protocol(websocket))
+
+    try:
+        await group_rooms.join(group_id, connection, after_seq)
+        await WebSocketRequestPipeline(
+            websocket, partial(handle_room_message, group_id, current_user.id), connection=connection).run()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await group_rooms.leave(group_id, connection)
+        await room_connections.close(connection)
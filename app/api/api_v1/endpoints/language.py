@@ -4,15 +4,17 @@
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_async_db, get_db
 from app.core.i18n import translator, i18n_settings, _
 from app.core.consent import consent_manager
 from app.core.geolocation import geolocation_service
 
 from app.schemas import language as language_schemas
 from app.schemas.user import UserInDB
-from app.core.security import get_current_user, PermissionChecker
+from app.core.security import get_current_user, get_current_user_async, PermissionChecker
 
 router = APIRouter()
 
@@ -25,8 +27,8 @@ router = APIRouter()
 )
 async def get_language_consent(
     request: Request,
-    current_user: UserInDB = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserInDB = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     الحصول على حالة موافقة اللغة للمستخدم
@@ -34,13 +36,13 @@ async def get_language_consent(
     Args:
         request: كائن الطلب
         current_user: المستخدم الحالي
-        db: جلسة قاعدة البيانات
+        db: جلسة قاعدة البيانات غير المتزامنة
 
     Returns:
         قاموس يحتوي على حالة موافقة اللغة
     """
     # الحصول على حالة الموافقة
-    consent_status = consent_manager.get_consent_status(db, current_user.id)
+    consent_status = await consent_manager.get_consent_status_async(db, current_user.id)
 
     # الحصول على خيارات اللغة المتاحة
     language_options = consent_manager.get_locale_options()
@@ -73,7 +75,7 @@ async def get_language_consent(
 )
 async def give_language_consent(
     consent_data: language_schemas.ConsentStatus,
-    current_user: UserInDB = Depends(get_current_user),
+    current_user: UserInDB = Depends(get_current_user_async),
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -90,7 +92,9 @@ async def give_language_consent(
     """
     consent_data_dict = consent_data.dict()
     # تسجيل الموافقة
-    consent_result = consent_manager.record_consent(
+    # الكتابة ما زالت بالجلسة المتزامنة، فتُنفذ في مجمع الخيوط بدل حلقة الأحداث
+    consent_result = await run_in_threadpool(
+        consent_manager.record_consent,
         db=db,
         user_id=current_user.id,
         consent_given=consent_data.consent_given,
@@ -118,8 +122,8 @@ async def give_language_consent(
 )
 async def detect_locale(
     request: Request,
-    current_user: UserInDB = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserInDB = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     الكشف عن اللغة المناسبة للمستخدم
@@ -127,7 +131,7 @@ async def detect_locale(
     Args:
         request: كائن الطلب
         current_user: المستخدم الحالي
-        db: جلسة قاعدة البيانات
+        db: جلسة قاعدة البيانات غير المتزامنة
 
     Returns:
         قاموس يحتوي على اللغة المكتشفة
@@ -145,7 +149,7 @@ async def detect_locale(
     device_locale = translator.get_locale_by_device_language()
 
     # الحصول على اللغة المفضلة للمستخدم إذا كان قد حددها
-    consent_status = consent_manager.get_consent_status(db, current_user.id)
+    consent_status = await consent_manager.get_consent_status_async(db, current_user.id)
     user_locale = consent_status["preferred_locale"] if consent_status["consent_given"] else None
 
     # ترتيب اللغات حسب الأولوية
@@ -182,7 +186,7 @@ async def detect_locale(
     description="يُرجع قائمة بجميع اللغات المدعومة من قبل النظام.",
 )
 async def get_language_options(
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: UserInDB = Depends(get_current_user_async)
 ) -> Any:
     """
     الحصول على خيارات اللغة المتاحة
@@ -211,7 +215,7 @@ async def get_language_options(
 )
 async def set_locale(
     locale_data: language_schemas.SetLocaleRequest,
-    current_user: UserInDB = Depends(get_current_user),
+    current_user: UserInDB = Depends(get_current_user_async),
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -238,7 +242,9 @@ async def set_locale(
     translator.set_locale(locale)
 
     # تسجيل اللغة المفضلة للمستخدم
-    consent_result = consent_manager.record_consent(
+    # الكتابة ما زالت بالجلسة المتزامنة، فتُنفذ في مجمع الخيوط بدل حلقة الأحداث
+    consent_result = await run_in_threadpool(
+        consent_manager.record_consent,
         db=db,
         user_id=current_user.id,
         consent_given=True,
@@ -1,202 +1,123 @@
-
 # نقاط نهاية API للترجمة التلقائية في الوقت الفعلي
 
-from typing import Dict, List, Optional, Any
+from functools import partial
+from typing import Dict, List, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.i18n import translator, i18n_settings, _
-from app.core.auto_translator import auto_translator
 from app.core.consent import consent_manager
 from app.core.geolocation import geolocation_service
 
 from app.schemas.user import UserInDB
-from app.core.security import verify_token
+from app.core.security import authenticate_websocket, verify_token
 from fastapi import WebSocket, WebSocketDisconnect
+from app.core.websocket_pipeline import Reply, WebSocketRequestPipeline
+from app.core.presence import presence_registry
+from app.core.realtime_translation import PRESENCE_SCOPE, realtime_translation_manager
 
 router = APIRouter()
 
 
-class RealtimeTranslationManager:
-    """مدير الترجمة في الوقت الفعلي"""
-
-    def __init__(self):
-        """تهيئة المدير"""
-        self.active_connections: Dict[int, WebSocket] = {}
-        self.user_languages: Dict[int, str] = {}
-
-    async def connect(self, websocket: WebSocket, user_id: int, db: Session):
-        """اتصال عميل جديد"""
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
-
-        # الحصول على لغة المستخدم
-        consent_status = consent_manager.get_consent_status(db, user_id)
-        if consent_status["consent_given"] and consent_status["preferred_locale"]:
-            self.user_languages[user_id] = consent_status["preferred_locale"]
-        else:
-            self.user_languages[user_id] = i18n_settings.default_locale
-
-    def disconnect(self, user_id: int):
-        """قطع اتصال عميل"""
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-        if user_id in self.user_languages:
-            del self.user_languages[user_id]
-
-    async def translate_text(self, user_id: int, text: str) -> Optional[str]:
-        """ترجمة نص"""
-        if user_id not in self.user_languages:
-            return None
+async def handle_translate(user_id: int, request: Dict[str, Any], reply: Reply):
+    """معالجة طلب ترجمة واحد إلى لغة المستخدم"""
+    # التحقق من صحة الطلب
+    if "text" not in request:
+        await reply({"error": "Invalid request format"})
+        return
 
-        # الحصول على لغة المستخدم
-        target_language = self.user_languages[user_id]
+    # استخراج البيانات
+    text = request["text"]
+
+    # ترجمة النص
+    if request.get("stream"):
+        # إرسال أجزاء الترجمة فور وصولها ثم إطار نهائي بالنص الكامل
+        parts = []
+        async for delta in realtime_translation_manager.translate_text_stream(user_id, text):
+            parts.append(delta)
+            await reply({"delta": delta, "status": "partial"})
+        translated_text = "".join(parts).strip()
+    else:
+        translated_text = await realtime_translation_manager.translate_text(user_id, text)
+
+    # إرسال النتيجة
+    if translated_text:
+        await reply({
+            "original_text": text,
+            "translated_text": translated_text,
+            "target_language": realtime_translation_manager.user_languages.get(user_id),
+            "status": "success"
+        })
+    else:
+        await reply({"error": "Translation failed", "status": "error"})
 
-        # ترجمة النص
-        return auto_translator.translate_text(text, target_language)
 
-    async def detect_language(self, text: str) -> Optional[str]:
-        """كشف لغة النص"""
-        return auto_translator.detect_language(text)
+async def handle_detect_language(request: Dict[str, Any], reply: Reply):
+    """معالجة طلب كشف لغة واحد"""
+    # التحقق من صحة الطلب
+    if "text" not in request:
+        await reply({"error": "Invalid request format"})
+        return
 
-    async def broadcast_translation(self, message: str):
-        """بث رسالة لجميع العملاء"""
-        for connection in self.active_connections.values():
-            await connection.send_text(message)
+    # استخراج البيانات
+    text = request["text"]
 
+    # كشف اللغة
+    detected_language = await realtime_translation_manager.detect_language(text)
 
-# إنشاء مثيل من المدير
-realtime_translation_manager = RealtimeTranslationManager()
+    # إرسال النتيجة
+    if detected_language:
+        await reply({
+            "text": text,
+            "detected_language": detected_language,
+            "language_name": translator.get_translation(f"language_name.{detected_language}", detected_language),
+            "status": "success"
+        })
+    else:
+        await reply({"error": "Language detection failed", "status": "error"})
 
 
 @router.websocket("/translate")
-async def websocket_translate(websocket: WebSocket, token: str, db: Session = Depends(get_db)):
-    """نقطة نهاية WebSocket للترجمة التلقائية"""
-    # التحقق من المصادقة
-    user_id = None
-    try:
-        user_id = verify_token(token)
-    except:
-        await websocket.close(code=1008, reason="Authentication failed")
-        return
+async def websocket_translate(websocket: WebSocket):
+    """
+    نقطة نهاية WebSocket للترجمة التلقائية
 
-    # الاتصال بالعميل
-    await realtime_translation_manager.connect(websocket, user_id, db)
+    يمكن للعميل إرسال عدة طلبات دون انتظار الردود؛ يُعاد "id" الطلب في كل
+    إطار رد، ويُلغى طلب جارٍ برسالة {"type": "cancel", "id": ...}.
+    """
+    # المصادقة بجلسة قصيرة العمر حتى لا يُحجز اتصال قاعدة البيانات طوال عمر المقبس
+    current_user = await authenticate_websocket(websocket)
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication failed")
+        return
+    connection = await realtime_translation_manager.connect(websocket, current_user.id)
 
     try:
-        while True:
-            # استلام رسالة من العميل
-            data = await websocket.receive_text()
-
-            try:
-                # تحليل البيانات
-                import json
-                request = json.loads(data)
-
-                # التحقق من صحة الطلب
-                if "text" not in request:
-                    await websocket.send_text(json.dumps({
-                        "error": "Invalid request format"
-                    }))
-                    continue
-
-                # استخراج البيانات
-                text = request["text"]
-
-                # ترجمة النص
-                translated_text = await realtime_translation_manager.translate_text(user_id, text)
-
-                # إرسال النتيجة
-                if translated_text:
-                    await websocket.send_text(json.dumps({
-                        "original_text": text,
-                        "translated_text": translated_text,
-                        "target_language": realtime_translation_manager.user_languages.get(user_id),
-                        "status": "success"
-                    }))
-                else:
-                    await websocket.send_text(json.dumps({
-                        "error": "Translation failed",
-                        "status": "error"
-                    }))
-
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({
-                    "error": "Invalid JSON format"
-                }))
-            except Exception as e:
-                await websocket.send_text(json.dumps({
-                    "error": str(e),
-                    "status": "error"
-                }))
-
+        await WebSocketRequestPipeline(
+            websocket, partial(handle_translate, current_user.id), connection=connection).run()
     except WebSocketDisconnect:
-        realtime_translation_manager.disconnect(user_id)
+        pass
+    finally:
+        # التنظيف عند أي سبب للإغلاق (قطع الاتصال أو الخمول أو خطأ)
+        await realtime_translation_manager.disconnect(connection)
 
 
 @router.websocket("/detect-language")
-async def websocket_detect_language(websocket: WebSocket, token: str, db: Session = Depends(get_db)):
+async def websocket_detect_language(websocket: WebSocket):
     """نقطة نهاية WebSocket لكشف اللغة"""
-    # التحقق من المصادقة
-    user_id = None
-    try:
-        user_id = verify_token(token)
-    except:
-        await websocket.close(code=1008, reason="Authentication failed")
+    # المصادقة بجلسة قصيرة العمر حتى لا يُحجز اتصال قاعدة البيانات طوال عمر المقبس
+    current_user = await authenticate_websocket(websocket)
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication failed")
         return
-
-    # الاتصال بالعميل
-    await realtime_translation_manager.connect(websocket, user_id, db)
+    connection = await realtime_translation_manager.connect(websocket, current_user.id)
 
     try:
-        while True:
-            # استلام رسالة من العميل
-            data = await websocket.receive_text()
-
-            try:
-                # تحليل البيانات
-                import json
-                request = json.loads(data)
-
-                # التحقق من صحة الطلب
-                if "text" not in request:
-                    await websocket.send_text(json.dumps({
-                        "error": "Invalid request format"
-                    }))
-                    continue
-
-                # استخراج البيانات
-                text = request["text"]
-
-                # كشف اللغة
-                detected_language = await realtime_translation_manager.detect_language(text)
-
-                # إرسال النتيجة
-                if detected_language:
-                    await websocket.send_text(json.dumps({
-                        "text": text,
-                        "detected_language": detected_language,
-                        "language_name": translator.get_translation(f"language_name.{detected_language}", detected_language),
-                        "status": "success"
-                    }))
-                else:
-                    await websocket.send_text(json.dumps({
-                        "error": "Language detection failed",
-                        "status": "error"
-                    }))
-
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({
-                    "error": "Invalid JSON format"
-                }))
-            except Exception as e:
-                await websocket.send_text(json.dumps({
-                    "error": str(e),
-                    "status": "error"
-                }))
-
+        await WebSocketRequestPipeline(websocket, handle_detect_language, connection=connection).run()
     except WebSocketDisconnect:
-        realtime_translation_manager.disconnect(user_id)
+        pass
+    finally:
+        await realtime_translation_manager.disconnect(connection)
 
 
 @router.get("/user-language")
@@ -275,7 +196,7 @@ async def set_user_language(
         )
 
     # تعيين اللغة
-    realtime_translation_manager.user_languages[user_id] = language
+    await realtime_translation_manager.set_language(user_id, language)
 
     # تسجيل الموافقة
     consent_manager.record_consent(
@@ -308,18 +229,17 @@ async def get_active_users(
     Returns:
         قائمة المستخدمين النشطين
     """
-    # الحصول على المستخدمين النشطين
-    active_users = []
+    # الحصول على المستخدمين النشطين في جميع العمليات
+    active_users = {}
 
-    for user_id in realtime_translation_manager.active_connections.keys():
-        active_users.append({
-            "user_id": user_id,
-            "language": realtime_translation_manager.user_languages.get(user_id, i18n_settings.default_locale)
+    for record in await presence_registry.active_connections(PRESENCE_SCOPE):
+        active_users.setdefault(record["user_id"], {
+            "user_id": record["user_id"],
+            "language": record.get("language", i18n_settings.default_locale)
         })
+    active_users = list(active_users.values())
 
     return {
         "active_users": active_users,
         "count": len(active_users)
     }
-": len(active_users)
-    }
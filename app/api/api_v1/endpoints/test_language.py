@@ -1,10 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 from app.main import app  # افترض أن هذا هو ملف التطبيق الرئيسي
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.security import verify_token
 from app.schemas.user import UserInDB
 
@@ -32,10 +33,18 @@ def db_session(mocker) -> Session:
     return mocker.MagicMock(spec=Session)
 
 
+@pytest.fixture
+def async_db_session(mocker) -> AsyncSession:
+    """
+    إنشاء جلسة قاعدة بيانات غير متزامنة وهمية.
+    """
+    return mocker.AsyncMock(spec=AsyncSession)
+
+
 @pytest.fixture(autouse=True)
-def override_dependencies(db_session: Session):
+def override_dependencies(db_session: Session, async_db_session: AsyncSession):
     """
-    تجاوز التبعيات (get_db, verify_token) لجميع الاختبارات في هذا الملف.
+    تجاوز التبعيات (get_db, get_async_db, verify_token) لجميع الاختبارات في هذا الملف.
     """
     def override_get_db():
         try:
@@ -43,10 +52,14 @@ def override_dependencies(db_session: Session):
         finally:
             pass
 
+    async def override_get_async_db():
+        yield async_db_session
+
     def override_verify_token():
         return mock_user.id
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[verify_token] = override_verify_token
     yield
     # تنظيف التجاوزات بعد انتهاء الاختبارات
@@ -58,7 +71,7 @@ def test_get_language_consent(mocker):
     اختبار نقطة النهاية للحصول على حالة موافقة اللغة.
     """
     # محاكاة الدوال الخارجية
-    mocker.patch("app.core.consent.consent_manager.get_consent_status", return_value={
+    mocker.patch("app.core.consent.consent_manager.get_consent_status_async", return_value={
         "consent_given": False, "preferred_locale": None, "locale_source": None
     })
     mocker.patch("app.core.consent.consent_manager.get_locale_options", return_value={
@@ -120,7 +133,7 @@ def test_detect_locale_with_user_preference(mocker, db_session):
     اختبار الكشف عن اللغة عندما يكون لدى المستخدم تفضيل محفوظ.
     """
     # إعداد المحاكاة
-    mocker.patch("app.core.consent.consent_manager.get_consent_status", return_value={
+    mocker.patch("app.core.consent.consent_manager.get_consent_status_async", return_value={
         "consent_given": True, "preferred_locale": "fr", "locale_source": "manual"
     })
 
@@ -139,7 +152,7 @@ def test_detect_locale_with_browser_preference(mocker, db_session):
     اختبار الكشف عن اللغة بناءً على لغة المتصفح.
     """
     # إعداد المحاكاة
-    mocker.patch("app.core.consent.consent_manager.get_consent_status", return_value={
+    mocker.patch("app.core.consent.consent_manager.get_consent_status_async", return_value={
         "consent_given": False, "preferred_locale": None
     })
     mocker.patch(
@@ -4,8 +4,10 @@
 from typing import Dict, List, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.config import settings
 from app.core.i18n import translator, i18n_settings
 from app.core.translation_loader import translation_loader
 from app.core.consent import consent_manager
@@ -144,9 +146,9 @@ async def translate_text(
             detail=f"Source language {source_language} is not supported"
         )
 
-    # ترجمة النص
-    translated_text = auto_translator.translate_text(
-        text, target_language, source_language)
+    # ترجمة النص خارج حلقة الأحداث حتى تتداخل الطلبات المتزامنة وتُدمج المتطابقة منها
+    translated_text = await run_in_threadpool(
+        auto_translator.translate_text, text, target_language, source_language)
 
     if translated_text is None:
         raise HTTPException(
@@ -177,8 +179,8 @@ async def detect_language(
     Returns:
         اللغة المكتشفة
     """
-    # الكشف عن اللغة
-    detected_language = auto_translator.detect_language(text)
+    # الكشف عن اللغة في مجمّع الخيوط: قد يلجأ إلى النموذج اللغوي
+    detected_language = await run_in_threadpool(auto_translator.detect_language, text)
 
     if detected_language is None:
         raise HTTPException(
@@ -193,6 +195,48 @@ async def detect_language(
     }
 
 
+@router.post("/detect-batch")
+async def detect_languages(
+    texts: List[str],
+    current_user: UserInDB = Depends(verify_token)
+) -> Dict[str, Any]:
+    """
+    الكشف عن لغة مجموعة من النصوص
+
+    Args:
+        texts: النصوص المطلوب الكشف عن لغتها
+        current_user: المستخدم الحالي
+
+    Returns:
+        اللغات المكتشفة بنفس ترتيب النصوص
+    """
+    if len(texts) > settings.language_detection_batch_max_texts:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.language_detection_batch_max_texts} texts per request"
+        )
+    if any(len(text) > settings.language_detection_max_text_chars for text in texts):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Each text must be at most {settings.language_detection_max_text_chars} characters"
+        )
+
+    # الكشف عن اللغات في مجمّع الخيوط: النصوص غير المؤكدة تُرسل إلى النموذج اللغوي
+    detected_languages = await run_in_threadpool(auto_translator.detect_languages, texts)
+
+    return {
+        "results": [
+            {
+                "text": text,
+                "detected_language": detected_language,
+                "language_name": translation_loader.get_translation(f"language_name.{detected_language}", detected_language) if detected_language else None
+            }
+            for text, detected_language in zip(texts, detected_languages)
+        ],
+        "count": len(texts)
+    }
+
+
 @router.post("/import")
 async def import_translations(
     lang_code: str,
@@ -336,6 +380,3 @@ async def get_translation_status(
         "total_languages": len(i18n_settings.supported_locales),
         "default_language": i18n_settings.default_locale
     }
-cale
-    }
-}
@@ -1,6 +1,7 @@
 # نقاط نهاية المستخدمين
 
-from typing import Any, List
+from typing import Any, List, Optional
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -8,6 +9,7 @@ from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
 from app.core.security import get_current_user, get_password_hash, invalidate_user_cache
+from app.core.biomarker_partitions import biomarker_partitions
 
 router = APIRouter()
 
@@ -96,14 +98,19 @@ def update_user_preferences(
 def read_user_digital_biomarkers(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(deps.get_db),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     current_user: models.User = Depends(get_current_user),
 ) -> Any:
     """
     الحصول على مؤشرات المستخدم الحيوية الرقمية
+
+    النطاق الافتراضي آخر 90 يوماً، فلا تُقرأ إلا أقسام الأشهر المتقاطعة معه
     """
-    biomarkers = crud.get_user_digital_biomarkers(
-        db, user_id=current_user.id, skip=skip, limit=limit)
+    end_date = end_date or datetime.now(timezone.utc)
+    start_date = start_date or end_date - timedelta(days=90)
+    biomarkers = biomarker_partitions.readings(
+        current_user.id, start=start_date, end=end_date, skip=skip, limit=limit)
     return biomarkers
 
 
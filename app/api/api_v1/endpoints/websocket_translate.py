@@ -1,195 +1,172 @@
 
 # نقاط نهاية WebSocket للترجمة التلقائية في الوقت الفعلي
 
-from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
+from typing import Dict, List, Any
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
 from app.core.i18n import translator, i18n_settings
 from app.core.auto_translator import auto_translator
-from app.core.consent import consent_manager
-from app.core.geolocation import geolocation_service
-from app.models.user import User as UserModel
-from app.schemas.user import UserInDB
-from app.core.security import get_current_user, verify_token
+from app.core.llm_scheduler import Priority
+from app.core.translation_batcher import translation_batcher
+from app.core.security import authenticate_websocket
+from app.core.websocket_pipeline import Reply, WebSocketRequestPipeline, iterate_stream
+from app.core.websocket_connections import ConnectionTracker, TrackedConnection
+from app.core.websocket_protocol import negotiate_protocol
+from app.core.presence import presence_registry
 
 router = APIRouter()
 
+# نطاق اتصالات هذه الوحدة في سجل الحضور
+PRESENCE_SCOPE = "websocket"
+
 
 class ConnectionManager:
     """مدير اتصالات WebSocket"""
 
     def __init__(self):
         """تهيئة المدير"""
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.connections = ConnectionTracker(PRESENCE_SCOPE)
+
+    @property
+    def active_connections(self) -> Dict[int, List[WebSocket]]:
+        """اتصالات كل مستخدم في هذه العملية"""
+        active: Dict[int, List[WebSocket]] = {}
+        for connection in self.connections.connections():
+            active.setdefault(connection.user_id, []).append(connection.websocket)
+        return active
 
-    async def connect(self, websocket: WebSocket, user_id: int):
-        """اتصال عميل جديد"""
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+    async def connect(self, websocket: WebSocket, user_id: int) -> TrackedConnection:
+        """اتصال عميل جديد بصيغة الإطارات التي عرضها (JSON افتراضياً)"""
+        return await self.connections.open(websocket, user_id, protocol=negotiate_protocol(websocket))
 
-    def disconnect(self, websocket: WebSocket, user_id: int):
+    async def disconnect(self, connection: TrackedConnection):
         """قطع اتصال عميل"""
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+        await self.connections.close(connection)
 
-    async def send_personal_message(self, message: str, user_id: int):
-        """إرسال رسالة شخصية للمستخدم"""
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                await connection.send_text(message)
+    async def send_personal_message(self, message: Dict[str, Any], user_id: int):
+        """إرسال رسالة شخصية للمستخدم أينما كان متصلاً في العنقود (بصيغة كل اتصال)"""
+        await presence_registry.send_to_user(PRESENCE_SCOPE, user_id, message)
 
-    async def broadcast(self, message: str):
-        """بث رسالة لجميع العملاء"""
-        for user_connections in self.active_connections.values():
-            for connection in user_connections:
-                await connection.send_text(message)
+    async def broadcast(self, message: Dict[str, Any]):
+        """بث رسالة لجميع العملاء في العنقود (إضافة إلى طوابير الإرسال دون انتظار الشبكة)"""
+        await presence_registry.broadcast(PRESENCE_SCOPE, message)
 
 
 # إنشاء مثيل من مدير الاتصالات
 manager = ConnectionManager()
 
 
+async def handle_translate(request: Dict[str, Any], reply: Reply):
+    """معالجة طلب ترجمة واحد على اتصال WebSocket"""
+    # التحقق من صحة الطلب
+    if "text" not in request or "target_language" not in request:
+        await reply({"error": "Invalid request format"})
+        return
+
+    # استخراج البيانات
+    text = request["text"]
+    target_language = request["target_language"]
+    source_language = request.get("source_language")
+
+    # التحقق من صحة لغة الهدف
+    if target_language not in i18n_settings.supported_locales:
+        await reply({"error": f"Target language {target_language} is not supported"})
+        return
+
+    # التحقق من صحة لغة المصدر إذا تم توفيرها
+    if source_language and (source_language not in i18n_settings.supported_locales):
+        await reply({"error": f"Source language {source_language} is not supported"})
+        return
+
+    # ترجمة النص
+    if request.get("stream"):
+        # إرسال أجزاء الترجمة فور وصولها ثم إطار نهائي بالنص الكامل
+        parts = []
+        async for delta in iterate_stream(auto_translator.translate_text_stream(
+                text, target_language, source_language)):
+            parts.append(delta)
+            await reply({"delta": delta, "status": "partial"})
+        translated_text = "".join(parts).strip()
+    else:
+        translated_text = await translation_batcher.translate(
+            text, target_language, source_language)
+
+    # إرسال النتيجة
+    if translated_text:
+        await reply({
+            "original_text": text,
+            "translated_text": translated_text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "status": "success"
+        })
+    else:
+        await reply({"error": "Translation failed", "status": "error"})
+
+
+async def handle_detect_language(request: Dict[str, Any], reply: Reply):
+    """معالجة طلب كشف لغة واحد على اتصال WebSocket"""
+    # التحقق من صحة الطلب
+    if "text" not in request:
+        await reply({"error": "Invalid request format"})
+        return
+
+    # استخراج البيانات
+    text = request["text"]
+
+    # كشف اللغة في مجمّع الخيوط حتى لا تُحجب الاتصالات الأخرى
+    detected_language = await run_in_threadpool(
+        auto_translator.detect_language, text, Priority.INTERACTIVE)
+
+    # إرسال النتيجة
+    if detected_language:
+        await reply({
+            "text": text,
+            "detected_language": detected_language,
+            "language_name": translator.get_translation(f"language_name.{detected_language}", detected_language),
+            "status": "success"
+        })
+    else:
+        await reply({"error": "Language detection failed", "status": "error"})
+
+
 @router.websocket("/translate")
-async def websocket_translate(websocket: WebSocket, current_user: UserInDB = Depends(get_current_user)):
-    """نقطة نهاية WebSocket للترجمة التلقائية"""
+async def websocket_translate(websocket: WebSocket):
+    """
+    نقطة نهاية WebSocket للترجمة التلقائية
+
+    يمكن للعميل إرسال عدة طلبات دون انتظار الردود؛ يُعاد "id" الطلب في كل
+    إطار رد، ويُلغى طلب جارٍ برسالة {"type": "cancel", "id": ...}.
+    """
+    # المصادقة بجلسة قصيرة العمر حتى لا يُحجز اتصال قاعدة البيانات طوال عمر المقبس
+    current_user = await authenticate_websocket(websocket)
     if not current_user:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication failed")
         return
-    await manager.connect(websocket, current_user.id)
+    connection = await manager.connect(websocket, current_user.id)
 
     try:
-        while True:
-            # استلام رسالة من العميل
-            data = await websocket.receive_text()
-
-            try:
-                # تحليل البيانات
-                import json
-                request = json.loads(data)
-
-                # التحقق من صحة الطلب
-                if "text" not in request or "target_language" not in request:
-                    await websocket.send_text(json.dumps({
-                        "error": "Invalid request format"
-                    }))
-                    continue
-
-                # استخراج البيانات
-                text = request["text"]
-                target_language = request["target_language"]
-                source_language = request.get("source_language")
-
-                # التحقق من صحة لغة الهدف
-                if target_language not in i18n_settings.supported_locales:
-                    await websocket.send_text(json.dumps({
-                        "error": f"Target language {target_language} is not supported"
-                    }))
-                    continue
-
-                # التحقق من صحة لغة المصدر إذا تم توفيرها
-                if source_language and (source_language not in i18n_settings.supported_locales):
-                    await websocket.send_text(json.dumps({
-                        "error": f"Source language {source_language} is not supported"
-                    }))
-                    continue
-
-                # ترجمة النص
-                translated_text = auto_translator.translate_text(
-                    text, target_language, source_language)
-
-                # إرسال النتيجة
-                if translated_text:
-                    await websocket.send_text(json.dumps({
-                        "original_text": text,
-                        "translated_text": translated_text,
-                        "source_language": source_language,
-                        "target_language": target_language,
-                        "status": "success"
-                    }))
-                else:
-                    await websocket.send_text(json.dumps({
-                        "error": "Translation failed",
-                        "status": "error"
-                    }))
-
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({
-                    "error": "Invalid JSON format"
-                }))
-            except Exception as e:
-                await websocket.send_text(json.dumps({
-                    "error": str(e),
-                    "status": "error"
-                }))
-
+        await WebSocketRequestPipeline(websocket, handle_translate, connection=connection).run()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, current_user.id)
+        pass
+    finally:
+        # التنظيف عند أي سبب للإغلاق (قطع الاتصال أو الخمول أو خطأ)
+        await manager.disconnect(connection)
 
 
 @router.websocket("/detect-language")
-async def websocket_detect_language(websocket: WebSocket, token: str):
+async def websocket_detect_language(websocket: WebSocket):
     """نقطة نهاية WebSocket لكشف اللغة"""
-    # التحقق من المصادقة
-    user_id = None
-    try:
-        user_id = verify_token(token)
-    except:
-        await websocket.close(code=1008, reason="Authentication failed")
+    # المصادقة بجلسة قصيرة العمر حتى لا يُحجز اتصال قاعدة البيانات طوال عمر المقبس
+    current_user = await authenticate_websocket(websocket)
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication failed")
         return
-
-    # الاتصال بالعميل
-    await manager.connect(websocket, user_id)
+    connection = await manager.connect(websocket, current_user.id)
 
     try:
-        while True:
-            # استلام رسالة من العميل
-            data = await websocket.receive_text()
-
-            try:
-                # تحليل البيانات
-                import json
-                request = json.loads(data)
-
-                # التحقق من صحة الطلب
-                if "text" not in request:
-                    await websocket.send_text(json.dumps({
-                        "error": "Invalid request format"
-                    }))
-                    continue
-
-                # استخراج البيانات
-                text = request["text"]
-
-                # كشف اللغة
-                detected_language = auto_translator.detect_language(text)
-
-                # إرسال النتيجة
-                if detected_language:
-                    await websocket.send_text(json.dumps({
-                        "text": text,
-                        "detected_language": detected_language,
-                        "language_name": translator.get_translation(f"language_name.{detected_language}", detected_language),
-                        "status": "success"
-                    }))
-                else:
-                    await websocket.send_text(json.dumps({
-                        "error": "Language detection failed",
-                        "status": "error"
-                    }))
-
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({
-                    "error": "Invalid JSON format"
-                }))
-            except Exception as e:
-                await websocket.send_text(json.dumps({
-                    "error": str(e),
-                    "status": "error"
-                }))
-
+        await WebSocketRequestPipeline(websocket, handle_detect_language, connection=connection).run()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id)
+        pass
+    finally:
+        await manager.disconnect(connection)
@@ -1,10 +1,9 @@
 # التبعيات المشتركة للAPI
 
-from typing import Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.core.security import verify_token
 from app import crud, schemas
 
@@ -12,17 +11,6 @@ from app import crud, schemas
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 
-def get_db() -> Generator:
-    """
-    الحصول على جلسة قاعدة البيانات
-    """
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> schemas.User:
@@ -1,44 +1,255 @@
 
 # الترجمة التلقائية للمحتوى
 
-import openai
-from typing import Dict, List, Optional, Any
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from app.core.i18n import translator, i18n_settings
+from app.core.inflight import InFlightRequests
+from app.core.language_detector import language_detector
+from app.core.llm_scheduler import Priority, ScheduledStream, llm_scheduler
+from app.core.translation_memory import TranslationMemory, normalize_segment, segment_text, translation_memory
+from app.core.translation_metrics import record_cache, record_llm_call, register_translator_collectors
+from app.core.translation_providers import ProviderRouter, build_providers
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# الحقول النصية القابلة للترجمة في المحتوى
+TRANSLATABLE_FIELDS = ("title", "description", "content", "summary", "instructions")
+
+# الحقول التي تحتوي على عناصر متداخلة
+NESTED_FIELDS = ("modules", "exercises")
+
+# عدد الأحرف المستخدمة من المستند للكشف عن لغته
+DETECTION_SAMPLE_CHARS = 500
+
 
 class AutoTranslator:
     """مترجم آلي للمحتوى"""
 
-    def __init__(self):
-        """تهيئة المترجم الآلي"""
-        self.client = None
-        if settings.openai_api_key:
-            self.client = openai.OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, router: ProviderRouter = None, memory: TranslationMemory = None):
+        """
+        تهيئة المترجم الآلي
+
+        Args:
+            router: موجّه المزودين (افتراضياً المزودون المُعدّون في الإعدادات)
+            memory: ذاكرة الترجمة على مستوى المقطع (افتراضياً الذاكرة المشتركة)
+        """
+        self.router = router or ProviderRouter(build_providers())
+        self.memory = memory or translation_memory
+        self.in_flight = InFlightRequests()
+        self.scheduler = llm_scheduler
+
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int,
+                  priority: int = Priority.API, stream: bool = False, operation: str = "translate",
+                  source_locale: str = None, target_locale: str = None) -> Any:
+        """
+        إرسال طلب إلى النموذج اللغوي عبر المجدول المركزي وموجّه المزودين
+
+        الطلبات التفاعلية تُرسل مع التحوط (Hedging) إلى مزود ثانٍ عند التأخر.
+        يُسجل لكل طلب المزود والنموذج وزوج اللغات والرموز وزمن الاستجابة
+        والنتيجة في مؤشرات الترجمة.
 
-    def translate_text(self, text: str, target_locale: str, source_locale: str = None) -> Optional[str]:
+        Args:
+            messages: رسائل المحادثة
+            max_tokens: الحد الأقصى لرموز الرد
+            priority: أولوية الطلب
+            stream: إرجاع الرد كبث من الأجزاء
+            operation: نوع العملية في المؤشرات
+            source_locale: اللغة المصدر في المؤشرات
+            target_locale: اللغة الهدف في المؤشرات
+
+        Returns:
+            نص الرد، أو مكرّر لأجزائه في وضع البث
+
+        Raises:
+            خطأ المزود إذا فشلت جميع محاولات المجدول
+        """
+        prompt_tokens = sum(
+            self._estimate_tokens(message["content"]) for message in messages)
+        estimated_tokens = max_tokens + prompt_tokens
+        start = time.monotonic()
+
+        try:
+            if stream:
+                # يبقى مكان الطلب محجوزاً حتى انتهاء البث ثم تُصحح حصة الرموز
+                chunks = self.scheduler.stream(
+                    lambda: self.router.stream(messages, max_tokens),
+                    priority=priority,
+                    estimated_tokens=estimated_tokens,
+                    usage=lambda text: prompt_tokens + self._estimate_tokens(text)
+                )
+            else:
+                result = self.scheduler.run(
+                    lambda: self.router.complete(
+                        messages, max_tokens, hedge=priority == Priority.INTERACTIVE),
+                    priority=priority,
+                    estimated_tokens=estimated_tokens
+                )
+        except Exception:
+            record_llm_call(operation, None, None, source_locale, target_locale,
+                            "error", time.monotonic() - start)
+            raise
+
+        if stream:
+            return self._metered_stream(
+                chunks, start, operation, source_locale, target_locale, prompt_tokens)
+
+        # تصحيح حصة الرموز بالاستهلاك الفعلي
+        self.scheduler.record_usage(estimated_tokens, result.total_tokens)
+
+        record_llm_call(
+            operation, result.provider, result.model, source_locale, target_locale,
+            "success", time.monotonic() - start,
+            result.prompt_tokens or prompt_tokens,
+            result.completion_tokens or self._estimate_tokens(result.text))
+
+        return result.text
+
+    def _metered_stream(self, chunks: ScheduledStream, start: float, operation: str,
+                        source_locale: str, target_locale: str, prompt_tokens: int) -> Iterator[str]:
+        """تمرير أجزاء البث وتسجيل الطلب في المؤشرات عند انتهائه أو انقطاعه"""
+        received = []
+        outcome = "cancelled"
+        try:
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+            outcome = "success"
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            # تحرير مكان الطلب في المجدول إذا توقف المستهلك قبل نهاية البث
+            chunks.close()
+            record_llm_call(
+                operation, chunks.provider, chunks.model,
+                source_locale, target_locale, outcome, time.monotonic() - start,
+                prompt_tokens, self._estimate_tokens("".join(received)) if received else 0)
+
+    def translate_text(self, text: str, target_locale: str, source_locale: str = None,
+                       priority: int = Priority.API) -> Optional[str]:
         """
         ترجمة نص
 
+        الطلبات المتطابقة المتزامنة (نفس النص واللغتين والأولوية) تشترك في
+        استدعاء واحد للمزود ونتيجته، فلا ينتظر طلب تفاعلي خلف طلب خلفية.
+
         Args:
             text: النص المطلوب ترجمته
             target_locale: اللغة الهدف
             source_locale: اللغة المصدر (اختياري، سيتم الكشف تلقائياً إذا لم يتم تحديدها)
+            priority: أولوية الطلب في مجدول النموذج اللغوي
 
         Returns:
             النص المترجم أو None في حالة الفشل
         """
-        # التحقق من وجود عميل OpenAI
-        if not self.client:
+        # التحقق من وجود مزود للترجمة
+        if not self.router.providers:
+            return None
+
+        executed = []
+        result = self.in_flight.run(
+            (text, target_locale, source_locale, priority),
+            lambda: executed.append(True) or self._translate_text(
+                text, target_locale, source_locale, priority)
+        )
+        record_cache("in_flight", hit=not executed)
+        return result
+
+    def _translate_text(self, text: str, target_locale: str, source_locale: str = None,
+                        priority: int = Priority.API) -> Optional[str]:
+        """ترجمة نص باستدعاء واحد للمزود (انظر translate_text)"""
+        prepared = self._translation_messages(
+            text, target_locale, source_locale, priority)
+        if prepared is None:
+            return None
+        messages, source_locale = prepared
+
+        # إنشاء طلب الترجمة
+        try:
+            response = self._complete(messages, 2000, priority, operation="translate",
+                                      source_locale=source_locale, target_locale=target_locale)
+
+            # استخراج النص المترجم
+            translated_text = response.strip()
+
+            return translated_text
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
             return None
 
+    def translate_text_stream(self, text: str, target_locale: str, source_locale: str = None,
+                              priority: int = Priority.INTERACTIVE) -> Iterator[str]:
+        """
+        ترجمة نص مع إرجاع أجزاء الترجمة فور وصولها من النموذج اللغوي
+
+        Args:
+            text: النص المطلوب ترجمته
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر (اختياري، سيتم الكشف تلقائياً إذا لم يتم تحديدها)
+            priority: أولوية الطلب في مجدول النموذج اللغوي
+
+        Returns:
+            مولّد لأجزاء النص المترجم بالترتيب (لا يُنتج شيئاً في حالة عدم توفر الترجمة)
+        """
+        # التحقق من وجود مزود للترجمة
+        if not self.router.providers:
+            return
+
+        prepared = self._translation_messages(
+            text, target_locale, source_locale, priority)
+        if prepared is None:
+            return
+        messages, source_locale = prepared
+
+        try:
+            stream = self._complete(messages, 2000, priority, stream=True, operation="translate_stream",
+                                    source_locale=source_locale, target_locale=target_locale)
+
+            # إغلاق البث صراحة إذا توقف المستهلك مبكراً حتى يُحرر مكانه في المجدول
+            try:
+                leading = True
+                for delta in stream:
+                    # إزالة المسافات البادئة كما في الترجمة الكاملة
+                    if leading:
+                        delta = delta.lstrip()
+                        if not delta:
+                            continue
+                        leading = False
+
+                    yield delta
+            finally:
+                stream.close()
+        except Exception as e:
+            # الأجزاء المرسلة مسبقاً ليست ترجمة كاملة، لذا يجب إبلاغ المستدعي
+            logger.error(f"Streaming translation error: {e}")
+            raise
+
+    def _translation_messages(self, text: str, target_locale: str, source_locale: str = None,
+                              priority: int = Priority.API) -> Optional[Tuple[List[Dict[str, str]], str]]:
+        """
+        إعداد رسائل طلب ترجمة نص واحد
+
+        Args:
+            text: النص المطلوب ترجمته
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر (اختياري)
+            priority: أولوية طلب الكشف عن اللغة إن لزم
+
+        Returns:
+            (قائمة الرسائل، اللغة المصدر) أو None إذا كانت اللغة الهدف غير مدعومة
+        """
         # التحقق من صحة اللغات
         if target_locale not in i18n_settings.supported_locales:
             return None
 
         # إذا لم يتم تحديد اللغة المصدر، قم بالكشف عنها
         if source_locale is None:
-            source_locale = self.detect_language(text)
+            source_locale = self.detect_language(text, priority)
 
         # إذا لم يتمكن من الكشف عن اللغة المصدر، استخدم اللغة الافتراضية
         if source_locale is None or source_locale not in i18n_settings.supported_locales:
@@ -50,127 +261,304 @@ class AutoTranslator:
         target_lang_name = translator.get_translation(
             f"language_name.{target_locale}", target_locale)
 
-        # إنشاء طلب الترجمة
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a professional translator. Your task is to translate text from {source_lang_name} to {target_lang_name}. Maintain the original meaning and tone. Only return the translated text without any additional explanations or formatting."
-                    },
-                    {
-                        "role": "user",
-                        "content": text
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.1
-            )
-
-            # استخراج النص المترجم
-            translated_text = response.choices[0].message.content.strip()
-
-            return translated_text
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return None
-
-    def translate_content(self, content: Dict[str, Any], target_locale: str, source_locale: str = None) -> Optional[Dict[str, Any]]:
+        return [
+            {
+                "role": "system",
+                "content": f"You are a professional translator. Your task is to translate text from {source_lang_name} to {target_lang_name}. Maintain the original meaning and tone. Only return the translated text without any additional explanations or formatting."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ], source_locale
+
+    def translate_content(self, content: Dict[str, Any], target_locale: str, source_locale: str = None,
+                          priority: int = Priority.API) -> Optional[Dict[str, Any]]:
         """
         ترجمة محتوى
 
+        يتم تسطيح شجرة المحتوى إلى حقول نصية، والكشف عن اللغة مرة واحدة
+        للمستند بأكمله، ثم ترجمة الحقول على مستوى المقطع (انظر
+        translate_segments) وإعادة تجميعها.
+
         Args:
             content: محتوى الترجمة
             target_locale: اللغة الهدف
             source_locale: اللغة المصدر (اختياري)
+            priority: أولوية الطلبات في مجدول النموذج اللغوي
 
         Returns:
             المحتوى المترجم أو None في حالة الفشل
         """
-        # نسخ المحتوى
+        # تسطيح المحتوى إلى مقاطع (المسار، النص)
+        segments = self._collect_segments(content)
+
+        # الكشف عن اللغة مرة واحدة للمستند بأكمله
+        if source_locale is None and segments:
+            source_locale = self.detect_language(
+                self._detection_sample(segments), priority)
+
+        if source_locale is None or source_locale not in i18n_settings.supported_locales:
+            source_locale = i18n_settings.default_locale
+
+        # ترجمة الحقول على مستوى المقطع
+        texts = [text for _, text in segments]
+        translations = self.translate_segments(
+            texts, target_locale, source_locale, priority)
+
+        # إعادة تجميع المحتوى المترجم
+        translated_content = self._rebuild_content(
+            content, target_locale, source_locale)
+        for (path, _), translated_text in zip(segments, translations):
+            self._set_path(translated_content, path, translated_text)
+
+        return translated_content
+
+    def translate_segments(self, texts: List[str], target_locale: str, source_locale: str = None,
+                           priority: int = Priority.API) -> List[Optional[str]]:
+        """
+        ترجمة نصوص طويلة على مستوى الجملة أو الفقرة مع ذاكرة الترجمة
+
+        يتم تقسيم كل نص إلى مقاطع، وترجمة المقاطع الفريدة غير الموجودة في
+        ذاكرة الترجمة فقط في دفعة واحدة، ثم إعادة تجميع كل نص مع الحفاظ
+        على تنسيقه (الأسطر والقوائم والمسافات).
+
+        Args:
+            texts: النصوص المطلوب ترجمتها
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر (اختياري)
+            priority: أولوية الطلبات في مجدول النموذج اللغوي
+
+        Returns:
+            قائمة بالنصوص المترجمة (None للنصوص التي فشلت ترجمة أحد مقاطعها)
+        """
+        if not texts:
+            return []
+
+        # التحقق من صحة اللغات
+        if target_locale not in i18n_settings.supported_locales:
+            return [None] * len(texts)
+
+        if source_locale is None:
+            source_locale = self.detect_language(self._detection_sample(
+                [(None, text) for text in texts]), priority)
+
+        if source_locale is None or source_locale not in i18n_settings.supported_locales:
+            source_locale = i18n_settings.default_locale
+
+        # تقسيم النصوص وجمع المقاطع الفريدة غير المترجمة مسبقاً
+        documents = [segment_text(text, source_locale) if isinstance(text, str) else []
+                     for text in texts]
+        translated: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        for pieces in documents:
+            for piece, translatable in pieces:
+                key = normalize_segment(piece)
+                if not translatable or key in translated or key in missing:
+                    continue
+                cached = self.memory.get(piece, source_locale, target_locale)
+                if cached is None:
+                    missing[key] = piece.strip()
+                else:
+                    translated[key] = cached
+
+        record_cache("memory", hit=True, count=len(translated))
+        record_cache("memory", hit=False, count=len(missing))
+
+        # ترجمة المقاطع الفريدة في دفعة واحدة وتخزينها في الذاكرة
+        if missing:
+            keys = list(missing)
+            results = self.batch_translate(
+                [missing[key] for key in keys], target_locale, source_locale, priority)
+            for key, result in zip(keys, results):
+                if result is not None:
+                    translated[key] = result
+                    self.memory.set(key, source_locale, target_locale, result)
+
+        # إعادة تجميع النصوص
+        outputs: List[Optional[str]] = []
+        for text, pieces in zip(texts, documents):
+            if not isinstance(text, str):
+                outputs.append(text)
+                continue
+            parts = []
+            for piece, translatable in pieces:
+                if not translatable:
+                    parts.append(piece)
+                    continue
+                translation = translated.get(normalize_segment(piece))
+                if translation is None:
+                    parts = None
+                    break
+                parts.append(translation)
+            outputs.append("".join(parts) if parts is not None else None)
+
+        return outputs
+
+    def _collect_segments(self, content: Dict[str, Any], path: tuple = ()) -> List[tuple]:
+        """
+        تسطيح شجرة المحتوى إلى قائمة من المقاطع النصية
+
+        Args:
+            content: المحتوى
+            path: مسار العنصر الحالي داخل الشجرة
+
+        Returns:
+            قائمة من (المسار، النص)
+        """
+        segments = []
+
+        for field in TRANSLATABLE_FIELDS:
+            if field in content:
+                segments.append((path + (field,), content[field]))
+
+        for field in NESTED_FIELDS:
+            if field in content:
+                for index, item in enumerate(content[field]):
+                    segments.extend(self._collect_segments(
+                        item, path + (field, index)))
+
+        return segments
+
+    def _detection_sample(self, segments: List[tuple]) -> str:
+        """الحصول على عينة نصية من بداية المستند للكشف عن اللغة"""
+        sample = ""
+        for _, text in segments:
+            if isinstance(text, str) and text.strip():
+                sample = f"{sample}\n{text}" if sample else text
+            if len(sample) >= DETECTION_SAMPLE_CHARS:
+                break
+        return sample[:DETECTION_SAMPLE_CHARS]
+
+    def _translate_concurrently(self, texts: List[str], target_locale: str, source_locale: str,
+                                priority: int = Priority.API) -> List[Optional[str]]:
+        """
+        ترجمة مجموعة من النصوص بالتوازي مع الحفاظ على الترتيب
+
+        Args:
+            texts: النصوص المطلوب ترجمتها
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر
+            priority: أولوية الطلبات في مجدول النموذج اللغوي
+
+        Returns:
+            النصوص المترجمة بنفس ترتيب المدخلات
+        """
+        if not texts:
+            return []
+
+        max_workers = max(1, min(len(texts), settings.translation_max_concurrency))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auto-translate") as executor:
+            return list(executor.map(
+                lambda text: self.translate_text(
+                    text, target_locale, source_locale, priority),
+                texts
+            ))
+
+    def _rebuild_content(self, content: Dict[str, Any], target_locale: str, source_locale: str) -> Dict[str, Any]:
+        """نسخ بنية المحتوى وإضافة معلومات الترجمة لكل عنصر"""
         translated_content = content.copy()
 
-        # ترجمة العناصر النصية
-        if "title" in content:
-            translated_content["title"] = self.translate_text(
-                content["title"], target_locale, source_locale)
-
-        if "description" in content:
-            translated_content["description"] = self.translate_text(
-                content["description"], target_locale, source_locale)
-
-        if "content" in content:
-            translated_content["content"] = self.translate_text(
-                content["content"], target_locale, source_locale)
-
-        if "summary" in content:
-            translated_content["summary"] = self.translate_text(
-                content["summary"], target_locale, source_locale)
-
-        if "instructions" in content:
-            translated_content["instructions"] = self.translate_text(
-                content["instructions"], target_locale, source_locale)
-
-        # ترجمة العناصر المتداخلة
-        if "modules" in content:
-            translated_content["modules"] = []
-            for module in content["modules"]:
-                translated_module = self.translate_content(
-                    module, target_locale, source_locale)
-                if translated_module:
-                    translated_content["modules"].append(translated_module)
-
-        if "exercises" in content:
-            translated_content["exercises"] = []
-            for exercise in content["exercises"]:
-                translated_exercise = self.translate_content(
-                    exercise, target_locale, source_locale)
-                if translated_exercise:
-                    translated_content["exercises"].append(translated_exercise)
+        for field in NESTED_FIELDS:
+            if field in content:
+                translated_content[field] = [
+                    self._rebuild_content(item, target_locale, source_locale)
+                    for item in content[field]
+                ]
 
         # إضافة معلومات الترجمة
         translated_content["translation_info"] = {
-            "source_locale": source_locale or i18n_settings.default_locale,
+            "source_locale": source_locale,
             "target_locale": target_locale,
             "translated_at": "now"  # في التطبيق الحقيقي، سيتم استخدام التاريخ والوقت الفعلي
         }
 
         return translated_content
 
-    def detect_language(self, text: str) -> Optional[str]:
+    @staticmethod
+    def _set_path(content: Dict[str, Any], path: tuple, value: Any):
+        """تعيين قيمة داخل شجرة المحتوى حسب المسار"""
+        node = content
+        for key in path[:-1]:
+            node = node[key]
+        node[path[-1]] = value
+
+    def detect_language(self, text: str, priority: int = Priority.API) -> Optional[str]:
         """
         الكشف عن لغة النص
 
+        يتم استخدام الكاشف المحلي أولاً، ولا يُستدعى النموذج اللغوي إلا
+        إذا كانت ثقة الكاشف المحلي أقل من settings.language_detection_min_confidence.
+
+        Args:
+            text: النص المطلوب الكشف عن لغته
+            priority: أولوية طلب النموذج اللغوي عند الحاجة إليه
+
+        Returns:
+            رمز اللغة أو None في حالة الفشل
+        """
+        locale, confidence = language_detector.detect(text)
+        if locale is not None and confidence >= settings.language_detection_min_confidence:
+            return locale
+
+        return self._detect_language_llm(text, priority) or locale
+
+    def detect_languages(self, texts: List[str], priority: int = Priority.API) -> List[Optional[str]]:
+        """
+        الكشف عن لغة مجموعة من النصوص
+
+        Args:
+            texts: النصوص المطلوب الكشف عن لغتها
+            priority: أولوية طلبات النموذج اللغوي عند الحاجة إليها
+
+        Returns:
+            قائمة برموز اللغات بنفس ترتيب النصوص
+        """
+        detections = language_detector.detect_batch(texts)
+        results = [locale for locale, _ in detections]
+
+        # اللجوء إلى النموذج اللغوي للنصوص منخفضة الثقة فقط
+        uncertain = [index for index, (locale, confidence) in enumerate(detections)
+                     if locale is None or confidence < settings.language_detection_min_confidence]
+        if uncertain and self.router.providers:
+            max_workers = max(1, min(len(uncertain), settings.translation_max_concurrency))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auto-translate") as executor:
+                fallbacks = executor.map(
+                    lambda index: self._detect_language_llm(texts[index], priority), uncertain)
+                for index, locale in zip(uncertain, fallbacks):
+                    results[index] = locale or results[index]
+
+        return results
+
+    def _detect_language_llm(self, text: str, priority: int = Priority.API) -> Optional[str]:
+        """
+        الكشف عن لغة النص باستخدام النموذج اللغوي
+
         Args:
             text: النص المطلوب الكشف عن لغته
+            priority: أولوية الطلب في مجدول النموذج اللغوي
 
         Returns:
             رمز اللغة أو None في حالة الفشل
         """
-        # التحقق من وجود عميل OpenAI
-        if not self.client:
+        # التحقق من وجود مزود للترجمة
+        if not self.router.providers:
             return None
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a language detection expert. Your task is to identify the language of the given text and return only the ISO 639-1 language code (e.g., 'en' for English, 'ar' for Arabic). If you are unsure, return 'unknown'."
-                    },
-                    {
-                        "role": "user",
-                        "content": text
-                    }
-                ],
-                max_tokens=10,
-                temperature=0.1
-            )
+            response = self._complete([
+                {
+                    "role": "system",
+                    "content": "You are a language detection expert. Your task is to identify the language of the given text and return only the ISO 639-1 language code (e.g., 'en' for English, 'ar' for Arabic). If you are unsure, return 'unknown'."
+                },
+                {
+                    "role": "user",
+                    "content": text
+                }
+            ], 10, priority, operation="detect_language")
 
             # استخراج رمز اللغة
-            language_code = response.choices[0].message.content.strip().lower()
+            language_code = response.strip().lower()
 
             # التحقق مما إذا كانت اللغة مدعومة
             if language_code in i18n_settings.supported_locales:
@@ -178,7 +566,7 @@ class AutoTranslator:
 
             return None
         except Exception as e:
-            print(f"Language detection error: {e}")
+            logger.error(f"Language detection error: {e}")
             return None
 
     def get_available_translations(self, content: Dict[str, Any]) -> List[str]:
@@ -195,74 +583,191 @@ class AutoTranslator:
         # هنا نعيد جميع اللغات المدعومة
         return i18n_settings.supported_locales
 
-    def batch_translate(self, texts: List[str], target_locale: str, source_locale: str = None) -> List[Optional[str]]:
+    def batch_translate(self, texts: List[str], target_locale: str, source_locale: str = None,
+                        priority: int = Priority.API) -> List[Optional[str]]:
         """
         ترجمة دفعة من النصوص
 
+        يتم إرسال النصوص بتنسيق JSON مُعرَّف (id, text) ومقسّمة إلى أجزاء
+        حسب ميزانية الرموز المقدّرة. تُرسل الأجزاء بالتوازي، ويُعاد
+        إرسال العناصر الفاشلة فقط بشكل فردي.
+
         Args:
             texts: قائمة النصوص المطلوب ترجمتها
             target_locale: اللغة الهدف
             source_locale: اللغة المصدر (اختياري)
+            priority: أولوية الطلبات في مجدول النموذج اللغوي
 
         Returns:
-            قائمة بالنصوص المترجمة
+            قائمة بالنصوص المترجمة (None للعناصر التي فشلت ترجمتها)
         """
-        # التحقق من وجود عميل OpenAI
-        if not self.client:
+        # التحقق من وجود مزود للترجمة
+        if not self.router.providers or not texts:
             return [None] * len(texts)
 
         # التحقق من صحة اللغات
         if target_locale not in i18n_settings.supported_locales:
             return [None] * len(texts)
 
-        # إذا لم يتم تحديد اللغة المصدر، قم بالكشف عنها
+        # إذا لم يتم تحديد اللغة المصدر، قم بالكشف عنها مرة واحدة للدفعة
+        # نفترض أن جميع النصوص بنفس اللغة
         if source_locale is None:
-            # في التطبيق الحقيقي، سيتم الكشف عن لغة كل نص على حدة
-            # هنا سنفترض أن جميع النصوص بنفس اللغة
-            sample_text = texts[0] if texts else ""
-            source_locale = self.detect_language(sample_text)
+            source_locale = self.detect_language(self._detection_sample(
+                [(None, text) for text in texts]), priority)
 
         # إذا لم يتمكن من الكشف عن اللغة المصدر، استخدم اللغة الافتراضية
         if source_locale is None or source_locale not in i18n_settings.supported_locales:
             source_locale = i18n_settings.default_locale
 
-        # الحصول على أسماء اللغات
+        # تقسيم النصوص إلى أجزاء حسب ميزانية الرموز
+        chunks = self._chunk_by_token_budget(
+            texts, settings.translation_batch_max_tokens)
+
+        # ترجمة الأجزاء بالتوازي
+        results: List[Optional[str]] = [None] * len(texts)
+        max_workers = max(1, min(len(chunks), settings.translation_max_concurrency))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auto-translate") as executor:
+            for chunk_results in executor.map(
+                lambda chunk: self._translate_chunk(
+                    chunk, texts, target_locale, source_locale, priority),
+                chunks
+            ):
+                for index, translated_text in chunk_results.items():
+                    results[index] = translated_text
+
+        # إعادة محاولة العناصر الفاشلة فقط بشكل فردي
+        failed = [index for index, result in enumerate(results)
+                  if result is None]
+        if failed:
+            retried = self._translate_concurrently(
+                [texts[index] for index in failed], target_locale, source_locale, priority)
+            for index, translated_text in zip(failed, retried):
+                results[index] = translated_text
+
+        return results
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """
+        تقدير تقريبي لعدد الرموز في النص
+
+        الأحرف اللاتينية ~4 أحرف لكل رمز، وبقية الأنظمة الكتابية ~رمز لكل حرف.
+        """
+        ascii_chars = sum(1 for char in text if ord(char) < 128)
+        return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+    def _chunk_by_token_budget(self, texts: List[str], max_tokens: int) -> List[List[int]]:
+        """
+        تقسيم فهارس النصوص إلى أجزاء لا تتجاوز ميزانية الرموز
+
+        Args:
+            texts: النصوص
+            max_tokens: الحد الأقصى المقدّر للرموز في كل جزء
+
+        Returns:
+            قائمة من الأجزاء، كل جزء قائمة من الفهارس
+        """
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def _translate_chunk(self, chunk: List[int], texts: List[str], target_locale: str, source_locale: str,
+                         priority: int = Priority.API) -> Dict[int, str]:
+        """
+        ترجمة جزء واحد من الدفعة بتنسيق JSON مُعرَّف
+
+        Args:
+            chunk: فهارس النصوص في هذا الجزء
+            texts: جميع نصوص الدفعة
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر
+            priority: أولوية الطلب في مجدول النموذج اللغوي
+
+        Returns:
+            قاموس {الفهرس: النص المترجم} للعناصر التي نجحت ترجمتها فقط
+        """
         source_lang_name = translator.get_translation(
             f"language_name.{source_locale}", source_locale)
         target_lang_name = translator.get_translation(
             f"language_name.{target_locale}", target_locale)
 
-        # إنشاء طلب الترجمة
+        payload = json.dumps(
+            {"items": [{"id": index, "text": texts[index]} for index in chunk]},
+            ensure_ascii=False
+        )
+        estimated_tokens = sum(self._estimate_tokens(texts[index])
+                               for index in chunk)
+
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a professional translator. Your task is to translate texts from {source_lang_name} to {target_lang_name}. Maintain the original meaning and tone. Return each translated text on a new line without any additional explanations or formatting."
-                    },
-                    {
-                        "role": "user",
-                        "content": "\n".join(texts)
-                    }
-                ],
-                max_tokens=2000 * len(texts),
-                temperature=0.1
-            )
-
-            # استخراج النصوص المترجمة
-            translated_texts = response.choices[0].message.content.strip().split(
-                "\n")
-
-            # التأكد من أن عدد النصوص المترجمة مطابق للنصوص الأصلية
-            if len(translated_texts) != len(texts):
-                return [None] * len(texts)
-
-            return translated_texts
+            response = self._complete([
+                {
+                    "role": "system",
+                    "content": f"You are a professional translator. Your task is to translate texts from {source_lang_name} to {target_lang_name}. Maintain the original meaning and tone. The input is a JSON object of the form {{\"items\": [{{\"id\": <int>, \"text\": <string>}}]}}. Return only a JSON object of the same form, keeping every id unchanged and replacing each text with its translation. Do not add any explanations or formatting."
+                },
+                {
+                    "role": "user",
+                    "content": payload
+                }
+            ], min(settings.translation_max_output_tokens, estimated_tokens * 2 + 100), priority,
+                operation="batch_translate", source_locale=source_locale, target_locale=target_locale)
+
+            return self._parse_batch_reply(
+                response, set(chunk))
         except Exception as e:
-            print(f"Batch translation error: {e}")
-            return [None] * len(texts)
+            logger.error(f"Batch translation error: {e}")
+            return {}
+
+    @staticmethod
+    def _parse_batch_reply(reply: str, expected_ids: set) -> Dict[int, str]:
+        """
+        تحليل رد الدفعة واستخراج الترجمات حسب المعرّف
+
+        يتم تجاهل العناصر غير الصالحة أو ذات المعرّفات غير المتوقعة،
+        بحيث يُعاد إرسال العناصر المفقودة فقط.
+        """
+        if not reply:
+            return {}
+
+        # إزالة أي تنسيق حول كائن JSON (مثل ```json)
+        start, end = reply.find("{"), reply.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+
+        try:
+            items = json.loads(reply[start:end + 1]).get("items", [])
+        except (ValueError, AttributeError):
+            return {}
+
+        translations = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            text = item.get("text")
+            if item_id in expected_ids and isinstance(text, str) and text.strip():
+                translations[item_id] = text.strip()
+
+        return translations
 
 
 # إنشاء مثيل من المترجم الآلي
 auto_translator = AutoTranslator()
+
+# تصدير حالة المجدول والمزودين والذاكرة في مؤشرات التطبيق
+register_translator_collectors(auto_translator)
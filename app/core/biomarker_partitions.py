@@ -0,0 +1,423 @@
+# تخزين المؤشرات الحيوية الرقمية في أقسام شهرية والاحتفاظ بها لمدة محددة
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import (Column, DateTime, Float, Index, Integer, MetaData, String, Table, func, insert,
+                        select, text, union_all)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+partitions_retired = metrics_registry.counter(
+    "biomarker_partitions_retired_total",
+    "Monthly digital_biomarkers partitions dropped or archived by the retention job.",
+    ["action"])
+
+# الجدول الأب والبادئة المشتركة لأسماء الأقسام الشهرية (digital_biomarkers_202610)
+BASE_TABLE = "digital_biomarkers"
+PARTITION_PATTERN = re.compile(rf"^{BASE_TABLE}_(\d{{4}})(\d{{2}})$")
+
+# مخطط PostgreSQL الذي تُنقل إليه الأقسام المؤرشفة، وبادئة الجداول المؤرشفة في SQLite
+ARCHIVE_SCHEMA = "biomarker_archive"
+SQLITE_ARCHIVE_PREFIX = "archived_"
+
+RETENTION_ACTIONS = ("drop", "archive")
+
+# مفتاح قفل PostgreSQL الاستشاري الذي يضمن أن عاملاً واحداً فقط يصون الأقسام
+MAINTENANCE_LOCK_KEY = 0x62696F6D
+
+
+def month_start(moment) -> date:
+    """أول يوم في شهر التاريخ المعطى"""
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """إزاحة بداية شهر بعدد من الأشهر (سالب للماضي)"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """اسم القسم الشهري"""
+    return f"{BASE_TABLE}_{month.year:04d}{month.month:02d}"
+
+
+def months_between(start: datetime, end: datetime) -> List[date]:
+    """الأشهر التي يتقاطع معها النطاق [start, end)"""
+    months, month = [], month_start(start)
+    while datetime(month.year, month.month, 1, tzinfo=timezone.utc) < end:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def as_utc(moment: datetime) -> datetime:
+    """توحيد الوقت إلى UTC (الوقت بلا منطقة زمنية يُعامل كـ UTC)"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def shard_id_base(month: date) -> int:
+    """
+    أول معرّف لقراءات الشهر في SQLite
+
+    يبدأ تسلسل كل جدول شهري من yyyymm << 32 فتبقى المعرّفات فريدة عبر الأشهر
+    عند دمجها بـ UNION ALL.
+    """
+    return (month.year * 100 + month.month) << 32
+
+
+def _shard_table(name: str) -> Table:
+    """جدول شهري في SQLite بأعمدة digital_biomarkers نفسها"""
+    return Table(
+        name, MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("biomarker_type", String, nullable=False),
+        Column("value", Float, nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        Column("metadata", String, nullable=True),
+        # SQLite لا يدعم INCLUDE: تُلحق الأعمدة المقروءة بالمفتاح ليصبح الفهرس مغطياً
+        Index(f"ix_{name}_user_id_timestamp", "user_id", "timestamp", "biomarker_type", "value"),
+        # AUTOINCREMENT يحفظ التسلسل في sqlite_sequence ليُزاح بداية كل شهر
+        sqlite_autoincrement=True,
+    )
+
+
+class BiomarkerPartitions:
+    """
+    أقسام شهرية لجدول digital_biomarkers
+
+    في PostgreSQL الجدول مقسم بـ PARTITION BY RANGE ("timestamp") وكل شهر قسم
+    مستقل؛ الاستعلامات على الجدول الأب بنطاق زمني لا تقرأ إلا أقسام النطاق. في
+    SQLite (محلياً) يُخزن كل شهر في جدول منفصل بالاسم نفسه وتختار الاستعلامات
+    الجداول المتقاطعة مع النطاق. حذف أو أرشفة شهر كامل عملية على الجدول لا على
+    الصفوف، فلا حاجة إلى DELETE جماعي.
+    """
+
+    def __init__(self, engine: Engine = None, retention_months: int = None,
+                 retention_action: str = None, months_ahead: int = None):
+        """
+        تهيئة مدير الأقسام
+
+        Args:
+            engine: محرك قاعدة البيانات (المحرك الرئيسي افتراضياً)
+            retention_months: عدد الأشهر المحتفظ بها قبل الشهر الحالي
+            retention_action: drop لحذف الأقسام القديمة أو archive لنقلها خارج الجدول
+            months_ahead: عدد الأشهر القادمة التي تُنشأ أقسامها مسبقاً
+        """
+        self._engine = engine
+        self.retention_months = retention_months or settings.biomarker_retention_months
+        self.retention_action = retention_action or settings.biomarker_retention_action
+        self.months_ahead = settings.biomarker_partitions_ahead if months_ahead is None else months_ahead
+        if self.retention_action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown biomarker retention action: {self.retention_action}")
+        self._known: Optional[Dict[date, str]] = None
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            from app.core.database import engine
+            self._engine = engine
+        return self._engine
+
+    @property
+    def partitioned(self) -> bool:
+        """PostgreSQL (تقسيم أصلي) أو SQLite (جدول لكل شهر)"""
+        return self.engine.dialect.name == "postgresql"
+
+    def partitions(self) -> Dict[date, str]:
+        """
+        الأقسام الشهرية الموجودة
+
+        Returns:
+            اسم القسم حسب بداية الشهر
+        """
+        with self.engine.connect() as connection:
+            if self.partitioned:
+                names = connection.execute(text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                    "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                    "WHERE parent.relname = :parent"), {"parent": BASE_TABLE}).scalars().all()
+            else:
+                names = connection.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+
+        found = {}
+        for name in names:
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                found[date(int(match.group(1)), int(match.group(2)), 1)] = name
+        self._known = found
+        return dict(found)
+
+    def _partitions(self) -> Dict[date, str]:
+        """الأقسام المعروفة دون استعلام إن سبق جلبها"""
+        return self._known if self._known is not None else self.partitions()
+
+    def ensure(self, month: date) -> str:
+        """
+        إنشاء قسم الشهر إن لم يكن موجوداً
+
+        Args:
+            month: بداية الشهر
+
+        Returns:
+            اسم القسم
+        """
+        name = partition_name(month)
+        if month in self._partitions():
+            return name
+
+        try:
+            with self.engine.begin() as connection:
+                if self.partitioned:
+                    connection.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {BASE_TABLE} '
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"))
+                else:
+                    _shard_table(name).create(connection, checkfirst=True)
+                    connection.execute(text(
+                        "INSERT INTO sqlite_sequence (name, seq) SELECT :name, :seq "
+                        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = :name)"),
+                        {"name": name, "seq": shard_id_base(month)})
+        except DBAPIError:
+            # عامل آخر أنشأ القسم في اللحظة نفسها
+            if month not in self.partitions():
+                raise
+            return name
+        self._known[month] = name
+        logger.info(f"Created biomarker partition {name}")
+        return name
+
+    def ensure_upcoming(self, now: datetime = None) -> List[str]:
+        """إنشاء أقسام الشهر الحالي والأشهر القادمة مسبقاً"""
+        current = month_start(as_utc(now or datetime.now(timezone.utc)))
+        return [self.ensure(add_months(current, offset)) for offset in range(self.months_ahead + 1)]
+
+    def insert(self, readings: Iterable[Dict[str, Any]]) -> int:
+        """
+        حفظ قراءات المؤشرات الحيوية
+
+        Args:
+            readings: قواميس user_id و biomarker_type و value و timestamp و metadata
+
+        Returns:
+            عدد القراءات المحفوظة
+        """
+        by_month: Dict[date, List[Dict[str, Any]]] = {}
+        for reading in readings:
+            moment = as_utc(reading.get("timestamp") or datetime.now(timezone.utc))
+            by_month.setdefault(month_start(moment), []).append({
+                "user_id": reading["user_id"],
+                "biomarker_type": reading["biomarker_type"],
+                "value": reading["value"],
+                "timestamp": moment if self.partitioned else moment.replace(tzinfo=None),
+                "metadata": reading.get("metadata"),
+            })
+        if not by_month:
+            return 0
+
+        try:
+            self._insert(by_month)
+        except DBAPIError:
+            # الأقسام المعروفة لهذه العملية قديمة: عامل آخر أزال أحدها بمهمة الاحتفاظ
+            self.partitions()
+            self._insert(by_month)
+        return sum(len(rows) for rows in by_month.values())
+
+    def _insert(self, by_month: Dict[date, List[Dict[str, Any]]]):
+        """إدخال صفوف مجمعة حسب الشهر بعد التأكد من وجود أقسامها"""
+        names = {month: self.ensure(month) for month in by_month}
+        with self.engine.begin() as connection:
+            if self.partitioned:
+                # يوجّه PostgreSQL كل صف إلى قسم شهره
+                from app.models.analytics import DigitalBiomarker
+                connection.execute(insert(DigitalBiomarker.__table__),
+                                   [row for rows in by_month.values() for row in rows])
+            else:
+                for month, rows in by_month.items():
+                    connection.execute(insert(_shard_table(names[month])), rows)
+
+    def _range_source(self, user_id: int, start: datetime, end: datetime,
+                      biomarker_type: Optional[str] = None):
+        """
+        مصدر قراءات المستخدم في النطاق [start, end)، أو None إذا لم يتقاطع مع أي قسم
+
+        في PostgreSQL شرط timestamp على الجدول الأب يكفي ليقتصر المخطط على أقسام
+        النطاق؛ في SQLite يُبنى UNION ALL من الجداول الشهرية المتقاطعة فقط.
+        """
+        start, end = as_utc(start), as_utc(end)
+        if self.partitioned:
+            from app.models.analytics import DigitalBiomarker
+            tables = [(DigitalBiomarker.__table__, start, end)]
+        else:
+            existing = self._partitions()
+            tables = [(_shard_table(existing[month]), start.replace(tzinfo=None), end.replace(tzinfo=None))
+                      for month in months_between(start, end) if month in existing]
+        if not tables:
+            return None
+
+        selects = []
+        for table, lower, upper in tables:
+            query = select(table.c.id, table.c.biomarker_type, table.c.value, table.c.timestamp,
+                           table.c.metadata).where(
+                table.c.user_id == user_id, table.c.timestamp >= lower, table.c.timestamp < upper)
+            if biomarker_type:
+                query = query.where(table.c.biomarker_type == biomarker_type)
+            selects.append(query)
+        return selects[0].subquery() if len(selects) == 1 else union_all(*selects).subquery()
+
+    def readings(self, user_id: int, start: datetime, end: datetime, biomarker_type: Optional[str] = None,
+                 skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        قراءات المستخدم في نطاق زمني، الأحدث أولاً
+
+        Returns:
+            قائمة القراءات
+        """
+        source = self._range_source(user_id, start, end, biomarker_type)
+        if source is None:
+            return []
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(source).order_by(source.c.timestamp.desc())
+                                      .offset(skip).limit(limit)).all()
+        return [{"id": row.id, "user_id": user_id, "biomarker_type": row.biomarker_type, "value": row.value,
+                 "timestamp": as_utc(row.timestamp), "metadata": row.metadata} for row in rows]
+
+    def analyze(self, user_id: int, start: datetime, end: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        ملخص قراءات المستخدم لكل نوع مؤشر في نطاق زمني
+
+        Returns:
+            العدد والمتوسط والحد الأدنى والأقصى وآخر قراءة حسب نوع المؤشر
+        """
+        source = self._range_source(user_id, start, end)
+        if source is None:
+            return {}
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(source.c.biomarker_type, func.count(), func.avg(source.c.value), func.min(source.c.value),
+                       func.max(source.c.value), func.max(source.c.timestamp))
+                .group_by(source.c.biomarker_type)).all()
+        return {
+            biomarker_type: {"count": count, "mean": mean, "min": minimum, "max": maximum,
+                             "latest": as_utc(latest) if isinstance(latest, datetime) else latest}
+            for biomarker_type, count, mean, minimum, maximum, latest in rows
+        }
+
+    def apply_retention(self, now: datetime = None) -> List[str]:
+        """
+        حذف أو أرشفة الأقسام الأقدم من مدة الاحتفاظ
+
+        كل قسم يُفصل ويُحذف (أو يُنقل) كجدول كامل: عملية على البيانات الوصفية
+        لا تعتمد على عدد الصفوف.
+
+        Returns:
+            أسماء الأقسام التي أُزيلت من الجدول
+        """
+        cutoff = add_months(month_start(as_utc(now or datetime.now(timezone.utc))), -self.retention_months)
+        expired = sorted((month, name) for month, name in self.partitions().items() if month < cutoff)
+
+        for month, name in expired:
+            with self.engine.begin() as connection:
+                if self.partitioned:
+                    connection.execute(text(f'ALTER TABLE {BASE_TABLE} DETACH PARTITION "{name}"'))
+                    if self.retention_action == "archive":
+                        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+                        connection.execute(text(f'ALTER TABLE "{name}" SET SCHEMA {ARCHIVE_SCHEMA}'))
+                    else:
+                        connection.execute(text(f'DROP TABLE "{name}"'))
+                elif self.retention_action == "archive":
+                    connection.execute(text(f'ALTER TABLE "{name}" RENAME TO "{SQLITE_ARCHIVE_PREFIX}{name}"'))
+                else:
+                    connection.execute(text(f'DROP TABLE "{name}"'))
+            self._known.pop(month, None)
+            partitions_retired.inc(action=self.retention_action)
+            logger.info(f"Retention {self.retention_action}: biomarker partition {name}")
+        return [name for _, name in expired]
+
+    def maintain(self, now: datetime = None) -> List[str]:
+        """
+        إنشاء الأقسام القادمة ثم تطبيق مدة الاحتفاظ
+
+        تعمل المهمة في كل عامل uvicorn؛ في PostgreSQL يصون الأقسام العامل الذي
+        يحصل على القفل الاستشاري فقط ويتجاوز الباقون هذه الدورة.
+
+        Returns:
+            أسماء الأقسام التي أُزيلت من الجدول
+        """
+        if not self.partitioned:
+            self.ensure_upcoming(now)
+            return self.apply_retention(now)
+
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            locked = connection.execute(text("SELECT pg_try_advisory_lock(:key)"),
+                                        {"key": MAINTENANCE_LOCK_KEY}).scalar()
+            if not locked:
+                logger.debug("Biomarker partition maintenance is running in another worker")
+                return []
+            try:
+                self.ensure_upcoming(now)
+                return self.apply_retention(now)
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+
+
+class BiomarkerRetentionJob:
+    """مهمة خلفية دورية لصيانة أقسام المؤشرات الحيوية"""
+
+    def __init__(self, partitions: BiomarkerPartitions, interval_hours: float = None):
+        """
+        تهيئة المهمة
+
+        Args:
+            partitions: مدير الأقسام
+            interval_hours: الفاصل بين التشغيلات بالساعات (0 لتعطيل المهمة)
+        """
+        self.partitions = partitions
+        self.interval = (settings.biomarker_maintenance_interval_hours
+                         if interval_hours is None else interval_hours) * 3600
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """بدء المهمة على حلقة الأحداث الحالية"""
+        if not self.interval or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """إيقاف المهمة"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await run_in_threadpool(self.partitions.maintain)
+            except Exception as e:
+                logger.error(f"Biomarker partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# إنشاء مثيل من مدير أقسام المؤشرات الحيوية
+biomarker_partitions = BiomarkerPartitions()
+
+# إنشاء مثيل من مهمة الاحتفاظ بالمؤشرات الحيوية
+biomarker_retention_job = BiomarkerRetentionJob(biomarker_partitions)
@@ -4,10 +4,13 @@
 import json
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, status
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.config import settings
+from app.core.cache import cache_service
+from app.core.database import Base, session_scope
 from app.core.i18n.translation_manager import translator
 from app.core.geolocation import geolocation_service
 
@@ -33,9 +36,40 @@ class LanguageConsent(Base):
 class LanguageConsentManager:
     """مدير موافقة المستخدم على اللغة"""
 
-    def __init__(self):
-        """تهيئة مدير موافقة المستخدم"""
-        pass
+    def __init__(self, session_factory=None):
+        """
+        تهيئة مدير موافقة المستخدم
+
+        Args:
+            session_factory: مصنع الجلسات القصيرة (SessionLocal افتراضياً)
+        """
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f"consent:{user_id}"
+
+    def get_cached_consent_status(self, user_id: int) -> Dict[str, Any]:
+        """
+        الحصول على حالة موافقة المستخدم من الذاكرة المؤقتة أو بجلسة قصيرة العمر
+
+        لا يحتاج المستدعي إلى جلسة، فيُعاد اتصال قاعدة البيانات إلى المجمع فوراً
+        (مناسب لاتصالات WebSocket طويلة العمر).
+
+        Args:
+            user_id: معرف المستخدم
+
+        Returns:
+            قاموس يحتوي على حالة الموافقة
+        """
+        cached = cache_service.get(self._cache_key(user_id))
+        if cached is not None:
+            return cached
+
+        with session_scope(self.session_factory) as db:
+            consent_status = self.get_consent_status(db, user_id)
+        cache_service.set(self._cache_key(user_id), consent_status, settings.consent_cache_seconds)
+        return consent_status
 
     def get_consent_status(self, db: Session, user_id: int) -> Dict[str, Any]:
         """
@@ -50,7 +84,26 @@ class LanguageConsentManager:
         """
         consent = db.query(LanguageConsent).filter(
             LanguageConsent.user_id == user_id).first()
+        return self._consent_status(consent)
+
+    async def get_consent_status_async(self, db: AsyncSession, user_id: int) -> Dict[str, Any]:
+        """
+        الحصول على حالة موافقة المستخدم بجلسة غير متزامنة
+
+        Args:
+            db: جلسة قاعدة البيانات غير المتزامنة
+            user_id: معرف المستخدم
+
+        Returns:
+            قاموس يحتوي على حالة الموافقة
+        """
+        result = await db.execute(
+            select(LanguageConsent).where(LanguageConsent.user_id == user_id).limit(1))
+        return self._consent_status(result.scalars().first())
 
+    @staticmethod
+    def _consent_status(consent: Optional[LanguageConsent]) -> Dict[str, Any]:
+        """تحويل سجل الموافقة (أو غيابه) إلى قاموس الحالة"""
         if consent:
             return {
                 "consent_given": consent.consent_given,
@@ -102,6 +155,7 @@ class LanguageConsentManager:
 
         db.commit()
         db.refresh(consent)
+        cache_service.delete(self._cache_key(user_id))
 
         response_data = {
             "consent_given": consent_given,
@@ -0,0 +1,510 @@
+# الترجمة المسبقة للمحتوى المنشور في الخلفية
+
+import hashlib
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from app.config import settings
+from app.core.auto_translator import auto_translator
+from app.core.i18n import i18n_settings
+from app.core.llm_scheduler import Priority
+from app.core.metrics import metrics_registry
+from app.core.translation_metrics import record_cache
+from app.models.content import (
+    Article,
+    ContentTranslation,
+    Exercise,
+    Meditation,
+    Program,
+    ProgramModule,
+)
+
+logger = logging.getLogger(__name__)
+
+# أنواع المحتوى القابلة للترجمة المسبقة: النوع -> (النموذج، الحقول النصية)
+PRETRANSLATED_CONTENT = {
+    "article": (Article, ("title", "summary", "content")),
+    "meditation": (Meditation, ("title", "description")),
+    "exercise": (Exercise, ("title", "description", "instructions")),
+    "program": (Program, ("title", "description")),
+    "program_module": (ProgramModule, ("title", "description", "content")),
+}
+
+# الحقول التي يؤدي تغييرها إلى إعادة الترجمة إضافة إلى الحقول النصية
+TRIGGER_FIELDS = ("published",)
+
+
+def content_type_of(obj: Any) -> Optional[str]:
+    """نوع المحتوى لكائن نموذج أو None إذا لم يكن قابلاً للترجمة المسبقة"""
+    for content_type, (model, _) in PRETRANSLATED_CONTENT.items():
+        if type(obj) is model:
+            return content_type
+    return None
+
+
+def content_fields(content_type: str, obj: Any) -> Dict[str, str]:
+    """الحقول النصية غير الفارغة للمحتوى"""
+    _, fields = PRETRANSLATED_CONTENT[content_type]
+    values = {}
+    for field in fields:
+        value = getattr(obj, field, None)
+        if isinstance(value, str) and value.strip():
+            values[field] = value
+    return values
+
+
+def source_hash(fields: Dict[str, str]) -> str:
+    """بصمة الحقول الأصلية (تتغير بتغير أي حقل)"""
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_published(content_type: str, obj: Any) -> bool:
+    """هل المحتوى منشور (وحدات البرامج تتبع حالة البرنامج)"""
+    if content_type == "program_module":
+        return bool(obj.program and obj.program.published)
+    return bool(obj.published)
+
+
+def detect_source_locale(fields: Dict[str, str], priority: int = Priority.BACKGROUND) -> str:
+    """لغة المحتوى الأصلية كما يكشفها عامل الترجمة المسبقة (الافتراضية إذا تعذر الكشف)"""
+    sample = "\n".join(fields.values())
+    return auto_translator.detect_language(sample, priority) or i18n_settings.default_locale
+
+
+def get_published_content(db: Session, content_type: str, content_id: int) -> Optional[Any]:
+    """
+    الحصول على محتوى منشور قابل للترجمة المسبقة
+
+    Args:
+        db: جلسة قاعدة البيانات
+        content_type: نوع المحتوى
+        content_id: معرف المحتوى
+
+    Returns:
+        كائن المحتوى أو None إذا لم يكن موجوداً أو كان مسودة غير منشورة
+    """
+    model, _ = PRETRANSLATED_CONTENT[content_type]
+    obj = db.get(model, content_id)
+    # المسودات غير المنشورة لا تُعرض ولا تُترجم (الشرط نفسه في عامل الترجمة المسبقة)
+    if obj is None or not is_published(content_type, obj):
+        return None
+    return obj
+
+
+def get_content_translation(db: Session, content_type: str, content_id: int,
+                            locale: str) -> Optional[ContentTranslation]:
+    """
+    الحصول على الترجمة المخزنة لمحتوى بلغة معينة
+
+    Args:
+        db: جلسة قاعدة البيانات
+        content_type: نوع المحتوى
+        content_id: معرف المحتوى
+        locale: رمز اللغة
+
+    Returns:
+        سجل الترجمة أو None إذا لم تتم ترجمته بعد
+    """
+    return db.query(ContentTranslation).filter(
+        ContentTranslation.content_type == content_type,
+        ContentTranslation.content_id == content_id,
+        ContentTranslation.locale == locale
+    ).first()
+
+
+def get_translated_content(db: Session, content_type: str, obj: Any, target_locale: str,
+                           priority: int = Priority.API) -> Dict[str, Any]:
+    """
+    الترجمة المخزنة لمحتوى منشور بلغة معينة
+
+    لا يُستدعى النموذج اللغوي للترجمة: إذا لم تكن الترجمة جاهزة أو كانت لنسخة
+    سابقة من المحتوى يُضاف المحتوى إلى طابور الترجمة المسبقة. اللغة الهدف
+    المطابقة للغة المحتوى الأصلية تُعاد بالحقول الأصلية لأن العامل لا يترجم إليها.
+
+    Args:
+        db: جلسة قاعدة البيانات
+        content_type: نوع المحتوى
+        obj: كائن المحتوى
+        target_locale: اللغة الهدف
+        priority: أولوية كشف لغة المحتوى إذا لم تُخزن بعد
+
+    Returns:
+        المحتوى الأصلي والمترجم وحالة الترجمة (completed أو pending)
+    """
+    fields = content_fields(content_type, obj)
+    current_hash = source_hash(fields)
+    original_content = {"id": obj.id, "type": content_type, **fields}
+    result = {
+        "content_type": content_type,
+        "content_id": obj.id,
+        "original_content": original_content,
+        "translated_content": None,
+        "source_language": None,
+        "target_language": target_locale,
+        "status": "pending"
+    }
+
+    translation = get_content_translation(db, content_type, obj.id, target_locale)
+    record_cache("pretranslated", hit=translation is not None)
+
+    if translation is None:
+        # العامل لا يكتب ترجمة للغة المحتوى الأصلية: تُعرف من ترجمات النسخة الحالية أو بالكشف
+        stored = db.query(ContentTranslation).filter(
+            ContentTranslation.content_type == content_type,
+            ContentTranslation.content_id == obj.id,
+            ContentTranslation.source_hash == current_hash
+        ).first()
+        source_locale = stored.source_locale if stored else detect_source_locale(fields, priority)
+        result["source_language"] = source_locale
+        if source_locale == target_locale:
+            result["status"] = "completed"
+            result["translated_content"] = {
+                **original_content,
+                "translation_info": {
+                    "source_locale": source_locale,
+                    "target_locale": target_locale,
+                    "translated_at": None
+                }
+            }
+        else:
+            pretranslation_worker.enqueue(content_type, obj.id)
+        return result
+
+    # إعادة الترجمة في الخلفية إذا كانت لنسخة سابقة من المحتوى
+    if translation.source_hash != current_hash:
+        pretranslation_worker.enqueue(content_type, obj.id)
+
+    translated_at = translation.updated_at or translation.created_at
+    result.update({
+        "translated_content": {
+            **original_content,
+            **json.loads(translation.fields),
+            "translation_info": {
+                "source_locale": translation.source_locale,
+                "target_locale": target_locale,
+                "translated_at": translated_at.isoformat() if translated_at else None
+            }
+        },
+        "source_language": translation.source_locale,
+        "status": "completed"
+    })
+    return result
+
+
+def get_translation_progress(db: Session, content_type: str, obj: Any) -> Dict[str, Any]:
+    """
+    حساب تغطية الترجمة الفعلية لمحتوى من جدول الترجمات
+
+    الترجمات المخزنة لنسخة سابقة من المحتوى تُحسب قديمة (outdated).
+
+    Args:
+        db: جلسة قاعدة البيانات
+        content_type: نوع المحتوى
+        obj: كائن المحتوى
+
+    Returns:
+        عدد اللغات المترجمة ونسبتها وحالة كل لغة
+    """
+    current_hash = source_hash(content_fields(content_type, obj))
+    rows = db.query(ContentTranslation).filter(
+        ContentTranslation.content_type == content_type,
+        ContentTranslation.content_id == obj.id
+    ).all()
+    by_locale = {row.locale: row for row in rows}
+    source_locale = next((row.source_locale for row in rows if row.source_locale), None)
+
+    languages = []
+    for locale in i18n_settings.supported_locales:
+        row = by_locale.get(locale)
+        if locale == source_locale:
+            state = "source"
+        elif row is None:
+            state = "missing"
+        elif row.source_hash != current_hash:
+            state = "outdated"
+        else:
+            state = "translated"
+        languages.append({
+            "language": locale,
+            "translated": state in ("source", "translated"),
+            "status": state
+        })
+
+    total = len(languages)
+    translated = sum(1 for language in languages if language["translated"])
+    return {
+        "content_type": content_type,
+        "content_id": obj.id,
+        "source_language": source_locale,
+        "total_languages": total,
+        "translated_languages": translated,
+        "translation_percentage": round(translated / total * 100, 1) if total else 0.0,
+        "languages": languages
+    }
+
+
+def collect_changed_content(session: Session):
+    """
+    جمع المحتوى القابل للترجمة الذي أُضيف أو حُذف أو تغيرت حقوله النصية أو حالة نشره
+    في session.info (يُستدعى بعد كل flush حيث يكون سجل التغييرات متاحاً)
+
+    Args:
+        session: الجلسة بعد flush
+    """
+    changed = session.info.setdefault("pretranslation", set())
+
+    for obj in session.new:
+        content_type = content_type_of(obj)
+        if content_type:
+            changed.add((content_type, obj.id))
+
+    for obj in session.dirty:
+        content_type = content_type_of(obj)
+        if not content_type:
+            continue
+        _, fields = PRETRANSLATED_CONTENT[content_type]
+        if any(get_history(obj, field).has_changes()
+               for field in fields + TRIGGER_FIELDS if hasattr(obj, field)):
+            changed.add((content_type, obj.id))
+
+    # حذف الترجمات المخزنة للمحتوى المحذوف
+    for obj in session.deleted:
+        content_type = content_type_of(obj)
+        if content_type:
+            changed.add((content_type, obj.id))
+
+
+def enqueue_changed_content(session: Session):
+    """
+    إضافة المحتوى المتغير إلى طابور الترجمة المسبقة (يُستدعى بعد commit ناجح)
+
+    Args:
+        session: الجلسة بعد commit
+    """
+    changed = session.info.pop("pretranslation", None)
+    if not changed:
+        return
+
+    logger.debug(f"Queueing {len(changed)} content item(s) for pre-translation")
+    for content_type, content_id in changed:
+        pretranslation_worker.enqueue(content_type, content_id)
+
+
+class PretranslationWorker:
+    """
+    عامل خلفية لترجمة المحتوى المنشور إلى جميع اللغات المدعومة
+
+    تُضاف المهام عند نشر المحتوى أو تعديله (انظر events.setup_pretranslation_listeners)،
+    ويتم تجاهل المهام المكررة للمحتوى نفسه ما دامت في الطابور. تُرسل طلبات
+    الترجمة بأولوية BACKGROUND في مجدول النموذج اللغوي حتى لا تؤثر على
+    الطلبات التفاعلية.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = None, workers: int = None,
+                 process: Callable[[str, int], None] = None):
+        """
+        تهيئة العامل
+
+        Args:
+            session_factory: منشئ جلسات قاعدة البيانات (افتراضياً SessionLocal)
+            workers: عدد خيوط المعالجة
+            process: دالة معالجة مهمة (content_type, content_id)
+        """
+        self.session_factory = session_factory
+        self.workers = workers or settings.pretranslation_workers
+        self.process = process or self.translate_content
+        self._queue: "queue.Queue[Optional[Tuple[str, int]]]" = queue.Queue()
+        self._pending = set()
+        self._active = set()
+        self._rerun = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self.processed = 0
+        self.failed = 0
+
+    def enqueue(self, content_type: str, content_id: int) -> bool:
+        """
+        إضافة محتوى إلى طابور الترجمة المسبقة
+
+        Returns:
+            False إذا كان المحتوى في الطابور بالفعل
+        """
+        key = (content_type, content_id)
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        self._queue.put(key)
+        return True
+
+    def start(self):
+        """تشغيل خيوط المعالجة"""
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"pretranslation-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = None):
+        """إيقاف خيوط المعالجة بعد إنهاء المهام الجارية"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def join(self):
+        """انتظار إنهاء جميع المهام في الطابور"""
+        self._queue.join()
+
+    def get_stats(self) -> Dict[str, int]:
+        """إحصائيات الطابور"""
+        return {
+            "queued": self._queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+    def _run(self):
+        """حلقة المعالجة"""
+        while True:
+            key = self._queue.get()
+            try:
+                if key is None:
+                    return
+
+                # إزالة المهمة من المعلقة قبل المعالجة حتى تُضاف مجدداً إذا عُدّل المحتوى أثناءها،
+                # وتأجيلها إذا كان خيط آخر يعالج المحتوى نفسه
+                with self._lock:
+                    self._pending.discard(key)
+                    if key in self._active:
+                        self._rerun.add(key)
+                        continue
+                    self._active.add(key)
+
+                succeeded = True
+                try:
+                    self.process(*key)
+                except Exception as e:
+                    succeeded = False
+                    logger.error(f"Pre-translation of {key[0]} {key[1]} failed: {e}")
+
+                # العدادات تُحدّث من عدة خيوط
+                with self._lock:
+                    if succeeded:
+                        self.processed += 1
+                    else:
+                        self.failed += 1
+                    self._active.discard(key)
+                    rerun = key in self._rerun
+                    self._rerun.discard(key)
+                if rerun:
+                    self.enqueue(*key)
+            finally:
+                self._queue.task_done()
+
+    def translate_content(self, content_type: str, content_id: int):
+        """
+        ترجمة محتوى واحد إلى جميع اللغات المدعومة وتخزين النتائج
+
+        يتم تخطي اللغات التي تمت ترجمتها لنفس نسخة المحتوى، وحذف ترجمات
+        المحتوى المحذوف، وكل لغة تُحفظ فور ترجمتها.
+
+        Args:
+            content_type: نوع المحتوى
+            content_id: معرف المحتوى
+        """
+        if self.session_factory is None:
+            from app.core.database import SessionLocal
+            self.session_factory = SessionLocal
+
+        model, _ = PRETRANSLATED_CONTENT[content_type]
+        db = self.session_factory()
+        try:
+            obj = db.get(model, content_id)
+            if obj is None:
+                db.query(ContentTranslation).filter(
+                    ContentTranslation.content_type == content_type,
+                    ContentTranslation.content_id == content_id
+                ).delete()
+                db.commit()
+                return
+
+            if not is_published(content_type, obj):
+                return
+
+            # وحدات البرنامج تُترجم مع البرنامج عند نشره
+            if content_type == "program":
+                for module in obj.modules:
+                    self.enqueue("program_module", module.id)
+
+            fields = content_fields(content_type, obj)
+            if not fields:
+                return
+            current_hash = source_hash(fields)
+
+            existing = {row.locale: row for row in db.query(ContentTranslation).filter(
+                ContentTranslation.content_type == content_type,
+                ContentTranslation.content_id == content_id
+            )}
+
+            source_locale = detect_source_locale(fields)
+
+            locales = [
+                locale for locale in i18n_settings.supported_locales
+                if locale != source_locale
+                and not (locale in existing and existing[locale].source_hash == current_hash)
+            ]
+            if not locales:
+                return
+
+            names, texts = list(fields.keys()), list(fields.values())
+            max_workers = max(1, min(len(locales), settings.translation_max_concurrency))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pretranslation") as executor:
+                results = executor.map(
+                    lambda locale: auto_translator.translate_segments(
+                        texts, locale, source_locale, priority=Priority.BACKGROUND),
+                    locales
+                )
+                for locale, translations in zip(locales, results):
+                    if any(translation is None for translation in translations):
+                        logger.warning(f"Pre-translation of {content_type} {content_id} to {locale} incomplete")
+                        continue
+
+                    row = existing.get(locale) or ContentTranslation(
+                        content_type=content_type, content_id=content_id, locale=locale)
+                    row.source_locale = source_locale
+                    row.source_hash = current_hash
+                    row.fields = json.dumps(dict(zip(names, translations)), ensure_ascii=False)
+                    db.add(row)
+                    db.commit()
+        finally:
+            db.close()
+
+
+# إنشاء مثيل من عامل الترجمة المسبقة
+pretranslation_worker = PretranslationWorker()
+
+
+# تصدير حالة طابور الترجمة المسبقة في مؤشرات التطبيق
+def _collect_pretranslation_metrics():
+    stats = pretranslation_worker.get_stats()
+    return [
+        ("pretranslation_queue_depth", "gauge", "Content items waiting for pre-translation.",
+         [({}, stats["queued"])]),
+        ("pretranslation_jobs_total", "counter", "Pre-translation jobs finished.",
+         [({"outcome": "success"}, stats["processed"]), ({"outcome": "error"}, stats["failed"])]),
+    ]
+
+
+metrics_registry.register_collector(_collect_pretranslation_metrics)
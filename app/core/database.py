@@ -1,14 +1,108 @@
 
 # إعدادات قاعدة البيانات
 
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Type
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from starlette.requests import HTTPConnection
 from app.config import settings
-from app.core.events import setup_cache_invalidation_listeners
+from app.core.events import setup_cache_invalidation_listeners, setup_pretranslation_listeners
+from app.core.metrics import metrics_registry
+
+pool_checkout_wait = metrics_registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    ["engine"], buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0))
+pool_timeouts = metrics_registry.counter(
+    "db_pool_timeouts_total",
+    "Pool checkouts that gave up after db_pool_timeout_seconds.",
+    ["engine"])
+
+# برنامج التشغيل غير المتزامن لكل قاعدة بيانات
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+class _CheckoutTimingMixin:
+    """قياس زمن انتظار الحصول على اتصال من المجمع"""
+
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(engine=self.engine_label)
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start, engine=self.engine_label)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """مجمع اتصالات المحرك المتزامن مع قياس زمن الانتظار"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """مجمع اتصالات المحرك غير المتزامن مع قياس زمن الانتظار"""
+
+    engine_label = "async"
+
+
+def engine_options(database_url: str, poolclass: Type[Pool] = InstrumentedQueuePool) -> Dict[str, Any]:
+    """
+    خيارات مجمع الاتصالات للمحرك حسب الإعدادات
+
+    قاعدة SQLite في الذاكرة تستخدم مجمعها الخاص (اتصال واحد لكل خيط) فلا
+    تُمرر لها خيارات المجمع.
+
+    Args:
+        database_url: عنوان قاعدة البيانات
+        poolclass: صنف المجمع (InstrumentedAsyncQueuePool للمحرك غير المتزامن)
+
+    Returns:
+        وسائط create_engine
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    عنوان قاعدة البيانات نفسها ببرنامج تشغيل غير متزامن
+
+    postgresql:// يصبح postgresql+asyncpg:// و sqlite:// يصبح sqlite+aiosqlite://.
+
+    Args:
+        database_url: عنوان قاعدة البيانات المتزامن
+
+    Returns:
+        العنوان غير المتزامن
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
 
 # إنشاء محرك قاعدة البيانات
-engine = create_engine(settings.database_url)
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
 
 # إنشاء جلسة قاعدة البيانات
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,20 +110,189 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # إنشاء Base لنماذج SQLAlchemy
 Base = declarative_base()
 
+# مفتاح جلسة الطلب في حالة الطلب (scope["state"]) المشتركة بين الوسيط ونقطة النهاية
+REQUEST_SESSION_KEY = "db"
+# علامة أن RequestSessionMiddleware يتولى إغلاق جلسة الطلب
+REQUEST_SESSION_MANAGED_KEY = "db_managed"
+
+
+def get_request_session(connection: HTTPConnection) -> Session:
+    """
+    جلسة قاعدة البيانات الخاصة بالطلب الحالي، تُنشأ عند أول استخدام
+
+    الوسيط والتبعيات ونقطة النهاية يتشاركون الجلسة نفسها (واتصالاً واحداً من
+    المجمع) بدلاً من فتح جلسة لكل منهم.
+
+    Args:
+        connection: الطلب أو اتصال WebSocket
+
+    Returns:
+        جلسة الطلب
+    """
+    state = connection.scope.setdefault("state", {})
+    db = state.get(REQUEST_SESSION_KEY)
+    if db is None:
+        db = state[REQUEST_SESSION_KEY] = SessionLocal()
+    return db
+
+
+def close_request_session(scope: Dict[str, Any]):
+    """إغلاق جلسة الطلب (إن فُتحت) وإعادة اتصالها إلى المجمع"""
+    db = scope.get("state", {}).pop(REQUEST_SESSION_KEY, None)
+    if db is not None:
+        db.close()
+
+
 # تبعية للوصول إلى جلسة قاعدة البيانات
 
 
-def get_db():
-    db = SessionLocal()
+def get_db(connection: HTTPConnection):
+    db = get_request_session(connection)
+    try:
+        yield db
+    finally:
+        # بدون الوسيط (اختبارات أو WebSocket) تُغلق الجلسة مع انتهاء التبعية
+        if not connection.scope.get("state", {}).get(REQUEST_SESSION_MANAGED_KEY):
+            close_request_session(connection.scope)
+
+
+class RequestSessionMiddleware:
+    """
+    وسيط ASGI يغلق جلسة الطلب بعد انتهاء كل الوسطاء ونقطة النهاية
+
+    يجب أن يكون الوسيط الخارجي (آخر add_middleware) حتى يتمكن وسطاء اللغة من
+    استخدام الجلسة قبل نقطة النهاية وبعدها.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})[REQUEST_SESSION_MANAGED_KEY] = True
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            close_request_session(scope)
+
+
+@contextmanager
+def session_scope(session_factory=None):
+    """
+    جلسة قصيرة العمر تُعاد إلى المجمع فور انتهاء الكتلة
+
+    تُستخدم في اتصالات WebSocket بدلاً من Depends(get_db) التي تحجز اتصالاً
+    من المجمع طوال عمر المقبس.
+
+    Args:
+        session_factory: مصنع الجلسات (SessionLocal افتراضياً)
+    """
+    db = (session_factory or SessionLocal)()
     try:
         yield db
     finally:
         db.close()
 
 
+# المحرك غير المتزامن يُنشأ عند أول استخدام حتى لا يُشترط تثبيت asyncpg/aiosqlite
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    محرك قاعدة البيانات غير المتزامن (asyncpg في الإنتاج و aiosqlite محلياً)
+
+    Returns:
+        المحرك المشترك لهذه العملية
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.async_database_url or async_database_url(settings.database_url)
+        _async_engine = create_async_engine(url, **engine_options(url, InstrumentedAsyncQueuePool))
+        _async_session_factory = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """إنشاء جلسة غير متزامنة من المحرك المشترك"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    تبعية جلسة قاعدة البيانات غير المتزامنة لنقاط النهاية async def
+
+    الاستعلامات تنتظر دون حجب حلقة الأحداث ودون حجز خيط من مجمع الخيوط.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """إغلاق اتصالات المحرك غير المتزامن عند إيقاف العملية"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
+
+def pool_metrics(pools: Dict[str, Pool]):
+    """
+    حالة مجمعات الاتصالات ومجمع الخيوط لمقارنة حجميهما
+
+    نقاط النهاية المتزامنة تعمل في مجمع خيوط anyio؛ إذا كانت خيوطه أكثر من
+    pool_size + max_overflow ينتظر بعضها اتصالاً (db_pool_checkout_wait_seconds).
+
+    Args:
+        pools: المجمعات حسب تسمية المحرك (sync أو async)
+    """
+    queue_pools = [({"engine": label}, pool) for label, pool in pools.items() if isinstance(pool, QueuePool)]
+    metrics = [
+        ("db_pool_size", "gauge", "Configured number of persistent pool connections.",
+         [(labels, pool.size()) for labels, pool in queue_pools]),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out of the pool.",
+         [(labels, pool.checkedout()) for labels, pool in queue_pools]),
+        ("db_pool_overflow", "gauge", "Overflow connections open beyond pool_size (negative while below it).",
+         [(labels, pool.overflow()) for labels, pool in queue_pools]),
+    ]
+    try:
+        import anyio.to_thread
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        metrics += [
+            ("threadpool_max_threads", "gauge", "Worker threads available to sync endpoints.",
+             [({}, limiter.total_tokens)]),
+            ("threadpool_busy_threads", "gauge", "Worker threads currently running sync endpoints.",
+             [({}, limiter.borrowed_tokens)]),
+        ]
+    except Exception:
+        # خارج حلقة الأحداث (مثل القراءة من خيط آخر) لا يتوفر مجمع الخيوط
+        pass
+    return metrics
+
+
+def _collect_pool_metrics():
+    """حالة مجمعي اتصالات المحركين المتزامن وغير المتزامن"""
+    pools = {"sync": engine.pool}
+    if _async_engine is not None:
+        pools["async"] = _async_engine.sync_engine.pool
+    return pool_metrics(pools)
+
+
+metrics_registry.register_collector(_collect_pool_metrics)
+
 # إعداد مستمعي الأحداث لإبطال ذاكرة التخزين المؤقت
 setup_cache_invalidation_listeners(SessionLocal)
 
+# إعداد مستمعي الأحداث للترجمة المسبقة للمحتوى المنشور
+if settings.pretranslation_enabled:
+    setup_pretranslation_listeners(SessionLocal)
+
 
 def create_tables():
     """Helper to create all tables. Use in development only when
@@ -58,3 +58,38 @@ def setup_cache_invalidation_listeners(SessionLocal: sessionmaker):
 
     logger.info(
         "SQLAlchemy event listeners for cache invalidation have been set up.")
+
+
+def setup_pretranslation_listeners(SessionLocal: sessionmaker):
+    """
+    إعداد مستمعي الأحداث لإضافة المحتوى المنشور أو المعدّل إلى طابور الترجمة المسبقة.
+
+    يتم جمع المحتوى المتغير بعد كل flush (حيث يكون سجل التغييرات متاحاً)،
+    ولا يُضاف إلى الطابور إلا بعد commit ناجح.
+    """
+
+    @event.listens_for(SessionLocal, "after_flush")
+    def receive_after_flush(session: Session, flush_context):
+        """
+        جمع المحتوى القابل للترجمة الذي تغيرت حقوله النصية أو حالة نشره.
+        """
+        from app.core.content_pretranslation import collect_changed_content
+        collect_changed_content(session)
+
+    @event.listens_for(SessionLocal, "after_commit")
+    def receive_after_commit(session: Session):
+        """
+        إضافة المحتوى المتغير إلى طابور الترجمة المسبقة بعد commit ناجح.
+        """
+        from app.core.content_pretranslation import enqueue_changed_content
+        enqueue_changed_content(session)
+
+    @event.listens_for(SessionLocal, "after_rollback")
+    def receive_after_rollback(session: Session):
+        """
+        تجاهل التغييرات التي لم يتم حفظها.
+        """
+        session.info.pop("pretranslation", None)
+
+    logger.info(
+        "SQLAlchemy event listeners for content pre-translation have been set up.")
@@ -0,0 +1,588 @@
+# غرف مجموعات الدعم الحية: توزيع الرسائل على الأعضاء في العنقود وتسلسل لكل غرفة وحفظ على دفعات
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.database import session_scope
+from app.core.metrics import metrics_registry
+from app.core.presence import PresenceRegistry, presence_registry
+from app.core.websocket_connections import TrackedConnection
+from app.core.websocket_protocol import DEFAULT_PROTOCOL
+
+logger = logging.getLogger(__name__)
+
+# نطاق الغرف في سجل الحضور: تُسجل كل عملية مرة واحدة لكل غرفة لها أعضاء متصلون بها
+# (user_id في السجل هو معرف المجموعة)، فتُنشر الرسالة إلى العمليات المعنية فقط
+ROOM_SCOPE = "group-room"
+
+room_messages = metrics_registry.counter(
+    "group_room_messages_total",
+    "Messages posted to live support-group rooms.")
+
+room_gaps = metrics_registry.counter(
+    "group_room_gaps_total",
+    "Sequence gaps seen by a worker, by resolution: filled from the room buffer or skipped.",
+    ("result",))
+
+flushed_posts = metrics_registry.counter(
+    "group_posts_flushed_total",
+    "Live group messages written to group_posts, by outcome.",
+    ("result",))
+
+
+class RoomStore:
+    """
+    واجهة أرقام التسلسل والرسائل الأخيرة لكل غرفة (مشتركة بين العمليات)
+
+    الرسائل الأخيرة تكفي لاستئناف الاتصال وسد الفجوات قبل حفظها في قاعدة البيانات.
+    """
+
+    async def ensure(self, group_id: int, floor: int):
+        """بدء عداد الغرفة من floor إذا لم يكن موجوداً (بعد إعادة التشغيل)"""
+        raise NotImplementedError
+
+    async def append(self, group_id: int, message: Dict[str, Any]) -> Dict[str, Any]:
+        """إعطاء الرسالة رقم التسلسل التالي وحفظها في الرسائل الأخيرة"""
+        raise NotImplementedError
+
+    async def current(self, group_id: int) -> int:
+        """آخر رقم تسلسل في الغرفة"""
+        raise NotImplementedError
+
+    async def since(self, group_id: int, after_seq: int, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        الرسائل الأخيرة بعد رقم تسلسل
+
+        Returns:
+            (الرسائل بترتيب التسلسل، هل تبدأ من after_seq + 1 دون نقص)
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """تحرير الموارد"""
+
+
+class MemoryRoomStore(RoomStore):
+    """أرقام التسلسل والرسائل الأخيرة داخل العملية (عملية واحدة أو الاختبار)"""
+
+    def __init__(self, buffer_size: int = None):
+        self.buffer_size = buffer_size or settings.group_room_buffer_size
+        self._sequences: Dict[int, int] = {}
+        self._buffers: Dict[int, deque] = {}
+
+    async def ensure(self, group_id: int, floor: int):
+        self._sequences.setdefault(group_id, floor)
+
+    async def append(self, group_id: int, message: Dict[str, Any]) -> Dict[str, Any]:
+        sequence = self._sequences.get(group_id, 0) + 1
+        self._sequences[group_id] = sequence
+        message = {**message, "seq": sequence}
+        self._buffers.setdefault(group_id, deque(maxlen=self.buffer_size)).append(message)
+        return message
+
+    async def current(self, group_id: int) -> int:
+        return self._sequences.get(group_id, 0)
+
+    async def since(self, group_id: int, after_seq: int, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        buffer = self._buffers.get(group_id, ())
+        messages = [message for message in buffer if message["seq"] > after_seq][:limit]
+        complete = (after_seq >= self._sequences.get(group_id, 0)
+                    or bool(buffer) and buffer[0]["seq"] <= after_seq + 1)
+        return messages, complete
+
+
+class RedisRoomStore(RoomStore):
+    """أرقام التسلسل عبر INCR والرسائل الأخيرة في مجموعة مرتبة لكل غرفة"""
+
+    def __init__(self, url: str = None, prefix: str = "group-room", buffer_size: int = None):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url or settings.redis_url, decode_responses=True)
+        self.prefix = prefix
+        self.buffer_size = buffer_size or settings.group_room_buffer_size
+
+    def _sequence_key(self, group_id: int) -> str:
+        return f"{self.prefix}:seq:{group_id}"
+
+    def _buffer_key(self, group_id: int) -> str:
+        return f"{self.prefix}:buffer:{group_id}"
+
+    async def ensure(self, group_id: int, floor: int):
+        await self.redis.set(self._sequence_key(group_id), floor, nx=True)
+
+    async def append(self, group_id: int, message: Dict[str, Any]) -> Dict[str, Any]:
+        sequence = await self.redis.incr(self._sequence_key(group_id))
+        message = {**message, "seq": sequence}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(self._buffer_key(group_id), {json.dumps(message): sequence})
+            pipe.zremrangebyrank(self._buffer_key(group_id), 0, -(self.buffer_size + 1))
+            await pipe.execute()
+        return message
+
+    async def current(self, group_id: int) -> int:
+        return int(await self.redis.get(self._sequence_key(group_id)) or 0)
+
+    async def since(self, group_id: int, after_seq: int, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(self._buffer_key(group_id), f"({after_seq}", "+inf", start=0, num=limit)
+            pipe.zrange(self._buffer_key(group_id), 0, 0, withscores=True)
+            pipe.get(self._sequence_key(group_id))
+            values, oldest, current = await pipe.execute()
+        complete = after_seq >= int(current or 0) or bool(oldest) and oldest[0][1] <= after_seq + 1
+        return [json.loads(value) for value in values], complete
+
+    async def close(self):
+        await self.redis.connection_pool.disconnect()
+
+
+class GroupPostRepository:
+    """قراءة وكتابة رسائل الغرف في جدول group_posts (استعلامات قصيرة بجلسة مستقلة)"""
+
+    def is_member(self, group_id: int, user_id: int) -> bool:
+        """هل المستخدم عضو في المجموعة أو مشرفها"""
+        from app.models.content import GroupMembership, SupportGroup
+
+        with session_scope() as db:
+            member = db.execute(select(GroupMembership.id).where(
+                GroupMembership.group_id == group_id, GroupMembership.user_id == user_id).limit(1)).first()
+            if member is not None:
+                return True
+            moderator = db.execute(select(SupportGroup.moderator_id).where(
+                SupportGroup.id == group_id)).scalar()
+            return moderator == user_id
+
+    def latest_sequence(self, group_id: int) -> int:
+        """آخر رقم تسلسل محفوظ للمجموعة"""
+        from app.models.content import GroupPost
+
+        with session_scope() as db:
+            return db.execute(select(GroupPost.sequence).where(
+                GroupPost.group_id == group_id, GroupPost.sequence.isnot(None))
+                .order_by(GroupPost.sequence.desc()).limit(1)).scalar() or 0
+
+    def messages_after(self, group_id: int, after_seq: int, limit: int) -> List[Dict[str, Any]]:
+        """الرسائل المحفوظة بعد رقم تسلسل"""
+        from app.models.content import GroupPost
+
+        with session_scope() as db:
+            rows = db.execute(select(GroupPost.user_id, GroupPost.content, GroupPost.sequence,
+                                     GroupPost.created_at)
+                              .where(GroupPost.group_id == group_id, GroupPost.sequence > after_seq)
+                              .order_by(GroupPost.sequence).limit(limit)).all()
+        return [{"type": "message", "group_id": group_id, "user_id": row.user_id, "content": row.content,
+                 "created_at": row.created_at.isoformat() if row.created_at else None, "seq": row.sequence}
+                for row in rows]
+
+    def insert(self, rows: List[Dict[str, Any]]):
+        """إدراج دفعة رسائل في استعلام واحد"""
+        from app.models.content import GroupPost
+
+        with session_scope() as db:
+            db.execute(insert(GroupPost.__table__), rows)
+            db.commit()
+
+
+class GroupPostWriter:
+    """
+    حفظ رسائل الغرف في group_posts على دفعات
+
+    تُجمع الرسائل وتُدرج كل فترة قصيرة أو عند امتلاء الدفعة، بدل معاملة
+    لكل رسالة. عند تعذر الكتابة تبقى الرسائل في الانتظار حتى الحد الأقصى.
+    """
+
+    def __init__(self, repository: GroupPostRepository = None, flush_ms: int = None,
+                 batch_size: int = None, max_pending: int = None):
+        """
+        تهيئة الكاتب
+
+        Args:
+            repository: مستودع الرسائل
+            flush_ms: أقصى مدة انتظار الرسالة قبل حفظها
+            batch_size: عدد الرسائل الذي يبدأ الحفظ فوراً
+            max_pending: أقصى عدد رسائل منتظرة (تُسقط الأقدم بعده)
+        """
+        self.repository = repository or GroupPostRepository()
+        self.flush_interval = (flush_ms or settings.group_post_flush_ms) / 1000
+        self.batch_size = batch_size or settings.group_post_batch_size
+        self.max_pending = max_pending or settings.group_post_max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, row: Dict[str, Any]):
+        """إضافة رسالة إلى الدفعة التالية"""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """إيقاف الحفظ الدوري مع حفظ الرسائل المتبقية"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """حفظ الرسائل المنتظرة"""
+        rows, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        if not rows:
+            return
+        try:
+            await run_in_threadpool(self.repository.insert, rows)
+            flushed_posts.inc(len(rows), result="written")
+        except IntegrityError:
+            # رسالة مكررة (مثل إعادة ضبط عداد Redis) لا يجوز أن تمنع حفظ بقية الدفعة
+            await run_in_threadpool(self._insert_each, rows)
+        except Exception as e:
+            logger.error(f"Group post flush error: {e}")
+            self._pending = rows + self._pending
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                flushed_posts.inc(overflow, result="dropped")
+
+    def _insert_each(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            try:
+                self.repository.insert([row])
+                flushed_posts.inc(result="written")
+            except Exception as e:
+                logger.error(f"Group post dropped (group {row['group_id']}, seq {row['sequence']}): {e}")
+                flushed_posts.inc(result="dropped")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            while self._pending:
+                await self.flush()
+                if len(self._pending) < self.batch_size:
+                    break
+
+
+class RoomMember:
+    """اتصال عضو في غرفة مع آخر رقم تسلسل سُلّم إليه"""
+
+    def __init__(self, connection: TrackedConnection, last_seq: int):
+        self.connection = connection
+        self.last_seq = last_seq
+        # الرسائل الحية الواردة أثناء إرسال الرسائل الفائتة
+        self.pending: Optional[List[Tuple[Dict[str, Any], Optional[str]]]] = []
+
+    def offer(self, message: Dict[str, Any], text: Optional[str] = None):
+        """تسليم رسالة إذا كانت أحدث من آخر ما سُلّم"""
+        if message["seq"] <= self.last_seq:
+            return
+        if self.pending is not None:
+            self.pending.append((message, text))
+            return
+        self.deliver(message, text)
+
+    def deliver(self, message: Dict[str, Any], text: Optional[str] = None):
+        """إرسال رسالة وتسجيل رقم تسلسلها"""
+        self.last_seq = message["seq"]
+        self.send(message, text)
+
+    def send(self, message: Dict[str, Any], text: Optional[str] = None):
+        """إرسال إطار إلى الاتصال بصيغته المتفق عليها"""
+        protocol = self.connection.protocol
+        # نص JSON المنشور يُرسل كما هو لعملاء JSON دون إعادة ترميز
+        frame = text if text is not None and not protocol.codec.binary else protocol.encode(message)
+        self.connection.sender.send_nowait(frame)
+
+
+class LocalRoom:
+    """أعضاء غرفة متصلون بهذه العملية وآخر رقم تسلسل سُلّم إليهم بالترتيب"""
+
+    def __init__(self, group_id: int):
+        self.group_id = group_id
+        self.members: Dict[TrackedConnection, RoomMember] = {}
+        self.last_seq: Optional[int] = None
+        # رسائل وصلت قبل سابقاتها: رقم التسلسل -> (الرسالة، نصها)
+        self.held: Dict[int, Tuple[Dict[str, Any], Optional[str]]] = {}
+        self.presence_id: Optional[str] = None
+        self.ready: Optional[asyncio.Future] = None
+        self.gap_task: Optional[asyncio.Task] = None
+
+
+class GroupRoomHub:
+    """
+    غرف مجموعات الدعم الحية في هذه العملية
+
+    تحصل كل رسالة على رقم تسلسل من المخزن المشترك، وتُضاف إلى دفعة الحفظ،
+    وتُنشر مرة واحدة لكل عملية لها أعضاء في الغرفة ثم تُوزع محلياً على
+    اتصالاتهم (التوزيع عند الكتابة). تُسلم الرسائل لكل عضو بترتيب التسلسل دون
+    فجوات: الرسالة التي تسبق سابقتها تُحجز حتى تصل، أو تُجلب الناقصة من
+    المخزن بعد مهلة قصيرة. العميل الذي يعيد الاتصال يرسل آخر رقم استلمه
+    (after_seq) فتصله الرسائل الفائتة ثم الرسائل الحية.
+    """
+
+    def __init__(self, store: RoomStore = None, repository: GroupPostRepository = None,
+                 writer: GroupPostWriter = None, registry: PresenceRegistry = None,
+                 gap_timeout_ms: int = None, resume_limit: int = None):
+        """
+        تهيئة الغرف
+
+        Args:
+            store: مخزن أرقام التسلسل والرسائل الأخيرة
+            repository: مستودع الرسائل المحفوظة
+            writer: كاتب دفعات الرسائل
+            registry: سجل الحضور لنشر الرسائل بين العمليات
+            gap_timeout_ms: مدة انتظار رسالة ناقصة قبل جلبها من المخزن
+            resume_limit: أقصى عدد رسائل فائتة تُرسل عند الاستئناف
+        """
+        self.store = store or create_room_store()
+        self.repository = repository or GroupPostRepository()
+        self.writer = writer or GroupPostWriter(self.repository)
+        self.registry = registry or presence_registry
+        self.gap_timeout = (gap_timeout_ms or settings.group_room_gap_timeout_ms) / 1000
+        self.resume_limit = resume_limit or settings.group_room_resume_limit
+        self._rooms: Dict[int, LocalRoom] = {}
+        self._seeded: set = set()
+
+    def start(self):
+        """بدء حفظ الرسائل على دفعات"""
+        self.writer.start()
+
+    async def stop(self):
+        """حفظ الرسائل المتبقية وتحرير الغرف"""
+        for room in list(self._rooms.values()):
+            await self._close_room(room)
+        await self.writer.stop()
+        await self.store.close()
+
+    async def is_member(self, group_id: int, user_id: int) -> bool:
+        """هل يحق للمستخدم دخول الغرفة"""
+        return await run_in_threadpool(self.repository.is_member, group_id, user_id)
+
+    async def join(self, group_id: int, connection: TrackedConnection, after_seq: Optional[int] = None) -> int:
+        """
+        إضافة اتصال إلى غرفة
+
+        Args:
+            group_id: معرف المجموعة
+            connection: اتصال العضو
+            after_seq: آخر رقم تسلسل استلمه العميل قبل انقطاعه (None للرسائل الجديدة فقط)
+
+        Returns:
+            رقم التسلسل الذي يبدأ بعده التسليم الحي
+        """
+        while True:
+            room = await self._room(group_id)
+            if self._rooms.get(group_id) is room:
+                break
+
+        upto = room.last_seq
+        member = RoomMember(connection, upto if after_seq is None else after_seq)
+        room.members[connection] = member
+        member.send({"type": "joined", "group_id": group_id, "latest_seq": upto})
+
+        if after_seq is not None and after_seq < upto:
+            # الرسائل الحية الواردة أثناء جلب الفائت تُحجز في member.pending
+            backlog = await self.history(group_id, after_seq, upto)
+            if backlog is None:
+                # فائت أكثر من حد الاستئناف: يعيد العميل تحميل السجل ثم يتابع من هنا
+                member.send({"type": "reset", "group_id": group_id, "latest_seq": upto})
+            else:
+                for message in backlog:
+                    if message["seq"] > member.last_seq:
+                        member.deliver(message)
+            member.last_seq = max(member.last_seq, upto)
+
+        pending, member.pending = member.pending, None
+        for message, text in pending or ():
+            member.offer(message, text)
+        return member.last_seq
+
+    async def leave(self, group_id: int, connection: TrackedConnection):
+        """حذف اتصال من غرفة وإلغاء تسجيل الغرفة عند مغادرة آخر أعضائها المحليين"""
+        room = self._rooms.get(group_id)
+        if room is None:
+            return
+        room.members.pop(connection, None)
+        if not room.members:
+            await self._close_room(room)
+
+    async def post(self, group_id: int, user_id: int, content: str, client_id: Any = None) -> int:
+        """
+        نشر رسالة في غرفة
+
+        Args:
+            group_id: معرف المجموعة
+            user_id: معرف الكاتب
+            content: نص الرسالة
+            client_id: معرّف العميل المحلي للرسالة (يُعاد مع الرسالة لمطابقتها)
+
+        Returns:
+            رقم تسلسل الرسالة
+        """
+        await self._seed(group_id)
+        created_at = datetime.now(timezone.utc)
+        message = {"type": "message", "group_id": group_id, "user_id": user_id, "content": content,
+                   "created_at": created_at.isoformat()}
+        if client_id is not None:
+            message["client_id"] = client_id
+        message = await self.store.append(group_id, message)
+        self.writer.add({"group_id": group_id, "user_id": user_id, "content": content,
+                         "sequence": message["seq"], "created_at": created_at})
+        room_messages.inc()
+        await self.registry.send_to_user(ROOM_SCOPE, group_id, DEFAULT_PROTOCOL.encode(message))
+        return message["seq"]
+
+    async def history(self, group_id: int, after_seq: int, upto: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        الرسائل بعد after_seq حتى upto من المخزن أو من قاعدة البيانات
+
+        Returns:
+            الرسائل بترتيب التسلسل، أو None إذا تجاوزت حد الاستئناف
+        """
+        if upto - after_seq > self.resume_limit:
+            return None
+        messages, complete = await self.store.since(group_id, after_seq, self.resume_limit)
+        if not complete:
+            persisted = await run_in_threadpool(
+                self.repository.messages_after, group_id, after_seq, self.resume_limit)
+            merged = {message["seq"]: message for message in persisted}
+            merged.update((message["seq"], message) for message in messages)
+            messages = [merged[seq] for seq in sorted(merged)]
+        return [message for message in messages if message["seq"] <= upto]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """عدد الغرف والأعضاء المحليين والرسائل المنتظرة للحفظ"""
+        return {
+            "rooms": len(self._rooms),
+            "members": sum(len(room.members) for room in self._rooms.values()),
+            "pending_posts": self.writer.pending,
+        }
+
+    async def _seed(self, group_id: int):
+        """بدء عداد الغرفة من آخر رقم محفوظ (مرة واحدة لكل غرفة في العملية)"""
+        if group_id in self._seeded:
+            return
+        floor = await run_in_threadpool(self.repository.latest_sequence, group_id)
+        await self.store.ensure(group_id, floor)
+        self._seeded.add(group_id)
+
+    async def _room(self, group_id: int) -> LocalRoom:
+        """الغرفة المحلية (تُسجل في سجل الحضور عند أول عضو)"""
+        room = self._rooms.get(group_id)
+        if room is None:
+            room = self._rooms[group_id] = LocalRoom(group_id)
+            room.ready = asyncio.ensure_future(self._open_room(room))
+        try:
+            await asyncio.shield(room.ready)
+        except Exception:
+            # فشل فتح الغرفة: يُعاد المحاولة عند الانضمام التالي
+            if not room.members:
+                await self._close_room(room)
+            raise
+        return room
+
+    async def _open_room(self, room: LocalRoom):
+        # التسجيل قبل قراءة آخر رقم: الرسائل الواردة بينهما تُحجز ولا تضيع
+        room.presence_id = await self.registry.register(
+            ROOM_SCOPE, room.group_id, partial(self._on_message, room))
+        await self._seed(room.group_id)
+        room.last_seq = await self.store.current(room.group_id)
+        for sequence in [sequence for sequence in room.held if sequence <= room.last_seq]:
+            del room.held[sequence]
+        self._drain(room)
+
+    async def _close_room(self, room: LocalRoom):
+        if self._rooms.get(room.group_id) is room:
+            del self._rooms[room.group_id]
+        if room.gap_task is not None:
+            room.gap_task.cancel()
+        if room.ready is not None:
+            await asyncio.gather(room.ready, return_exceptions=True)
+        if room.presence_id is not None:
+            await self.registry.unregister(ROOM_SCOPE, room.group_id, room.presence_id)
+
+    def _on_message(self, room: LocalRoom, text: str):
+        """رسالة منشورة في الغرفة (من هذه العملية أو من غيرها)"""
+        message = json.loads(text)
+        sequence = message["seq"]
+        if room.last_seq is not None and sequence <= room.last_seq:
+            return
+        room.held[sequence] = (message, text)
+        if room.last_seq is None:
+            return
+        self._drain(room)
+        if room.held and (room.gap_task is None or room.gap_task.done()):
+            room.gap_task = asyncio.ensure_future(self._fill_gap(room))
+
+    def _drain(self, room: LocalRoom):
+        """تسليم الرسائل المحجوزة التي اكتمل ما قبلها"""
+        while room.last_seq + 1 in room.held:
+            message, text = room.held.pop(room.last_seq + 1)
+            room.last_seq = message["seq"]
+            for member in list(room.members.values()):
+                member.offer(message, text)
+
+    async def _fill_gap(self, room: LocalRoom):
+        """جلب الرسائل الناقصة من المخزن بعد مهلة، أو تجاوزها إذا لم تُحفظ"""
+        while room.held:
+            await asyncio.sleep(self.gap_timeout)
+            if not room.held:
+                return
+            try:
+                messages, _ = await self.store.since(room.group_id, room.last_seq, self.resume_limit)
+            except Exception as e:
+                logger.error(f"Group room gap fill error: {e}")
+                messages = []
+            for message in messages:
+                room.held.setdefault(message["seq"], (message, None))
+            if room.last_seq + 1 in room.held:
+                room_gaps.inc(result="filled")
+            else:
+                # رسالة حصلت على رقم ولم تُنشر (مثل توقف العملية بينهما)
+                room_gaps.inc(result="skipped")
+                room.last_seq = min(room.held) - 1
+            self._drain(room)
+
+
+def create_room_store() -> RoomStore:
+    """إنشاء مخزن الغرف حسب خلفية الحضور (memory أو redis)"""
+    if settings.presence_backend == "redis":
+        return RedisRoomStore(settings.redis_url)
+    return MemoryRoomStore()
+
+
+# إنشاء مثيل من غرف المجموعات
+group_rooms = GroupRoomHub()
+
+
+def _collect_room_metrics():
+    """الغرف والأعضاء في هذه العملية والرسائل المنتظرة للحفظ"""
+    stats = group_rooms.get_stats()
+    return [
+        ("group_room_local_rooms", "gauge", "Live group rooms with members on this worker.",
+         [({}, stats["rooms"])]),
+        ("group_room_local_members", "gauge", "Group room connections on this worker.",
+         [({}, stats["members"])]),
+        ("group_posts_pending", "gauge", "Live group messages waiting to be written to group_posts.",
+         [({}, stats["pending_posts"])]),
+    ]
+
+
+metrics_registry.register_collector(_collect_room_metrics)
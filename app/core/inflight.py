@@ -0,0 +1,65 @@
+# دمج الطلبات المتطابقة الجارية في استدعاء واحد
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class InFlightRequests:
+    """
+    خريطة الطلبات الجارية
+
+    أول طلب لمفتاح معين ينفذ الاستدعاء، وأي طلب مطابق يصل قبل انتهائه
+    ينتظر النتيجة نفسها (أو الخطأ نفسه) بدلاً من تكرار الاستدعاء.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def run(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        تنفيذ استدعاء أو مشاركة نتيجة استدعاء مطابق جارٍ
+
+        Args:
+            key: مفتاح الطلب
+            call: الاستدعاء الفعلي
+
+        Returns:
+            نتيجة الاستدعاء
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """إحصائيات دمج الطلبات"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self.executed,
+                "shared": self.shared,
+            }
@@ -0,0 +1,294 @@
+# الكشف المحلي عن لغة النص دون الحاجة إلى نموذج لغوي
+
+import math
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from app.core.i18n import i18n_settings
+from app.core.language_samples import LANGUAGE_SAMPLES
+
+# نطاقات يونيكود للأنظمة الكتابية (البداية، النهاية، النظام)
+SCRIPT_RANGES = sorted([
+    (0x0041, 0x005A, "latin"), (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x024F, "latin"), (0x1E00, 0x1EFF, "latin"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0530, 0x058F, "armenian"),
+    (0x0590, 0x05FF, "hebrew"), (0xFB1D, 0xFB4F, "hebrew"),
+    (0x0600, 0x06FF, "arabic"), (0x0750, 0x077F, "arabic"),
+    (0xFB50, 0xFDFF, "arabic"), (0xFE70, 0xFEFF, "arabic"),
+    (0x0780, 0x07BF, "thaana"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0980, 0x09FF, "bengali"),
+    (0x0A00, 0x0A7F, "gurmukhi"),
+    (0x0A80, 0x0AFF, "gujarati"),
+    (0x0B00, 0x0B7F, "oriya"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"),
+    (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"),
+    (0x0D80, 0x0DFF, "sinhala"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x0E80, 0x0EFF, "lao"),
+    (0x0F00, 0x0FFF, "tibetan"),
+    (0x1000, 0x109F, "myanmar"),
+    (0x10A0, 0x10FF, "georgian"),
+    (0x1100, 0x11FF, "hangul"), (0x3130, 0x318F, "hangul"), (0xAC00, 0xD7AF, "hangul"),
+    (0x1200, 0x139F, "ethiopic"),
+    (0x1400, 0x167F, "canadian"),
+    (0x1780, 0x17FF, "khmer"),
+    (0x1800, 0x18AF, "mongolian"),
+    (0x3040, 0x30FF, "kana"), (0x31F0, 0x31FF, "kana"),
+    (0x3400, 0x4DBF, "han"), (0x4E00, 0x9FFF, "han"), (0xF900, 0xFAFF, "han"),
+    (0xA000, 0xA48F, "yi"),
+])
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# الأنظمة الكتابية التي تخص لغة واحدة أو لغات محددة
+SCRIPT_LOCALES = {
+    "armenian": ("hy",),
+    "hebrew": ("he", "yi"),
+    "thaana": ("dv",),
+    "bengali": ("bn", "as"),
+    "gurmukhi": ("pa",),
+    "gujarati": ("gu",),
+    "oriya": ("or",),
+    "tamil": ("ta",),
+    "telugu": ("te",),
+    "kannada": ("kn",),
+    "malayalam": ("ml",),
+    "sinhala": ("si",),
+    "thai": ("th",),
+    "lao": ("lo",),
+    "tibetan": ("dz",),
+    "myanmar": ("my",),
+    "georgian": ("ka",),
+    "hangul": ("ko",),
+    "ethiopic": ("am", "ti"),
+    "canadian": ("iu",),
+    "khmer": ("km",),
+    "mongolian": ("mn",),
+    "kana": ("ja",),
+    "han": ("zh",),
+    "yi": ("ii",),
+}
+
+# لغات مدعومة تكتب بنظام له نموذج لكن بلا نص مرجعي في LANGUAGE_SAMPLES؛ نصوصها
+# تُنسب بثقة إلى أقرب لغة لها نموذج ما لم تُخفض الثقة (انظر MIN_TRIGRAM_COVERAGE)
+UNMODELLED_SCRIPT_LOCALES = {
+    "latin": ("kr", "kx", "na", "nv", "oj", "pi", "vo"),
+}
+
+# أدنى نسبة من ثلاثيات النص موجودة في نص اللغة المكتشفة؛ دونها يُعد النص بلغة بلا
+# نموذج في الأنظمة أعلاه وتُعاد ثقة 0 ليُحال إلى النموذج اللغوي
+MIN_TRIGRAM_COVERAGE = 0.12
+
+# الحد الأقصى لعدد الأحرف التي يتم تحليلها من النص
+MAX_ANALYZED_CHARS = 256
+
+# معامل التنعيم لنموذج n-gram
+SMOOTHING = 0.5
+
+# معامل معايرة الثقة (كلما زاد قلّت الثقة لنفس الفرق في الاحتمال)
+CONFIDENCE_TEMPERATURE = 12.0
+
+
+def char_script(char: str) -> Optional[str]:
+    """الحصول على النظام الكتابي لحرف"""
+    code = ord(char)
+    index = bisect_right(_RANGE_STARTS, code) - 1
+    if index >= 0:
+        start, end, script = SCRIPT_RANGES[index]
+        if code <= end:
+            return script
+    return None
+
+
+def extract_ngrams(text: str) -> List[str]:
+    """استخراج أحرف النص وثنائياته وثلاثياته من كلماته مع حدود الكلمات"""
+    words = "".join(
+        char if char.isalpha() or char in "'\u200c" or unicodedata.category(char)[0] == "M" else " "
+        for char in text.lower()
+    ).split()
+
+    ngrams = []
+    for word in words:
+        padded = f" {word} "
+        ngrams.extend(word)
+        ngrams.extend(padded[i:i + 2] for i in range(len(padded) - 1))
+        ngrams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return ngrams
+
+
+class _ScriptModel:
+    """نموذج Naive Bayes لمقاطع الأحرف (n-gram) للغات نظام كتابي واحد"""
+
+    def __init__(self, samples: Dict[str, str]):
+        self.locales = list(samples.keys())
+        counts = [Counter(extract_ngrams(text)) for text in samples.values()]
+        vocabulary = set().union(*counts)
+
+        # الاحتمال الافتراضي للمقاطع غير المرئية في كل لغة
+        self.defaults = []
+        # فهرس معكوس: المقطع -> [(فهرس اللغة، الفرق عن الاحتمال الافتراضي)]
+        self.index: Dict[str, List[Tuple[int, float]]] = {}
+
+        # الثلاثيات المرئية في نص كل لغة لقياس تغطية النص المكتشف
+        self.trigrams = [{ngram for ngram in counter if len(ngram) == 3} for counter in counts]
+
+        for locale_index, counter in enumerate(counts):
+            denominator = sum(counter.values()) + SMOOTHING * len(vocabulary)
+            default = math.log(SMOOTHING / denominator)
+            self.defaults.append(default)
+            for ngram, count in counter.items():
+                delta = math.log((count + SMOOTHING) / denominator) - default
+                self.index.setdefault(ngram, []).append((locale_index, delta))
+
+    def score(self, ngrams: List[str]) -> Tuple[Optional[str], float]:
+        """حساب اللغة الأكثر احتمالاً ودرجة الثقة"""
+        if len(self.locales) == 1:
+            return self.locales[0], 1.0
+        if not ngrams:
+            return None, 0.0
+
+        scores = [default * len(ngrams) for default in self.defaults]
+        for ngram in ngrams:
+            for locale_index, delta in self.index.get(ngram, ()):
+                scores[locale_index] += delta
+
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        best, second = ranked[0], ranked[1]
+        margin = scores[best] - scores[second]
+        confidence = math.tanh(margin / (2 * CONFIDENCE_TEMPERATURE))
+        return self.locales[best], confidence
+
+    def coverage(self, ngrams: List[str], locale: str) -> float:
+        """نسبة ثلاثيات النص الموجودة في نص اللغة المرجعي"""
+        trigrams = [ngram for ngram in ngrams if len(ngram) == 3]
+        if not trigrams:
+            return 0.0
+        seen = self.trigrams[self.locales.index(locale)]
+        return sum(ngram in seen for ngram in trigrams) / len(trigrams)
+
+
+class LanguageDetector:
+    """
+    كاشف لغة محلي
+
+    يعتمد أولاً على النظام الكتابي (يونيكود) للغات ذات الأنظمة الفريدة،
+    ثم على نموذج مقاطع الأحرف (1-3 أحرف) للتمييز بين اللغات التي تشترك في نظام
+    كتابي واحد (اللاتينية، السيريلية، العربية، الديفاناغارية).
+    """
+
+    def __init__(self, supported_locales: List[str] = None):
+        """
+        تهيئة الكاشف
+
+        Args:
+            supported_locales: اللغات المدعومة (افتراضياً لغات النظام)
+        """
+        self.supported_locales = set(
+            supported_locales or i18n_settings.supported_locales)
+
+        # تجميع النصوص المرجعية حسب النظام الكتابي
+        samples_by_script: Dict[str, Dict[str, str]] = {}
+        for locale, text in LANGUAGE_SAMPLES.items():
+            if locale not in self.supported_locales:
+                continue
+            script = self._dominant_script(text)
+            samples_by_script.setdefault(script, {})[locale] = text
+
+        self.models = {
+            script: _ScriptModel(samples)
+            for script, samples in samples_by_script.items()
+        }
+
+        # الأنظمة التي تضم لغات مدعومة بلا نص مرجعي
+        self.unmodelled_scripts = {
+            script for script, locales in UNMODELLED_SCRIPT_LOCALES.items()
+            if self.supported_locales.intersection(locales)
+        }
+
+    @staticmethod
+    def _script_counts(text: str) -> Counter:
+        """عدد الأحرف لكل نظام كتابي"""
+        counts = Counter()
+        for char in text:
+            script = char_script(char)
+            if script:
+                counts[script] += 1
+        return counts
+
+    def _dominant_script(self, text: str) -> Optional[str]:
+        """النظام الكتابي الغالب في النص"""
+        counts = self._script_counts(text)
+        if not counts:
+            return None
+        # وجود الكانا يعني اليابانية حتى لو غلبت الأحرف الصينية
+        if counts.get("kana") and counts.get("han"):
+            return "kana"
+        return counts.most_common(1)[0][0]
+
+    def _resolve_script_locale(self, script: str, text: str) -> Tuple[Optional[str], float]:
+        """تحديد اللغة من نظام كتابي يخص لغات محددة"""
+        candidates = [locale for locale in SCRIPT_LOCALES[script]
+                      if locale in self.supported_locales]
+        if not candidates:
+            return None, 0.0
+
+        # قواعد تمييز بأحرف خاصة بلغة معينة
+        if script == "bengali" and "as" in candidates and any(char in text for char in "ৰৱ"):
+            return "as", 1.0
+        if script == "hebrew" and "yi" in candidates and any(char in text for char in "ײװױ"):
+            return "yi", 1.0
+
+        return candidates[0], 1.0 if len(candidates) == 1 else 0.9
+
+    def detect(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        الكشف عن لغة النص
+
+        Args:
+            text: النص
+
+        Returns:
+            (رمز اللغة أو None، درجة الثقة بين 0 و 1)
+        """
+        if not text:
+            return None, 0.0
+
+        sample = text[:MAX_ANALYZED_CHARS]
+        script = self._dominant_script(sample)
+        if script is None:
+            return None, 0.0
+
+        if script in SCRIPT_LOCALES:
+            return self._resolve_script_locale(script, sample)
+
+        model = self.models.get(script)
+        if model is None:
+            return None, 0.0
+
+        ngrams = extract_ngrams(sample)
+        locale, confidence = model.score(ngrams)
+        # نص بعيد عن كل النصوص المرجعية قد يكون بلغة مدعومة بلا نموذج
+        if (locale is not None and script in self.unmodelled_scripts
+                and model.coverage(ngrams, locale) < MIN_TRIGRAM_COVERAGE):
+            return locale, 0.0
+        return locale, confidence
+
+    def detect_batch(self, texts: List[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        الكشف عن لغة مجموعة من النصوص
+
+        Args:
+            texts: النصوص
+
+        Returns:
+            قائمة (رمز اللغة، درجة الثقة) بنفس ترتيب النصوص
+        """
+        return [self.detect(text) for text in texts]
+
+
+# إنشاء مثيل من كاشف اللغة
+language_detector = LanguageDetector()
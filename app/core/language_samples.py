@@ -0,0 +1,740 @@
+# نصوص مرجعية لبناء نماذج الأحرف (n-gram) للكشف المحلي عن اللغة
+#
+# كل نص يتكون من المادة الأولى من الإعلان العالمي لحقوق الإنسان وجمل عامة
+# حول الصحة النفسية. اللغات ذات الأنظمة الكتابية الفريدة (الصينية، اليابانية،
+# الكورية، التايلاندية، ...) تُكشف من النظام الكتابي مباشرة ولا تحتاج نصاً هنا.
+# لبعض اللغات الأقل انتشاراً نص المادة الأولى وحده. كل لغة مدعومة تشترك في نظام
+# كتابي له نموذج تحتاج نصاً هنا، وإلا تُذكر في UNMODELLED_SCRIPT_LOCALES في
+# language_detector.py.
+
+LANGUAGE_SAMPLES = {
+    # ---------------- اللاتينية ----------------
+    "en": (
+        "All human beings are born free and equal in dignity and rights. They are endowed with reason "
+        "and conscience and should act towards one another in a spirit of brotherhood. Taking care of "
+        "your mental health is just as important as looking after your body. Try to get enough sleep, "
+        "stay in touch with the people you love and talk to someone when you feel overwhelmed."
+    ),
+    "fr": (
+        "Tous les êtres humains naissent libres et égaux en dignité et en droits. Ils sont doués de "
+        "raison et de conscience et doivent agir les uns envers les autres dans un esprit de fraternité. "
+        "Prendre soin de sa santé mentale est aussi important que de prendre soin de son corps. Essayez "
+        "de dormir suffisamment, de garder le contact avec vos proches et de parler à quelqu'un lorsque "
+        "vous vous sentez dépassé."
+    ),
+    "es": (
+        "Todos los seres humanos nacen libres e iguales en dignidad y derechos y, dotados como están de "
+        "razón y conciencia, deben comportarse fraternalmente los unos con los otros. Cuidar tu salud "
+        "mental es tan importante como cuidar tu cuerpo. Intenta dormir lo suficiente, mantente en "
+        "contacto con las personas que quieres y habla con alguien cuando te sientas desbordado."
+    ),
+    "de": (
+        "Alle Menschen sind frei und gleich an Würde und Rechten geboren. Sie sind mit Vernunft und "
+        "Gewissen begabt und sollen einander im Geist der Brüderlichkeit begegnen. Die Sorge um die "
+        "psychische Gesundheit ist genauso wichtig wie die Pflege des Körpers. Versuchen Sie, genug zu "
+        "schlafen, mit den Menschen in Kontakt zu bleiben, die Ihnen wichtig sind, und sprechen Sie mit "
+        "jemandem, wenn Sie sich überfordert fühlen."
+    ),
+    "it": (
+        "Tutti gli esseri umani nascono liberi ed eguali in dignità e diritti. Essi sono dotati di "
+        "ragione e di coscienza e devono agire gli uni verso gli altri in spirito di fratellanza. "
+        "Prendersi cura della propria salute mentale è importante quanto prendersi cura del proprio "
+        "corpo. Cerca di dormire abbastanza, resta in contatto con le persone che ami e parla con "
+        "qualcuno quando ti senti sopraffatto."
+    ),
+    "pt": (
+        "Todos os seres humanos nascem livres e iguais em dignidade e em direitos. Dotados de razão e "
+        "de consciência, devem agir uns para com os outros em espírito de fraternidade. Cuidar da saúde "
+        "mental é tão importante quanto cuidar do corpo. Tente dormir o suficiente, mantenha contato "
+        "com as pessoas de quem gosta e converse com alguém quando se sentir sobrecarregado."
+    ),
+    "nl": (
+        "Alle mensen worden vrij en gelijk in waardigheid en rechten geboren. Zij zijn begiftigd met "
+        "verstand en geweten, en behoren zich jegens elkander in een geest van broederschap te gedragen. "
+        "Zorgen voor je mentale gezondheid is net zo belangrijk als zorgen voor je lichaam. Probeer "
+        "voldoende te slapen, blijf in contact met de mensen van wie je houdt en praat met iemand "
+        "wanneer je je overweldigd voelt."
+    ),
+    "sv": (
+        "Alla människor är födda fria och lika i värde och rättigheter. De har utrustats med förnuft "
+        "och samvete och bör handla gentemot varandra i en anda av broderskap. Att ta hand om sin "
+        "psykiska hälsa är lika viktigt som att ta hand om kroppen. Försök att sova tillräckligt, håll "
+        "kontakten med de människor du tycker om och prata med någon när du känner dig överväldigad."
+    ),
+    "da": (
+        "Alle mennesker er født frie og lige i værdighed og rettigheder. De er udstyret med fornuft og "
+        "samvittighed, og de bør handle mod hverandre i en broderskabets ånd. Det er lige så vigtigt at "
+        "passe på sin mentale sundhed som at passe på sin krop. Prøv at få nok søvn, hold kontakten med "
+        "de mennesker, du holder af, og tal med nogen, når du føler dig overvældet."
+    ),
+    "no": (
+        "Alle mennesker er født frie og med samme menneskeverd og menneskerettigheter. De er utstyrt "
+        "med fornuft og samvittighet og bør handle mot hverandre i brorskapets ånd. Det er like viktig "
+        "å ta vare på den psykiske helsen som å ta vare på kroppen. Prøv å få nok søvn, hold kontakten "
+        "med menneskene du er glad i, og snakk med noen når du føler deg overveldet."
+    ),
+    "fi": (
+        "Kaikki ihmiset syntyvät vapaina ja tasavertaisina arvoltaan ja oikeuksiltaan. Heille on "
+        "annettu järki ja omatunto, ja heidän on toimittava toisiaan kohtaan veljeyden hengessä. "
+        "Mielenterveydestä huolehtiminen on yhtä tärkeää kuin kehosta huolehtiminen. Yritä nukkua "
+        "riittävästi, pidä yhteyttä läheisiisi ja puhu jollekulle, kun tunnet olosi ylivoimaiseksi."
+    ),
+    "pl": (
+        "Wszyscy ludzie rodzą się wolni i równi pod względem swej godności i swych praw. Są oni "
+        "obdarzeni rozumem i sumieniem i powinni postępować wobec innych w duchu braterstwa. Dbanie o "
+        "zdrowie psychiczne jest tak samo ważne jak dbanie o ciało. Staraj się wysypiać, utrzymuj "
+        "kontakt z bliskimi osobami i porozmawiaj z kimś, gdy czujesz się przytłoczony."
+    ),
+    "cs": (
+        "Všichni lidé rodí se svobodní a sobě rovní co do důstojnosti a práv. Jsou nadáni rozumem a "
+        "svědomím a mají spolu jednat v duchu bratrství. Péče o duševní zdraví je stejně důležitá jako "
+        "péče o tělo. Snažte se dostatečně spát, udržujte kontakt s lidmi, na kterých vám záleží, a "
+        "promluvte si s někým, když se cítíte zahlceni."
+    ),
+    "sk": (
+        "Všetci ľudia sa rodia slobodní a sebe rovní, čo sa týka ich dôstojnosti a práv. Sú obdarení "
+        "rozumom a svedomím a majú navzájom jednať v bratskom duchu. Starostlivosť o duševné zdravie je "
+        "rovnako dôležitá ako starostlivosť o telo. Snažte sa dostatočne spať, udržiavajte kontakt s "
+        "ľuďmi, na ktorých vám záleží, a porozprávajte sa s niekým, keď sa cítite preťažení."
+    ),
+    "sl": (
+        "Vsi ljudje se rodijo svobodni in imajo enako dostojanstvo in enake pravice. Obdarjeni so z "
+        "razumom in vestjo in bi morali ravnati drug z drugim kakor bratje. Skrb za duševno zdravje je "
+        "enako pomembna kot skrb za telo. Poskusite dovolj spati, ostanite v stiku z ljudmi, ki jih "
+        "imate radi, in se pogovorite z nekom, ko se počutite preobremenjeni."
+    ),
+    "hr": (
+        "Sva ljudska bića rađaju se slobodna i jednaka u dostojanstvu i pravima. Ona su obdarena "
+        "razumom i sviješću pa jedna prema drugima trebaju postupati u duhu bratstva. Briga o mentalnom "
+        "zdravlju jednako je važna kao briga o tijelu. Pokušajte dovoljno spavati, ostanite u kontaktu "
+        "s ljudima koje volite i razgovarajte s nekim kada se osjećate preopterećeno."
+    ),
+    "hu": (
+        "Minden emberi lény szabadon születik és egyenlő méltósága és joga van. Az emberek, ésszel és "
+        "lelkiismerettel bírván, egymással szemben testvéri szellemben kell hogy viseltessenek. A lelki "
+        "egészség ápolása ugyanolyan fontos, mint a test ápolása. Próbáljon eleget aludni, tartsa a "
+        "kapcsolatot a szeretteivel, és beszéljen valakivel, ha túlterheltnek érzi magát."
+    ),
+    "ro": (
+        "Toate ființele umane se nasc libere și egale în demnitate și în drepturi. Ele sunt înzestrate "
+        "cu rațiune și conștiință și trebuie să se comporte unele față de altele în spiritul "
+        "fraternității. Grija pentru sănătatea mintală este la fel de importantă ca grija pentru corp. "
+        "Încercați să dormiți suficient, păstrați legătura cu oamenii dragi și vorbiți cu cineva atunci "
+        "când vă simțiți copleșit."
+    ),
+    "et": (
+        "Kõik inimesed sünnivad vabadena ja võrdsetena oma väärikuselt ja õigustelt. Neile on antud "
+        "mõistus ja südametunnistus ja nende suhtumist üksteisesse peab kandma vendluse vaim. Vaimse "
+        "tervise eest hoolitsemine on sama tähtis kui keha eest hoolitsemine. Püüa piisavalt magada, "
+        "hoia sidet lähedastega ja räägi kellegagi, kui tunned end ülekoormatuna."
+    ),
+    "lv": (
+        "Visi cilvēki piedzimst brīvi un vienlīdzīgi savā pašcieņā un tiesībās. Viņi ir apveltīti ar "
+        "saprātu un sirdsapziņu, un viņiem jāizturas citam pret citu brālības garā. Rūpes par garīgo "
+        "veselību ir tikpat svarīgas kā rūpes par ķermeni. Centieties pietiekami gulēt, uzturiet saikni "
+        "ar tuviem cilvēkiem un runājiet ar kādu, kad jūtaties pārslogots."
+    ),
+    "lt": (
+        "Visi žmonės gimsta laisvi ir lygūs savo orumu ir teisėmis. Jiems suteiktas protas ir sąžinė, "
+        "ir jie turi elgtis vienas kito atžvilgiu kaip broliai. Rūpintis psichikos sveikata yra taip "
+        "pat svarbu, kaip rūpintis kūnu. Stenkitės pakankamai miegoti, palaikykite ryšį su artimais "
+        "žmonėmis ir pasikalbėkite su kuo nors, kai jaučiatės priblokšti."
+    ),
+    "tr": (
+        "Bütün insanlar hür, haysiyet ve haklar bakımından eşit doğarlar. Akıl ve vicdana sahiptirler "
+        "ve birbirlerine karşı kardeşlik zihniyeti ile hareket etmelidirler. Ruh sağlığınıza dikkat "
+        "etmek, bedeninize dikkat etmek kadar önemlidir. Yeterince uyumaya çalışın, sevdiğiniz "
+        "insanlarla iletişimde kalın ve kendinizi bunalmış hissettiğinizde biriyle konuşun."
+    ),
+    "az": (
+        "Bütün insanlar ləyaqət və hüquqlarına görə azad və bərabər doğulurlar. Onlara ağıl və vicdan "
+        "bəxş edilmişdir və bir-birlərinə münasibətdə qardaşlıq ruhunda davranmalıdırlar. Psixi "
+        "sağlamlığınızın qayğısına qalmaq bədəninizin qayğısına qalmaq qədər vacibdir. Kifayət qədər "
+        "yatmağa çalışın, sevdiyiniz insanlarla əlaqə saxlayın və özünüzü çətin hiss etdikdə kiminləsə "
+        "danışın."
+    ),
+    "uz": (
+        "Barcha odamlar erkin, qadr-qimmat va huquqlarda teng bo'lib tug'iladilar. Ular aql va vijdon "
+        "sohibidirlar va bir-birlari ila birodarlarcha muomala qilishlari zarur. Ruhiy salomatlikka "
+        "g'amxo'rlik qilish tanaga g'amxo'rlik qilish kabi muhimdir. Yetarlicha uxlashga harakat "
+        "qiling, yaqinlaringiz bilan aloqada bo'ling va o'zingizni yomon his qilganingizda kimdir "
+        "bilan gaplashing."
+    ),
+    "vi": (
+        "Tất cả mọi người sinh ra đều được tự do và bình đẳng về nhân phẩm và quyền. Mọi con người đều "
+        "được tạo hóa ban cho lý trí và lương tâm và cần phải đối xử với nhau trong tình bằng hữu. Chăm "
+        "sóc sức khỏe tinh thần cũng quan trọng như chăm sóc cơ thể. Hãy cố gắng ngủ đủ giấc, giữ liên "
+        "lạc với những người bạn yêu thương và nói chuyện với ai đó khi bạn cảm thấy quá tải."
+    ),
+    "id": (
+        "Semua orang dilahirkan merdeka dan mempunyai martabat dan hak-hak yang sama. Mereka "
+        "dikaruniai akal dan hati nurani dan hendaknya bergaul satu sama lain dalam semangat "
+        "persaudaraan. Menjaga kesehatan mental sama pentingnya dengan menjaga kesehatan tubuh. Cobalah "
+        "untuk tidur yang cukup, tetap berhubungan dengan orang-orang yang Anda sayangi, dan bicaralah "
+        "dengan seseorang ketika Anda merasa kewalahan."
+    ),
+    "ms": (
+        "Semua manusia dilahirkan bebas dan samarata dari segi kemuliaan dan hak-hak. Mereka mempunyai "
+        "pemikiran dan perasaan hati dan hendaklah bertindak di antara satu sama lain dengan semangat "
+        "persaudaraan. Menjaga kesihatan mental adalah sama penting dengan menjaga badan. Cuba tidur "
+        "secukupnya, kekal berhubung dengan orang yang anda sayangi dan bercakap dengan seseorang "
+        "apabila anda berasa tertekan."
+    ),
+    "tl": (
+        "Ang lahat ng tao'y isinilang na malaya at pantay-pantay sa karangalan at mga karapatan. Sila'y "
+        "pinagkalooban ng katwiran at budhi at dapat magpalagayan ang isa't isa sa diwa ng "
+        "pagkakapatiran. Ang pag-aalaga sa kalusugan ng isip ay kasinghalaga ng pag-aalaga sa katawan. "
+        "Subukang matulog nang sapat, manatiling konektado sa mga taong mahal mo at makipag-usap sa "
+        "isang tao kapag nakakaramdam ka ng labis na pagod."
+    ),
+    "sw": (
+        "Watu wote wamezaliwa huru, hadhi na haki zao ni sawa. Wote wamejaliwa akili na dhamiri, hivyo "
+        "yapasa watendeane kindugu. Kutunza afya ya akili ni muhimu sawa na kutunza mwili. Jaribu "
+        "kulala vya kutosha, endelea kuwasiliana na watu unaowapenda na zungumza na mtu unapojisikia "
+        "kuzidiwa."
+    ),
+    "af": (
+        "Alle menslike wesens word vry, met gelyke waardigheid en regte, gebore. Hulle het rede en "
+        "gewete en behoort in die gees van broederskap teenoor mekaar op te tree. Om na jou "
+        "geestesgesondheid om te sien is net so belangrik as om na jou liggaam om te sien. Probeer "
+        "genoeg slaap, bly in kontak met die mense vir wie jy lief is en praat met iemand wanneer jy "
+        "oorweldig voel."
+    ),
+    "ca": (
+        "Tots els éssers humans neixen lliures i iguals en dignitat i en drets. Són dotats de raó i de "
+        "consciència, i han de comportar-se fraternalment els uns amb els altres. Tenir cura de la "
+        "salut mental és tan important com tenir cura del cos. Intenta dormir prou, mantén el contacte "
+        "amb les persones que estimes i parla amb algú quan et sentis aclaparat."
+    ),
+    "gl": (
+        "Tódolos seres humanos nacen libres e iguais en dignidade e dereitos e, dotados como están de "
+        "razón e conciencia, débense comportar fraternalmente uns cos outros. Coidar a saúde mental é "
+        "tan importante como coidar o corpo. Intenta durmir o suficiente, mantén o contacto coas "
+        "persoas que queres e fala con alguén cando te sintas desbordado."
+    ),
+    "eu": (
+        "Gizon-emakume guztiak aske jaiotzen dira, duintasun eta eskubide berberak dituztela; eta "
+        "ezaguera eta kontzientzia dutenez gero, elkarren artean senide legez jokatu beharra dute. "
+        "Osasun mentala zaintzea gorputza zaintzea bezain garrantzitsua da. Saiatu behar adina lo "
+        "egiten, mantendu harremana maite dituzun pertsonekin eta hitz egin norbaitekin gainezka "
+        "sentitzen zarenean."
+    ),
+    "cy": (
+        "Genir pawb yn rhydd ac yn gydradd â'i gilydd mewn urddas a hawliau. Fe'u cynysgaeddir â "
+        "rheswm a chydwybod, a dylai pawb ymddwyn y naill at y llall mewn ysbryd cymodlon. Mae gofalu "
+        "am eich iechyd meddwl yr un mor bwysig â gofalu am eich corff. Ceisiwch gael digon o gwsg, "
+        "cadwch mewn cysylltiad â'r bobl rydych chi'n eu caru a siaradwch â rhywun pan fyddwch chi'n "
+        "teimlo'n llethol."
+    ),
+    "ga": (
+        "Saolaítear na daoine uile saor agus comhionann ina ndínit agus ina gcearta. Tá bua an réasúin "
+        "agus an choinsiasa acu agus dlíd iad féin d'iompar de mheon bráithreachais i leith a chéile. "
+        "Tá sé chomh tábhachtach aire a thabhairt do do shláinte mheabhrach agus atá sé aire a thabhairt "
+        "do do chorp. Déan iarracht go leor codlata a fháil, coinnigh i dteagmháil leis na daoine a "
+        "bhfuil grá agat dóibh agus labhair le duine éigin nuair a bhíonn tú faoi bhrú."
+    ),
+    "is": (
+        "Hver maður er borinn frjáls og jafn öðrum að virðingu og réttindum. Menn eru gæddir vitsmunum "
+        "og samvisku, og ber þeim að breyta bróðurlega hverjum við annan. Að hugsa um andlega heilsu er "
+        "jafn mikilvægt og að hugsa um líkamann. Reyndu að fá nægan svefn, haltu sambandi við fólkið "
+        "sem þér þykir vænt um og talaðu við einhvern þegar þér líður illa."
+    ),
+    "mt": (
+        "Il-bnedmin kollha jitwieldu ħielsa u ugwali fid-dinjità u d-drittijiet. Huma mogħnija "
+        "bir-raġuni u bil-kuxjenza u għandhom iġibu ruħhom ma' xulxin bi spirtu ta' aħwa. Li tieħu "
+        "ħsieb is-saħħa mentali tiegħek huwa importanti daqs li tieħu ħsieb ġismek."
+    ),
+    "sq": (
+        "Të gjithë njerëzit lindin të lirë dhe të barabartë në dinjitet dhe në të drejta. Ata kanë "
+        "arsye dhe ndërgjegje dhe duhet të sillen ndaj njëri-tjetrit me frymë vëllazërimi. Kujdesi për "
+        "shëndetin mendor është po aq i rëndësishëm sa kujdesi për trupin. Përpiquni të flini "
+        "mjaftueshëm, mbani kontakt me njerëzit që doni dhe flisni me dikë kur ndiheni të mbingarkuar."
+    ),
+    "eo": (
+        "Ĉiuj homoj estas denaske liberaj kaj egalaj laŭ digno kaj rajtoj. Ili posedas racion kaj "
+        "konsciencon, kaj devus konduti unu al alia en spirito de frateco. Zorgi pri via mensa sano "
+        "estas same grave kiel zorgi pri via korpo. Provu dormi sufiĉe, restu en kontakto kun la homoj, "
+        "kiujn vi amas, kaj parolu kun iu kiam vi sentas vin superŝutita."
+    ),
+    "ha": (
+        "Su dai 'yan-adam, ana haifuwarsu ne duka 'yantattu, kuma kowannensu na da mutunci da hakkoki "
+        "daidai da na kowa. Suna da hankali da tunani, saboda haka duk abin da za su aikata wa juna, ya "
+        "kamata su yi shi a cikin 'yan-uwanci. Kula da lafiyar kwakwalwa yana da muhimmanci kamar kula "
+        "da jiki."
+    ),
+    "yo": (
+        "Gbogbo ènìyàn ni a bí ní òmìnira; iyì àti ẹ̀tọ́ kọ̀ọ̀kan sì dọ́gba. Wọ́n ní ẹ̀bùn ti làákàyè "
+        "àti ti ẹ̀rí-ọkàn, ó sì yẹ kí wọn ó máa hùwà sí ara wọn gẹ́gẹ́ bí ọmọ ìyá. Ṣíṣe ìtọ́jú ìlera "
+        "ọpọlọ ṣe pàtàkì gẹ́gẹ́ bí ìtọ́jú ara."
+    ),
+    "zu": (
+        "Bonke abantu bazalwa bekhululekile belingana ngesithunzi nangamalungelo. Bahlanganiswe "
+        "wumcabango nangunembeza futhi kufanele baphathane ngomoya wobunye. Ukunakekela impilo yakho "
+        "yengqondo kubaluleke njengokunakekela umzimba wakho. Zama ukulala ngokwanele, uhlale "
+        "uxhumana nabantu obathandayo futhi ukhulume nomuntu uma uzizwa ukhungathekile."
+    ),
+    "so": (
+        "Aadanaha dhammaan waxay dhashaan iyagoo xor ah kuna siman xagga sharafta iyo xuquuqda. Waxaa "
+        "Alle siiyey aqoon iyo wacyi, waana in qof la arkaa qofka kale ula dhaqmaa si walaaltinimo ah. "
+        "Daryeelka caafimaadka maskaxda wuxuu u muhiimsan yahay sida daryeelka jirka."
+    ),
+    "bs": (
+        "Sva ljudska bića rađaju se slobodna i jednaka u dostojanstvu i pravima. Ona su obdarena "
+        "razumom i sviješću i trebaju jedno prema drugome postupati u duhu bratstva. Briga o mentalnom "
+        "zdravlju jednako je važna kao i briga o tijelu. Pokušajte dovoljno spavati, ostanite u kontaktu "
+        "sa ljudima koje volite i razgovarajte sa nekim kada osjećate da vam je svega previše."
+    ),
+    "me": (
+        "Sva ljudska bića rađaju se slobodna i jednaka u dostojanstvu i pravima. Ona su obdarena "
+        "razumom i sviješću i treba jedni prema drugima da postupaju u duhu bratstva. Briga o mentalnom "
+        "zdravlju je jednako važna kao briga o tijelu. Pokušajte da dovoljno spavate, ostanite u vezi sa "
+        "ljudima koje volite i razgovarajte sa nekim kad osjećate da vam je svega previše."
+    ),
+    "sh": (
+        "Sva ljudska bića rađaju se slobodna i jednaka u dostojanstvu i pravima. Ona su obdarena "
+        "razumom i svešću i treba jedni prema drugima da postupaju u duhu bratstva. Briga o mentalnom "
+        "zdravlju jednako je važna kao briga o telu."
+    ),
+    "mo": (
+        "Toate ființele umane se nasc libere și egale în demnitate și în drepturi. Ele sunt înzestrate "
+        "cu rațiune și conștiință și trebuie să se comporte unele față de altele în spiritul "
+        "fraternității. Grija pentru sănătatea mintală este la fel de importantă ca grija pentru corp."
+    ),
+    "nb": (
+        "Alle mennesker er født frie og med samme menneskeverd og menneskerettigheter. De er utstyrt med "
+        "fornuft og samvittighet og bør handle mot hverandre i brorskapets ånd. Å ta vare på den psykiske "
+        "helsen er like viktig som å ta vare på kroppen. Prøv å få nok søvn, hold kontakten med dem du "
+        "er glad i, og snakk med noen når alt blir for mye."
+    ),
+    "nn": (
+        "Alle menneske er fødde til fridom og med same menneskeverd og menneskerettar. Dei har fått "
+        "fornuft og samvit og skal leve med kvarandre som brør. Å ta vare på den psykiske helsa er like "
+        "viktig som å ta vare på kroppen. Prøv å få nok søvn, hald kontakten med dei du er glad i, og "
+        "snakk med nokon når alt vert for mykje."
+    ),
+    "fo": (
+        "Øll menniskju eru fødd fræls og jøvn til virðingar og mannarættindi. Tey hava skil og "
+        "samvitsku og eiga at fara hvørt um annað í bræðralagsanda. At ansa eftir sálarligu heilsuni er "
+        "líka týdningarmikið sum at ansa eftir kroppinum."
+    ),
+    "lb": (
+        "All Mënsch kënnt fräi a gläich u Wierd a Rechter op d'Welt. Jiddereen huet säi Verstand a säi "
+        "Gewëssen a soll dem Aneren am Geescht vun der Bridderlechkeet begéinen. Sech ëm seng mental "
+        "Gesondheet ze këmmeren ass genee esou wichteg wéi sech ëm säi Kierper ze këmmeren. Probéiert "
+        "genuch ze schlofen a schwätzt mat engem, wann Dir iech iwwerfuerdert fillt."
+    ),
+    "fy": (
+        "Alle minsken wurde frij en gelyk yn weardigens en rjochten berne. Hja hawwe ferstân en gewisse "
+        "meikrigen en hoege har foar inoar oer yn in geast fan bruorskip te hâlden en te dragen. Soarch "
+        "foar dyn geastlike sûnens is krekt sa wichtich as soarch foar dyn lichem."
+    ),
+    "li": (
+        "Alle mènse weure vrie en geliek in weerdigheid en rechte gebore. Ze höbbe verstandj en geweite "
+        "mitgekrege en mótte zich taenoaver eine in ene geis van broederlikheid gedrage."
+    ),
+    "oc": (
+        "Totes las personas naisson liuras e egalas en dignitat e en dreches. Son dotadas de rason e "
+        "de consciéncia e se devon comportar las unas amb las autras dins un esperit de fraternitat. "
+        "Prene suènh de sa santat mentala es tan important coma prene suènh de son còs."
+    ),
+    "an": (
+        "Totz os sers humanos naixen libres y iguals en dignidat y dreitos y, dotaus como son de razón "
+        "y conzenzia, han de comportar-se fraternalment os unos con os atros."
+    ),
+    "sc": (
+        "Totu sos èsseres umanos naschint lìberos e eguales in dinnidade e in deretos. Issos tenent sa "
+        "resone e sa cussèntzia e depent operare s'unu cun s'àteru cun ispìritu de fraternidade."
+    ),
+    "rm": (
+        "Tut ils umans naschan libers ed eguals en dignitad ed en dretgs. Els èn dotads cun raschun e "
+        "conscienza e duain agir in vers l'auter en in spiert da fraternitad."
+    ),
+    "wa": (
+        "Tos les djins vinèt å monde lîbes, et so l' minme pî po çou k' est d' leu dignité et d' leus "
+        "dreûts. Il ont l' rêzon et l' consyince et s' duvèt kidûre onk' avou l' ôte come des frés."
+    ),
+    "la": (
+        "Omnes homines liberi aequique dignitate atque iuribus nascuntur. Ratione conscientiaque "
+        "praediti sunt et alii erga alios cum fraternitate se gerere debent. Cura valetudinis animi non "
+        "minoris momenti est quam cura corporis."
+    ),
+    "ia": (
+        "Tote le esseres human nasce libere e equal in dignitate e in derectos. Illes es dotate de "
+        "ration e de conscientia e debe ager le unes verso le alteres in un spirito de fraternitate."
+    ),
+    "ie": (
+        "Omni homes nasce liber e egal in dignitá e in jures. Ili es dotat per rason e conscientie e "
+        "deve agir vers unaltru in un spiritu de fraternitá."
+    ),
+    "io": (
+        "Omna homi naskas libera ed egala en digneso e yuri. Li es dotita per raciono e koncienco e "
+        "devas agar vers l'una l'altra en spirito di frateso."
+    ),
+    "ht": (
+        "Tout moun fèt lib, egal ego pou diyite kou wè dwa. Nou gen konprann ak konsyans epi nou fèt "
+        "pou nou aji youn ak lòt ak lespri fratènite. Pran swen sante mantal ou enpòtan menm jan ak pran "
+        "swen kò ou. Eseye dòmi ase epi pale ak yon moun lè ou santi ou depase."
+    ),
+    "gd": (
+        "Tha gach uile duine air a bhreith saor agus co-ionnan ann an urram 's ann an còirichean. Tha "
+        "iad air am breith le reusan is le cogais agus mar sin bu chòir dhaibh a bhith beò nam measg "
+        "fhèin ann an spiorad bràthaireil."
+    ),
+    "gv": (
+        "Ta dagh ooilley pheiagh ruggit seyr as corrym ayns ard-cheim as kiartyn. Ta resoon as "
+        "cooinsheanse stowit orroo as by chair daue ymmyrkey dy cheilley ayns spyrryd braaragh."
+    ),
+    "br": (
+        "Dieub ha par en o dellezegezh hag o gwirioù eo ganet an holl dud. Poell ha skiant a zo dezho "
+        "ha dleout a reont bevañ an eil gant egile en ur spered a genvreudeuriezh."
+    ),
+    "kw": (
+        "Genys frank ha par yw oll tus an bys yn aga dynita hag yn aga gwiryow. Yma dhedha reson ha "
+        "kowses hag y tal dhedha omdhon an eyl orth y gila yn spyrys a vrederedh."
+    ),
+    "ku": (
+        "Hemû mirov azad û di weqar û mafan de wekhev tên dinyayê. Xwedî hiş û şuûr in û divê li hember "
+        "hev bi zihniyeteke bratiyê bilivin. Lênêrîna tenduristiya derûnî bi qasî lênêrîna laş girîng e."
+    ),
+    "tk": (
+        "Ähli adamlar özleriniň mertebesi we hukuklary boýunça azat we deň bolup dogulýarlar. Olara aň "
+        "we wyždan berlendir we olar biri-birine doganlyk ruhunda çemeleşmelidirler. Akyl saglygyňa "
+        "seretmek bedeniňe seretmek ýaly möhümdir."
+    ),
+    "se": (
+        "Buot olbmot leat riegádan friddjan ja olmmošárvvu ja olmmošvuoigatvuođaid dáfus. Sii leat "
+        "jierbmalaš olbmot geain lea oamedovdu ja sii gálggaše leat dego vieljačagat."
+    ),
+    "kl": (
+        "Inuit tamarmik inunngorput nammineersinnaassuseqarlutik assigiimmillu ataqqinassuseqarlutillu "
+        "pisinnaatitaaffeqarlutik. Solaqassusermik tarnillu nalunngissusianik pilersugaapput, "
+        "imminnullu iliorfigeqatigiittariaqaraluarput qatanngutigiittut peqatigiinneq eqqarsaatigalugu."
+    ),
+    "jv": (
+        "Saben manungsa lair kanthi mardika lan darbe martabat lan hak-hak kang padha. Kabeh pinaringan "
+        "akal lan kalbu sarta kaajab pasrawungan siji lan sijine kanthi jiwa paseduluran. Njaga "
+        "kesehatan batin iku padha pentinge karo njaga awak."
+    ),
+    "su": (
+        "Sakumna jalma gubrag ka alam dunya teh sifatna merdika jeung boga martabat katut hak-hak anu "
+        "sarua. Maranehna dibere akal jeung hate nurani, campur-gaul jeung sasamana aya dina sumanget "
+        "duduluran."
+    ),
+    "mg": (
+        "Teraka afaka sy mitovy zo sy fahamendrehana avokoa ny olombelona rehetra. Samy manan-tsaina sy "
+        "fieritreretana ka tokony hifampitondra am-pirahalahiana. Ny fikarakarana ny fahasalamana "
+        "ara-tsaina dia zava-dehibe toy ny fikarakarana ny vatana."
+    ),
+    "ny": (
+        "Anthu onse amabadwa aufulu ndiponso ofanana m'maufulu ndi ulemu wawo. Iwo ali ndi nzeru ndi "
+        "chikumbumtima ndipo ayenera kuchitirana zinthu mwaubale."
+    ),
+    "ig": (
+        "Amụrụ mmadụ nile n'ohere nakwa nha anya ugwu na ikike. E nyere ha uche na mmụọ ime ihe ziri "
+        "ezi, ya mere ha ga na-emeso ibe ha ihe n'ụzọ nwanne na nwanne."
+    ),
+    "st": (
+        "Batho bohle ba tswetswe ba lokolohile mme ba lekana ka botho le ditokelo. Ba na le monahano "
+        "le letswalo mme ba tlameha ho phedisana le ba bang ka moya wa boena."
+    ),
+    "nso": (
+        "Batho ka moka ba belegwe ba lokologile le gona ba lekana ka seriti le ditokelo. Ba filwe "
+        "monagano le letswalo mme ba swanetše go swarana ka moya wa bana ba mpa."
+    ),
+    "tn": (
+        "Batho botlhe ba tsetswe ba gololosegile e bile ba lekalekana ka seriti le ditshwanelo. Ba "
+        "abetswe go akanya le maikutlo, ka jalo ba tshwanetse go direlana ka mowa wa bokaulengwe."
+    ),
+    "ss": (
+        "Bonkhe bantfu batalwa bakhululekile futsi balingana ngesitfunti nangemalungelo. Baphiwe "
+        "ingcondvo nanembeza ngako kufanele baphatsane ngemoya webuzalwane."
+    ),
+    "xh": (
+        "Bonke abantu bazalwa bekhululekile belingana ngesidima nangokweemfanelo. Bonke abantu "
+        "banesiphiwo sesazela nesizathu sokwenza isenzo ngomoya wobuzalwana."
+    ),
+    "nr": (
+        "Boke abantu babelethwa bakhululekile begodu bayalingana ngesithunzi namalungelo. Baphiwe "
+        "ikghono lokucabanga nesazelo, ngalokho kufuze baphathane ngomoya wobuzalwana."
+    ),
+    "nd": (
+        "Abantu bonke bazalwa bekhululekile njalo belingana ngesithunzi lamalungelo. Bona balesipho "
+        "sokucabanga lesazela, ngakho bamele ukuphathana ngomoya wobuzalwane."
+    ),
+    "ve": (
+        "Vhathu vhoṱhe vho bebwa vho vhofholowa nahone vho lingana siani ḽa tshirunzi na pfanelo. Vho "
+        "ṋewa mihumbulo na luvalo nahone vha tea u farana sa vhathu vha muṱa muthihi."
+    ),
+    "ts": (
+        "Vanhu hinkwavo va velekiwa va tshunxekile naswona va ringana eka xindzhuti ni timfanelo. Va "
+        "havaxiwe ku anakanya ni ripfalo kutani va fanele ku khomana hi moya wa vumaxaka."
+    ),
+    "sn": (
+        "Vanhu vese vanoberekwa vakasununguka uye vakaenzana pahunhu nekodzero. Vakapiwa njere nehana "
+        "saka vanofanira kubatana sehama."
+    ),
+    "rw": (
+        "Abantu bose bavuka aho bakwiye, kandi bareshya mu gaciro no mu burenganzira. Bafite ubwenge "
+        "n'umutimanama kandi bagomba gukorerana kivandimwe."
+    ),
+    "rn": (
+        "Abantu bose bavuka bafise umwidegemvyo n'agateka bangana n'ubugenzi bumwe. Bafise ubwenge "
+        "n'umutima kandi bategerezwa kubana mu mutima wa kivukanyi."
+    ),
+    "lg": (
+        "Abantu bonna bazaalibwa nga ba ddembe era nga benkanankana mu kitiibwa ne mu ddembe. Bonna "
+        "baweebwa amagezi n'endowooza ey'obuntu, kyebava basaanidde okuyisiganya nga ab'oluganda."
+    ),
+    "ki": (
+        "Andũ othe maciaragwo marĩ akururi na marĩ ndũire ĩmwe ya ũtĩĩku na kĩhoto. Nĩ mahe ũgĩ na "
+        "mũtima wa kwĩiciria, na nĩ magĩrĩirwo nĩ gũtũũrania marĩ na roho wa ũrĩ wa mũrũ wa maitũ."
+    ),
+    "ln": (
+        "Bato nyonso na mbotama bazali nsomi mpe bakokani na limemya mpe na makoki. Bazali na mayele "
+        "mpe na motema, mpe basengeli kofanda na bondeko bango na bango."
+    ),
+    "kg": (
+        "Bantu yonso ke butukaka ti kimpwanza ya kukonda kutudila ntalu ya kuswaswana. Bantu yonso kele "
+        "ti mayindu ya kukwenda na ndongisila ya mbote, yo yina, bo fwete vandaka na bumosi bonso "
+        "bampangi."
+    ),
+    "sg": (
+        "Adû âzo kûê yamba, ngâ âla kûê ayeke ôko na lêgë tî nëngö-ngangü na tî ânzönî-kôdë. Âla kûê "
+        "ayeke na ndarä na bê-ngangü sï âla lîngbi tî dutï na âmbâ tî âla na bê tî ita."
+    ),
+    "kj": (
+        "Ovanhu aveshe ova dalwa ve li vamanguluka noku na ondilo nouyuki wa fa umwe. Ova pewa ounongo "
+        "nediladilo, naave na okukala pamwe momhepo youmwainafana."
+    ),
+    "ng": (
+        "Aantu ayehe oya valwa ye li ya manguluka noye na uuthemba nesimaneko lya faathana. Oya pewa "
+        "omadhiladhilo nomaiyuvo, onkee oye na okukalathana mombepo yuumwainathana."
+    ),
+    "om": (
+        "Namni kamiyyuu bilisa ta'ee dhalata; ulfinaa fi mirgi isaas walqixxee dha. Sammuu fi qalbii "
+        "qaba; namni hundinuu hafuura obbolummaatiin wal haa ilaalu."
+    ),
+    "ak": (
+        "Wɔwo adesamma nyinaa sɛ nnipa a wɔwɔ ahofadi. Wɔn nyinaa wɔ nidi ne kyɛfa koro. Wɔwɔ adwene ne "
+        "ahonim, na ɛsɛ sɛ wɔne wɔn ho wɔn ho di no wɔ anuonyam mu."
+    ),
+    "tw": (
+        "Wɔwo adesamma nyinaa sɛ nnipa a wɔwɔ ahofadi. Wɔn nyinaa wɔ nidi ne kyɛfa koro. Wɔwɔ adwene ne "
+        "ahonim, na ɛsɛ sɛ wɔne wɔn ho wɔn ho di no wɔ anuonyam mu."
+    ),
+    "ee": (
+        "Wodzi amegbetɔwo katã ablɔɖeviwoe eye wodzena bubu kple gomekpɔkpɔ sɔsɔe. Susu kple dzitsinya "
+        "le wo dometɔ ɖesiaɖe si eyata wodze be woanɔ anyi kple wo nɔewo le nɔviwɔwɔ me."
+    ),
+    "wo": (
+        "Doomi aadama yépp danuy juddu, yam ci tawfeex ci sag ak ci sañ-sañ. Nekk na it ku xam dëgg te "
+        "ànd ak xel, te war naa jëflante ak nawleen, te teg ko ci wàllu mbokk."
+    ),
+    "bm": (
+        "Hadamaden bɛɛ danmakɛɲɛnen bɛ bange, danbe ni josira la. Hakili ni taasi b'u bɛɛ la, u ka kan "
+        "ka badenya bonya u ni ɲɔgɔn cɛ."
+    ),
+    "ff": (
+        "Innama aadeeji fof poti, ndimɗidi e jibinannde to bannge hakkeeji. Eɓe ngoodi miijo e "
+        "hakkilantaagal; ete eɓe poti huufo ndirde e nder ɓii-ɗiɗɗiraagal."
+    ),
+    "qu": (
+        "Llapa runakunam libre nacekun kausaypi, llapallantaqmi kaqlla respetasqa, hayñinkunapas. "
+        "Yuyayniyoqmi, concienciayoqmi kanku, chaymi hawkalla kausananku wawqe-pura hina."
+    ),
+    "ay": (
+        "Taqpach jaqejh khuskat uñjatatäpjewa, munañapansa, kamachinakapansa, amuyumpi, chuymampi "
+        "churatawa, ukatwa jilata kullakjama sarnaqapxañapa."
+    ),
+    "gn": (
+        "Mayma yvypóra ou ko yvy ári iñapytyʼyre ha eteîcha tekoruvicharãme ha akatúape; ha ikatu rupi "
+        "oikuaa añetéva ha ikatu rupi avei ohecha mbaʼépa ndaha'éi añetéva, iporãva ha ombaʼapo "
+        "ojoehegui ha tekoguápe."
+    ),
+    "mi": (
+        "Ko te katoa o nga tangata i te whanaungatanga mai e watea ana i nga here katoa; e tauriterite "
+        "ana hoki nga mana me nga tika. E whakawhiwhia ana hoki ki a ratou te ngakau whai whakaaro me "
+        "te hinengaro mohio ki te tika me te he, a e tika ana kia meinga te mahi a tetahi ki tetahi me "
+        "ma roto atu i te wairua o te noho tahi."
+    ),
+    "sm": (
+        "O tagata soifua uma ua saoloto lo latou fananau mai, ma e tutusa o latou tulaga aloaia faapea "
+        "a latou aia tatau. Ua faaeeina atu i ai le mafaufau lelei ma le loto fuatiaifo ma e tatau ona "
+        "faatino le agaga faauso i le va o le tasi i le isi."
+    ),
+    "to": (
+        "Ko e kotoa ʻo e faʻahinga ʻo e tangata ʻoku fanauʻi mai ʻoku tauʻataʻina pea tatau ʻi he ngeia "
+        "mo e ngaahi totonu. Naʻe fakanaʻunaʻu kinautolu ʻaki ʻa e ʻatamai mo e konisenisi pea ʻoku "
+        "totonu ke nau fakafeangai ki he tokotaha kotoa ʻi he laumālie ʻo e fakatokoua."
+    ),
+    "haw": (
+        "Hānau kūʻokoʻa ʻia nā kānaka apau loa, a ua kaulike ka hanohano a me nā pono kīvila ma waena o "
+        "kākou. Ua hāʻawi ʻia mai ka noʻonoʻo pono a me ka lunamanaʻo iā kākou, no laila, e aloha kākou "
+        "kekahi i kekahi."
+    ),
+    "fj": (
+        "Era sucu ena galala na tamata kecega, era tautauvata ena nodra dokai kei na nodra dodonu. E "
+        "tiko na nodra vakasama kei na nodra lewaeloma, sa dodonu me ra veidokadokai ena yalo ni "
+        "veitacini."
+    ),
+    "ty": (
+        "E fanauhia te tā'āto'ara'a o te ta'ata-tupu ma te ti'amā e te ti'amanara'a 'aifaito. Ua 'ī te "
+        "mana'o pa'ari e i te manava e ma te 'a'au taea'e 'oia ta ratou ha'a i rotopū ia ratou iho."
+    ),
+    "mh": (
+        "Aolep armij rej lotak ilo anemkwōj im jonan utiej eo im maron̄ ko aer rej jonan wōt juon. "
+        "Em̧ōj lewaj n̄an kajjojo maron̄ in bukot ta eo ejim̧we im ta eo ejjab jim̧we, im eaorok bwe "
+        "kajjojo en lolorjake doon ilo jitōbōn jimpenpen."
+    ),
+    "za": (
+        "Boux boux ma daengz lajmbwn couh miz cwyouz, cinhyenz caeuq genzli bouxboux bingzdaengj. "
+        "Gyoengqde miz lijsing caeuq liengzsim, wngdang aeu cingsaenz beixnuengx doxdaih."
+    ),
+
+    # ---------------- السيريلية ----------------
+    "ru": (
+        "Все люди рождаются свободными и равными в своем достоинстве и правах. Они наделены разумом и "
+        "совестью и должны поступать в отношении друг друга в духе братства. Забота о психическом "
+        "здоровье так же важна, как забота о теле. Старайтесь высыпаться, поддерживайте связь с "
+        "близкими людьми и поговорите с кем-нибудь, когда чувствуете себя подавленным."
+    ),
+    "uk": (
+        "Всі люди народжуються вільними і рівними у своїй гідності та правах. Вони наділені розумом і "
+        "совістю і повинні діяти у відношенні один до одного в дусі братерства. Турбота про психічне "
+        "здоров'я так само важлива, як турбота про тіло. Намагайтеся висипатися, підтримуйте зв'язок з "
+        "близькими людьми і поговоріть з кимось, коли відчуваєте себе пригніченим."
+    ),
+    "be": (
+        "Усе людзі нараджаюцца свабоднымі і роўнымі ў сваёй годнасці і правах. Яны надзелены розумам і "
+        "сумленнем і павінны ставіцца адзін да аднаго ў духу брацтва. Клопат пра псіхічнае здароўе "
+        "такі ж важны, як клопат пра цела. Старайцеся высыпацца і падтрымлівайце сувязь з блізкімі."
+    ),
+    "bg": (
+        "Всички хора се раждат свободни и равни по достойнство и права. Те са надарени с разум и "
+        "съвест и следва да се отнасят помежду си в дух на братство. Грижата за психичното здраве е "
+        "толкова важна, колкото и грижата за тялото. Опитайте се да спите достатъчно, поддържайте "
+        "връзка с хората, които обичате, и говорете с някого, когато се чувствате претоварени."
+    ),
+    "mk": (
+        "Сите човечки суштества се раѓаат слободни и еднакви по достоинство и права. Тие се обдарени со "
+        "разум и совест и треба да се однесуваат еден кон друг во духот на братството. Грижата за "
+        "менталното здравје е исто толку важна како и грижата за телото. Обидете се да спиете доволно "
+        "и разговарајте со некого кога се чувствувате преоптоварени."
+    ),
+    "sr": (
+        "Сва људска бића рађају се слободна и једнака у достојанству и правима. Она су обдарена разумом "
+        "и свешћу и треба једни према другима да поступају у духу братства. Брига о менталном здрављу "
+        "једнако је важна као брига о телу. Покушајте да довољно спавате и разговарајте са неким када "
+        "се осећате преоптерећено."
+    ),
+    "kk": (
+        "Барлық адамдар тумысынан азат және қадір-қасиеті мен құқықтары тең болып дүниеге келеді. "
+        "Адамдарға ақыл-парасат, ар-ождан берілген, сондықтан олар бір-бірімен туыстық, бауырмалдық "
+        "қарым-қатынас жасаулары тиіс. Психикалық денсаулыққа қамқорлық жасау денеге қамқорлық жасау "
+        "сияқты маңызды."
+    ),
+    "ky": (
+        "Бардык адамдар өз беделинде жана укуктарында эркин жана тең болуп жаралат. Алардын аң-сезими "
+        "менен абийири бар жана бири-бирине бир туугандык мамиле кылууга тийиш. Психикалык ден "
+        "соолукка кам көрүү денеге кам көрүү сыяктуу эле маанилүү."
+    ),
+    "tg": (
+        "Тамоми одамон озод ба дунё меоянд ва аз лиҳози шаъну эътибор ва ҳуқуқ бо ҳам баробаранд. Онҳо "
+        "соҳиби ақлу виҷдонанд ва бояд бо ҳамдигар бародарвор муносибат кунанд. Нигоҳубини солимии "
+        "равонӣ ҳамчун нигоҳубини бадан муҳим аст."
+    ),
+    "mn": (
+        "Хүн бүр төрөхөөс эрх чөлөөтэй, адилхан нэр төртэй, ижил эрхтэй байдаг. Оюун ухаан, нандин "
+        "чанар заяасан хүн гэгч өөр хоорондоо ахан дүүгийн үзэл санаагаар харьцах учиртай. Сэтгэцийн "
+        "эрүүл мэндээ анхаарах нь биеэ анхаарахтай адил чухал."
+    ),
+    "tt": (
+        "Барлык кешеләр дә азат һәм үз абруйлары һәм хокуклары ягыннан тиң булып туалар. Аларга акыл "
+        "һәм вөҗдан бирелгән һәм бер-берсенә карата туганлык рухында мөнәсәбәттә булырга тиешләр."
+    ),
+    "ce": (
+        "Массо адам вина маьрша а, шен сий а, бакъонаш а цхьатерра йолуш. Царна делла хьекъал а, "
+        "кхетам а, вовшашца вежарийн юкъаметтиг хила еза."
+    ),
+    "cv": (
+        "Пур çынсем те ирĕклĕ, тан тивĕçлĕ тата праваллă пулса çуралаççĕ. Вĕсене ăс-тăн тата чун-чĕре "
+        "панă, вĕсен пĕр-пĕринпе тăванла хутшăнмалла."
+    ),
+    "os": (
+        "Адæймæгтæ се 'ппæт дæр райгуырынц сæрибарæй æмæ æмхуызонæй сæ барты æмæ сæ кадæн. Уыдонæн "
+        "лæвæрд ис зонд æмæ цæсгом, æмæ кæрæдзимæ хъуамæ уой æфсымæрон ахаст."
+    ),
+    "kv": (
+        "Став йӧз чужӧны мездлунаӧн да ӧткодьӧн асланыс пыдди пуктӧмӧн да правоясӧн. Налы сетӧма "
+        "мывкыд да бур вежӧр, и налы колӧ овны ӧта-мӧдыскӧд вокъяслӧн сьӧлӧмӧн."
+    ),
+    "av": (
+        "Киналго инсанал гьаризе гьечІо ва цого бараб рукІуна жидерго ритІухълъиялъулъ ва "
+        "ихтиярзабазулъ. Гьезие кьун буго пикру ва иман, гьел цоцазда вацлъиялъул руххалда рукІине ккола."
+    ),
+    "kum": (
+        "Бары адамлар да азат болуп ва оьз ҳакъ-ҳукукъларында ва ягьларында тенг болуп тувалар. Олагъа "
+        "акъыл ва вижданлыкъ берилген ва бир-бирине къардашлыкъ руҳда янашмагъа тюшюп тура."
+    ),
+
+    # ---------------- العربية ----------------
+    "ar": (
+        "يولد جميع الناس أحراراً متساوين في الكرامة والحقوق. وقد وهبوا عقلاً وضميراً وعليهم أن يعامل "
+        "بعضهم بعضاً بروح الإخاء. إن الاهتمام بصحتك النفسية لا يقل أهمية عن الاهتمام بجسدك. حاول أن "
+        "تنام بشكل كافٍ، وابقَ على تواصل مع الأشخاص الذين تحبهم، وتحدث إلى شخص ما عندما تشعر بالإرهاق."
+    ),
+    "fa": (
+        "تمام افراد بشر آزاد به دنیا می‌آیند و از لحاظ حیثیت و حقوق با هم برابرند. همه دارای عقل و "
+        "وجدان هستند و باید نسبت به یکدیگر با روح برادری رفتار کنند. مراقبت از سلامت روان به اندازه "
+        "مراقبت از بدن مهم است. سعی کنید به اندازه کافی بخوابید، با افرادی که دوستشان دارید در ارتباط "
+        "باشید و وقتی احساس فشار می‌کنید با کسی صحبت کنید."
+    ),
+    "ur": (
+        "تمام انسان آزاد اور حقوق و عزت کے اعتبار سے برابر پیدا ہوئے ہیں۔ انہیں ضمیر اور عقل ودیعت "
+        "ہوئی ہے۔ اس لیے انہیں ایک دوسرے کے ساتھ بھائی چارے کا سلوک کرنا چاہیے۔ ذہنی صحت کا خیال رکھنا "
+        "اتنا ہی اہم ہے جتنا جسم کا خیال رکھنا۔ کافی نیند لینے کی کوشش کریں اور جب آپ پریشان ہوں تو "
+        "کسی سے بات کریں۔"
+    ),
+    "ps": (
+        "ټول انسانان آزاد زیږیدلي او د حیثیت او حقونو له مخې سره برابر دي. دوی د عقل او وجدان خاوندان "
+        "دي او باید یو له بل سره د ورورولۍ په روحیه چلند وکړي. د رواني روغتیا ساتنه د بدن د ساتنې په "
+        "څېر مهمه ده."
+    ),
+    "ug": (
+        "ھەممە ئادەم زانىدىنلا ئەركىن، ئىززەت-ھۆرمەت ۋە ھوقۇقتا باپباراۋەر بولۇپ تۇغۇلغان. ئۇلار "
+        "ئەقىلگە ۋە ۋىجدانغا ئىگە ھەمدە بىر-بىرىگە قېرىنداشلىق مۇناسىۋىتىگە خاس روھ بىلەن موئامىلە "
+        "قىلىشى كېرەك."
+    ),
+    "sd": (
+        "سڀ انسان آزاد ۽ عزت ۽ حقن ۾ برابر پيدا ٿيا آهن. انهن کي سمجهه ۽ ضمير عطا ٿيل آهي، تنهنڪري کين "
+        "هڪٻئي سان ڀائپيءَ وارو سلوڪ ڪرڻ گهرجي."
+    ),
+    "ks": (
+        "سٲری اِنسان چھِ آزاد زامٕتۍ۔ وِقار تہٕ حۆقوٗق چھِ سارِنٕے ہِوی۔ تِمن چھُ سوچ سَمجُن تہٕ ضَمیٖر "
+        "عطا کَرنہٕ آمُت۔ تِمن پَزِ بێیِس سٟتۍ برادرانہٕ سلوٗک کَرُن۔"
+    ),
+
+    # ---------------- الديفاناغارية ----------------
+    "hi": (
+        "सभी मनुष्यों को गौरव और अधिकारों के मामले में जन्मजात स्वतन्त्रता और समानता प्राप्त है। उन्हें "
+        "बुद्धि और अन्तरात्मा की देन प्राप्त है और परस्पर उन्हें भाईचारे के भाव से बर्ताव करना चाहिये। "
+        "मानसिक स्वास्थ्य का ध्यान रखना उतना ही ज़रूरी है जितना शरीर का ध्यान रखना। पर्याप्त नींद लेने "
+        "की कोशिश करें और जब आप परेशान महसूस करें तो किसी से बात करें।"
+    ),
+    "mr": (
+        "सर्व मानवी व्यक्ति जन्मतःच स्वतंत्र आहेत व त्यांना समान प्रतिष्ठा व समान अधिकार आहेत. त्यांना "
+        "विचारशक्ती व सदसद्विवेकबुद्धी लाभलेली आहे व त्यांनी एकमेकांशी बंधुत्वाच्या भावनेने आचरण करावे. "
+        "मानसिक आरोग्याची काळजी घेणे हे शरीराची काळजी घेण्याइतकेच महत्त्वाचे आहे. पुरेशी झोप घेण्याचा "
+        "प्रयत्न करा आणि तुम्हाला ताण जाणवत असेल तेव्हा कोणाशी तरी बोला."
+    ),
+    "ne": (
+        "सबै व्यक्तिहरू जन्मजात स्वतन्त्र हुन् ती सबैको समान अधिकार र महत्व छ। निजहरूमा विचार शक्ति र "
+        "सद्विचार भएकोले निजहरूले आपसमा भातृत्वको भावनाबाट व्यवहार गर्नु पर्छ। मानसिक स्वास्थ्यको ख्याल "
+        "राख्नु शरीरको ख्याल राख्नु जत्तिकै महत्त्वपूर्ण छ। पर्याप्त निद्रा लिने प्रयास गर्नुहोस् र तनाव "
+        "महसुस हुँदा कसैसँग कुरा गर्नुहोस्।"
+    ),
+    "sa": (
+        "सर्वे मानवाः स्वतन्त्राः समुत्पन्नाः वर्तन्ते अपि च, गौरवदृशा अधिकारदृशा च समानाः एव वर्तन्ते। एते "
+        "सर्वे चेतना-तर्क-शक्तिभ्यां सुसम्पन्नाः सन्ति। अपि च, सर्वेऽपि बन्धुत्व-भावनया परस्परं व्यवहरन्तु।"
+    ),
+}
@@ -0,0 +1,410 @@
+# جدولة طلبات النموذج اللغوي مع مراعاة حدود المعدل والأولويات
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# رموز حالة HTTP التي تستحق إعادة المحاولة
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+# أسماء أخطاء الاتصال في مكتبات المزودين التي تستحق إعادة المحاولة
+RETRYABLE_ERROR_NAMES = ("APIConnectionError", "APITimeoutError", "Timeout", "ConnectionError")
+
+
+class Priority(IntEnum):
+    """فئات أولوية طلبات النموذج اللغوي (الأصغر أولاً)"""
+    INTERACTIVE = 0  # WebSocket والترجمة في الوقت الفعلي
+    API = 1  # طلبات REST العادية
+    BACKGROUND = 2  # الترجمة المسبقة في الخلفية
+
+
+class TokenBucket:
+    """دلو رموز (Token Bucket) يُعاد ملؤه بشكل مستمر"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        تهيئة الدلو
+
+        Args:
+            capacity: السعة القصوى للدلو
+            refill_per_second: معدل إعادة الملء في الثانية
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        """إعادة ملء الدلو حسب الوقت المنقضي"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        الوقت اللازم بالثواني حتى يتوفر المقدار المطلوب
+
+        Args:
+            amount: المقدار المطلوب (يُقصّ إلى سعة الدلو)
+            now: الوقت الحالي (monotonic)
+
+        Returns:
+            0 إذا كان المقدار متوفراً الآن
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        """استهلاك مقدار من الدلو (قد يصبح الرصيد سالباً عند التصحيح)"""
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """تصحيح الرصيد بعد معرفة الاستهلاك الفعلي"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Ticket:
+    """طلب في انتظار دوره"""
+
+    __slots__ = ("priority", "sequence", "tokens", "enqueued_at")
+
+    def __init__(self, priority: int, sequence: int, tokens: int):
+        self.priority = priority
+        self.sequence = sequence
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class LLMScheduler:
+    """
+    مجدول مركزي لطلبات النموذج اللغوي
+
+    يُمرّر الطلبات حسب الأولوية عبر دلوين للرموز (الطلبات في الدقيقة والرموز
+    في الدقيقة) مع حد للطلبات المتزامنة، ويعيد محاولة الأخطاء المؤقتة بتأخير
+    أسي عشوائي يحترم ترويسة Retry-After. عند تلقي 429 يتوقف إرسال جميع
+    الطلبات حتى انتهاء مدة الانتظار بدلاً من فشل كل المستخدمين معاً.
+    """
+
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None,
+                 max_concurrency: int = None, max_retries: int = None,
+                 backoff_base: float = None, backoff_max: float = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        تهيئة المجدول
+
+        Args:
+            requests_per_minute: الحد الأقصى للطلبات في الدقيقة
+            tokens_per_minute: الحد الأقصى للرموز في الدقيقة
+            max_concurrency: الحد الأقصى للطلبات المتزامنة
+            max_retries: الحد الأقصى لإعادة المحاولة لكل طلب
+            backoff_base: التأخير الأساسي لإعادة المحاولة بالثواني
+            backoff_max: الحد الأقصى للتأخير بالثواني
+            sleep: دالة الانتظار (قابلة للاستبدال في الاختبارات)
+        """
+        requests_per_minute = requests_per_minute or settings.llm_requests_per_minute
+        tokens_per_minute = tokens_per_minute or settings.llm_tokens_per_minute
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.backoff_base = settings.llm_backoff_base_seconds if backoff_base is None else backoff_base
+        self.backoff_max = settings.llm_backoff_max_seconds if backoff_max is None else backoff_max
+        self._sleep = sleep
+
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._blocked_until = 0.0
+
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "max_queue_depth": 0,
+            "wait_time": {
+                priority.name.lower(): {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+                for priority in Priority
+            },
+        }
+
+    def run(self, call: Callable[[], Any], priority: int = Priority.API,
+            estimated_tokens: int = 1) -> Any:
+        """
+        تنفيذ طلب عبر المجدول (يحجب الخيط الحالي حتى يحين دوره)
+
+        Args:
+            call: دالة بدون معاملات تنفذ الطلب
+            priority: أولوية الطلب
+            estimated_tokens: الرموز المقدّرة للطلب (المدخلات + الحد الأقصى للرد)
+
+        Returns:
+            نتيجة الدالة
+
+        Raises:
+            الخطأ الأخير إذا فشلت جميع المحاولات أو كان الخطأ غير مؤقت
+        """
+        return self._run(call, priority, estimated_tokens, hold=False)
+
+    def stream(self, call: Callable[[], Iterable[str]], priority: int = Priority.API,
+               estimated_tokens: int = 1,
+               usage: Callable[[str], Optional[int]] = None) -> "ScheduledStream":
+        """
+        فتح بث عبر المجدول مع الاحتفاظ بمكانه حتى انتهاء البث
+
+        يُعاد فتح البث عند الأخطاء المؤقتة كما في run، لكن مكان الطلب المتزامن
+        لا يُحرر إلا عند استنفاد البث أو فشله أو إغلاقه، وعندها يُصحح دلو
+        الرموز بالاستهلاك الفعلي.
+
+        Args:
+            call: دالة بدون معاملات تفتح البث
+            priority: أولوية الطلب
+            estimated_tokens: الرموز المقدّرة للطلب (المدخلات + الحد الأقصى للرد)
+            usage: دالة تحسب الرموز المستهلكة فعلياً من النص المستلم
+
+        Returns:
+            بث لأجزاء الرد يحرر مكانه في المجدول عند انتهائه
+        """
+        chunks = self._run(call, priority, estimated_tokens, hold=True)
+        return ScheduledStream(self, chunks, estimated_tokens, usage)
+
+    def _run(self, call: Callable[[], Any], priority: int, estimated_tokens: int, hold: bool) -> Any:
+        """تنفيذ الطلب مع إعادة المحاولة؛ مع hold يبقى مكان الطلب محجوزاً بعد النجاح"""
+        sequence = next(self._sequence)
+        attempt = 0
+        while True:
+            self._acquire(priority, sequence, estimated_tokens)
+            try:
+                result = call()
+            except Exception as e:
+                self._release()
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    with self._condition:
+                        self._stats["failed"] += 1
+                    raise
+
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                with self._condition:
+                    self._stats["retries"] += 1
+                    if self.status_code(e) == 429:
+                        # إيقاف جميع الطلبات حتى انتهاء مدة الانتظار
+                        self._stats["rate_limited"] += 1
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                        self._condition.notify_all()
+                logger.warning(f"LLM request failed ({e}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                self._sleep(delay)
+                continue
+
+            if not hold:
+                self._release()
+            with self._condition:
+                self._stats["completed"] += 1
+            return result
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        تصحيح دلو الرموز بالاستهلاك الفعلي بعد انتهاء الطلب
+
+        Args:
+            estimated_tokens: الرموز المحجوزة مسبقاً
+            actual_tokens: الرموز المستهلكة فعلياً (من usage)
+        """
+        if actual_tokens is None:
+            return
+        with self._condition:
+            self.token_bucket.refund(estimated_tokens - actual_tokens)
+            self._condition.notify_all()
+
+    def _acquire(self, priority: int, sequence: int, tokens: int):
+        """انتظار الدور حسب الأولوية ثم حجز الحصة من الدلوين"""
+        ticket = _Ticket(priority, sequence, tokens)
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+
+            while True:
+                timeout = None
+                if self._queue[0] is ticket and self._active < self.max_concurrency:
+                    now = time.monotonic()
+                    timeout = max(
+                        self._blocked_until - now,
+                        self.request_bucket.wait_time(1, now),
+                        self.token_bucket.wait_time(tokens, now),
+                    )
+                    if timeout <= 0:
+                        break
+                self._condition.wait(timeout)
+
+            heapq.heappop(self._queue)
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(tokens)
+            self._active += 1
+
+            waited = time.monotonic() - ticket.enqueued_at
+            wait_stats = self._stats["wait_time"][Priority(priority).name.lower()]
+            wait_stats["count"] += 1
+            wait_stats["total_seconds"] += waited
+            wait_stats["max_seconds"] = max(wait_stats["max_seconds"], waited)
+
+            # السماح للطلب التالي في الطابور بفحص دوره
+            self._condition.notify_all()
+
+    def _release(self):
+        """تحرير مكان الطلب المتزامن"""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """حساب تأخير إعادة المحاولة (Retry-After أو أسي مع تشويش كامل)"""
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def status_code(error: Exception) -> Optional[int]:
+        """استخراج رمز حالة HTTP من خطأ المزود إن وجد"""
+        code = getattr(error, "status_code", None)
+        if code is None:
+            response = getattr(error, "response", None)
+            code = getattr(response, "status_code", None)
+        return code if isinstance(code, int) else None
+
+    @classmethod
+    def is_retryable(cls, error: Exception) -> bool:
+        """هل الخطأ مؤقت ويستحق إعادة المحاولة"""
+        if cls.status_code(error) in RETRYABLE_STATUS_CODES:
+            return True
+        return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """قراءة مدة الانتظار من ترويسة Retry-After إن وجدت"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        الحصول على إحصائيات المجدول
+
+        Returns:
+            عمق الطابور الحالي لكل أولوية وأزمنة الانتظار وعدد إعادة المحاولة
+        """
+        with self._condition:
+            queue_depth = {priority.name.lower(): 0 for priority in Priority}
+            for ticket in self._queue:
+                queue_depth[Priority(ticket.priority).name.lower()] += 1
+
+            wait_time = {}
+            for name, values in self._stats["wait_time"].items():
+                wait_time[name] = {
+                    "count": values["count"],
+                    "avg_seconds": round(values["total_seconds"] / values["count"], 4) if values["count"] else 0.0,
+                    "max_seconds": round(values["max_seconds"], 4),
+                }
+
+            return {
+                "active": self._active,
+                "queue_depth": queue_depth,
+                "max_queue_depth": self._stats["max_queue_depth"],
+                "wait_time": wait_time,
+                "completed": self._stats["completed"],
+                "failed": self._stats["failed"],
+                "retries": self._stats["retries"],
+                "rate_limited": self._stats["rate_limited"],
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            }
+
+
+class ScheduledStream:
+    """
+    بث رد يحتفظ بمكان طلبه في المجدول
+
+    يُحرر المكان ويُسجل الاستهلاك الفعلي مرة واحدة عند استنفاد البث أو فشله
+    أو استدعاء close (أو عند حذف الكائن إذا لم يُغلق).
+    """
+
+    def __init__(self, scheduler: LLMScheduler, chunks: Iterable[str], estimated_tokens: int,
+                 usage: Callable[[str], Optional[int]] = None):
+        self.provider = getattr(chunks, "provider", None)
+        self.model = getattr(chunks, "model", None)
+        self._scheduler = scheduler
+        self._chunks = iter(chunks)
+        self._estimated_tokens = estimated_tokens
+        self._usage = usage
+        self._received = []
+        self._lock = threading.Lock()
+        self._finished = False
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        if self._finished:
+            raise StopIteration
+        try:
+            chunk = next(self._chunks)
+        except BaseException:
+            self._finish()
+            raise
+        self._received.append(chunk)
+        return chunk
+
+    def close(self):
+        """إيقاف البث قبل اكتماله وتحرير مكانه"""
+        close = getattr(self._chunks, "close", None)
+        try:
+            if close is not None and not self._finished:
+                close()
+        finally:
+            self._finish()
+
+    def _finish(self):
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        self._scheduler._release()
+        if self._usage is not None:
+            self._scheduler.record_usage(self._estimated_tokens, self._usage("".join(self._received)))
+
+    def __del__(self):
+        self._finish()
+
+
+# إنشاء مثيل من مجدول طلبات النموذج اللغوي
+llm_scheduler = LLMScheduler()
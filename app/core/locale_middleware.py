@@ -1,16 +1,39 @@
 
 # middleware للتعامل مع اللغة
 
-from typing import Callable
+from typing import Any, Callable, Dict
 from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.i18n import translator, i18n_settings
 from app.core.locale_session import locale_session_manager
 from app.core.consent import consent_manager
 from app.core.security import verify_token, get_current_user
 from app.models.user import User as UserModel
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_request_session
+
+
+async def get_request_consent_status(request: Request, user_id: int, refresh: bool = False) -> Dict[str, Any]:
+    """
+    حالة موافقة اللغة للمستخدم مرة واحدة لكل طلب
+
+    تُقرأ بجلسة الطلب المشتركة مع نقطة النهاية في مجمع الخيوط حتى لا يُحجب
+    الاستعلام حلقة الأحداث، وتُحفظ في حالة الطلب لبقية وسطاء اللغة.
+
+    Args:
+        request: كائن الطلب
+        user_id: معرف المستخدم
+        refresh: تجاهل القيمة المحفوظة وقراءتها من قاعدة البيانات
+
+    Returns:
+        حالة الموافقة
+    """
+    consent_status = getattr(request.state, "consent_status", None)
+    if consent_status is None or refresh:
+        db = get_request_session(request)
+        consent_status = await run_in_threadpool(consent_manager.get_consent_status, db, user_id)
+        request.state.consent_status = consent_status
+    return consent_status
 
 
 class LocaleMiddleware(BaseHTTPMiddleware):
@@ -48,9 +71,8 @@ class LocaleMiddleware(BaseHTTPMiddleware):
 
         # إذا كان المستخدم مسجلاً وحصل على موافقة للغة، قم بتحديث الجلسة
         if user_id:
-            db: Session = next(get_db())
-            consent_status = consent_manager.get_consent_status(db, user_id)
-            db.close()
+            # قد تغيّر نقطة النهاية الموافقة، لذا تُقرأ من جديد بعد الاستجابة
+            consent_status = await get_request_consent_status(request, user_id, refresh=True)
             if consent_status["consent_given"] and consent_status["preferred_locale"]:
                 # تحديث الجلسة اللغوية
                 session_id = request.cookies.get("locale_session")
@@ -96,9 +118,7 @@ class LocaleConsentMiddleware(BaseHTTPMiddleware):
 
         # إذا كان المستخدم مسجلاً والتطبيق يتطلب موافقة اللغة
         if user_id:
-            db: Session = next(get_db())
-            consent_status = consent_manager.get_consent_status(db, user_id)
-            db.close()
+            consent_status = await get_request_consent_status(request, user_id)
 
             # إذا لم يوافق المستخدم بعد، أعد توجيهه إلى صفحة الموافقة
             if not consent_status["consent_given"]:
@@ -147,9 +167,7 @@ class LocaleRedirectMiddleware(BaseHTTPMiddleware):
 
         # إذا كان المستخدم مسجلاً
         if user_id:
-            db: Session = next(get_db())
-            consent_status = consent_manager.get_consent_status(db, user_id)
-            db.close()
+            consent_status = await get_request_consent_status(request, user_id)
 
             # إذا كان المستخدم قد وافق على لغة معينة
             if consent_status["consent_given"] and consent_status["preferred_locale"]:
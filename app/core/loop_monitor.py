@@ -0,0 +1,100 @@
+# مراقبة تأخر حلقة الأحداث وذاكرة العملية (لقياس سعة اتصالات WebSocket لكل عملية)
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional
+from app.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+loop_lag = metrics_registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event-loop wake-up and when it actually ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+# نافذة أقصى تأخر المعروض في المؤشرات بالثواني
+LAG_WINDOW_SECONDS = 60
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """
+    الذاكرة المقيمة الحالية للعملية
+
+    Returns:
+        عدد البايتات، أو None إذا لم تتوفر /proc (غير لينكس)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class EventLoopLagMonitor:
+    """
+    قياس تأخر حلقة الأحداث
+
+    تنام مهمة خلفية فترة ثابتة وتقيس كم تأخر استيقاظها عن موعده؛ التأخر
+    يعني أن شيئاً يحجب الحلقة (عمل متزامن أو عدد كبير من المهام الجاهزة)،
+    وهو ما يؤخر كل اتصالات WebSocket في العملية.
+    """
+
+    def __init__(self, interval: float = None):
+        """
+        تهيئة المراقب
+
+        Args:
+            interval: الفاصل بين القياسات بالثواني (0 لتعطيل المراقبة)
+        """
+        self.interval = settings.event_loop_lag_interval_seconds if interval is None else interval
+        self._recent = deque(maxlen=max(1, int(LAG_WINDOW_SECONDS / self.interval)) if self.interval else 1)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """بدء القياس على حلقة الأحداث الحالية"""
+        if not self.interval or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """إيقاف القياس"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def max_lag(self) -> float:
+        """أقصى تأخر خلال النافذة الأخيرة بالثواني"""
+        return max(self._recent, default=0.0)
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - expected)
+            loop_lag.observe(lag)
+            self._recent.append(lag)
+            if lag >= 1:
+                logger.warning(f"Event loop blocked for {lag:.2f}s")
+
+
+# إنشاء مثيل من مراقب حلقة الأحداث
+loop_lag_monitor = EventLoopLagMonitor()
+
+
+def _collect_process_metrics():
+    """أقصى تأخر حديث للحلقة والذاكرة المقيمة للعملية"""
+    return [
+        ("event_loop_lag_max_seconds", "gauge", "Largest event-loop lag over the last minute.",
+         [({}, loop_lag_monitor.max_lag)]),
+        ("process_resident_memory_bytes", "gauge", "Resident memory of this worker process.",
+         [({}, resident_memory_bytes())]),
+    ]
+
+
+metrics_registry.register_collector(_collect_process_metrics)
@@ -0,0 +1,206 @@
+# مؤشرات التطبيق داخل العملية بتنسيق Prometheus النصي
+
+import bisect
+import logging
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# حدود فئات زمن الاستجابة الافتراضية بالثواني
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# قيمة التسمية التي تُجمع تحتها السلاسل بعد تجاوز الحد الأقصى
+OVERFLOW_LABEL = "other"
+
+# نتيجة جامع المؤشرات: (الاسم، النوع، الوصف، [(التسميات، القيمة)])
+CollectedMetric = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    """تهريب قيمة التسمية حسب تنسيق Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """تنسيق التسميات {name="value",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """تنسيق القيمة العددية"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """أساس المؤشرات ذات التسميات مع حد أقصى لعدد السلاسل"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 max_series: int = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series or settings.metrics_max_series
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """مفتاح السلسلة، مع جمع السلاسل الزائدة عن الحد تحت "other" """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        if key not in self._series and len(self._series) >= self.max_series:
+            return (OVERFLOW_LABEL,) * len(self.labelnames)
+        return key
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """عدّاد تراكمي"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        """زيادة العدّاد"""
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """القيمة الحالية لسلسلة"""
+        with self._lock:
+            return self._series.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0.0)
+
+    def samples(self):
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            yield self.name, self._labels(key), value
+
+
+class Histogram(_Metric):
+    """مدرج تكراري بفئات ثابتة"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, max_series: int = None):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str):
+        """تسجيل قيمة"""
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items()]
+        for key, (counts, total, count) in series:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """سجل المؤشرات وجامعي القيم اللحظية (Gauges)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """إنشاء عدّاد (أو إرجاع العدّاد المسجل بنفس الاسم)"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """إنشاء مدرج تكراري (أو إرجاع المدرج المسجل بنفس الاسم)"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]):
+        """
+        تسجيل دالة تُرجع قيماً لحظية عند كل قراءة للمؤشرات
+
+        Args:
+            collector: دالة تُرجع قائمة (الاسم، النوع، الوصف، [(التسميات، القيمة)])
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        تنسيق جميع المؤشرات بتنسيق Prometheus النصي (الإصدار 0.0.4)
+
+        Returns:
+            نص المؤشرات
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector error: {e}")
+                continue
+            for name, metric_type, documentation, samples in collected:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def bounded_label(value: Optional[str], allowed: Iterable[str]) -> str:
+    """قيمة تسمية من مجموعة معروفة، أو "other" لغيرها (للحد من عدد السلاسل)"""
+    if value is None:
+        return "none"
+    return value if value in allowed else OVERFLOW_LABEL
+
+
+# إنشاء مثيل من سجل المؤشرات
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,449 @@
+# سجل حضور اتصالات WebSocket على مستوى جميع العمليات وتوجيه الرسائل بينها
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import socket
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# دالة تسليم رسالة إلى اتصال محلي (مثل TrackedConnection.deliver)؛ الرسائل قابلة للتحويل إلى JSON
+# ويرمّزها كل اتصال بصيغته المتفق عليها
+Deliver = Callable[[Any], Any]
+
+
+def default_worker_id() -> str:
+    """معرّف العملية الحالية في العنقود"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class PresenceBackend:
+    """
+    واجهة تخزين الحضور وقنوات الرسائل بين العمليات
+
+    كل عملية لها قناة باسم معرّفها، وتُعد العملية حية ما دامت تجدد نبضها.
+    """
+
+    async def add(self, record: Dict[str, Any]):
+        """تسجيل اتصال (record يحتوي user_id و worker_id و connection_id)"""
+        raise NotImplementedError
+
+    async def remove(self, user_id: int, worker_id: str, connection_id: str):
+        """حذف اتصال"""
+        raise NotImplementedError
+
+    async def connections(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """اتصالات مستخدم أو جميع الاتصالات (بما فيها اتصالات العمليات المتوقفة)"""
+        raise NotImplementedError
+
+    async def heartbeat(self, worker_id: str, ttl: float):
+        """تجديد نبض العملية"""
+        raise NotImplementedError
+
+    async def live_workers(self) -> List[str]:
+        """العمليات التي لم تنتهِ صلاحية نبضها"""
+        raise NotImplementedError
+
+    async def clear_worker(self, worker_id: str):
+        """حذف نبض العملية واتصالاتها عند إيقافها"""
+        raise NotImplementedError
+
+    async def publish(self, worker_id: str, message: Dict[str, Any]):
+        """إرسال رسالة إلى قناة عملية"""
+        raise NotImplementedError
+
+    def listen(self, worker_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """استقبال رسائل قناة العملية"""
+        raise NotImplementedError
+
+    async def close(self):
+        """تحرير الموارد"""
+
+
+class PresenceHub:
+    """
+    الحالة المشتركة للخلفية المحلية
+
+    بدون مدير تكون الحالة داخل العملية فقط؛ مع multiprocessing.Manager() تُشارك
+    بين عمليات محلية متعددة (بديل Redis للتطوير والاختبار).
+    """
+
+    def __init__(self, manager=None):
+        """
+        تهيئة الحالة المشتركة
+
+        Args:
+            manager: مدير multiprocessing (None للحالة داخل العملية)
+        """
+        self._manager = manager
+        self._manager_address = manager.address if manager is not None else None
+        if manager is None:
+            self.connections: Dict[str, Dict[str, Any]] = {}
+            self.heartbeats: Dict[str, float] = {}
+            self.channels: Dict[str, Any] = {}
+        else:
+            self.connections = manager.dict()
+            self.heartbeats = manager.dict()
+            self.channels = manager.dict()
+
+    def channel(self, worker_id: str):
+        """طابور رسائل العملية (يُنشأ عند أول استخدام)"""
+        channel = self.channels.get(worker_id)
+        if channel is None:
+            manager = self._connect_manager()
+            channel = self.channels.setdefault(
+                worker_id, manager.Queue() if manager is not None else queue.Queue())
+        return channel
+
+    def _connect_manager(self):
+        """مدير multiprocessing في العملية الحالية (يُعاد الاتصال به في العمليات الفرعية)"""
+        if self._manager is None and self._manager_address is not None:
+            from multiprocessing.managers import SyncManager
+            self._manager = SyncManager(address=self._manager_address)
+            self._manager.connect()
+        return self._manager
+
+    def __getstate__(self):
+        # كائن المدير لا يُنقل بين العمليات؛ يكفي عنوانه لإعادة الاتصال
+        state = dict(self.__dict__)
+        state["_manager"] = None
+        return state
+
+
+class MemoryPresenceBackend(PresenceBackend):
+    """خلفية الحضور المحلية (داخل العملية أو بين عمليات محلية عبر PresenceHub)"""
+
+    def __init__(self, hub: PresenceHub = None, poll_interval: float = 0.2):
+        """
+        تهيئة الخلفية
+
+        Args:
+            hub: الحالة المشتركة
+            poll_interval: مدة انتظار الرسائل في كل استطلاع بالثواني
+        """
+        self.hub = hub or PresenceHub()
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def _key(worker_id: str, connection_id: str) -> str:
+        return f"{worker_id}|{connection_id}"
+
+    async def add(self, record: Dict[str, Any]):
+        self.hub.connections[self._key(record["worker_id"], record["connection_id"])] = dict(record)
+
+    async def remove(self, user_id: int, worker_id: str, connection_id: str):
+        self.hub.connections.pop(self._key(worker_id, connection_id), None)
+
+    async def connections(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        records = list(self.hub.connections.values())
+        if user_id is not None:
+            records = [record for record in records if record["user_id"] == user_id]
+        return records
+
+    async def heartbeat(self, worker_id: str, ttl: float):
+        self.hub.heartbeats[worker_id] = time.time() + ttl
+
+    async def live_workers(self) -> List[str]:
+        now = time.time()
+        return [worker_id for worker_id, expires in list(self.hub.heartbeats.items()) if expires > now]
+
+    async def clear_worker(self, worker_id: str):
+        self.hub.heartbeats.pop(worker_id, None)
+        for key in [key for key in list(self.hub.connections.keys()) if key.startswith(f"{worker_id}|")]:
+            self.hub.connections.pop(key, None)
+
+    async def publish(self, worker_id: str, message: Dict[str, Any]):
+        self.hub.channel(worker_id).put(json.dumps(message))
+
+    async def listen(self, worker_id: str) -> AsyncIterator[Dict[str, Any]]:
+        channel = self.hub.channel(worker_id)
+        while True:
+            try:
+                data = await asyncio.to_thread(channel.get, True, self.poll_interval)
+            except queue.Empty:
+                continue
+            yield json.loads(data)
+
+
+class RedisPresenceBackend(PresenceBackend):
+    """خلفية الحضور عبر Redis: جداول تجزئة للاتصالات ونشر/اشتراك للرسائل"""
+
+    def __init__(self, url: str = None, prefix: str = "presence"):
+        """
+        تهيئة الخلفية
+
+        Args:
+            url: عنوان Redis
+            prefix: بادئة المفاتيح والقنوات
+        """
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url or settings.redis_url, decode_responses=True)
+        self.prefix = prefix
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self.prefix}:worker:{worker_id}"
+
+    def _channel(self, worker_id: str) -> str:
+        return f"{self.prefix}:channel:{worker_id}"
+
+    async def add(self, record: Dict[str, Any]):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._user_key(record["user_id"]),
+                      f"{record['worker_id']}|{record['connection_id']}", json.dumps(record))
+            pipe.sadd(f"{self.prefix}:users", record["user_id"])
+            await pipe.execute()
+
+    async def remove(self, user_id: int, worker_id: str, connection_id: str):
+        await self.redis.hdel(self._user_key(user_id), f"{worker_id}|{connection_id}")
+        if not await self.redis.hlen(self._user_key(user_id)):
+            await self.redis.srem(f"{self.prefix}:users", user_id)
+
+    async def connections(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        user_ids = [user_id] if user_id is not None else await self.redis.smembers(f"{self.prefix}:users")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for uid in user_ids:
+                pipe.hvals(self._user_key(uid))
+            results = await pipe.execute()
+        return [json.loads(value) for values in results for value in values]
+
+    async def heartbeat(self, worker_id: str, ttl: float):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._worker_key(worker_id), "1", px=int(ttl * 1000))
+            pipe.sadd(f"{self.prefix}:workers", worker_id)
+            await pipe.execute()
+
+    async def live_workers(self) -> List[str]:
+        workers = list(await self.redis.smembers(f"{self.prefix}:workers"))
+        if not workers:
+            return []
+        alive = await self.redis.mget([self._worker_key(worker_id) for worker_id in workers])
+        dead = [worker_id for worker_id, flag in zip(workers, alive) if not flag]
+        if dead:
+            await self.redis.srem(f"{self.prefix}:workers", *dead)
+        return [worker_id for worker_id, flag in zip(workers, alive) if flag]
+
+    async def clear_worker(self, worker_id: str):
+        await self.redis.delete(self._worker_key(worker_id))
+        await self.redis.srem(f"{self.prefix}:workers", worker_id)
+        for record in await self.connections():
+            if record["worker_id"] == worker_id:
+                await self.remove(record["user_id"], worker_id, record["connection_id"])
+
+    async def publish(self, worker_id: str, message: Dict[str, Any]):
+        await self.redis.publish(self._channel(worker_id), json.dumps(message))
+
+    async def listen(self, worker_id: str) -> AsyncIterator[Dict[str, Any]]:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel(worker_id))
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.reset()
+
+    async def close(self):
+        await self.redis.connection_pool.disconnect()
+
+
+class PresenceRegistry:
+    """
+    سجل حضور اتصالات WebSocket وموجّه الرسائل بين العمليات
+
+    تُسلَّم الرسائل مباشرة إلى الاتصالات المحلية، وتُنشر إلى قنوات العمليات
+    الأخرى التي يتصل بها المستخدم.
+    """
+
+    def __init__(self, backend: PresenceBackend = None, worker_id: str = None,
+                 heartbeat_seconds: float = None, worker_ttl_seconds: float = None):
+        """
+        تهيئة السجل
+
+        Args:
+            backend: خلفية التخزين والرسائل
+            worker_id: معرّف هذه العملية
+            heartbeat_seconds: الفاصل بين نبضات العملية
+            worker_ttl_seconds: مدة اعتبار العملية حية بعد آخر نبض
+        """
+        self.backend = backend or create_presence_backend()
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_seconds = heartbeat_seconds or settings.presence_heartbeat_seconds
+        self.worker_ttl = worker_ttl_seconds or settings.presence_worker_ttl_seconds
+        # scope -> user_id -> connection_id -> دالة التسليم
+        self._local: Dict[str, Dict[int, Dict[str, Deliver]]] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """بدء النبض والاستماع إلى قناة العملية"""
+        if self._tasks:
+            return
+        await self.backend.heartbeat(self.worker_id, self.worker_ttl)
+        self._tasks = [asyncio.ensure_future(self._heartbeat_loop()),
+                       asyncio.ensure_future(self._listen_loop())]
+
+    async def stop(self):
+        """إيقاف العملية وحذف اتصالاتها من السجل المشترك"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.backend.clear_worker(self.worker_id)
+        except Exception as e:
+            logger.error(f"Presence cleanup error: {e}")
+        self._local.clear()
+        self._records.clear()
+
+    async def register(self, scope: str, user_id: int, deliver: Deliver,
+                       info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        تسجيل اتصال محلي
+
+        Args:
+            scope: نطاق الاتصال (مثل websocket أو realtime)
+            user_id: معرف المستخدم
+            deliver: دالة تسليم رسالة إلى الاتصال
+            info: بيانات إضافية تظهر في قائمة المستخدمين النشطين
+
+        Returns:
+            معرّف الاتصال
+        """
+        connection_id = uuid.uuid4().hex
+        self._local.setdefault(scope, {}).setdefault(user_id, {})[connection_id] = deliver
+        record = {"scope": scope, "user_id": user_id, "worker_id": self.worker_id,
+                  "connection_id": connection_id, "connected_at": time.time(), **(info or {})}
+        self._records[connection_id] = record
+        try:
+            await self.backend.add(record)
+        except Exception as e:
+            logger.error(f"Presence register error: {e}")
+        return connection_id
+
+    async def update(self, connection_id: str, info: Dict[str, Any]):
+        """تحديث البيانات الإضافية لاتصال محلي"""
+        record = self._records.get(connection_id)
+        if record is None:
+            return
+        record.update(info)
+        try:
+            await self.backend.add(record)
+        except Exception as e:
+            logger.error(f"Presence update error: {e}")
+
+    async def unregister(self, scope: str, user_id: int, connection_id: str):
+        """حذف اتصال محلي"""
+        self._records.pop(connection_id, None)
+        users = self._local.get(scope, {})
+        users.get(user_id, {}).pop(connection_id, None)
+        if user_id in users and not users[user_id]:
+            del users[user_id]
+        try:
+            await self.backend.remove(user_id, self.worker_id, connection_id)
+        except Exception as e:
+            logger.error(f"Presence unregister error: {e}")
+
+    async def active_connections(self, scope: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        اتصالات العمليات الحية في العنقود
+
+        Args:
+            scope: تصفية حسب النطاق (None للجميع)
+
+        Returns:
+            سجلات الاتصالات
+        """
+        live = set(await self.backend.live_workers())
+        return [record for record in await self.backend.connections()
+                if record["worker_id"] in live and (scope is None or record.get("scope") == scope)]
+
+    async def send_to_user(self, scope: str, user_id: int, message: Any) -> int:
+        """
+        إرسال رسالة إلى جميع اتصالات مستخدم في أي عملية
+
+        Returns:
+            عدد الاتصالات المحلية التي سُلمت إليها الرسالة
+        """
+        delivered = self._deliver_local(scope, user_id, message)
+        try:
+            live = set(await self.backend.live_workers())
+            workers = {record["worker_id"] for record in await self.backend.connections(user_id)
+                       if record.get("scope") == scope and record["worker_id"] in live}
+            workers.discard(self.worker_id)
+            for worker_id in workers:
+                await self.backend.publish(worker_id, {"scope": scope, "user_id": user_id, "message": message})
+        except Exception as e:
+            logger.error(f"Presence send error: {e}")
+        return delivered
+
+    async def broadcast(self, scope: str, message: Any) -> int:
+        """
+        بث رسالة إلى جميع اتصالات النطاق في العنقود
+
+        Returns:
+            عدد الاتصالات المحلية التي سُلمت إليها الرسالة
+        """
+        delivered = self._deliver_local(scope, None, message)
+        try:
+            for worker_id in await self.backend.live_workers():
+                if worker_id != self.worker_id:
+                    await self.backend.publish(worker_id, {"scope": scope, "user_id": None, "message": message})
+        except Exception as e:
+            logger.error(f"Presence broadcast error: {e}")
+        return delivered
+
+    def _deliver_local(self, scope: str, user_id: Optional[int], message: Any) -> int:
+        """تسليم رسالة إلى الاتصالات المحلية لمستخدم أو لجميع المستخدمين"""
+        users = self._local.get(scope, {})
+        targets = [users.get(user_id, {})] if user_id is not None else list(users.values())
+        delivered = 0
+        for connections in targets:
+            for deliver in list(connections.values()):
+                try:
+                    deliver(message)
+                    delivered += 1
+                except Exception as e:
+                    logger.error(f"Presence delivery error: {e}")
+        return delivered
+
+    async def _heartbeat_loop(self):
+        """تجديد نبض العملية دورياً"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.backend.heartbeat(self.worker_id, self.worker_ttl)
+            except Exception as e:
+                logger.error(f"Presence heartbeat error: {e}")
+
+    async def _listen_loop(self):
+        """تسليم الرسائل الواردة من العمليات الأخرى، مع إعادة الاشتراك عند الخطأ"""
+        while True:
+            try:
+                async for envelope in self.backend.listen(self.worker_id):
+                    self._deliver_local(envelope["scope"], envelope.get("user_id"), envelope["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Presence listener error: {e}")
+                await asyncio.sleep(1)
+
+
+def create_presence_backend() -> PresenceBackend:
+    """إنشاء خلفية الحضور حسب الإعدادات (memory أو redis)"""
+    if settings.presence_backend == "redis":
+        return RedisPresenceBackend(settings.redis_url)
+    return MemoryPresenceBackend()
+
+
+# إنشاء مثيل من سجل الحضور
+presence_registry = PresenceRegistry()
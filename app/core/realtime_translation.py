@@ -0,0 +1,93 @@
+# إدارة اتصالات الترجمة التلقائية في الوقت الفعلي ولغة كل مستخدم
+
+from typing import Any, AsyncIterator, Dict, Optional
+from fastapi import WebSocket
+from starlette.concurrency import run_in_threadpool
+from app.core.i18n import i18n_settings
+from app.core.auto_translator import auto_translator
+from app.core.llm_scheduler import Priority
+from app.core.translation_batcher import translation_batcher
+from app.core.consent import consent_manager
+from app.core.websocket_pipeline import iterate_stream
+from app.core.websocket_connections import ConnectionTracker, TrackedConnection
+from app.core.websocket_protocol import negotiate_protocol
+from app.core.presence import presence_registry
+
+# نطاق اتصالات هذه الوحدة في سجل الحضور
+PRESENCE_SCOPE = "realtime"
+
+
+class RealtimeTranslationManager:
+    """مدير الترجمة في الوقت الفعلي"""
+
+    def __init__(self):
+        """تهيئة المدير"""
+        self.connections = ConnectionTracker(PRESENCE_SCOPE)
+        self.user_languages: Dict[int, str] = {}
+
+    @property
+    def active_connections(self) -> Dict[int, WebSocket]:
+        """أحدث اتصال لكل مستخدم في هذه العملية"""
+        return {connection.user_id: connection.websocket for connection in self.connections.connections()}
+
+    async def connect(self, websocket: WebSocket, user_id: int) -> TrackedConnection:
+        """اتصال عميل جديد"""
+        # الحصول على لغة المستخدم من الذاكرة المؤقتة أو بجلسة قصيرة تُعاد فوراً إلى المجمع
+        consent_status = await run_in_threadpool(consent_manager.get_cached_consent_status, user_id)
+        if consent_status["consent_given"] and consent_status["preferred_locale"]:
+            self.user_languages[user_id] = consent_status["preferred_locale"]
+        else:
+            self.user_languages[user_id] = i18n_settings.default_locale
+
+        # صيغة الإطارات حسب البروتوكول الفرعي الذي عرضه العميل (JSON افتراضياً)
+        return await self.connections.open(
+            websocket, user_id, {"language": self.user_languages[user_id]},
+            negotiate_protocol(websocket))
+
+    async def disconnect(self, connection: TrackedConnection):
+        """قطع اتصال عميل وحذف لغته عند إغلاق آخر اتصالاته"""
+        await self.connections.close(connection)
+        if not self.connections.connections(connection.user_id):
+            self.user_languages.pop(connection.user_id, None)
+
+    async def translate_text(self, user_id: int, text: str) -> Optional[str]:
+        """ترجمة نص"""
+        if user_id not in self.user_languages:
+            return None
+
+        # الحصول على لغة المستخدم
+        target_language = self.user_languages[user_id]
+
+        # ترجمة النص عبر مجمّع الدفعات
+        return await translation_batcher.translate(text, target_language)
+
+    async def translate_text_stream(self, user_id: int, text: str) -> AsyncIterator[str]:
+        """ترجمة نص مع إرجاع أجزاء الترجمة فور وصولها"""
+        if user_id not in self.user_languages:
+            return
+
+        # الحصول على لغة المستخدم
+        target_language = self.user_languages[user_id]
+
+        # تشغيل مولّد الترجمة المتزامن في مجمّع الخيوط دون حجب حلقة الأحداث
+        async for delta in iterate_stream(
+                auto_translator.translate_text_stream(text, target_language)):
+            yield delta
+
+    async def detect_language(self, text: str) -> Optional[str]:
+        """كشف لغة النص"""
+        return await run_in_threadpool(auto_translator.detect_language, text, Priority.INTERACTIVE)
+
+    async def set_language(self, user_id: int, language: str):
+        """تعيين لغة المستخدم وتحديثها في سجل الحضور"""
+        self.user_languages[user_id] = language
+        for connection in self.connections.connections(user_id):
+            await presence_registry.update(connection.presence_id, {"language": language})
+
+    async def broadcast_translation(self, message: Dict[str, Any]):
+        """بث رسالة لجميع العملاء في العنقود (إضافة إلى طوابير الإرسال دون انتظار الشبكة)"""
+        await presence_registry.broadcast(PRESENCE_SCOPE, message)
+
+
+# إنشاء مثيل من المدير
+realtime_translation_manager = RealtimeTranslationManager()
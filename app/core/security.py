@@ -6,15 +6,18 @@ import logging
 from typing import Optional, List
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends, Request
+from fastapi import HTTPException, status, Depends, Request, WebSocket
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import joinedload
 
 from app import crud  # استيراد crud للوصول إلى قاعدة البيانات
 # استيراد خدمة ذاكرة التخزين المؤقت الجديدة
 from app.core.cache import cache_service
-from app.core.database import get_db
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_async_db, get_db, session_scope
 from app.config import settings
 from app.schemas.user import UserInDB
 from app.models import user
@@ -106,6 +109,103 @@ def verify_token(token: str) -> Optional[int]:
         return None
 
 
+def load_user(user_id: int) -> Optional[UserInDB]:
+    """
+    تحميل المستخدم من الذاكرة المؤقتة أو بجلسة قصيرة العمر
+
+    Args:
+        user_id: معرف المستخدم
+
+    Returns:
+        بيانات المستخدم، أو None إذا لم يوجد
+    """
+    cached_user = cache_service.get_user(user_id)
+    if cached_user:
+        return cached_user
+
+    with session_scope() as db:
+        db_user = db.query(crud.User).options(
+            joinedload(crud.User.role).joinedload(crud.Role.permissions)
+        ).filter(crud.User.id == user_id).first()
+        if db_user is None:
+            return None
+        user_data = UserInDB.from_orm(db_user)
+
+    cache_service.set_user(user_data)
+    return user_data
+
+
+async def load_user_async(db: AsyncSession, user_id: int) -> Optional[UserInDB]:
+    """
+    تحميل المستخدم من الذاكرة المؤقتة أو بجلسة غير متزامنة
+
+    Args:
+        db: جلسة قاعدة البيانات غير المتزامنة
+        user_id: معرف المستخدم
+
+    Returns:
+        بيانات المستخدم، أو None إذا لم يوجد
+    """
+    cached_user = cache_service.get_user(user_id)
+    if cached_user:
+        return cached_user
+
+    # التحميل المسبق ضروري: الجلسة غير المتزامنة لا تدعم التحميل الكسول للعلاقات
+    result = await db.execute(select(crud.User).options(
+        joinedload(crud.User.role).joinedload(crud.Role.permissions)
+    ).where(crud.User.id == user_id))
+    db_user = result.unique().scalars().first()
+    if db_user is None:
+        return None
+    user_data = UserInDB.from_orm(db_user)
+
+    cache_service.set_user(user_data)
+    return user_data
+
+
+async def get_current_user_async(
+    token: str = Depends(OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/login")),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserInDB:
+    """
+    نسخة get_current_user لنقاط النهاية async def
+
+    تستعلم بجلسة غير متزامنة فلا تحجب حلقة الأحداث عند عدم وجود المستخدم
+    في الذاكرة المؤقتة.
+    """
+    user_id = verify_token(token)
+    user = await load_user_async(db, user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def authenticate_websocket(websocket: WebSocket) -> Optional[UserInDB]:
+    """
+    مصادقة اتصال WebSocket من ترويسة Authorization أو معامل token
+
+    لا تحجز جلسة قاعدة بيانات طوال عمر الاتصال كما تفعل Depends(get_current_user).
+
+    Args:
+        websocket: اتصال WebSocket لم يُقبل بعد
+
+    Returns:
+        المستخدم، أو None إذا فشلت المصادقة
+    """
+    token = websocket.query_params.get("token")
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    user_id = verify_token(token) if token else None
+    if user_id is None:
+        return None
+    return await run_in_threadpool(load_user, user_id)
+
+
 def invalidate_user_cache(user_id: int):
     """إبطال صلاحية ذاكرة التخزين المؤقت لمستخدم معين."""
     cache_service.invalidate_user(user_id)
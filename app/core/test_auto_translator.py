@@ -0,0 +1,371 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.core.auto_translator import AutoTranslator
+from app.core.i18n import i18n_settings
+from app.core.language_detector import SCRIPT_LOCALES, UNMODELLED_SCRIPT_LOCALES, language_detector
+from app.core.language_samples import LANGUAGE_SAMPLES
+from app.core.llm_scheduler import Priority
+from app.core.metrics import metrics_registry
+from app.core.translation_metrics import llm_requests, llm_tokens
+from app.core.translation_memory import TranslationMemory
+from app.core.translation_providers import OpenAIProvider, ProviderRouter
+
+
+class FakeChatClient:
+    """عميل وهمي متوافق مع واجهة OpenAI"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, max_tokens, temperature, **kwargs):
+        with self._lock:
+            self.requests.append(
+                {"messages": messages, "max_tokens": max_tokens})
+        reply = self.handler(messages, max_tokens)
+        if kwargs.get("stream"):
+            return self._stream(reply)
+        return SimpleNamespace(choices=[SimpleNamespace(
+            message=SimpleNamespace(content=reply))])
+
+    @staticmethod
+    def _stream(reply):
+        """تقسيم الرد إلى أجزاء كما في وضع البث"""
+        if isinstance(reply, Exception):
+            yield SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content="partial"))])
+            raise reply
+        for index in range(0, len(reply), 4):
+            yield SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=reply[index:index + 4]))])
+        yield SimpleNamespace(choices=[SimpleNamespace(
+            delta=SimpleNamespace(content=None))])
+
+
+def echo_handler(messages, max_tokens):
+    """يعيد النص مع بادئة، ويعكس ترتيب عناصر الدفعة"""
+    if max_tokens <= 10:
+        return "en"
+    content = messages[-1]["content"]
+    if content.startswith('{"items"'):
+        items = json.loads(content)["items"]
+        return json.dumps({"items": [
+            {"id": item["id"], "text": f"T:{item['text']}"}
+            for item in reversed(items)
+        ]}, ensure_ascii=False)
+    return f"T:{content}"
+
+
+def use_client(instance, client):
+    """توجيه طلبات المترجم إلى عميل وهمي متوافق مع OpenAI"""
+    instance.router = ProviderRouter([OpenAIProvider(client=client)])
+
+
+def sent_requests(instance):
+    """الطلبات التي استلمها العميل الوهمي"""
+    return instance.router.providers[0].client.requests
+
+
+@pytest.fixture
+def auto_translator():
+    """مترجم آلي مع عميل وهمي"""
+    instance = AutoTranslator(ProviderRouter([]), TranslationMemory())
+    use_client(instance, FakeChatClient(echo_handler))
+    return instance
+
+
+def test_translate_content_detects_once(auto_translator, monkeypatch):
+    """
+    اختبار أن الكشف عن اللغة يتم مرة واحدة لكل مستند.
+    """
+    # إجبار اللجوء إلى النموذج اللغوي للكشف عن اللغة
+    monkeypatch.setattr(language_detector, "detect", lambda text: (None, 0.0))
+    content = {
+        "title": "Program",
+        "modules": [
+            {"title": f"Module {i}", "exercises": [{"instructions": "Breathe"}]}
+            for i in range(3)
+        ],
+    }
+
+    result = auto_translator.translate_content(content, "ar")
+
+    detections = [r for r in sent_requests(auto_translator)
+                  if r["max_tokens"] <= 10]
+    assert len(detections) == 1
+    # المقاطع الفريدة للمستند تُترجم في دفعة واحدة
+    assert len(sent_requests(auto_translator)) == 1 + 1
+    assert result["title"] == "T:Program"
+    assert result["modules"][2]["title"] == "T:Module 2"
+    assert result["modules"][0]["exercises"][0]["instructions"] == "T:Breathe"
+    assert result["translation_info"]["source_locale"] == "en"
+
+
+def test_batch_translate_handles_newlines_and_reordering(auto_translator):
+    """
+    اختبار أن النصوص متعددة الأسطر والردود المعاد ترتيبها تُطابق بالمعرّف.
+    """
+    texts = ["first line\nsecond line", "plain", "a\n\nb"]
+
+    result = auto_translator.batch_translate(texts, "ar", "en")
+
+    assert result == [f"T:{text}" for text in texts]
+    assert len(sent_requests(auto_translator)) == 1
+
+
+def test_batch_translate_chunks_by_token_budget(auto_translator, monkeypatch):
+    """
+    اختبار تقسيم الدفعة إلى أجزاء حسب ميزانية الرموز مع حد للرد.
+    """
+    monkeypatch.setattr(settings, "translation_batch_max_tokens", 30)
+    texts = ["x" * 100 for _ in range(5)]
+
+    result = auto_translator.batch_translate(texts, "ar", "en")
+
+    assert result == [f"T:{text}" for text in texts]
+    assert len(sent_requests(auto_translator)) == 5
+    assert all(r["max_tokens"] <= settings.translation_max_output_tokens
+               for r in sent_requests(auto_translator))
+
+
+def test_batch_translate_retries_only_missing_items(auto_translator):
+    """
+    اختبار أن العناصر المفقودة من رد الدفعة فقط يُعاد إرسالها بشكل فردي.
+    """
+    def drop_second(messages, max_tokens):
+        content = messages[-1]["content"]
+        if content.startswith('{"items"'):
+            items = json.loads(content)["items"]
+            return json.dumps({"items": [
+                {"id": item["id"], "text": f"T:{item['text']}"}
+                for item in items if item["id"] != 1
+            ]})
+        return f"T:{content}"
+
+    use_client(auto_translator, FakeChatClient(drop_second))
+
+    result = auto_translator.batch_translate(["one", "two", "three"], "ar", "en")
+
+    assert result == ["T:one", "T:two", "T:three"]
+    single_requests = [r for r in sent_requests(auto_translator)
+                       if not r["messages"][-1]["content"].startswith('{"items"')]
+    assert [r["messages"][-1]["content"] for r in single_requests] == ["two"]
+
+
+def test_batch_translate_invalid_reply_falls_back_per_item(auto_translator):
+    """
+    اختبار أن الرد غير الصالح لا يُفشل الدفعة بأكملها.
+    """
+    def broken_batch(messages, max_tokens):
+        content = messages[-1]["content"]
+        if content.startswith('{"items"'):
+            return "line one\nline two"
+        return f"T:{content}"
+
+    use_client(auto_translator, FakeChatClient(broken_batch))
+
+    result = auto_translator.batch_translate(["one", "two"], "ar", "en")
+
+    assert result == ["T:one", "T:two"]
+
+
+def test_detect_language_uses_local_detector(auto_translator):
+    """
+    اختبار أن الكشف عن اللغة بثقة عالية لا يستدعي النموذج اللغوي.
+    """
+    result = auto_translator.detect_language(
+        "Je me sens anxieux ces derniers temps et je n'arrive pas à dormir.")
+
+    assert result == "fr"
+    assert sent_requests(auto_translator) == []
+
+
+def test_detect_languages_falls_back_only_for_uncertain_texts(auto_translator):
+    """
+    اختبار أن الكشف الجماعي يلجأ إلى النموذج اللغوي للنصوص غير المؤكدة فقط.
+    """
+    result = auto_translator.detect_languages(["요즘 불안해요", "ok", "最近我感到很焦虑"])
+
+    assert result == ["ko", "en", "zh"]
+    assert [r["messages"][-1]["content"] for r in sent_requests(auto_translator)] == ["ok"]
+
+
+def test_every_supported_locale_is_modelled_or_declared_unmodelled():
+    """
+    اختبار أن كل لغة مدعومة إما تُكشف من نظامها الكتابي، أو لها نص مرجعي، أو
+    مذكورة صراحةً كلغة بلا نموذج في نظامها.
+    """
+    covered = set(LANGUAGE_SAMPLES)
+    covered.update(locale for locales in SCRIPT_LOCALES.values() for locale in locales)
+    covered.update(locale for locales in UNMODELLED_SCRIPT_LOCALES.values() for locale in locales)
+
+    assert sorted(set(i18n_settings.supported_locales) - covered) == []
+
+
+def test_close_and_unmodelled_languages_are_not_detected_confidently():
+    """
+    اختبار أن اللغات القريبة لها نماذجها، وأن نصاً بلغة مدعومة بلا نموذج يُعاد
+    بثقة 0 ليُحال إلى النموذج اللغوي بدل نسبته بثقة إلى لغة أخرى.
+    """
+    bosnian, bosnian_confidence = language_detector.detect(
+        "Svako ima pravo na život, slobodu i ličnu sigurnost. Niko ne smije biti držan u ropstvu.")
+    luxembourgish, _ = language_detector.detect(
+        "Jiddereen huet d'Recht op d'Liewen, op d'Fräiheet an op d'Sécherheet vu senger Persoun.")
+    _, navajo_confidence = language_detector.detect(
+        "Yáʼátʼééh, shí éí Diné nishłį́. Nahasdzáán bikáá'gi hózhǫ́ǫ́go naashá.")
+
+    assert bosnian != "hr" or bosnian_confidence < settings.language_detection_min_confidence
+    assert luxembourgish == "lb"
+    assert navajo_confidence == 0.0
+
+
+def test_translate_text_stream_yields_chunks(auto_translator):
+    """
+    اختبار أن الترجمة المتدفقة تُرجع الأجزاء بالترتيب دون مسافات بادئة.
+    """
+    use_client(auto_translator, FakeChatClient(
+        lambda messages, max_tokens: "  Hello streaming world"))
+
+    chunks = list(auto_translator.translate_text_stream("مرحبا", "en", "ar"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Hello streaming world"
+
+
+def test_translate_text_stream_releases_scheduler_slot_when_closed_early(auto_translator):
+    """
+    اختبار أن مكان الطلب في المجدول يبقى محجوزاً أثناء البث ويُحرر عند إغلاقه مبكراً.
+    """
+    use_client(auto_translator, FakeChatClient(
+        lambda messages, max_tokens: "Hello streaming world"))
+    active_before = auto_translator.scheduler.get_stats()["active"]
+
+    stream = auto_translator.translate_text_stream("مرحبا", "en", "ar")
+    next(stream)
+    assert auto_translator.scheduler.get_stats()["active"] == active_before + 1
+
+    stream.close()
+    assert auto_translator.scheduler.get_stats()["active"] == active_before
+
+
+def test_translate_text_stream_raises_on_interrupted_stream(auto_translator):
+    """
+    اختبار أن انقطاع البث لا يُعامل كترجمة مكتملة.
+    """
+    use_client(auto_translator, FakeChatClient(
+        lambda messages, max_tokens: RuntimeError("connection reset")))
+
+    stream = auto_translator.translate_text_stream("مرحبا", "en", "ar")
+
+    assert next(stream) == "partial"
+    with pytest.raises(RuntimeError):
+        next(stream)
+
+
+def test_translate_segments_deduplicates_and_uses_memory(auto_translator):
+    """
+    اختبار ترجمة المقاطع الفريدة فقط والحفاظ على التنسيق وإعادة استخدام ذاكرة الترجمة.
+    """
+    disclaimer = "If you are in crisis, call your local emergency number."
+    texts = [
+        f"# Sleep\n\nRest well. {disclaimer}",
+        f"- Breathe slowly.\n- Rest well.\n\n{disclaimer}",
+    ]
+
+    result = auto_translator.translate_segments(texts, "ar", "en")
+
+    assert result == [
+        f"# T:Sleep\n\nT:Rest well. T:{disclaimer}",
+        f"- T:Breathe slowly.\n- T:Rest well.\n\nT:{disclaimer}",
+    ]
+    batch = json.loads(sent_requests(auto_translator)[0]["messages"][-1]["content"])
+    assert sorted(item["text"] for item in batch["items"]) == sorted(
+        ["Sleep", "Rest well.", disclaimer, "Breathe slowly."])
+
+    # عند تعديل المستند تُرسل الجمل الجديدة فقط
+    edited = auto_translator.translate_segments(
+        [f"Rest well. Sleep early. {disclaimer}"], "ar", "en")
+
+    assert edited == [f"T:Rest well. T:Sleep early. T:{disclaimer}"]
+    assert len(sent_requests(auto_translator)) == 2
+    batch = json.loads(sent_requests(auto_translator)[1]["messages"][-1]["content"])
+    assert [item["text"] for item in batch["items"]] == ["Sleep early."]
+
+
+def test_concurrent_identical_translations_share_one_call(auto_translator):
+    """
+    اختبار أن الطلبات المتطابقة المتزامنة تنتج استدعاءً واحداً للمزود.
+    """
+    release = threading.Event()
+
+    def slow_handler(messages, max_tokens):
+        release.wait(5)
+        return echo_handler(messages, max_tokens)
+
+    use_client(auto_translator, FakeChatClient(slow_handler))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        auto_translator.translate_text("Welcome back", "ar", "en"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    while auto_translator.in_flight.get_stats()["shared"] < len(threads) - 1:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == ["T:Welcome back"] * 20
+    assert len(sent_requests(auto_translator)) == 1
+    assert auto_translator.in_flight.get_stats() == {"in_flight": 0, "executed": 1, "shared": 19}
+
+
+def test_interactive_translation_does_not_join_a_background_call(auto_translator):
+    """
+    اختبار أن طلباً تفاعلياً لا ينتظر نتيجة طلب خلفية مطابق جارٍ بأولوية أدنى.
+    """
+    background_started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def handler(messages, max_tokens):
+        calls.append(messages)
+        if len(calls) == 1:
+            background_started.set()
+            release.wait(5)
+        return echo_handler(messages, max_tokens)
+
+    use_client(auto_translator, FakeChatClient(handler))
+    background = threading.Thread(target=auto_translator.translate_text, args=(
+        "Welcome back", "ar", "en", Priority.BACKGROUND))
+    background.start()
+    background_started.wait(5)
+
+    interactive = auto_translator.translate_text("Welcome back", "ar", "en", Priority.INTERACTIVE)
+    release.set()
+    background.join(timeout=5)
+
+    assert interactive == "T:Welcome back"
+    assert auto_translator.in_flight.get_stats() == {"in_flight": 0, "executed": 2, "shared": 0}
+
+
+def test_translation_calls_are_recorded_in_metrics(auto_translator):
+    """
+    اختبار تسجيل المزود والنموذج وزوج اللغات والرموز لكل استدعاء.
+    """
+    labels = dict(operation="translate", provider="openai", model=settings.model_name,
+                  source_locale="en", target_locale="ar")
+    before = llm_requests.value(outcome="success", **labels)
+
+    assert auto_translator.translate_text("Good morning", "ar", "en") == "T:Good morning"
+
+    assert llm_requests.value(outcome="success", **labels) == before + 1
+    assert llm_tokens.value(operation="translate", provider="openai",
+                            model=settings.model_name, type="completion") > 0
+    assert "translation_llm_request_duration_seconds_bucket" in metrics_registry.render()
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event, inspect
+
+from app.core.biomarker_partitions import BiomarkerPartitions, partitions_retired
+
+
+def reading(user_id, month, value, biomarker_type="typing_speed", day=15):
+    return {"user_id": user_id, "biomarker_type": biomarker_type, "value": value,
+            "timestamp": datetime(2026, month, day, 12, tzinfo=timezone.utc)}
+
+
+def make_partitions(tmp_path, **options):
+    engine = create_engine(f"sqlite:///{tmp_path / 'biomarkers.db'}")
+    return engine, BiomarkerPartitions(engine=engine, retention_months=3, months_ahead=1, **options)
+
+
+def test_readings_are_stored_per_month_and_queries_read_only_overlapping_months(tmp_path):
+    """
+    اختبار أن كل قراءة تُخزن في جدول شهرها، وأن استعلام نطاق زمني لا يقرأ إلا
+    جداول الأشهر المتقاطعة معه، وأن التحليل يلخص كل نوع مؤشر.
+    """
+    engine, partitions = make_partitions(tmp_path)
+    stored = partitions.insert([reading(1, 1, 40.0), reading(1, 2, 50.0), reading(1, 3, 60.0),
+                                reading(1, 3, 7.5, "sleep_pattern"), reading(2, 3, 99.0)])
+
+    assert stored == 5
+    assert sorted(partitions.partitions().values()) == [
+        "digital_biomarkers_202601", "digital_biomarkers_202602", "digital_biomarkers_202603"]
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    rows = partitions.readings(1, start=datetime(2026, 2, 1, tzinfo=timezone.utc),
+                               end=datetime(2026, 4, 1, tzinfo=timezone.utc))
+
+    assert [(row["biomarker_type"], row["value"]) for row in rows] == [
+        ("typing_speed", 60.0), ("sleep_pattern", 7.5), ("typing_speed", 50.0)]
+    assert rows[0]["timestamp"] == datetime(2026, 3, 15, 12, tzinfo=timezone.utc)
+    assert "digital_biomarkers_202601" not in statements[-1]
+
+    analysis = partitions.analyze(1, start=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                                  end=datetime(2026, 4, 1, tzinfo=timezone.utc))
+    assert analysis["typing_speed"]["count"] == 3
+    assert analysis["typing_speed"]["mean"] == 50.0
+    assert analysis["typing_speed"]["latest"] == datetime(2026, 3, 15, 12, tzinfo=timezone.utc)
+    assert analysis["sleep_pattern"]["max"] == 7.5
+    assert partitions.readings(1, start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                               end=datetime(2025, 6, 1, tzinfo=timezone.utc)) == []
+
+
+def test_reading_ids_are_unique_across_monthly_tables(tmp_path):
+    """
+    اختبار أن معرّفات القراءات لا تتكرر بين الجداول الشهرية، وأن كل شهر يبدأ
+    تسلسله من إزاحته الخاصة.
+    """
+    _, partitions = make_partitions(tmp_path)
+    partitions.insert([reading(1, 1, 40.0), reading(1, 1, 41.0), reading(1, 2, 50.0), reading(1, 3, 60.0)])
+    partitions.insert([reading(1, 2, 51.0)])
+
+    rows = partitions.readings(1, start=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                               end=datetime(2026, 4, 1, tzinfo=timezone.utc))
+
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) == 5
+    assert {row["id"] >> 32 for row in rows} == {202601, 202602, 202603}
+
+
+def test_retention_archives_or_drops_whole_months_without_delete(tmp_path):
+    """
+    اختبار أن الصيانة تنشئ أقسام الأشهر القادمة، وأن الأشهر الأقدم من مدة الاحتفاظ
+    تُزال كجداول كاملة (أرشفة أو حذف) دون أي DELETE.
+    """
+    engine, partitions = make_partitions(tmp_path)
+    partitions.insert([reading(1, month, float(month)) for month in range(1, 7)])
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    archived_before = partitions_retired.value(action="archive")
+
+    retired = partitions.maintain(now=datetime(2026, 6, 10, tzinfo=timezone.utc))
+
+    assert retired == ["digital_biomarkers_202601", "digital_biomarkers_202602"]
+    assert partitions_retired.value(action="archive") == archived_before + 2
+    assert not any(statement.lstrip().upper().startswith("DELETE") for statement in statements)
+    tables = set(inspect(engine).get_table_names())
+    assert {"archived_digital_biomarkers_202601", "archived_digital_biomarkers_202602",
+            "digital_biomarkers_202607"} <= tables
+    assert min(partitions.partitions()) == datetime(2026, 3, 1).date()
+    assert partitions.readings(1, start=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                               end=datetime(2026, 7, 1, tzinfo=timezone.utc))[-1]["value"] == 3.0
+
+    dropping = BiomarkerPartitions(engine=engine, retention_months=1, retention_action="drop")
+    assert dropping.apply_retention(now=datetime(2026, 6, 10, tzinfo=timezone.utc)) == [
+        "digital_biomarkers_202603", "digital_biomarkers_202604"]
+    assert "digital_biomarkers_202603" not in inspect(engine).get_table_names()
+
+
+def test_insert_recovers_when_another_worker_retired_a_cached_partition(tmp_path):
+    """
+    اختبار أن عملية أزال عامل آخر قسماً من ذاكرتها المؤقتة تعيد قراءة الأقسام
+    وتنشئه بدل أن تفشل الكتابة.
+    """
+    engine, writer = make_partitions(tmp_path)
+    writer.insert([reading(1, 1, 40.0)])
+    maintainer = BiomarkerPartitions(engine=engine, retention_months=1, retention_action="drop")
+    maintainer.apply_retention(now=datetime(2026, 6, 10, tzinfo=timezone.utc))
+
+    assert writer.insert([reading(1, 1, 41.0)]) == 1
+    assert [row["value"] for row in writer.readings(
+        1, start=datetime(2026, 1, 1, tzinfo=timezone.utc), end=datetime(2026, 2, 1, tzinfo=timezone.utc))] == [41.0]
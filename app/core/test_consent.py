@@ -0,0 +1,104 @@
+import asyncio
+from collections import Counter
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core import realtime_translation
+from app.core.cache import cache_service
+from app.core.consent import LanguageConsentManager
+from app.core.database import session_scope
+from app.core.realtime_translation import RealtimeTranslationManager
+
+SOCKETS = 1000
+USERS = 100
+POOL_SIZE = 10
+
+
+class FakeWebSocket:
+    """اتصال WebSocket وهمي مقبول دون بروتوكول فرعي"""
+
+    scope = {}
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        pass
+
+    async def close(self, code=1000, reason=None):
+        pass
+
+
+def test_open_sockets_do_not_exhaust_the_connection_pool(tmp_path, monkeypatch):
+    """
+    اختبار أن 1000 مقبس مفتوح عبر RealtimeTranslationManager مع مجمع من 10 اتصالات
+    لا تحجز أي اتصال بعد قراءة الموافقة، وأن طلبات HTTP تستمر في الحصول على اتصالات،
+    وأن الموافقة تُقرأ من قاعدة البيانات مرة واحدة لكل مستخدم غير مخزن ولا تُقرأ عند
+    إصابة الذاكرة المؤقتة.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool,
+                           pool_size=POOL_SIZE, max_overflow=0, pool_timeout=2)
+    session_factory = sessionmaker(bind=engine)
+    with session_scope(session_factory) as db:
+        db.execute(text("CREATE TABLE consents (user_id INTEGER PRIMARY KEY, preferred_locale TEXT)"))
+        db.execute(text("INSERT INTO consents VALUES (:user_id, 'ar')"),
+                   [{"user_id": user_id} for user_id in range(0, USERS, 2)])
+        db.commit()
+
+    consent_manager = LanguageConsentManager(session_factory)
+    queries = []
+
+    def get_consent_status(db, user_id):
+        # استعلام مكافئ لقراءة الموافقة دون الاعتماد على بقية النماذج
+        queries.append(user_id)
+        locale = db.execute(text("SELECT preferred_locale FROM consents WHERE user_id = :user_id"),
+                            {"user_id": user_id}).scalar()
+        return {"consent_given": locale is not None, "preferred_locale": locale}
+
+    consent_manager.get_consent_status = get_consent_status
+    monkeypatch.setattr(realtime_translation, "consent_manager", consent_manager)
+    monkeypatch.setattr(settings, "websocket_max_connections_per_user", SOCKETS // USERS)
+    manager = RealtimeTranslationManager()
+    cache_service.clear()
+
+    def http_request():
+        with session_scope(session_factory) as db:
+            return db.execute(text("SELECT COUNT(*) FROM consents")).scalar()
+
+    async def scenario():
+        # أول اتصال لكل مستخدم يقرأ الموافقة من قاعدة البيانات، والبقية من الذاكرة المؤقتة
+        connections = await asyncio.gather(*(
+            manager.connect(FakeWebSocket(), user_id) for user_id in range(USERS)))
+        first_queries = Counter(queries)
+        connections += await asyncio.gather(*(
+            manager.connect(FakeWebSocket(), index % USERS) for index in range(USERS, SOCKETS)))
+        cached_queries = len(queries) - sum(first_queries.values())
+
+        checked_out = engine.pool.checkedout()
+        languages = dict(manager.user_languages)
+        open_connections = len(manager.connections.connections())
+        rows = await asyncio.wait_for(
+            asyncio.gather(*(run_in_threadpool(http_request) for _ in range(POOL_SIZE * 2))), 10)
+
+        for connection in connections:
+            await manager.disconnect(connection)
+        return first_queries, cached_queries, checked_out, languages, open_connections, rows
+
+    try:
+        first_queries, cached_queries, checked_out, languages, open_connections, rows = asyncio.run(scenario())
+    finally:
+        cache_service.clear()
+        engine.dispose()
+
+    assert first_queries == Counter(range(USERS))
+    assert cached_queries == 0
+    assert checked_out == 0
+    assert open_connections == SOCKETS
+    assert rows == [USERS // 2] * (POOL_SIZE * 2)
+    assert sum(1 for locale in languages.values() if locale == "ar") == USERS // 2
+    assert manager.user_languages == {}
+    assert manager.connections.get_stats()["connections"] == 0
@@ -0,0 +1,272 @@
+import threading
+
+import pytest
+from sqlalchemy import Boolean, Column, Integer, String, Text, create_engine, event
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core import content_pretranslation
+from app.core.auto_translator import auto_translator
+from app.core.content_pretranslation import (
+    PretranslationWorker,
+    collect_changed_content,
+    content_fields,
+    enqueue_changed_content,
+    get_published_content,
+    get_translated_content,
+    get_translation_progress,
+    source_hash,
+)
+from app.core.i18n import i18n_settings
+from app.models import content as content_models
+
+# نماذج مستقلة بنفس جداول المحتوى حتى لا تعتمد الاختبارات على بقية نماذج التطبيق
+Base = declarative_base()
+
+
+class Article(Base):
+    __tablename__ = "articles"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    summary = Column(Text, nullable=True)
+    content = Column(Text, nullable=False)
+    author = Column(String, nullable=True)
+    published = Column(Boolean, default=False)
+
+
+class ContentTranslation(Base):
+    __table__ = content_models.ContentTranslation.__table__.to_metadata(Base.metadata)
+
+
+@pytest.fixture
+def pretranslation(tmp_path, monkeypatch):
+    """
+    قاعدة SQLite بجداول المقالات والترجمات، وعامل غير مشغّل يُقرأ طابوره في
+    الاختبارات، ومترجم يسجل الطلبات ويكشف العربية دائماً.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'content.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    worker = PretranslationWorker(session_factory=session_factory, workers=1)
+    calls = {"detect": 0, "translate": []}
+
+    def detect_language(text, priority=None):
+        calls["detect"] += 1
+        return "ar"
+
+    def translate_segments(texts, target_locale, source_locale=None, priority=None):
+        calls["translate"].append(target_locale)
+        return [f"{target_locale}:{text}" for text in texts]
+
+    monkeypatch.setattr(content_pretranslation, "PRETRANSLATED_CONTENT",
+                        {"article": (Article, ("title", "summary", "content"))})
+    monkeypatch.setattr(content_pretranslation, "ContentTranslation", ContentTranslation)
+    monkeypatch.setattr(content_pretranslation, "pretranslation_worker", worker)
+    monkeypatch.setattr(auto_translator, "detect_language", detect_language)
+    monkeypatch.setattr(auto_translator, "translate_segments", translate_segments)
+    monkeypatch.setattr(i18n_settings, "supported_locales", ["ar", "en", "fr"])
+    yield session_factory, worker, calls
+    engine.dispose()
+
+
+def queued(worker):
+    """المهام المنتظرة في طابور عامل غير مشغّل"""
+    return list(worker._queue.queue)
+
+
+def add_article(session_factory, published=True):
+    with session_factory() as db:
+        article = Article(title="النوم", content="نم مبكراً.", published=published)
+        db.add(article)
+        db.commit()
+        return article.id
+
+
+def test_source_hash_tracks_field_changes():
+    """
+    اختبار أن بصمة المحتوى لا تعتمد على ترتيب الحقول وتتغير بتغير أي حقل.
+    """
+    fields = {"title": "Breathing", "content": "Breathe in slowly."}
+
+    assert source_hash(fields) == source_hash(dict(reversed(list(fields.items()))))
+    assert source_hash(fields) != source_hash({**fields, "content": "Breathe out slowly."})
+
+
+def test_content_fields_skips_empty_values():
+    """
+    اختبار تجاهل الحقول الفارغة عند استخراج النصوص القابلة للترجمة.
+    """
+    class Article:
+        title = "Sleep"
+        summary = "  "
+        content = None
+
+    assert content_fields("article", Article()) == {"title": "Sleep"}
+
+
+def test_worker_deduplicates_queued_content():
+    """
+    اختبار تجاهل المهام المكررة للمحتوى نفسه ما دامت في الطابور.
+    """
+    processed = []
+    worker = PretranslationWorker(workers=1, process=lambda *key: processed.append(key))
+
+    assert worker.enqueue("article", 1)
+    assert not worker.enqueue("article", 1)
+    assert worker.enqueue("article", 2)
+
+    worker.start()
+    worker.join()
+    worker.stop(timeout=1)
+
+    assert processed == [("article", 1), ("article", 2)]
+    assert worker.get_stats() == {"queued": 0, "processed": 2, "failed": 0}
+
+
+def test_worker_survives_failures_and_reruns_changed_content():
+    """
+    اختبار استمرار العامل بعد فشل مهمة وإعادة معالجة المحتوى المعدل أثناء ترجمته.
+    """
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def process(content_type, content_id):
+        calls.append((content_type, content_id))
+        if content_id == 1 and len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError("provider unavailable")
+
+    worker = PretranslationWorker(workers=2, process=process)
+    worker.enqueue("article", 1)
+    worker.start()
+    started.wait(5)
+
+    # تعديل المحتوى أثناء ترجمته: لا يُعالج بالتوازي بل يُعاد بعد انتهاء المعالجة الحالية
+    assert worker.enqueue("article", 1)
+    release.set()
+    worker.join()
+    worker.stop(timeout=1)
+
+    assert calls == [("article", 1), ("article", 1)]
+    assert worker.failed == 1
+    assert worker.processed == 1
+
+
+def test_translate_content_stores_each_locale_once_per_version(pretranslation):
+    """
+    اختبار أن الترجمة المسبقة تخزن كل لغة عدا لغة المحتوى الأصلية، ولا تعيد
+    ترجمة نسخة مترجمة، وتعيد الترجمة بعد التعديل، وتحذف ترجمات المحتوى المحذوف.
+    """
+    session_factory, worker, calls = pretranslation
+    article_id = add_article(session_factory)
+
+    worker.translate_content("article", article_id)
+    worker.translate_content("article", article_id)
+
+    assert sorted(calls["translate"]) == ["en", "fr"]
+    with session_factory() as db:
+        rows = {row.locale: row for row in db.query(ContentTranslation)}
+        assert sorted(rows) == ["en", "fr"]
+        assert rows["en"].source_locale == "ar"
+        assert rows["en"].fields == '{"title": "en:النوم", "content": "en:نم مبكراً."}'
+
+        db.get(Article, article_id).title = "الأرق"
+        db.commit()
+    worker.translate_content("article", article_id)
+    assert sorted(calls["translate"]) == ["en", "en", "fr", "fr"]
+
+    with session_factory() as db:
+        db.delete(db.get(Article, article_id))
+        db.commit()
+    worker.translate_content("article", article_id)
+    with session_factory() as db:
+        assert db.query(ContentTranslation).count() == 0
+
+
+def test_listeners_queue_changed_content_after_commit(pretranslation):
+    """
+    اختبار أن المحتوى الجديد أو المعدلة حقوله النصية أو حالة نشره يُضاف إلى الطابور
+    بعد commit فقط، وأن تعديل الحقول الأخرى لا يعيد الترجمة.
+    """
+    session_factory, worker, _ = pretranslation
+    event.listen(session_factory, "after_flush", lambda session, context: collect_changed_content(session))
+    event.listen(session_factory, "after_commit", enqueue_changed_content)
+
+    with session_factory() as db:
+        article = Article(title="النوم", content="نم مبكراً.")
+        db.add(article)
+        db.flush()
+        assert queued(worker) == []
+        db.commit()
+        assert queued(worker) == [("article", article.id)]
+        worker._queue.get_nowait()
+        worker._pending.clear()
+
+        article.author = "فريق المحتوى"
+        db.commit()
+        assert queued(worker) == []
+
+        article.published = True
+        db.commit()
+        assert queued(worker) == [("article", article.id)]
+
+
+def test_translated_content_serves_stored_translations_and_the_source_locale(pretranslation):
+    """
+    اختبار ما تعيده /content-type: حالة pending مع إضافة المحتوى إلى الطابور قبل
+    الترجمة، والترجمة المخزنة بعدها، واللغة الأصلية بحقولها الأصلية دون إضافة إلى
+    الطابور، وعدم إظهار المسودات غير المنشورة.
+    """
+    session_factory, worker, calls = pretranslation
+    article_id = add_article(session_factory)
+    draft_id = add_article(session_factory, published=False)
+
+    with session_factory() as db:
+        assert get_published_content(db, "article", draft_id) is None
+        article = get_published_content(db, "article", article_id)
+
+        source = get_translated_content(db, "article", article, "ar")
+        assert source["status"] == "completed"
+        assert source["translated_content"]["title"] == "النوم"
+        assert queued(worker) == []
+
+        pending = get_translated_content(db, "article", article, "en")
+        assert pending["status"] == "pending" and pending["translated_content"] is None
+        assert queued(worker) == [("article", article_id)]
+
+    worker.translate_content("article", article_id)
+    detections = calls["detect"]
+    with session_factory() as db:
+        article = get_published_content(db, "article", article_id)
+        translated = get_translated_content(db, "article", article, "en")
+        source = get_translated_content(db, "article", article, "ar")
+
+    assert translated["status"] == "completed"
+    assert translated["translated_content"]["title"] == "en:النوم"
+    assert translated["source_language"] == "ar"
+    # لغة المحتوى الأصلية تُقرأ من الترجمات المخزنة دون كشف جديد
+    assert source["status"] == "completed"
+    assert calls["detect"] == detections
+
+
+def test_translation_progress_reports_source_translated_and_outdated_locales(pretranslation):
+    """
+    اختبار ما تعيده /progress: اللغة الأصلية والمترجمة والقديمة بعد تعديل المحتوى.
+    """
+    session_factory, worker, _ = pretranslation
+    article_id = add_article(session_factory)
+    worker.translate_content("article", article_id)
+
+    with session_factory() as db:
+        article = db.get(Article, article_id)
+        progress = get_translation_progress(db, "article", article)
+        article.summary = "ملخص جديد"
+        db.commit()
+        outdated = get_translation_progress(db, "article", article)
+
+    assert progress["source_language"] == "ar"
+    assert [language["status"] for language in progress["languages"]] == ["source", "translated", "translated"]
+    assert progress["translation_percentage"] == 100.0
+    assert [language["status"] for language in outdated["languages"]] == ["source", "outdated", "outdated"]
+    assert outdated["translated_languages"] == 1
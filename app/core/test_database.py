@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import database
+from app.core.database import (InstrumentedQueuePool, RequestSessionMiddleware, _collect_pool_metrics,
+                               async_database_url, dispose_async_engine, get_async_db, get_db,
+                               get_request_session, pool_checkout_wait, pool_metrics, pool_timeouts)
+from app.core.metrics import metrics_registry
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def observations(metric):
+    return sum(value for name, _, value in metric.samples() if not name.endswith(("_bucket", "_sum")))
+
+
+def test_pool_reports_checkout_wait_checked_out_and_timeouts(tmp_path):
+    """
+    اختبار أن المجمع يسجل زمن انتظار الاتصال والمهلات، وأن المؤشرات اللحظية
+    تعرض الاتصالات المحجوزة والإضافية.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=1, pool_timeout=0.1)
+    waits, timeouts = observations(pool_checkout_wait), observations(pool_timeouts)
+
+    def gauges():
+        return {name: samples[0][1] for name, _, _, samples in pool_metrics({"sync": engine.pool})}
+
+    held = [engine.connect(), engine.connect()]
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    busy = gauges()
+    for connection in held:
+        connection.close()
+
+    assert observations(pool_checkout_wait) == waits + 3
+    assert observations(pool_timeouts) == timeouts + 1
+    assert busy["db_pool_size"] == 1
+    assert busy["db_pool_checked_out"] == 2
+    assert busy["db_pool_overflow"] == 1
+    assert gauges()["db_pool_checked_out"] == 0
+
+
+def test_middleware_and_endpoint_share_one_session_per_request(monkeypatch):
+    """
+    اختبار أن الوسيط والتبعيات ونقطة النهاية يستخدمون جلسة واحدة لكل طلب،
+    وأنها تُغلق بعد انتهاء الوسيط الخارجي.
+    """
+    created = []
+
+    def session_factory():
+        created.append(FakeSession())
+        return created[-1]
+
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    seen = []
+
+    class RecordingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            seen.append(get_request_session(request))
+            response = await call_next(request)
+            seen.append(get_request_session(request))
+            return response
+
+    def current_user(db=Depends(get_db)):
+        seen.append(db)
+        return 1
+
+    app = FastAPI()
+
+    @app.get("/profile")
+    def profile(user_id: int = Depends(current_user), db=Depends(get_db)):
+        seen.append(db)
+        return {"closed": db.closed}
+
+    @app.get("/bare")
+    def bare(request: Request):
+        return {}
+
+    app.add_middleware(RecordingMiddleware)
+    app.add_middleware(RequestSessionMiddleware)
+    client = TestClient(app)
+
+    assert client.get("/profile").json() == {"closed": False}
+    assert len(created) == 1 and all(db is created[0] for db in seen) and len(seen) == 4
+    assert created[0].closed
+
+    # بدون الوسيط تُغلق التبعية جلستها بنفسها
+    standalone = FastAPI()
+    standalone.get("/profile")(profile)
+    assert TestClient(standalone).get("/profile").json() == {"closed": False}
+    assert created[-1].closed
+
+    # الجلسة التي يفتحها الوسيط وحده تُغلق أيضاً
+    client.get("/bare")
+    assert len(created) == 3 and created[-1].closed
+
+
+def test_async_sessions_query_without_blocking_the_event_loop(tmp_path, monkeypatch):
+    """
+    اختبار أن get_async_db يعطي جلسة غير متزامنة من عنوان aiosqlite المشتق،
+    وأن الاستعلامات المتزامنة معها لا تحجب حلقة الأحداث.
+    """
+    assert async_database_url("postgresql://user:pw@db/app") == "postgresql+asyncpg://user:pw@db/app"
+    assert async_database_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+    path = tmp_path / "async.db"
+    with create_engine(f"sqlite:///{path}").begin() as connection:
+        connection.execute(text("CREATE TABLE numbers (value INTEGER)"))
+        connection.execute(text("INSERT INTO numbers VALUES (:value)"), [{"value": v} for v in range(50000)])
+    monkeypatch.setattr(database.settings, "async_database_url", f"sqlite+aiosqlite:///{path}")
+
+    async def query():
+        dependency = get_async_db()
+        db = await dependency.__anext__()
+        try:
+            return (await db.execute(text("SELECT sum(value) FROM numbers"))).scalar()
+        finally:
+            await dependency.aclose()
+
+    async def scenario():
+        ticks, stop = [], False
+
+        async def ticker():
+            while not stop:
+                start = time.perf_counter()
+                await asyncio.sleep(0)
+                ticks.append(time.perf_counter() - start)
+
+        ticking = asyncio.create_task(ticker())
+        totals = await asyncio.gather(*(query() for _ in range(20)))
+        gauges = {name: samples for name, _, _, samples in _collect_pool_metrics()}
+        stop = True
+        await ticking
+        await dispose_async_engine()
+        return totals, ticks, gauges
+
+    totals, ticks, gauges = asyncio.run(scenario())
+
+    assert totals == [sum(range(50000))] * 20
+    assert len(ticks) > 20 and max(ticks) < 0.05
+    assert ({"engine": "async"}, 0) in gauges["db_pool_checked_out"]
+    assert "db_pool_checkout_wait_seconds" in metrics_registry.render()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import random
+
+from app.core.group_rooms import GroupPostWriter, GroupRoomHub, MemoryRoomStore
+from app.core.presence import MemoryPresenceBackend, PresenceHub, PresenceRegistry
+from app.core.websocket_protocol import DEFAULT_PROTOCOL
+
+ROOMS = 200
+MEMBERS = 50
+POSTS_PER_ROOM = 10
+
+
+class FakeSender:
+    def __init__(self):
+        self.frames = []
+
+    def send_nowait(self, frame):
+        self.frames.append(json.loads(frame))
+
+
+class FakeConnection:
+    """اتصال عضو وهمي يسجل الإطارات المرسلة إليه"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.protocol = DEFAULT_PROTOCOL
+        self.sender = FakeSender()
+
+    def sequences(self):
+        return [frame["seq"] for frame in self.sender.frames if frame["type"] == "message"]
+
+
+class FakeRepository:
+    """مستودع رسائل في الذاكرة بدل group_posts"""
+
+    def __init__(self):
+        self.rows = []
+        self.batches = 0
+
+    def is_member(self, group_id, user_id):
+        return True
+
+    def latest_sequence(self, group_id):
+        return max((row["sequence"] for row in self.rows if row["group_id"] == group_id), default=0)
+
+    def messages_after(self, group_id, after_seq, limit):
+        rows = sorted((row for row in self.rows if row["group_id"] == group_id and row["sequence"] > after_seq),
+                      key=lambda row: row["sequence"])[:limit]
+        return [{"type": "message", "group_id": group_id, "user_id": row["user_id"],
+                 "content": row["content"], "seq": row["sequence"]} for row in rows]
+
+    def insert(self, rows):
+        self.batches += 1
+        self.rows.extend(rows)
+
+
+def create_hub(store, repository, registry, **kwargs):
+    writer = GroupPostWriter(repository, flush_ms=20, batch_size=500, max_pending=100000)
+    return GroupRoomHub(store, repository, writer, registry, gap_timeout_ms=100, **kwargs)
+
+
+async def wait_until(predicate, timeout=10):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.02)
+
+
+def test_rooms_fan_out_in_order_across_workers_and_persist_in_batches():
+    """
+    اختبار حمل: 200 غرفة × 50 عضواً موزعين على عمليتين؛ كل عضو يستلم كل رسائل
+    غرفته بالترتيب دون فجوات أو تكرار، وتُحفظ الرسائل على دفعات.
+    """
+    async def scenario():
+        presence = PresenceHub()
+        store, repository = MemoryRoomStore(), FakeRepository()
+        registries = [PresenceRegistry(MemoryPresenceBackend(presence, poll_interval=0.01),
+                                       worker_id=f"worker-{index}") for index in range(2)]
+        hubs = [create_hub(store, repository, registry) for registry in registries]
+        for registry, hub in zip(registries, hubs):
+            await registry.start()
+            hub.start()
+
+        members = {}
+        for group_id in range(1, ROOMS + 1):
+            members[group_id] = [FakeConnection(user_id) for user_id in range(MEMBERS)]
+            await asyncio.gather(*(hubs[index % 2].join(group_id, connection)
+                                   for index, connection in enumerate(members[group_id])))
+
+        rng = random.Random(0)
+        posts = [(group_id, rng.randrange(MEMBERS)) for group_id in members for _ in range(POSTS_PER_ROOM)]
+        rng.shuffle(posts)
+        await asyncio.gather(*(hubs[user_id % 2].post(group_id, user_id, f"hello from {user_id}")
+                               for group_id, user_id in posts))
+
+        everyone = [connection for connections in members.values() for connection in connections]
+        await wait_until(lambda: all(len(connection.sequences()) == POSTS_PER_ROOM for connection in everyone))
+        for hub, registry in zip(hubs, registries):
+            await hub.stop()
+            await registry.stop()
+        return everyone, repository
+
+    everyone, repository = asyncio.run(scenario())
+
+    expected = list(range(1, POSTS_PER_ROOM + 1))
+    assert all(connection.sequences() == expected for connection in everyone)
+    assert len(repository.rows) == ROOMS * POSTS_PER_ROOM
+    assert len({(row["group_id"], row["sequence"]) for row in repository.rows}) == ROOMS * POSTS_PER_ROOM
+    assert repository.batches < ROOMS * POSTS_PER_ROOM / 10
+
+
+def test_reconnecting_member_resumes_from_buffer_and_database():
+    """
+    اختبار أن العضو العائد بـ after_seq يستلم الرسائل الفائتة (القديمة من قاعدة
+    البيانات والحديثة من المخزن) ثم الرسائل الحية دون فجوة.
+    """
+    async def scenario():
+        repository = FakeRepository()
+        hub = create_hub(MemoryRoomStore(buffer_size=2), repository,
+                         PresenceRegistry(MemoryPresenceBackend(), worker_id="solo"))
+        reader, writer = FakeConnection(1), FakeConnection(2)
+        await hub.join(7, reader)
+        await hub.join(7, writer)
+        for index in range(3):
+            await hub.post(7, 2, f"seen {index}")
+        await hub.leave(7, reader)
+        for index in range(5):
+            await hub.post(7, 2, f"missed {index}")
+        await hub.writer.flush()
+
+        returning = FakeConnection(1)
+        await hub.join(7, returning, after_seq=reader.sequences()[-1])
+        await hub.post(7, 2, "live")
+        await hub.stop()
+        return reader, returning
+
+    reader, returning = asyncio.run(scenario())
+
+    assert reader.sequences() == [1, 2, 3]
+    assert returning.sender.frames[0] == {"type": "joined", "group_id": 7, "latest_seq": 8}
+    assert returning.sequences() == [4, 5, 6, 7, 8, 9]
+    assert [frame["content"] for frame in returning.sender.frames[1:]] == [
+        "missed 0", "missed 1", "missed 2", "missed 3", "missed 4", "live"]
+
+
+def test_out_of_order_messages_are_held_and_missing_ones_filled():
+    """
+    اختبار أن الرسالة التي تسبق سابقتها تُحجز، وأن الناقصة تُجلب من المخزن بعد المهلة.
+    """
+    async def scenario():
+        store = MemoryRoomStore()
+        hub = create_hub(store, FakeRepository(), PresenceRegistry(MemoryPresenceBackend(), worker_id="solo"))
+        member = FakeConnection(1)
+        await hub.join(3, member)
+        first, second, third = [await store.append(3, {"type": "message", "content": str(index)})
+                                for index in range(3)]
+        room = hub._rooms[3]
+        hub._on_message(room, json.dumps(second))
+        held = member.sequences()
+        hub._on_message(room, json.dumps(first))
+        in_order = member.sequences()
+        # الرسالة الثالثة لا تصل عبر النشر: تُجلب من المخزن عند وصول الرابعة
+        fourth = await store.append(3, {"type": "message", "content": "3"})
+        hub._on_message(room, json.dumps(fourth))
+        await wait_until(lambda: len(member.sequences()) == 4)
+        await hub.stop()
+        return held, in_order, member.sequences(), third
+
+    held, in_order, filled, third = asyncio.run(scenario())
+
+    assert held == []
+    assert in_order == [1, 2]
+    assert filled == [1, 2, third["seq"], 4]
@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+from app.core.inflight import InFlightRequests
+
+
+def test_waiters_share_result_and_error():
+    """
+    اختبار أن الطلبات المنتظرة تتلقى نتيجة أو خطأ الاستدعاء الجاري نفسه.
+    """
+    in_flight = InFlightRequests()
+    started, release = threading.Event(), threading.Event()
+    outcomes = []
+
+    def call():
+        started.set()
+        release.wait(5)
+        raise ValueError("provider down")
+
+    def follower():
+        try:
+            in_flight.run("key", lambda: "unused")
+        except ValueError as e:
+            outcomes.append(str(e))
+
+    leader = threading.Thread(target=lambda: pytest.raises(ValueError, in_flight.run, "key", call))
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=follower)
+    waiter.start()
+    while in_flight.get_stats()["shared"] < 1:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join(timeout=5)
+    waiter.join(timeout=5)
+
+    assert outcomes == ["provider down"]
+
+    # بعد انتهاء الاستدعاء يُنفذ الطلب التالي من جديد
+    assert in_flight.run("key", lambda: "fresh") == "fresh"
+    assert in_flight.get_stats() == {"in_flight": 0, "executed": 2, "shared": 1}
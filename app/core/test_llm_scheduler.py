@@ -0,0 +1,144 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.llm_scheduler import LLMScheduler, Priority, TokenBucket
+
+
+class ProviderError(Exception):
+    """خطأ وهمي بنفس شكل أخطاء مكتبات المزودين"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def make_scheduler(**kwargs):
+    """مجدول بحدود واسعة وانتظار مسجّل بدلاً من النوم الفعلي"""
+    delays = []
+    options = dict(requests_per_minute=6000, tokens_per_minute=1_000_000,
+                   max_concurrency=4, max_retries=3, backoff_base=0.5,
+                   backoff_max=10, sleep=delays.append)
+    options.update(kwargs)
+    return LLMScheduler(**options), delays
+
+
+def test_higher_priority_runs_first():
+    """
+    اختبار أن الطلبات التفاعلية تتقدم على طلبات الخلفية في الطابور.
+    """
+    scheduler, _ = make_scheduler(max_concurrency=1)
+    release = threading.Event()
+    order = []
+
+    blocker = threading.Thread(target=scheduler.run, args=(release.wait,))
+    blocker.start()
+    while scheduler.get_stats()["active"] == 0:
+        time.sleep(0.001)
+
+    threads = []
+    for priority in (Priority.BACKGROUND, Priority.API, Priority.INTERACTIVE):
+        thread = threading.Thread(target=scheduler.run, args=(
+            lambda priority=priority: order.append(priority), priority))
+        thread.start()
+        threads.append(thread)
+        while sum(scheduler.get_stats()["queue_depth"].values()) < len(threads):
+            time.sleep(0.001)
+
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join(timeout=5)
+
+    assert order == [Priority.INTERACTIVE, Priority.API, Priority.BACKGROUND]
+    assert scheduler.get_stats()["wait_time"]["background"]["count"] == 1
+
+
+def test_rate_limit_retry_honours_retry_after():
+    """
+    اختبار إعادة المحاولة بعد 429 مع احترام ترويسة Retry-After.
+    """
+    scheduler, delays = make_scheduler()
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ProviderError(429, {"retry-after": "0.05"})
+        return "ok"
+
+    assert scheduler.run(call) == "ok"
+    assert delays == [0.05]
+    stats = scheduler.get_stats()
+    assert stats["retries"] == 1
+    assert stats["rate_limited"] == 1
+    assert stats["completed"] == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    """
+    اختبار أن التأخير الأسي عشوائي ولا يتجاوز الحد الأقصى.
+    """
+    scheduler, delays = make_scheduler(max_retries=6, backoff_max=2)
+
+    def call():
+        raise ProviderError(503)
+
+    with pytest.raises(ProviderError):
+        scheduler.run(call)
+
+    assert len(delays) == 6
+    assert all(0 <= delay <= min(2, 0.5 * 2 ** attempt)
+               for attempt, delay in enumerate(delays))
+    assert scheduler.get_stats()["failed"] == 1
+
+
+def test_non_retryable_errors_are_raised_immediately():
+    """
+    اختبار أن الأخطاء غير المؤقتة لا يُعاد إرسالها.
+    """
+    scheduler, delays = make_scheduler()
+
+    with pytest.raises(ProviderError):
+        scheduler.run(lambda: (_ for _ in ()).throw(ProviderError(400)))
+
+    assert delays == []
+
+
+def test_token_bucket_wait_time():
+    """
+    اختبار حساب وقت الانتظار في دلو الرموز وتصحيح الاستهلاك الفعلي.
+    """
+    bucket = TokenBucket(capacity=600, refill_per_second=10)
+    now = bucket.updated_at
+
+    assert bucket.wait_time(500, now) == 0
+    bucket.consume(500)
+    assert bucket.wait_time(200, now) == pytest.approx(10.0)
+
+    bucket.refund(300)
+    assert bucket.wait_time(200, now) == 0
+
+
+def test_stream_holds_its_slot_until_exhausted_or_closed():
+    """
+    اختبار أن البث يحتفظ بمكانه في المجدول حتى استنفاده أو إغلاقه، وأن حصة
+    الرموز تُصحح بالاستهلاك الفعلي عند انتهائه.
+    """
+    scheduler, _ = make_scheduler(tokens_per_minute=1000)
+
+    stream = scheduler.stream(lambda: iter(["ab", "cd"]), estimated_tokens=500,
+                              usage=lambda text: len(text))
+    assert scheduler.get_stats()["active"] == 1
+    assert list(stream) == ["ab", "cd"]
+    assert scheduler.get_stats()["active"] == 0
+    assert scheduler.token_bucket.tokens == pytest.approx(996, abs=1)
+
+    stream = scheduler.stream(lambda: iter(["ab", "cd"]), estimated_tokens=500)
+    assert next(stream) == "ab"
+    assert scheduler.get_stats()["active"] == 1
+    stream.close()
+    stream.close()
+    assert scheduler.get_stats()["active"] == 0
@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from app.core.loop_monitor import EventLoopLagMonitor, loop_lag, resident_memory_bytes
+
+
+def test_blocking_the_loop_is_measured_as_lag():
+    """
+    اختبار أن حجب حلقة الأحداث بعمل متزامن يظهر في أقصى تأخر وفي المدرج.
+    """
+    async def scenario():
+        monitor = EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        quiet = monitor.max_lag
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return quiet, monitor.max_lag
+
+    def observations():
+        return sum(value for name, _, value in loop_lag.samples() if name.endswith("_count"))
+
+    before = observations()
+    quiet, blocked = asyncio.run(scenario())
+
+    assert quiet < 0.1
+    assert blocked >= 0.15
+    assert observations() > before
+    assert resident_memory_bytes() is None or resident_memory_bytes() > 0
@@ -0,0 +1,42 @@
+from app.core.metrics import MetricsRegistry
+
+
+def test_render_prometheus_text_format():
+    """
+    اختبار تنسيق العدادات والمدرجات التكرارية والقيم اللحظية.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("outcome",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    registry.register_collector(lambda: [("queue_depth", "gauge", "Queue.", [({}, 3)])])
+
+    requests.inc(outcome="success")
+    requests.inc(2, outcome="success")
+    latency.observe(0.05, route='say "hi"')
+    latency.observe(0.5, route='say "hi"')
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{outcome="success"} 3' in lines
+    assert 'latency_seconds_bucket{route="say \\"hi\\"",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="say \\"hi\\"",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="say \\"hi\\"",le="+Inf"} 2' in lines
+    assert 'latency_seconds_count{route="say \\"hi\\""} 2' in lines
+    assert "queue_depth 3" in lines
+
+
+def test_label_cardinality_is_bounded():
+    """
+    اختبار جمع السلاسل الزائدة عن الحد الأقصى تحت "other".
+    """
+    registry = MetricsRegistry()
+    counter = registry.counter("pairs_total", "Pairs.", ("pair",))
+    counter.max_series = 2
+
+    for index in range(5):
+        counter.inc(pair=f"en-{index}")
+
+    assert counter.value(pair="en-0") == 1
+    assert counter.value(pair="other") == 3
+    assert len(list(counter.samples())) == 3
@@ -0,0 +1,88 @@
+import asyncio
+import multiprocessing
+
+from app.core.presence import MemoryPresenceBackend, PresenceHub, PresenceRegistry
+
+
+def run_worker(hub, index, ready, done, results):
+    """عملية عاملة وهمية: تسجل مستخدماً واحداً وتعيد الرسائل التي وصلته"""
+    async def main():
+        registry = PresenceRegistry(MemoryPresenceBackend(hub, poll_interval=0.05),
+                                    worker_id=f"worker-{index}", heartbeat_seconds=0.1,
+                                    worker_ttl_seconds=5)
+        await registry.start()
+        received = []
+        await registry.register("realtime", index, received.append, {"language": "ar"})
+        ready.set()
+        await asyncio.to_thread(done.wait, 10)
+        await asyncio.sleep(0.2)
+        await registry.stop()
+        results.put((index, received))
+
+    asyncio.run(main())
+
+
+def test_presence_and_messages_span_worker_processes():
+    """
+    اختبار أن قائمة المستخدمين النشطين والرسائل الشخصية والبث تشمل جميع العمليات.
+    """
+    context = multiprocessing.get_context("fork")
+    with context.Manager() as manager:
+        hub = PresenceHub(manager)
+        ready = [context.Event() for _ in range(3)]
+        done = context.Event()
+        results = context.Queue()
+        workers = [context.Process(target=run_worker, args=(hub, index, ready[index], done, results))
+                   for index in range(3)]
+        for worker in workers:
+            worker.start()
+        try:
+            assert all(event.wait(10) for event in ready)
+
+            async def scenario():
+                registry = PresenceRegistry(MemoryPresenceBackend(hub), worker_id="front")
+                await registry.start()
+                active = await registry.active_connections("realtime")
+                await registry.send_to_user("realtime", 1, "for user 1")
+                await registry.broadcast("realtime", "for everyone")
+                await registry.stop()
+                return active
+
+            active = asyncio.run(scenario())
+        finally:
+            done.set()
+            received = dict(results.get(timeout=10) for _ in workers)
+            for worker in workers:
+                worker.join(10)
+
+    assert sorted((record["user_id"], record["worker_id"]) for record in active) == [
+        (0, "worker-0"), (1, "worker-1"), (2, "worker-2")]
+    assert {record["language"] for record in active} == {"ar"}
+    assert received == {0: ["for everyone"], 1: ["for user 1", "for everyone"], 2: ["for everyone"]}
+
+
+def test_connections_of_expired_workers_are_ignored():
+    """
+    اختبار أن اتصالات عملية توقف نبضها لا تظهر ولا تُرسل إليها رسائل.
+    """
+    async def scenario():
+        hub = PresenceHub()
+        alive = PresenceRegistry(MemoryPresenceBackend(hub), worker_id="alive")
+        crashed = PresenceRegistry(MemoryPresenceBackend(hub), worker_id="crashed",
+                                   worker_ttl_seconds=0.01)
+        received = []
+        await alive.start()
+        await crashed.backend.heartbeat("crashed", 0.01)
+        await alive.register("websocket", 1, received.append)
+        await crashed.register("websocket", 2, received.append)
+        await asyncio.sleep(0.05)
+        active = await alive.active_connections("websocket")
+        await alive.send_to_user("websocket", 1, "local")
+        await alive.stop()
+        return active, received, hub.channels
+
+    active, received, channels = asyncio.run(scenario())
+
+    assert [record["user_id"] for record in active] == [1]
+    assert received == ["local"]
+    assert "crashed" not in channels
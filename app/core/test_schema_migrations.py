@@ -0,0 +1,74 @@
+import importlib.util
+import os
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+
+VERSIONS = os.path.join(os.path.dirname(__file__), "..", "..", "alembic", "versions")
+
+
+def load_migration(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(VERSIONS, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(connection, step):
+    context = MigrationContext.configure(connection)
+    with Operations.context(context), context.begin_transaction():
+        step()
+    connection.commit()
+
+
+def test_content_translations_table_is_created_on_existing_databases(tmp_path):
+    """
+    اختبار أن الترحيل ينشئ content_translations بقيد التفرد في قاعدة أُنشئت قبله،
+    وأن تكراره آمن، وأن التراجع يحذفه.
+    """
+    migration = load_migration("0003_content_translations")
+    engine = create_engine(f"sqlite:///{tmp_path / 'content.db'}")
+    with engine.connect() as connection:
+        run(connection, migration.upgrade)
+        run(connection, migration.upgrade)
+        columns = [column["name"] for column in inspect(connection).get_columns("content_translations")]
+        constraints = inspect(connection).get_unique_constraints("content_translations")
+
+        run(connection, migration.downgrade)
+        tables = inspect(connection).get_table_names()
+
+    assert columns == ["id", "content_type", "content_id", "locale", "source_locale", "source_hash",
+                       "fields", "created_at", "updated_at"]
+    assert [(c["name"], c["column_names"]) for c in constraints] == [
+        ("uq_content_translations_content_locale", ["content_type", "content_id", "locale"])]
+    assert "content_translations" not in tables
+
+
+def test_group_posts_sequence_is_added_to_existing_tables(tmp_path):
+    """
+    اختبار أن الترحيل يضيف sequence وقيد التفرد إلى group_posts الموجود مع
+    الإبقاء على الرسائل القديمة، وأن تكراره آمن، وأن التراجع يزيلهما.
+    """
+    migration = load_migration("0004_group_post_sequence")
+    engine = create_engine(f"sqlite:///{tmp_path / 'groups.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE group_posts (id INTEGER PRIMARY KEY, group_id INTEGER NOT NULL, "
+                                "user_id INTEGER NOT NULL, content TEXT NOT NULL, created_at TIMESTAMP)"))
+        connection.execute(text("INSERT INTO group_posts (group_id, user_id, content) VALUES (1, 1, 'old')"))
+        connection.commit()
+
+        run(connection, migration.upgrade)
+        run(connection, migration.upgrade)
+        columns = [column["name"] for column in inspect(connection).get_columns("group_posts")]
+        constraints = inspect(connection).get_unique_constraints("group_posts")
+        rows = connection.execute(text("SELECT content, sequence FROM group_posts")).all()
+
+        run(connection, migration.downgrade)
+        after_downgrade = [column["name"] for column in inspect(connection).get_columns("group_posts")]
+
+    assert "sequence" in columns
+    assert [(c["name"], c["column_names"]) for c in constraints] == [
+        ("uq_group_posts_group_sequence", ["group_id", "sequence"])]
+    assert rows == [("old", None)]
+    assert "sequence" not in after_downgrade
@@ -0,0 +1,54 @@
+import importlib.util
+import os
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+
+MIGRATION = os.path.join(os.path.dirname(__file__), "..", "..", "alembic", "versions",
+                         "0001_tracker_time_series_indexes.py")
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("tracker_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(connection, step):
+    context = MigrationContext.configure(connection)
+    with Operations.context(context), context.begin_transaction():
+        step()
+    connection.commit()
+
+
+def test_migration_adds_range_indexes_used_by_tracker_queries(tmp_path):
+    """
+    اختبار أن الترحيل ينشئ فهرس (user_id, created_at) للجداول الموجودة فقط،
+    وأن تكراره آمن، وأن استعلام النطاق الزمني يستخدم الفهرس، وأن التراجع يحذفه.
+    """
+    migration = load_migration()
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE mood_entries (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                                "mood_score INTEGER, created_at TIMESTAMP)"))
+        connection.commit()
+
+        run(connection, migration.upgrade)
+        run(connection, migration.upgrade)
+        indexes = inspect(connection).get_indexes("mood_entries")
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM mood_entries WHERE user_id = 1 "
+            "AND created_at >= '2026-01-01' AND created_at < '2026-02-01' ORDER BY created_at")).all()
+        connection.commit()
+
+        run(connection, migration.downgrade)
+        after_downgrade = inspect(connection).get_indexes("mood_entries")
+        tables = inspect(connection).get_table_names()
+
+    assert [(index["name"], index["column_names"]) for index in indexes] == [
+        ("ix_mood_entries_user_id_created_at", ["user_id", "created_at"])]
+    assert "ix_mood_entries_user_id_created_at" in plan[0][-1]
+    assert after_downgrade == []
+    assert tables == ["mood_entries"]
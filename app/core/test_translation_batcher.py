@@ -0,0 +1,70 @@
+import asyncio
+
+from app.core.translation_batcher import TranslationMicroBatcher
+
+
+class RecordingBackend:
+    """دالة ترجمة دفعات وهمية تسجّل الاستدعاءات"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def translate_batch(self, texts, target_locale, source_locale=None):
+        self.calls.append((list(texts), target_locale, source_locale))
+        await asyncio.sleep(0)
+        return [f"{target_locale}:{text}" for text in texts]
+
+
+def test_requests_within_window_share_one_call():
+    """
+    اختبار أن الطلبات المتزامنة لنفس زوج اللغات تُرسل كدفعة واحدة.
+    """
+    backend = RecordingBackend()
+    batcher = TranslationMicroBatcher(
+        translate_batch=backend.translate_batch, window_ms=10, max_items=100)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(batcher.translate(f"msg {i}", "ar", "en") for i in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert results == [f"ar:msg {i}" for i in range(10)]
+    assert len(backend.calls) == 1
+
+
+def test_batches_are_split_by_language_pair_and_size():
+    """
+    اختبار فصل الدفعات حسب زوج اللغات والحد الأقصى لعدد العناصر.
+    """
+    backend = RecordingBackend()
+    batcher = TranslationMicroBatcher(
+        translate_batch=backend.translate_batch, window_ms=10, max_items=4)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(batcher.translate("hi", "ar", "en") for _ in range(6)),
+            *(batcher.translate("hi", "fr", "en") for _ in range(2)))
+
+    results = asyncio.run(scenario())
+
+    assert results == ["ar:hi"] * 6 + ["fr:hi"] * 2
+    assert sorted(len(texts) for texts, _, _ in backend.calls) == [2, 2, 4]
+    assert {target for _, target, _ in backend.calls} == {"ar", "fr"}
+
+
+def test_failed_batch_resolves_every_caller():
+    """
+    اختبار أن فشل الدفعة يعيد None لكل طلب بدلاً من تعليقه.
+    """
+    async def failing_batch(texts, target_locale, source_locale=None):
+        raise RuntimeError("provider down")
+
+    batcher = TranslationMicroBatcher(
+        translate_batch=failing_batch, window_ms=1, max_items=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(batcher.translate("hi", "ar", "en") for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [None, None, None]
@@ -0,0 +1,50 @@
+from app.core.translation_memory import TranslationMemory, segment_text
+
+
+def translatable(pieces):
+    return [piece for piece, is_translatable in pieces if is_translatable]
+
+
+def test_segment_text_round_trips_formatting():
+    """
+    اختبار أن ضم المقاطع يعيد النص الأصلي مع بادئات القوائم والأسطر الفارغة.
+    """
+    text = "## Title\n\n  1. First step. Second step!\n- Item?\t\n\n2024\n"
+
+    pieces = segment_text(text, "en", "sentence")
+
+    assert "".join(piece for piece, _ in pieces) == text
+    assert translatable(pieces) == ["Title", "First step.", "Second step!", "Item?"]
+    assert translatable(segment_text(text, "en", "paragraph")) == [
+        "Title", "First step. Second step!", "Item?"]
+
+
+def test_sentence_splitter_is_locale_aware():
+    """
+    اختبار الاختصارات وعلامات نهاية الجملة الخاصة بكل لغة.
+    """
+    assert translatable(segment_text("Talk to Dr. Smith today. Then rest.", "en", "sentence")) == [
+        "Talk to Dr. Smith today.", "Then rest."]
+    assert translatable(segment_text("Voir p.ex. la page. Puis M. Dupont.", "fr", "sentence")) == [
+        "Voir p.ex. la page.", "Puis M. Dupont."]
+    assert translatable(segment_text("كيف حالك؟ أنا بخير.", "ar", "sentence")) == [
+        "كيف حالك؟", "أنا بخير."]
+    assert translatable(segment_text("深呼吸します。ゆっくり休みます。", "ja", "sentence")) == [
+        "深呼吸します。", "ゆっくり休みます。"]
+
+
+def test_translation_memory_normalizes_and_evicts():
+    """
+    اختبار توحيد المسافات في مفاتيح الذاكرة وإزالة أقدم المدخلات.
+    """
+    memory = TranslationMemory(max_entries=2)
+    memory.set("Rest  well.", "en", "ar", "استرح جيداً.")
+    memory.set("Sleep.", "en", "ar", "نم.")
+
+    assert memory.get("Rest well.", "en", "ar") == "استرح جيداً."
+    assert memory.get("Rest well.", "en", "fr") is None
+
+    memory.set("Breathe.", "en", "ar", "تنفس.")
+
+    assert memory.get("Sleep.", "en", "ar") is None
+    assert memory.get_stats()["entries"] == 2
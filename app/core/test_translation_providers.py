@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from app.core.translation_providers import (
+    CircuitBreaker,
+    FakeProvider,
+    NoProviderAvailableError,
+    ProviderRouter,
+    build_providers,
+)
+
+MESSAGES = [{"role": "system", "content": "translate"}, {"role": "user", "content": "hello"}]
+
+
+def make_router(*providers, **kwargs):
+    """موجّه بقواطع دائرة سريعة الفتح للاختبار"""
+    router = ProviderRouter(list(providers), **kwargs)
+    for name in router.breakers:
+        router.breakers[name] = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    return router
+
+
+def test_router_prefers_lower_latency_provider():
+    """
+    اختبار ترتيب المزودين حسب زمن الاستجابة ومعدل الأخطاء.
+    """
+    slow, fast = FakeProvider("slow"), FakeProvider("fast")
+    router = make_router(slow, fast)
+    for _ in range(5):
+        router.health["slow"].record(0.5, True)
+        router.health["fast"].record(0.2, True)
+
+    result = router.complete(MESSAGES, 50)
+
+    assert result.provider == "fast"
+    assert result.text == "hello"
+
+    # معدل أخطاء مرتفع يجعل المزود الأسرع أقل تفضيلاً
+    for _ in range(5):
+        router.health["fast"].record(0.2, False)
+    assert [p.name for p in router.ranked_providers()] == ["slow", "fast"]
+
+
+def test_router_fails_over_and_opens_circuit():
+    """
+    اختبار الانتقال إلى المزود التالي عند الفشل وفتح قاطع الدائرة.
+    """
+    broken = FakeProvider("broken", error_rate=1.0)
+    backup = FakeProvider("backup")
+    router = make_router(broken, backup)
+
+    for _ in range(4):
+        assert router.complete(MESSAGES, 50).provider == "backup"
+
+    assert broken.calls == 2
+    assert router.get_stats()["providers"]["broken"]["circuit"] == CircuitBreaker.OPEN
+
+
+def test_circuit_half_open_allows_single_trial():
+    """
+    اختبار أن القاطع يسمح بطلب تجريبي واحد بعد انتهاء مهلة الفتح.
+    """
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_returns_first_answer():
+    """
+    اختبار إرسال طلب تحوطي للمزود الثاني عند تأخر الأول.
+    """
+    stalled = FakeProvider("stalled", latency=0.5)
+    quick = FakeProvider("quick")
+    router = make_router(stalled, quick, hedge_default_delay=0.02)
+
+    start = time.monotonic()
+    result = router.complete(MESSAGES, 50, hedge=True)
+
+    assert result.provider == "quick"
+    assert time.monotonic() - start < 0.4
+    assert router.hedges_fired == 1
+    assert router.hedges_won == 1
+
+
+def test_hedge_not_fired_for_fast_primary():
+    """
+    اختبار عدم إرسال طلب تحوطي إذا رد المزود الأول قبل التأخير.
+    """
+    primary, secondary = FakeProvider("primary"), FakeProvider("secondary")
+    router = make_router(primary, secondary, hedge_default_delay=0.5)
+
+    assert router.complete(MESSAGES, 50, hedge=True).provider == "primary"
+    assert secondary.calls == 0
+    assert router.hedges_fired == 0
+
+
+def test_stream_fails_over_before_first_chunk():
+    """
+    اختبار انتقال البث إلى مزود آخر إذا فشل قبل وصول أول جزء.
+    """
+    router = make_router(FakeProvider("broken", error_rate=1.0), FakeProvider("backup"))
+
+    assert list(router.stream(MESSAGES, 50)) == ["hello"]
+
+
+def test_no_provider_available():
+    """
+    اختبار الخطأ عند عدم وجود أي مزود.
+    """
+    with pytest.raises(NoProviderAvailableError):
+        ProviderRouter([]).complete(MESSAGES, 50)
+
+
+def test_build_providers_skips_unconfigured(monkeypatch):
+    """
+    اختبار تجاهل المزودين بدون مفاتيح API.
+    """
+    from app.config import settings
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.setattr(settings, "mistral_api_key", None)
+
+    providers = build_providers("openai, mistral, fake")
+
+    assert [provider.name for provider in providers] == ["fake"]
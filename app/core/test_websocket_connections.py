@@ -0,0 +1,106 @@
+import asyncio
+
+import msgpack
+
+from app.core.presence import presence_registry
+from app.core.websocket_connections import ConnectionTracker
+from app.core.websocket_protocol import DEFAULT_PROTOCOL, FIELD_TAGS, negotiate_protocol
+
+
+class FakeWebSocket:
+    """اتصال WebSocket وهمي يسجل الرسائل ورمز الإغلاق"""
+
+    def __init__(self, subprotocols=()):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+def test_oldest_connection_is_evicted_over_per_user_limit():
+    """
+    اختبار إغلاق أقدم اتصال للمستخدم عند تجاوز الحد وحذف الاتصالات مرة واحدة فقط.
+    """
+    async def scenario():
+        tracker = ConnectionTracker("test-evict", max_per_user=2)
+        sockets = [FakeWebSocket() for _ in range(3)]
+        connections = [await tracker.open(websocket, 7) for websocket in sockets]
+        await asyncio.sleep(0.01)
+        remaining = [connection.websocket for connection in tracker.connections(7)]
+        # قطع الاتصال المُغلق لاحقاً من نقطة النهاية لا يؤثر على الاتصالات الأخرى
+        await tracker.close(connections[0])
+        after_close = tracker.get_stats()
+        for connection in connections[1:]:
+            await tracker.close(connection)
+        return sockets, remaining, after_close, tracker.get_stats()
+
+    sockets, remaining, after_close, final = asyncio.run(scenario())
+
+    assert sockets[0].close_code == 1008
+    assert remaining == sockets[1:]
+    assert after_close["connections"] == 2
+    assert final["connections"] == 0 and final["users"] == 0
+
+
+def test_stats_report_buffered_bytes_per_connection():
+    """
+    اختبار حساب البايتات المنتظرة في طابور إرسال كل اتصال.
+    """
+    class StalledWebSocket(FakeWebSocket):
+        async def send_text(self, data):
+            await asyncio.Event().wait()
+
+    async def scenario():
+        tracker = ConnectionTracker("test-bytes", max_per_user=5)
+        connection = await tracker.open(StalledWebSocket(), 1)
+        for message in ("first", "مرحبا"):
+            connection.sender.send_nowait(message)
+        await asyncio.sleep(0.01)
+        stats = tracker.get_stats(detail=True)
+        await tracker.close(connection)
+        return stats, tracker.get_stats()
+
+    stats, final = asyncio.run(scenario())
+
+    # الرسالة الأولى قيد الإرسال والثانية تنتظر في الطابور
+    assert stats["buffered_bytes"] == len("مرحبا".encode("utf-8"))
+    assert stats["details"][0]["queued_messages"] == 1
+    assert final["buffered_bytes"] == 0
+
+
+def test_routed_messages_use_each_connections_protocol():
+    """
+    اختبار أن الرسائل الموجهة عبر سجل الحضور تُرمّز بصيغة كل اتصال: MessagePack
+    بلا النص المكرر لعميل noecho، وJSON كاملاً للعملاء القدامى.
+    """
+    message = {"type": "notice", "text": "مرحبا", "translated_text": "Hello"}
+
+    async def scenario():
+        tracker = ConnectionTracker("test-routing", max_per_user=5)
+        binary = FakeWebSocket(["mh.translate.v1.msgpack+noecho"])
+        legacy = FakeWebSocket()
+        connections = [await tracker.open(binary, 3, protocol=negotiate_protocol(binary)),
+                       await tracker.open(legacy, 3)]
+        delivered = await presence_registry.send_to_user("test-routing", 3, message)
+        await asyncio.sleep(0.01)
+        for connection in connections:
+            await tracker.close(connection)
+        return delivered, binary.sent, legacy.sent
+
+    delivered, binary_frames, legacy_frames = asyncio.run(scenario())
+
+    assert delivered == 2
+    assert msgpack.unpackb(binary_frames[0], strict_map_key=False) == {
+        FIELD_TAGS["type"]: "notice", FIELD_TAGS["translated_text"]: "Hello"}
+    assert legacy_frames == [DEFAULT_PROTOCOL.encode(message)]
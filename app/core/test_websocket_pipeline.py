@@ -0,0 +1,252 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.core.websocket_pipeline import WebSocketRequestPipeline
+
+
+class FakeWebSocket:
+    """اتصال WebSocket وهمي يقرأ الرسائل من طابور ويسجّل الردود"""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.sent_event = asyncio.Event()
+
+    async def receive_text(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return json.dumps(message)
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+        self.sent_event.set()
+
+    async def wait_for(self, predicate):
+        while not any(predicate(frame) for frame in self.sent):
+            self.sent_event.clear()
+            await asyncio.wait_for(self.sent_event.wait(), timeout=1)
+
+
+async def delayed_echo(request, reply):
+    """معالج وهمي ينتظر المدة المطلوبة ثم يعيد النص"""
+    await asyncio.sleep(request.get("delay", 0))
+    await reply({"text": request["text"], "status": "success"})
+
+
+def test_responses_are_sent_in_completion_order_with_ids():
+    """
+    اختبار أن الطلب البطيء لا يؤخر الطلبات التالية وأن كل رد يحمل معرّف طلبه.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(websocket, delayed_echo, max_in_flight=4)
+        runner = asyncio.ensure_future(pipeline.run())
+        await websocket.incoming.put({"id": 1, "text": "slow", "delay": 0.05})
+        await websocket.incoming.put({"id": 2, "text": "fast"})
+        await websocket.wait_for(lambda frame: frame.get("id") == 1)
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert sent == [
+        {"id": 2, "text": "fast", "status": "success"},
+        {"id": 1, "text": "slow", "status": "success"},
+    ]
+
+
+def test_cancel_and_per_connection_cap():
+    """
+    اختبار إلغاء طلب جارٍ ورفض الطلبات التي تتجاوز الحد دون إيقاف القراءة.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(websocket, delayed_echo, max_in_flight=1)
+        runner = asyncio.ensure_future(pipeline.run())
+        await websocket.incoming.put({"id": "a", "text": "long", "delay": 10})
+        await websocket.incoming.put({"id": "b", "text": "rejected"})
+        await websocket.incoming.put({"type": "cancel", "id": "a"})
+        await websocket.wait_for(lambda frame: frame.get("status") == "cancelled")
+        in_flight = pipeline.in_flight
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent, in_flight
+
+    sent, in_flight = asyncio.run(scenario())
+
+    assert sent == [
+        {"id": "b", "error": "Too many requests in flight", "status": "error"},
+        {"id": "a", "status": "cancelled"},
+    ]
+    assert in_flight == 0
+
+
+def test_invalid_request_id_and_handler_errors_keep_the_connection_open():
+    """
+    اختبار أن معرّفاً غير صالح يُرفض دون قطع الاتصال، وأن خطأ المعالج يُرسل
+    للعميل كرسالة عامة دون تفاصيله.
+    """
+    async def failing(request, reply):
+        if request.get("text") == "boom":
+            raise RuntimeError("provider secret: connection refused")
+        await delayed_echo(request, reply)
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(websocket, failing, max_in_flight=4)
+        runner = asyncio.ensure_future(pipeline.run())
+        await websocket.incoming.put({"id": [1], "text": "x"})
+        await websocket.incoming.put({"type": "cancel", "id": {}})
+        await websocket.incoming.put({"id": 1, "text": "boom"})
+        await websocket.wait_for(lambda frame: frame.get("id") == 1)
+        await websocket.incoming.put({"id": 2, "text": "ok"})
+        await websocket.wait_for(lambda frame: frame.get("id") == 2)
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert sent == [
+        {"error": "Invalid request id", "status": "error"},
+        {"error": "Invalid request id", "status": "error"},
+        {"id": 1, "error": "Request failed", "status": "error"},
+        {"id": 2, "text": "ok", "status": "success"},
+    ]
+
+
+def test_disconnect_cancels_pending_requests():
+    """
+    اختبار أن قطع الاتصال يلغي الطلبات الجارية ولا يرسل ردوداً بعدها.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(websocket, delayed_echo, max_in_flight=4)
+        runner = asyncio.ensure_future(pipeline.run())
+        await websocket.incoming.put({"id": 1, "text": "long", "delay": 10})
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent, pipeline.in_flight
+
+    sent, in_flight = asyncio.run(scenario())
+
+    assert sent == []
+    assert in_flight == 0
+
+
+def test_live_typing_updates_are_debounced_and_superseded():
+    """
+    اختبار أن تحديثات الكتابة المتتالية لنفس الحقل تُترجم مرة واحدة لآخر مراجعة،
+    وأن التحديث الجديد يلغي ترجمة جارية لمراجعة سابقة.
+    """
+    calls = []
+
+    async def recording_echo(request, reply):
+        calls.append(request["text"])
+        await delayed_echo(request, reply)
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(
+            websocket, recording_echo, max_in_flight=4, debounce_ms=30, debounce_max_wait_ms=1000)
+        runner = asyncio.ensure_future(pipeline.run())
+        text = "hello there"
+        for revision in range(1, len(text) + 1):
+            await websocket.incoming.put(
+                {"field": "message", "revision": revision, "text": text[:revision], "delay": 0.2})
+            await asyncio.sleep(0.005)
+        # الانتظار حتى تبدأ ترجمة آخر مراجعة ثم إرسال مراجعة أحدث ومراجعة متأخرة
+        while not calls:
+            await asyncio.sleep(0.01)
+        await websocket.incoming.put({"field": "message", "revision": 12, "text": "hello there!"})
+        await websocket.incoming.put({"field": "message", "revision": 5, "text": "hello"})
+        await websocket.wait_for(lambda frame: frame.get("status") == "success")
+        await asyncio.sleep(0.05)
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert calls == ["hello there", "hello there!"]
+    assert sent == [{"field": "message", "revision": 12, "text": "hello there!", "status": "success"}]
+
+
+def test_continuous_typing_is_translated_after_max_wait():
+    """
+    اختبار أن الكتابة المستمرة دون توقف تُترجم بعد أقصى تأخير بدلاً من الانتظار إلى الأبد.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(
+            websocket, delayed_echo, max_in_flight=4, debounce_ms=50, debounce_max_wait_ms=100)
+        runner = asyncio.ensure_future(pipeline.run())
+        for revision in range(1, 21):
+            await websocket.incoming.put({"field": "note", "revision": revision, "text": f"v{revision}"})
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.1)
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert 1 < len(sent) < 10
+    assert sent[-1]["revision"] == 20
+
+
+def test_live_fields_are_capped_and_forgotten_after_translation():
+    """
+    اختبار أن الحقول الحية الجديدة تُرفض بعد حد الطلبات الجارية، وأن حالة كل حقل
+    تُحذف بعد ترجمة آخر مراجعة له حتى لا تنمو الذاكرة مع أسماء الحقول.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(
+            websocket, delayed_echo, max_in_flight=2, debounce_ms=20, debounce_max_wait_ms=100)
+        runner = asyncio.ensure_future(pipeline.run())
+        for index in range(5):
+            await websocket.incoming.put({"field": f"field-{index}", "revision": 1, "text": f"v{index}"})
+        await websocket.wait_for(lambda frame: frame.get("field") == "field-1" and frame.get("status") == "success")
+        await asyncio.sleep(0.05)
+        state = (dict(pipeline._fields), dict(pipeline._revisions), dict(pipeline._pending_since))
+        await websocket.incoming.put(None)
+        with pytest.raises(WebSocketDisconnect):
+            await runner
+        return websocket.sent, state
+
+    sent, state = asyncio.run(scenario())
+
+    assert sorted(frame["field"] for frame in sent if frame.get("status") == "success") == ["field-0", "field-1"]
+    assert sum(1 for frame in sent if frame.get("error") == "Too many requests in flight") == 3
+    assert state == ({}, {}, {})
+
+
+def test_idle_connection_is_pinged_then_closed():
+    """
+    اختبار إرسال ping دورياً وإغلاق الاتصال الذي لا يرسل شيئاً خلال مهلة الخمول.
+    """
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = WebSocketRequestPipeline(
+            websocket, delayed_echo, ping_interval=0.02, idle_timeout=0.1)
+        await websocket.incoming.put({"type": "pong"})
+        with pytest.raises(WebSocketDisconnect) as error:
+            await asyncio.wait_for(pipeline.run(), timeout=1)
+        return websocket.sent, error.value.code
+
+    sent, code = asyncio.run(scenario())
+
+    assert sent and all(frame == {"type": "ping"} for frame in sent)
+    assert code == 1001
@@ -0,0 +1,72 @@
+import asyncio
+
+import msgpack
+from fastapi import WebSocketDisconnect
+
+from app.core.websocket_pipeline import WebSocketRequestPipeline
+from app.core.websocket_protocol import FIELD_TAGS, negotiate_protocol
+
+
+class FakeWebSocket:
+    """اتصال WebSocket وهمي بإطارات ثنائية يعرض بروتوكولات فرعية"""
+
+    def __init__(self, subprotocols=()):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def receive(self):
+        frame = await self.incoming.get()
+        if frame is None:
+            return {"type": "websocket.disconnect", "code": 1000}
+        return {"type": "websocket.receive", "bytes": frame}
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def send_text(self, data):
+        raise AssertionError("text frame sent on a binary connection")
+
+
+def test_first_supported_subprotocol_is_negotiated():
+    """
+    اختبار اختيار أول بروتوكول معروف بترتيب العميل وJSON للعملاء القدامى.
+    """
+    protocol = negotiate_protocol(FakeWebSocket(
+        ["chat", "mh.translate.v1.cbor", "mh.translate.v1.msgpack+noecho", "mh.translate.v1.json"]))
+    legacy = negotiate_protocol(FakeWebSocket())
+
+    assert (protocol.codec.name, protocol.echo, protocol.subprotocol) == (
+        "msgpack", False, "mh.translate.v1.msgpack+noecho")
+    assert (legacy.codec.name, legacy.echo, legacy.subprotocol) == ("json", True, None)
+
+
+def test_msgpack_frames_use_field_tags_and_skip_echoed_text():
+    """
+    اختبار أن الطلبات والردود تُرمز بمفاتيح رقمية وأن وضع noecho يحذف النص الأصلي.
+    """
+    async def handler(request, reply):
+        await reply({"original_text": request["text"], "translated_text": "مرحبا", "status": "success"})
+
+    async def scenario():
+        websocket = FakeWebSocket(["mh.translate.v1.msgpack+noecho"])
+        pipeline = WebSocketRequestPipeline(websocket, handler, ping_interval=0,
+                                            protocol=negotiate_protocol(websocket))
+        runner = asyncio.ensure_future(pipeline.run())
+        await websocket.incoming.put(msgpack.packb(
+            {FIELD_TAGS["id"]: 7, FIELD_TAGS["text"]: "hello", FIELD_TAGS["target_language"]: "ar"}))
+        await websocket.incoming.put(b"\xc1")
+        while len(websocket.sent) < 2:
+            await asyncio.sleep(0.01)
+        await websocket.incoming.put(None)
+        try:
+            await runner
+        except WebSocketDisconnect:
+            pass
+        return [msgpack.unpackb(frame, strict_map_key=False) for frame in websocket.sent]
+
+    frames = asyncio.run(scenario())
+
+    assert {FIELD_TAGS["id"]: 7, FIELD_TAGS["translated_text"]: "مرحبا",
+            FIELD_TAGS["status"]: "success"} in frames
+    assert {FIELD_TAGS["error"]: "Invalid MessagePack format"} in frames
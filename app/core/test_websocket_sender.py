@@ -0,0 +1,70 @@
+import asyncio
+
+from app.core.websocket_sender import WebSocketSender
+
+
+class FakeWebSocket:
+    """اتصال WebSocket وهمي بزمن إرسال قابل للضبط"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, data):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+def test_slow_or_dead_client_does_not_delay_broadcast():
+    """
+    اختبار أن البث إلى عميل بطيء أو منقطع لا يؤخر التسليم إلى الآخرين.
+    """
+    async def scenario():
+        fast, slow, dead = FakeWebSocket(), FakeWebSocket(delay=10), FakeWebSocket(fail=True)
+        senders = [WebSocketSender(websocket, max_size=8) for websocket in (fast, slow, dead)]
+        for sender in senders:
+            sender.start()
+        for index in range(3):
+            for sender in senders:
+                sender.send_nowait(f"m{index}")
+        await asyncio.sleep(0.01)
+        closed = [sender.closed for sender in senders]
+        for sender in senders:
+            await sender.close()
+        return fast.sent, closed
+
+    sent, closed = asyncio.run(scenario())
+
+    assert sent == ["m0", "m1", "m2"]
+    assert closed == [False, False, True]
+
+
+def test_slow_consumer_policies():
+    """
+    اختبار إسقاط أقدم الرسائل أو قطع الاتصال عند امتلاء طابور العميل البطيء.
+    """
+    async def scenario(policy):
+        websocket = FakeWebSocket(delay=10)
+        sender = WebSocketSender(websocket, max_size=2, policy=policy)
+        accepted = [sender.send_nowait(f"m{index}") for index in range(4)]
+        queued = list(sender._queue)
+        await asyncio.sleep(0.01)
+        await sender.close()
+        return accepted, queued, websocket.close_code
+
+    accepted, queued, close_code = asyncio.run(scenario("drop_oldest"))
+    assert accepted == [True, True, True, True]
+    assert queued == ["m2", "m3"]
+    assert close_code is None
+
+    accepted, queued, close_code = asyncio.run(scenario("disconnect"))
+    assert accepted == [True, True, False, False]
+    assert queued == []
+    assert close_code == 1013
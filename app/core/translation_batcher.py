@@ -0,0 +1,122 @@
+# تجميع طلبات الترجمة القصيرة عبر الطلبات المختلفة (Micro-batching)
+
+import asyncio
+import logging
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.auto_translator import auto_translator
+from app.core.language_detector import language_detector
+from app.core.llm_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationMicroBatcher:
+    """
+    مجمّع دفعات صغيرة لطلبات الترجمة في الوقت الفعلي
+
+    يجمع الطلبات المعلّقة لكل زوج (اللغة المصدر، اللغة الهدف) لمدة أقصاها
+    window_ms أو حتى max_items عنصراً، ثم يرسلها كطلب دفعة واحد ويحلّ
+    مستقبل (Future) كل طلب على حدة.
+    """
+
+    def __init__(self, translate_batch: Callable = None, window_ms: int = None,
+                 max_items: int = None, max_chars: int = None):
+        """
+        تهيئة المجمّع
+
+        Args:
+            translate_batch: دالة ترجمة الدفعة (texts, target_locale, source_locale)
+                             متزامنة أو غير متزامنة
+            window_ms: مدة نافذة التجميع بالمللي ثانية
+            max_items: الحد الأقصى لعدد العناصر في الدفعة
+            max_chars: النصوص الأطول من هذا الحد تُترجم مباشرة دون تجميع
+        """
+        # طلبات الوقت الفعلي لها الأولوية القصوى في مجدول النموذج اللغوي
+        self.translate_batch = translate_batch or partial(
+            auto_translator.batch_translate, priority=Priority.INTERACTIVE)
+        self.window_ms = settings.translation_microbatch_window_ms if window_ms is None else window_ms
+        self.max_items = max_items or settings.translation_microbatch_max_items
+        self.max_chars = max_chars or settings.translation_microbatch_max_chars
+
+        self._pending: Dict[Tuple[Optional[str], str], List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[Optional[str], str], asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+    async def translate(self, text: str, target_locale: str, source_locale: str = None) -> Optional[str]:
+        """
+        ترجمة نص عبر المجمّع
+
+        Args:
+            text: النص المطلوب ترجمته
+            target_locale: اللغة الهدف
+            source_locale: اللغة المصدر (اختياري)
+
+        Returns:
+            النص المترجم أو None في حالة الفشل
+        """
+        if len(text) > self.max_chars:
+            results = await self._call_translate_batch([text], target_locale, source_locale)
+            return results[0]
+
+        # الكشف المحلي عن اللغة المصدر حتى لا تختلط لغات مختلفة في دفعة واحدة
+        if source_locale is None:
+            detected, confidence = language_detector.detect(text)
+            if confidence >= settings.language_detection_min_confidence:
+                source_locale = detected
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (source_locale, target_locale)
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((text, future))
+
+        if len(batch) >= self.max_items:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(
+                self.window_ms / 1000, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Tuple[Optional[str], str]):
+        """إرسال الدفعة المعلّقة لزوج اللغات"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Tuple[Optional[str], str], batch: List[Tuple[str, asyncio.Future]]):
+        """تنفيذ الدفعة وحل مستقبل كل طلب"""
+        source_locale, target_locale = key
+        texts = [text for text, _ in batch]
+
+        try:
+            results = await self._call_translate_batch(texts, target_locale, source_locale)
+        except Exception as e:
+            logger.error(f"Micro-batch translation error: {e}")
+            results = [None] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _call_translate_batch(self, texts: List[str], target_locale: str,
+                                    source_locale: Optional[str]) -> List[Optional[str]]:
+        """استدعاء دالة ترجمة الدفعة دون حجب حلقة الأحداث"""
+        if asyncio.iscoroutinefunction(self.translate_batch):
+            return await self.translate_batch(texts, target_locale, source_locale)
+        return await asyncio.to_thread(self.translate_batch, texts, target_locale, source_locale)
+
+
+# إنشاء مثيل من مجمّع الترجمة
+translation_batcher = TranslationMicroBatcher()
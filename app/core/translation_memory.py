@@ -0,0 +1,185 @@
+# تقسيم النصوص إلى مقاطع وذاكرة الترجمة على مستوى المقطع
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+
+# مستويات التقسيم المدعومة
+SEGMENT_LEVELS = ("sentence", "paragraph")
+
+# البادئات التي تُحفظ كما هي في بداية السطر (المسافات البادئة وعناصر القوائم والعناوين والاقتباسات)
+_LINE_PREFIX = re.compile(r"^[ \t]*(?:(?:[-*+•]|\d+[.)]|#{1,6}|>)[ \t]+)*")
+
+# نهاية الجملة: علامات تليها مسافة، أو علامات النهاية ذات العرض الكامل (لا تليها مسافة عادةً)
+_SENTENCE_END = re.compile(
+    r"[.!?؟۔।…]+[\"'”’»)\]]*(?=\s)|[。！？]+[\"'”’»)\]」』]*")
+
+# الاختصارات الشائعة التي لا تنتهي بها الجملة حسب اللغة
+ABBREVIATIONS = {
+    "en": {"mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "approx", "min", "no"},
+    "fr": {"m", "mme", "mlle", "dr", "pr", "etc", "p.ex", "env", "min"},
+    "de": {"dr", "prof", "z.b", "bzw", "usw", "ca", "d.h", "u.a", "min", "nr"},
+    "es": {"sr", "sra", "srta", "dr", "dra", "etc", "p.ej", "aprox", "min"},
+    "it": {"sig", "sig.ra", "dott", "prof", "ecc", "p.es", "min"},
+    "pt": {"sr", "sra", "dr", "dra", "etc", "p.ex", "min"},
+    "nl": {"dhr", "mevr", "dr", "prof", "bijv", "enz", "min"},
+}
+
+
+def _is_abbreviation(body: str, end: int, terminator: str, locale: str) -> bool:
+    """هل النقطة في موضع end جزء من اختصار وليست نهاية جملة"""
+    if not terminator.startswith("."):
+        return False
+
+    word = re.search(r"(\S+)$", body[:end])
+    token = word.group(1).lower().rstrip(".") if word else ""
+    if token in ABBREVIATIONS.get(locale, ABBREVIATIONS["en"]):
+        return True
+    # الأحرف الأولى من الأسماء (مثل J. Smith)
+    if len(token) == 1 and token.isalpha():
+        return True
+
+    # جملة جديدة لا تبدأ بحرف صغير
+    following = body[end + len(terminator):].lstrip()
+    return bool(following) and following[0].islower()
+
+
+def _split_sentences(body: str, locale: str) -> List[Tuple[str, bool]]:
+    """تقسيم نص سطر واحد إلى جمل مع الحفاظ على المسافات بينها كفواصل"""
+    pieces = []
+    start = 0
+    for match in _SENTENCE_END.finditer(body):
+        if _is_abbreviation(body, match.start(), match.group(0), locale):
+            continue
+        end = match.end()
+        pieces.append((body[start:end], True))
+        gap = len(body[end:]) - len(body[end:].lstrip())
+        if gap:
+            pieces.append((body[end:end + gap], False))
+        start = end + gap
+    if start < len(body):
+        pieces.append((body[start:], True))
+    return pieces
+
+
+def segment_text(text: str, locale: str = None, level: str = None) -> List[Tuple[str, bool]]:
+    """
+    تقسيم نص إلى مقاطع قابلة للترجمة وفواصل تُحفظ كما هي
+
+    كل سطر غير فارغ يُعامل كفقرة، وتُحفظ بادئات التنسيق (المسافات البادئة
+    وعناصر القوائم والعناوين) والأسطر الفارغة والمسافات بين الجمل كفواصل،
+    بحيث يعيد ضم الأجزاء النص الأصلي تماماً.
+
+    Args:
+        text: النص المطلوب تقسيمه
+        locale: لغة النص (لتحديد الاختصارات التي لا تنتهي بها الجمل)
+        level: مستوى التقسيم "sentence" أو "paragraph" (افتراضياً من الإعدادات)
+
+    Returns:
+        قائمة من (الجزء، قابل للترجمة)
+    """
+    level = level or settings.translation_segment_level
+    pieces: List[Tuple[str, bool]] = []
+
+    for line in text.splitlines(keepends=True):
+        content = line.rstrip("\r\n")
+        prefix = _LINE_PREFIX.match(content).group(0)
+        body = content[len(prefix):].rstrip()
+        suffix = line[len(prefix) + len(body):]
+
+        if prefix:
+            pieces.append((prefix, False))
+        if body:
+            if level == "sentence":
+                pieces.extend(_split_sentences(body, locale or "en"))
+            else:
+                pieces.append((body, True))
+        if suffix:
+            pieces.append((suffix, False))
+
+    # المقاطع التي لا تحتوي على أحرف (أرقام أو رموز) لا تُترجم
+    return [(piece, translatable and any(char.isalpha() for char in piece))
+            for piece, translatable in pieces]
+
+
+def normalize_segment(text: str) -> str:
+    """توحيد المسافات في المقطع لاستخدامه كمفتاح في ذاكرة الترجمة"""
+    return " ".join(text.split())
+
+
+class TranslationMemory:
+    """
+    ذاكرة ترجمة على مستوى المقطع داخل العملية
+
+    تُخزن ترجمة كل مقطع حسب زوج اللغات، مع حد أقصى لعدد المدخلات
+    وإزالة الأقدم استخداماً (LRU).
+    """
+
+    def __init__(self, max_entries: int = None):
+        """
+        تهيئة ذاكرة الترجمة
+
+        Args:
+            max_entries: الحد الأقصى لعدد المقاطع المخزنة
+        """
+        self.max_entries = max_entries or settings.translation_memory_max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str, source_locale: str, target_locale: str) -> str:
+        """مفتاح المقطع في الذاكرة"""
+        digest = hashlib.sha256(normalize_segment(text).encode("utf-8")).hexdigest()
+        return f"{source_locale}:{target_locale}:{digest}"
+
+    def get(self, text: str, source_locale: str, target_locale: str) -> Optional[str]:
+        """
+        الحصول على ترجمة مقطع
+
+        Returns:
+            الترجمة المخزنة أو None
+        """
+        key = self._key(text, source_locale, target_locale)
+        with self._lock:
+            translation = self._entries.get(key)
+            if translation is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return translation
+
+    def set(self, text: str, source_locale: str, target_locale: str, translation: str):
+        """تخزين ترجمة مقطع"""
+        key = self._key(text, source_locale, target_locale)
+        with self._lock:
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """مسح الذاكرة"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """إحصائيات الذاكرة"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# إنشاء مثيل من ذاكرة الترجمة
+translation_memory = TranslationMemory()
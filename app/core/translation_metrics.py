@@ -0,0 +1,157 @@
+# مؤشرات استدعاءات الترجمة: زمن الاستجابة والرموز والتكلفة والتخزين المؤقت
+
+from typing import Any, Optional
+from app.config import settings
+from app.core.i18n import i18n_settings
+from app.core.llm_scheduler import Priority
+from app.core.metrics import bounded_label, metrics_registry
+from app.core.translation_providers import PROVIDER_FACTORIES
+
+# أسعار النماذج بالدولار لكل مليون رمز (المدخلات، المخرجات)
+MODEL_PRICES_PER_MILLION = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "mistral-small-latest": (0.20, 0.60),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+# أنواع العمليات المسجلة
+OPERATIONS = ("translate", "translate_stream", "batch_translate", "detect_language")
+
+# نتائج الاستدعاءات (cancelled: توقف المستهلك عن قراءة البث قبل انتهائه)
+OUTCOMES = ("success", "error", "cancelled")
+
+# طبقات التخزين المؤقت التي تُسجل نتائجها
+CACHE_LAYERS = ("memory", "in_flight", "pretranslated")
+
+# حدود فئات زمن استدعاءات النموذج اللغوي بالثواني
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+llm_requests = metrics_registry.counter(
+    "translation_llm_requests_total",
+    "LLM calls made by the translator.",
+    ("operation", "provider", "model", "source_locale", "target_locale", "outcome"))
+
+llm_latency = metrics_registry.histogram(
+    "translation_llm_request_duration_seconds",
+    "LLM call latency including scheduler queueing.",
+    ("operation", "provider", "source_locale", "target_locale"),
+    LLM_LATENCY_BUCKETS)
+
+llm_tokens = metrics_registry.counter(
+    "translation_llm_tokens_total",
+    "Prompt and completion tokens sent to and received from LLM providers.",
+    ("operation", "provider", "model", "type"))
+
+llm_cost = metrics_registry.counter(
+    "translation_llm_cost_usd_total",
+    "Estimated LLM spend in USD from list prices.",
+    ("provider", "model"))
+
+cache_requests = metrics_registry.counter(
+    "translation_cache_requests_total",
+    "Translation lookups answered (hit) or not (miss) by each cache layer.",
+    ("layer", "result"))
+
+
+def _provider_label(provider: Optional[str]) -> str:
+    return bounded_label(provider, set(PROVIDER_FACTORIES))
+
+
+def _model_label(model: Optional[str]) -> str:
+    known = set(MODEL_PRICES_PER_MILLION) | {
+        settings.model_name, settings.mistral_model, settings.gemini_model, "fake"}
+    return bounded_label(model, known)
+
+
+def _locale_label(locale: Optional[str]) -> str:
+    return bounded_label(locale, i18n_settings.supported_locales)
+
+
+def record_llm_call(operation: str, provider: Optional[str], model: Optional[str],
+                    source_locale: Optional[str], target_locale: Optional[str], outcome: str,
+                    latency: float, prompt_tokens: int = 0, completion_tokens: int = 0):
+    """
+    تسجيل استدعاء واحد للنموذج اللغوي
+
+    Args:
+        operation: نوع العملية (انظر OPERATIONS)
+        provider: اسم المزود (None إذا فشل الطلب قبل الوصول إلى مزود)
+        model: اسم النموذج
+        source_locale: اللغة المصدر
+        target_locale: اللغة الهدف
+        outcome: نتيجة الاستدعاء (انظر OUTCOMES)
+        latency: زمن الاستدعاء بالثواني
+        prompt_tokens: رموز الطلب
+        completion_tokens: رموز الرد
+    """
+    operation = bounded_label(operation, OPERATIONS)
+    provider_label, model_label = _provider_label(provider), _model_label(model)
+    source_label, target_label = _locale_label(source_locale), _locale_label(target_locale)
+
+    llm_requests.inc(
+        operation=operation, provider=provider_label, model=model_label,
+        source_locale=source_label, target_locale=target_label,
+        outcome=bounded_label(outcome, OUTCOMES))
+    llm_latency.observe(
+        latency, operation=operation, provider=provider_label,
+        source_locale=source_label, target_locale=target_label)
+
+    if prompt_tokens:
+        llm_tokens.inc(prompt_tokens, operation=operation, provider=provider_label,
+                       model=model_label, type="prompt")
+    if completion_tokens:
+        llm_tokens.inc(completion_tokens, operation=operation, provider=provider_label,
+                       model=model_label, type="completion")
+
+    prices = MODEL_PRICES_PER_MILLION.get(model)
+    if prices and (prompt_tokens or completion_tokens):
+        cost = (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+        llm_cost.inc(cost, provider=provider_label, model=model_label)
+
+
+def record_cache(layer: str, hit: bool, count: int = 1):
+    """تسجيل نتيجة البحث في طبقة تخزين مؤقت"""
+    if count:
+        cache_requests.inc(count, layer=bounded_label(layer, CACHE_LAYERS),
+                           result="hit" if hit else "miss")
+
+
+def register_translator_collectors(translator: Any):
+    """
+    تسجيل القيم اللحظية للمترجم الآلي (المجدول والمزودون والذاكرة)
+
+    Args:
+        translator: مثيل AutoTranslator
+    """
+    def collect():
+        scheduler = translator.scheduler.get_stats()
+        router = translator.router.get_stats()
+        memory = translator.memory.get_stats()
+        in_flight = translator.in_flight.get_stats()
+        providers = router["providers"]
+        return [
+            ("llm_scheduler_active_requests", "gauge", "LLM calls currently running.",
+             [({}, scheduler["active"])]),
+            ("llm_scheduler_queue_depth", "gauge", "LLM calls waiting in the scheduler queue.",
+             [({"priority": priority.name.lower()}, scheduler["queue_depth"].get(priority.name.lower(), 0))
+              for priority in Priority]),
+            ("llm_scheduler_rate_limited_total", "counter", "429 responses received from providers.",
+             [({}, scheduler["rate_limited"])]),
+            ("llm_provider_up", "gauge", "1 when the provider's circuit breaker is not open.",
+             [({"provider": _provider_label(name)}, 0 if stats["circuit"] == "open" else 1)
+              for name, stats in providers.items()]),
+            ("llm_provider_ewma_latency_seconds", "gauge", "Smoothed provider latency.",
+             [({"provider": _provider_label(name)},
+               stats["ewma_latency_ms"] / 1000 if stats["ewma_latency_ms"] is not None else None)
+              for name, stats in providers.items()]),
+            ("llm_hedges_fired_total", "counter", "Hedged requests sent to a second provider.",
+             [({}, router["hedges_fired"])]),
+            ("translation_memory_entries", "gauge", "Segments held in translation memory.",
+             [({}, memory["entries"])]),
+            ("translation_in_flight_requests", "gauge", "Distinct translations currently in flight.",
+             [({}, in_flight["in_flight"])]),
+        ]
+
+    metrics_registry.register_collector(collect)
@@ -0,0 +1,639 @@
+# مزودو النماذج اللغوية للترجمة والتوجيه بينهم
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# معامل التنعيم للمتوسط المتحرك الأسي (EWMA)
+EWMA_ALPHA = 0.2
+
+# عدد عينات الزمن المحفوظة لكل مزود لحساب النسبة المئوية 95
+LATENCY_WINDOW = 200
+
+# الحد الأدنى للعينات قبل الاعتماد على النسبة المئوية 95 لتأخير التحوط
+MIN_HEDGE_SAMPLES = 20
+
+# وزن معدل الأخطاء في ترتيب المزودين
+ERROR_RATE_PENALTY = 4.0
+
+
+class CompletionResult(NamedTuple):
+    """نتيجة طلب إكمال من مزود"""
+    text: str
+    total_tokens: Optional[int]
+    provider: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    model: Optional[str] = None
+
+
+class CompletionStream:
+    """بث إكمال مع اسم المزود والنموذج اللذين يخدمانه"""
+
+    def __init__(self, chunks: Iterator[str], provider: str, model: Optional[str] = None):
+        self.chunks = chunks
+        self.provider = provider
+        self.model = model
+
+    def __iter__(self):
+        return self.chunks
+
+
+class NoProviderAvailableError(RuntimeError):
+    """لا يوجد مزود متاح (غير مُعدّ أو جميع القواطع مفتوحة)"""
+
+
+class TranslationProvider:
+    """واجهة مزود نموذج لغوي"""
+
+    name = "base"
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int,
+                 temperature: float = 0.1) -> CompletionResult:
+        """
+        إرسال طلب إكمال
+
+        Args:
+            messages: رسائل المحادثة (system/user)
+            max_tokens: الحد الأقصى لرموز الرد
+            temperature: درجة العشوائية
+
+        Returns:
+            نتيجة الإكمال
+        """
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int,
+               temperature: float = 0.1) -> Iterator[str]:
+        """
+        إرسال طلب إكمال مع إرجاع الأجزاء فور وصولها
+
+        الافتراضي للمزودين الذين لا يدعمون البث: جزء واحد بالنص الكامل.
+        """
+        yield self.complete(messages, max_tokens, temperature).text
+
+
+class OpenAIProvider(TranslationProvider):
+    """مزود OpenAI (أو أي خادم متوافق مع واجهته)"""
+
+    name = "openai"
+
+    def __init__(self, client: Any = None, api_key: str = None, model: str = None,
+                 base_url: str = None):
+        """
+        تهيئة المزود
+
+        Args:
+            client: عميل جاهز متوافق مع واجهة OpenAI (اختياري)
+            api_key: مفتاح API (يُستخدم إذا لم يتم تمرير عميل)
+            model: اسم النموذج
+            base_url: عنوان خادم متوافق مع الواجهة (افتراضياً من الإعدادات)
+        """
+        if client is None:
+            import openai
+            base_url = base_url or settings.openai_base_url
+            # الخوادم المحلية المتوافقة لا تتطلب مفتاحاً حقيقياً
+            api_key = api_key or settings.openai_api_key or ("local" if base_url else None)
+            client = openai.OpenAI(api_key=api_key, base_url=base_url)
+        self.client = client
+        self.model = model or settings.model_name
+
+    def complete(self, messages, max_tokens, temperature=0.1):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        usage = getattr(response, "usage", None)
+        return CompletionResult(
+            response.choices[0].message.content or "",
+            getattr(usage, "total_tokens", None),
+            self.name,
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None),
+            self.model
+        )
+
+    def stream(self, messages, max_tokens, temperature=0.1):
+        chunks = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class MistralProvider(TranslationProvider):
+    """مزود Mistral"""
+
+    name = "mistral"
+
+    def __init__(self, api_key: str = None, model: str = None):
+        """
+        تهيئة المزود
+
+        Args:
+            api_key: مفتاح API
+            model: اسم النموذج
+        """
+        from mistralai import Mistral
+        self.client = Mistral(api_key=api_key or settings.mistral_api_key)
+        self.model = model or settings.mistral_model
+
+    def complete(self, messages, max_tokens, temperature=0.1):
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        usage = getattr(response, "usage", None)
+        return CompletionResult(
+            response.choices[0].message.content or "",
+            getattr(usage, "total_tokens", None),
+            self.name,
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None),
+            self.model
+        )
+
+    def stream(self, messages, max_tokens, temperature=0.1):
+        events = self.client.chat.stream(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        for event in events:
+            choices = event.data.choices
+            if choices and choices[0].delta.content:
+                yield choices[0].delta.content
+
+
+class GeminiProvider(TranslationProvider):
+    """مزود Google Gemini"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str = None, model: str = None):
+        """
+        تهيئة المزود
+
+        Args:
+            api_key: مفتاح API
+            model: اسم النموذج
+        """
+        import google.generativeai as genai
+        genai.configure(api_key=api_key or settings.google_api_key)
+        self.genai = genai
+        self.model = model or settings.gemini_model
+
+    def _request(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, stream: bool):
+        """تحويل رسائل OpenAI إلى طلب Gemini"""
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        contents = [
+            {"role": "model" if m["role"] == "assistant" else "user", "parts": [m["content"]]}
+            for m in messages if m["role"] != "system"
+        ]
+        model = self.genai.GenerativeModel(self.model, system_instruction=system or None)
+        return model.generate_content(
+            contents,
+            generation_config={"max_output_tokens": max_tokens, "temperature": temperature},
+            stream=stream
+        )
+
+    def complete(self, messages, max_tokens, temperature=0.1):
+        response = self._request(messages, max_tokens, temperature, stream=False)
+        usage = getattr(response, "usage_metadata", None)
+        return CompletionResult(
+            response.text or "",
+            getattr(usage, "total_token_count", None),
+            self.name,
+            getattr(usage, "prompt_token_count", None),
+            getattr(usage, "candidates_token_count", None),
+            self.model
+        )
+
+    def stream(self, messages, max_tokens, temperature=0.1):
+        for chunk in self._request(messages, max_tokens, temperature, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeProvider(TranslationProvider):
+    """
+    مزود محلي حتمي للاختبار والقياس دون اتصال
+
+    يعيد آخر رسالة من المستخدم كما هي (أو نتيجة responder) بعد زمن محدد،
+    ويفشل بنسبة error_rate وفق مولد أرقام عشوائية ذي بذرة ثابتة.
+    """
+
+    def __init__(self, name: str = "fake", latency: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, responder: Callable[[List[Dict[str, str]]], str] = None):
+        """
+        تهيئة المزود
+
+        Args:
+            name: اسم المزود
+            latency: زمن الاستجابة بالثواني
+            error_rate: نسبة الطلبات الفاشلة (0-1)
+            seed: بذرة مولد الأرقام العشوائية
+            responder: دالة تُنتج الرد من الرسائل (اختياري)
+        """
+        self.name = name
+        self.model = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.responder = responder
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(self, messages, max_tokens, temperature=0.1):
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise RuntimeError(f"{self.name} provider error")
+
+        text = self.responder(messages) if self.responder else messages[-1]["content"]
+        return CompletionResult(text, None, self.name, model=self.model)
+
+
+class CircuitBreaker:
+    """
+    قاطع دائرة لكل مزود
+
+    يُفتح بعد failure_threshold أخطاء متتالية، ويسمح بطلب تجريبي واحد
+    بعد reset_timeout ثانية (نصف مفتوح) ليقرر الإغلاق أو إعادة الفتح.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None):
+        self.failure_threshold = failure_threshold or settings.llm_circuit_failure_threshold
+        self.reset_timeout = settings.llm_circuit_reset_seconds if reset_timeout is None else reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """هل يُسمح بإرسال طلب الآن"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def is_available(self) -> bool:
+        """هل يمكن اختيار المزود (دون حجز الطلب التجريبي)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return self.state == self.CLOSED or not self._trial_in_flight
+
+    def record_success(self):
+        """تسجيل نجاح"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """تسجيل فشل"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class ProviderHealth:
+    """مؤشرات زمن الاستجابة ومعدل الأخطاء لمزود"""
+
+    def __init__(self):
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, success: bool):
+        """تسجيل نتيجة طلب"""
+        with self._lock:
+            self.requests += 1
+            self.error_rate += EWMA_ALPHA * ((0.0 if success else 1.0) - self.error_rate)
+            if success:
+                self.latencies.append(latency)
+                if self.ewma_latency is None:
+                    self.ewma_latency = latency
+                else:
+                    self.ewma_latency += EWMA_ALPHA * (latency - self.ewma_latency)
+            else:
+                self.errors += 1
+
+    def p95(self) -> Optional[float]:
+        """النسبة المئوية 95 لزمن الاستجابة أو None إذا كانت العينات قليلة"""
+        with self._lock:
+            if len(self.latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def score(self) -> float:
+        """درجة الترتيب (الأقل أفضل)، والمزود غير المجرّب يُجرّب أولاً"""
+        if self.ewma_latency is None:
+            return 0.0
+        return self.ewma_latency * (1 + ERROR_RATE_PENALTY * self.error_rate)
+
+
+class ProviderRouter:
+    """
+    موجّه الطلبات بين المزودين
+
+    يرتب المزودين حسب زمن الاستجابة ومعدل الأخطاء (EWMA) ويتجاوز من كان
+    قاطع دائرته مفتوحاً، وينتقل إلى المزود التالي عند الفشل. للطلبات
+    التفاعلية يُرسل طلب تحوطي (Hedged) إلى مزود ثانٍ إذا لم يصل الرد خلال
+    النسبة المئوية 95 لزمن المزود الأول، ويُعتمد أول رد ناجح.
+    """
+
+    def __init__(self, providers: List[TranslationProvider], hedge_default_delay: float = None,
+                 hedge_min_delay: float = None):
+        """
+        تهيئة الموجّه
+
+        Args:
+            providers: المزودون حسب ترتيب التفضيل
+            hedge_default_delay: تأخير التحوط قبل توفر عينات كافية (بالثواني)
+            hedge_min_delay: الحد الأدنى لتأخير التحوط (بالثواني)
+        """
+        self.providers = list(providers)
+        self.hedge_default_delay = (settings.llm_hedge_default_delay_ms / 1000
+                                    if hedge_default_delay is None else hedge_default_delay)
+        self.hedge_min_delay = (settings.llm_hedge_min_delay_ms / 1000
+                                if hedge_min_delay is None else hedge_min_delay)
+        self.health = {provider.name: ProviderHealth() for provider in self.providers}
+        self.breakers = {provider.name: CircuitBreaker() for provider in self.providers}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def ranked_providers(self) -> List[TranslationProvider]:
+        """المزودون المتاحون مرتبين من الأفضل إلى الأسوأ"""
+        available = [provider for provider in self.providers
+                     if self.breakers[provider.name].is_available()]
+        return sorted(available, key=lambda provider: self.health[provider.name].score())
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int,
+                 temperature: float = 0.1, hedge: bool = False) -> CompletionResult:
+        """
+        إرسال طلب إكمال عبر أفضل مزود متاح
+
+        Args:
+            messages: رسائل المحادثة
+            max_tokens: الحد الأقصى لرموز الرد
+            temperature: درجة العشوائية
+            hedge: إرسال طلب تحوطي لمزود ثانٍ عند التأخر
+
+        Returns:
+            نتيجة أول مزود ناجح
+
+        Raises:
+            NoProviderAvailableError أو خطأ آخر مزود إذا فشل الجميع
+        """
+        candidates = self.ranked_providers()
+        if not candidates:
+            raise NoProviderAvailableError("No translation provider is available")
+
+        if hedge and len(candidates) > 1:
+            return self._complete_hedged(candidates, messages, max_tokens, temperature)
+
+        last_error: Exception = NoProviderAvailableError("No translation provider accepted the request")
+        for provider in candidates:
+            try:
+                return self._call(provider, messages, max_tokens, temperature)
+            except NoProviderAvailableError:
+                continue
+            except Exception as e:
+                logger.warning(f"Provider {provider.name} failed: {e}")
+                last_error = e
+        raise last_error
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int,
+               temperature: float = 0.1) -> CompletionStream:
+        """
+        فتح بث إكمال عبر أفضل مزود متاح
+
+        يتم الانتقال إلى المزود التالي فقط إذا فشل البث قبل وصول أول جزء،
+        إذ لا يمكن دمج أجزاء من مزودين مختلفين.
+
+        Returns:
+            بث لأجزاء الرد يبدأ بالجزء الأول المستلم
+        """
+        last_error: Exception = NoProviderAvailableError("No translation provider is available")
+        for provider in self.ranked_providers():
+            breaker = self.breakers[provider.name]
+            if not breaker.allow_request():
+                continue
+
+            start = time.monotonic()
+            chunks = provider.stream(messages, max_tokens, temperature)
+            try:
+                first = next(chunks, None)
+            except Exception as e:
+                breaker.record_failure()
+                self.health[provider.name].record(time.monotonic() - start, False)
+                logger.warning(f"Provider {provider.name} stream failed: {e}")
+                last_error = e
+                continue
+
+            # يُقاس زمن أول جزء لأنه ما يشعر به المستخدم
+            breaker.record_success()
+            self.health[provider.name].record(time.monotonic() - start, True)
+            return CompletionStream(self._chain(first, chunks), provider.name,
+                                    getattr(provider, "model", None))
+
+        raise last_error
+
+    @staticmethod
+    def _chain(first: Optional[str], rest: Iterator[str]) -> Iterator[str]:
+        """إعادة الجزء الأول المستلم ثم بقية البث"""
+        if first:
+            yield first
+        yield from rest
+
+    def _call(self, provider: TranslationProvider, messages: List[Dict[str, str]],
+              max_tokens: int, temperature: float) -> CompletionResult:
+        """استدعاء مزود واحد مع تحديث قاطع الدائرة والمؤشرات"""
+        breaker = self.breakers[provider.name]
+        if not breaker.allow_request():
+            raise NoProviderAvailableError(f"Circuit for {provider.name} is open")
+
+        start = time.monotonic()
+        try:
+            result = provider.complete(messages, max_tokens, temperature)
+        except Exception:
+            breaker.record_failure()
+            self.health[provider.name].record(time.monotonic() - start, False)
+            raise
+
+        breaker.record_success()
+        self.health[provider.name].record(time.monotonic() - start, True)
+        return result
+
+    def _hedge_delay(self, provider: TranslationProvider) -> float:
+        """تأخير إرسال الطلب التحوطي (النسبة المئوية 95 للمزود الأول)"""
+        p95 = self.health[provider.name].p95()
+        if p95 is None:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, p95)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """منفّذ مشترك للطلبات التحوطية (قد يستمر الطلب الخاسر في الخلفية)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.llm_max_concurrency * 4, thread_name_prefix="llm-hedge")
+            return self._executor
+
+    def _complete_hedged(self, candidates: List[TranslationProvider], messages: List[Dict[str, str]],
+                         max_tokens: int, temperature: float) -> CompletionResult:
+        """إرسال الطلب للمزود الأول ثم للمزودين التاليين عند التأخر أو الفشل"""
+        executor = self._get_executor()
+        pending = {}
+        remaining = list(candidates)
+        last_error: Exception = NoProviderAvailableError("No translation provider accepted the request")
+
+        def launch():
+            provider = remaining.pop(0)
+            future = executor.submit(self._call, provider, messages, max_tokens, temperature)
+            pending[future] = provider
+            return provider
+
+        primary = launch()
+        timeout = self._hedge_delay(primary)
+
+        while pending:
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # تأخر الرد: إرسال طلب تحوطي للمزود التالي
+                if remaining:
+                    launch()
+                    self.hedges_fired += 1
+                timeout = None
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except NoProviderAvailableError:
+                    continue
+                except Exception as e:
+                    logger.warning(f"Provider {provider.name} failed: {e}")
+                    last_error = e
+                    continue
+                if provider is not primary:
+                    self.hedges_won += 1
+                return result
+
+            # فشل أحد الطلبات: الانتقال فوراً إلى المزود التالي
+            if not pending and remaining:
+                launch()
+            timeout = None
+
+        raise last_error
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        الحصول على حالة المزودين
+
+        Returns:
+            زمن الاستجابة ومعدل الأخطاء وحالة القاطع لكل مزود وإحصائيات التحوط
+        """
+        providers = {}
+        for provider in self.providers:
+            health = self.health[provider.name]
+            p95 = health.p95()
+            providers[provider.name] = {
+                "requests": health.requests,
+                "errors": health.errors,
+                "error_rate": round(health.error_rate, 4),
+                "ewma_latency_ms": round(health.ewma_latency * 1000, 1) if health.ewma_latency is not None else None,
+                "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "circuit": self.breakers[provider.name].state,
+            }
+        return {
+            "providers": providers,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+        }
+
+
+# مُنشئو المزودين حسب الاسم ومفاتيح API المطلوبة
+PROVIDER_FACTORIES = {
+    "openai": (lambda: OpenAIProvider(), lambda: settings.openai_api_key or settings.openai_base_url),
+    "mistral": (lambda: MistralProvider(), lambda: settings.mistral_api_key),
+    "gemini": (lambda: GeminiProvider(), lambda: settings.google_api_key),
+    "fake": (lambda: FakeProvider(), lambda: True),
+}
+
+
+def build_providers(names: str = None) -> List[TranslationProvider]:
+    """
+    إنشاء المزودين المُعدّين من الإعدادات
+
+    يتم تجاهل المزودين بدون مفتاح API أو الذين لم تُثبّت مكتباتهم.
+
+    Args:
+        names: أسماء المزودين مفصولة بفواصل حسب التفضيل (افتراضياً settings.translation_providers)
+
+    Returns:
+        قائمة المزودين
+    """
+    providers = []
+    for name in (names or settings.translation_providers).split(","):
+        name = name.strip()
+        if name not in PROVIDER_FACTORIES:
+            if name:
+                logger.warning(f"Unknown translation provider: {name}")
+            continue
+
+        factory, api_key = PROVIDER_FACTORIES[name]
+        if not api_key():
+            continue
+        try:
+            providers.append(factory())
+        except ImportError as e:
+            logger.warning(f"Translation provider {name} is not installed: {e}")
+
+    return providers
@@ -0,0 +1,183 @@
+# تتبع اتصالات WebSocket المحلية: الحد الأقصى لكل مستخدم والتنظيف وإحصائيات الذاكرة
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+from fastapi import WebSocket, status
+from app.config import settings
+from app.core.metrics import metrics_registry
+from app.core.presence import presence_registry
+from app.core.websocket_protocol import DEFAULT_PROTOCOL, WireProtocol
+from app.core.websocket_sender import WebSocketSender
+
+logger = logging.getLogger(__name__)
+
+reaped_connections = metrics_registry.counter(
+    "websocket_reaped_connections_total",
+    "WebSocket connections closed by the server: idle, lost (send failed) or evicted (per-user limit).",
+    ("reason",))
+
+# جميع متتبعات الاتصالات في هذه العملية (لعرض المسؤول والمؤشرات)
+connection_trackers: List["ConnectionTracker"] = []
+
+
+class TrackedConnection:
+    """اتصال WebSocket مسجل مع طابور إرساله ووقت آخر نشاط"""
+
+    def __init__(self, websocket: WebSocket, user_id: int, sender: WebSocketSender,
+                 protocol: WireProtocol = DEFAULT_PROTOCOL):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.sender = sender
+        self.protocol = protocol
+        self.presence_id: Optional[str] = None
+        self.connected_at = time.time()
+        self.last_seen = time.monotonic()
+        self.messages_received = 0
+        self.closed = False
+
+    def deliver(self, message: Dict[str, Any]):
+        """تسليم رسالة موجهة (من سجل الحضور) بصيغة الاتصال المتفق عليها"""
+        self.sender.send_nowait(self.protocol.encode(self.protocol.trim(message)))
+
+    def touch(self):
+        """تسجيل نشاط من العميل"""
+        self.last_seen = time.monotonic()
+        self.messages_received += 1
+
+    @property
+    def idle_seconds(self) -> float:
+        """المدة منذ آخر رسالة من العميل"""
+        return time.monotonic() - self.last_seen
+
+    def to_dict(self) -> Dict[str, Any]:
+        """بيانات الاتصال لعرض المسؤول"""
+        return {
+            "user_id": self.user_id,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            "idle_seconds": round(self.idle_seconds, 1),
+            "messages_received": self.messages_received,
+            "format": self.protocol.codec.name,
+            "echo": self.protocol.echo,
+            "queued_messages": self.sender.depth,
+            "buffered_bytes": self.sender.buffered_bytes,
+        }
+
+
+class ConnectionTracker:
+    """
+    اتصالات WebSocket لنطاق واحد في هذه العملية
+
+    يفرض حداً أقصى للاتصالات لكل مستخدم (يُغلق الأقدم عند تجاوزه)، ويسجل
+    الاتصالات في سجل الحضور، ويضمن حذف كل اتصال مرة واحدة مهما كان سبب إغلاقه.
+    """
+
+    def __init__(self, scope: str, max_per_user: int = None):
+        """
+        تهيئة المتتبع
+
+        Args:
+            scope: نطاق الاتصالات في سجل الحضور
+            max_per_user: الحد الأقصى لاتصالات المستخدم الواحد
+        """
+        self.scope = scope
+        self.max_per_user = max_per_user or settings.websocket_max_connections_per_user
+        self._connections: Dict[int, List[TrackedConnection]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        connection_trackers.append(self)
+
+    async def open(self, websocket: WebSocket, user_id: int, info: Optional[Dict[str, Any]] = None,
+                   protocol: Optional[WireProtocol] = None) -> TrackedConnection:
+        """
+        قبول اتصال جديد وتسجيله
+
+        Args:
+            websocket: اتصال WebSocket لم يُقبل بعد
+            user_id: معرف المستخدم
+            info: بيانات إضافية لسجل الحضور
+            protocol: البروتوكول المتفق عليه (JSON افتراضياً)
+
+        Returns:
+            الاتصال المسجل
+        """
+        protocol = protocol or DEFAULT_PROTOCOL
+        await websocket.accept(subprotocol=protocol.subprotocol)
+        sender = WebSocketSender(websocket)
+        sender.start()
+        connection = TrackedConnection(websocket, user_id, sender, protocol)
+        connections = self._connections.setdefault(user_id, [])
+        connections.append(connection)
+
+        # إغلاق أقدم الاتصالات عند تجاوز الحد (غالباً علامات تبويب قديمة أو اتصالات نصف مفتوحة)
+        while len(connections) > self.max_per_user:
+            oldest = connections[0]
+            reaped_connections.inc(reason="evicted")
+            await self.close(oldest)
+            # الإغلاق في الخلفية حتى لا يؤخر اتصال نصف مفتوح قبول الاتصال الجديد
+            closing = asyncio.ensure_future(
+                oldest.sender.close(status.WS_1008_POLICY_VIOLATION, "Too many connections"))
+            self._closing.add(closing)
+            closing.add_done_callback(self._closing.discard)
+
+        connection.presence_id = await presence_registry.register(
+            self.scope, user_id, connection.deliver, info)
+        return connection
+
+    async def close(self, connection: TrackedConnection):
+        """حذف اتصال وإيقاف طابور إرساله (آمن للاستدعاء أكثر من مرة)"""
+        if connection.closed:
+            return
+        connection.closed = True
+        connection.sender.stop()
+        connections = self._connections.get(connection.user_id, [])
+        if connection in connections:
+            connections.remove(connection)
+        if not connections:
+            self._connections.pop(connection.user_id, None)
+        if connection.presence_id is not None:
+            await presence_registry.unregister(self.scope, connection.user_id, connection.presence_id)
+
+    def connections(self, user_id: Optional[int] = None) -> List[TrackedConnection]:
+        """اتصالات مستخدم أو جميع الاتصالات"""
+        if user_id is not None:
+            return list(self._connections.get(user_id, []))
+        return [connection for connections in self._connections.values() for connection in connections]
+
+    def get_stats(self, detail: bool = False) -> Dict[str, Any]:
+        """
+        إحصائيات الاتصالات
+
+        Args:
+            detail: تضمين بيانات كل اتصال
+
+        Returns:
+            عدد الاتصالات والمستخدمين والبايتات المنتظرة في طوابير الإرسال
+        """
+        connections = self.connections()
+        buffered = [connection.sender.buffered_bytes for connection in connections]
+        stats = {
+            "scope": self.scope,
+            "connections": len(connections),
+            "users": len(self._connections),
+            "max_per_user": self.max_per_user,
+            "buffered_bytes": sum(buffered),
+            "max_buffered_bytes": max(buffered, default=0),
+        }
+        if detail:
+            stats["details"] = [connection.to_dict() for connection in connections]
+        return stats
+
+
+def _collect_connection_metrics():
+    """عدد الاتصالات والبايتات المنتظرة لكل نطاق"""
+    stats = [tracker.get_stats() for tracker in connection_trackers]
+    return [
+        ("websocket_connections", "gauge", "Open WebSocket connections on this worker.",
+         [({"scope": item["scope"]}, item["connections"]) for item in stats]),
+        ("websocket_buffered_bytes", "gauge", "Bytes waiting in outbound queues on this worker.",
+         [({"scope": item["scope"]}, item["buffered_bytes"]) for item in stats]),
+    ]
+
+
+metrics_registry.register_collector(_collect_connection_metrics)
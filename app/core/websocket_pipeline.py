@@ -0,0 +1,319 @@
+# تنفيذ طلبات اتصال WebSocket بالتوازي مع معرّفات الطلبات والإلغاء
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+from fastapi import WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import iterate_in_threadpool
+from app.config import settings
+from app.core.metrics import metrics_registry
+from app.core.websocket_connections import TrackedConnection, reaped_connections
+from app.core.websocket_protocol import DEFAULT_PROTOCOL, Frame, WireProtocol
+
+logger = logging.getLogger(__name__)
+
+# دالة إرسال إطار رد لطلب واحد (يُضاف إليه معرّف الطلب تلقائياً)
+Reply = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# معالج طلب واحد: (الطلب، دالة الرد)
+RequestHandler = Callable[[Dict[str, Any], Reply], Awaitable[None]]
+
+# مفاتيح الطلب التي تُعاد في كل إطار رد لربطه بالطلب
+ECHO_KEYS = ("id", "field", "revision")
+
+live_updates = metrics_registry.counter(
+    "websocket_live_updates_total",
+    "Live-typing updates by outcome: translated, superseded by a newer update, or stale.",
+    ("result",))
+
+
+def _echo(request: Dict[str, Any]) -> Dict[str, Any]:
+    """مفاتيح الربط التي تُعاد مع ردود الطلب"""
+    return {key: request[key] for key in ECHO_KEYS if request.get(key) is not None}
+
+
+async def iterate_stream(stream: Iterator[str]) -> AsyncIterator[str]:
+    """
+    تشغيل مولّد متزامن في مجمّع الخيوط دون حجب حلقة الأحداث
+
+    يُغلق المولّد عند الإلغاء أو التوقف المبكر حتى يُحرَّر بث المزود.
+    """
+    try:
+        async for item in iterate_in_threadpool(stream):
+            yield item
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                # المولّد ما زال يعمل في خيط آخر وسيُجمع لاحقاً
+                pass
+
+
+class WebSocketRequestPipeline:
+    """
+    تنفيذ طلبات اتصال WebSocket واحد بالتوازي
+
+    كل رسالة تُنفذ كمهمة مستقلة فلا يوقف طلب بطيء قراءة الرسائل التالية،
+    وتُرسل الردود بترتيب الانتهاء مع معرّف الطلب "id" الذي أرسله العميل.
+    عدد الطلبات الجارية محدود لكل اتصال، ويمكن إلغاء طلب جارٍ برسالة
+    {"type": "cancel", "id": ...}.
+
+    الطلبات التي تحمل "field" تحديثات كتابة حية: تُؤجل حتى يتوقف العميل عن
+    الكتابة لفترة قصيرة، ويلغي كل تحديث جديد للحقل نفسه التحديث السابق سواء
+    كان ينتظر أو قيد الترجمة، فلا يُرسل إلا رد آخر مراجعة ("revision").
+
+    يرسل الخادم {"type": "ping"} دورياً وأي رسالة من العميل (مثل
+    {"type": "pong"}) تُعد نشاطاً؛ ويُغلق الاتصال إذا لم يصل شيء خلال مهلة
+    الخمول أو تعذر الإرسال إليه، حتى لا تبقى الاتصالات نصف المفتوحة إلى الأبد.
+
+    صيغة الإطارات (JSON أو MessagePack) وحذف النص المكرر من الردود يحددهما
+    البروتوكول المتفق عليه عند الاتصال.
+    """
+
+    def __init__(self, websocket: WebSocket, handler: RequestHandler, max_in_flight: int = None,
+                 debounce_ms: int = None, debounce_max_wait_ms: int = None,
+                 connection: Optional[TrackedConnection] = None,
+                 ping_interval: float = None, idle_timeout: float = None,
+                 protocol: Optional[WireProtocol] = None):
+        """
+        تهيئة خط المعالجة
+
+        Args:
+            websocket: اتصال WebSocket مقبول
+            handler: معالج الطلب الواحد
+            max_in_flight: الحد الأقصى للطلبات الجارية على الاتصال
+            debounce_ms: فترة الهدوء قبل ترجمة تحديث حي
+            debounce_max_wait_ms: أقصى تأخير لتحديث حي أثناء الكتابة المستمرة
+            connection: الاتصال المسجل وطابور إرساله (None للإرسال المباشر)
+            ping_interval: الفاصل بين رسائل ping بالثواني (0 لتعطيل المراقبة)
+            idle_timeout: مهلة الخمول قبل إغلاق الاتصال بالثواني
+            protocol: صيغة الإطارات (بروتوكول الاتصال أو JSON افتراضياً)
+        """
+        self.websocket = websocket
+        self.protocol = protocol or (connection.protocol if connection is not None else DEFAULT_PROTOCOL)
+        self.connection = connection
+        self.sender = connection.sender if connection is not None else None
+        self.handler = handler
+        self.ping_interval = settings.websocket_ping_interval_seconds if ping_interval is None else ping_interval
+        self.idle_timeout = settings.websocket_idle_timeout_seconds if idle_timeout is None else idle_timeout
+        self.last_seen = time.monotonic()
+        self.max_in_flight = max_in_flight or settings.websocket_max_in_flight
+        self.debounce = (settings.websocket_debounce_ms if debounce_ms is None else debounce_ms) / 1000
+        self.debounce_max_wait = (settings.websocket_debounce_max_wait_ms
+                                  if debounce_max_wait_ms is None else debounce_max_wait_ms) / 1000
+        self._tasks: Dict[Any, asyncio.Task] = {}
+        self._fields: Dict[Any, asyncio.Task] = {}
+        self._revisions: Dict[Any, Any] = {}
+        self._pending_since: Dict[Any, float] = {}
+
+    async def send(self, payload: Dict[str, Any], request_id: Any = None):
+        """إرسال إطار مع معرّف الطلب إن وُجد"""
+        if request_id is not None:
+            payload = {"id": request_id, **payload}
+        await self._write(payload)
+
+    async def _write(self, payload: Dict[str, Any]):
+        """كتابة إطار عبر طابور الإرسال إن وُجد"""
+        frame = self.protocol.encode(payload)
+        if self.sender is not None:
+            await self.sender.send(frame)
+        else:
+            await self.protocol.send(self.websocket, frame)
+
+    async def run(self):
+        """
+        حلقة استلام الرسائل حتى قطع الاتصال
+
+        Raises:
+            WebSocketDisconnect عند قطع الاتصال (بعد إلغاء الطلبات الجارية)
+        """
+        receiver = asyncio.ensure_future(self._receive_loop())
+        watchdog = asyncio.ensure_future(self._watchdog()) if self.ping_interval else None
+        try:
+            done, _ = await asyncio.wait({task for task in (receiver, watchdog) if task},
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                receiver.result()
+            # انتهت المراقبة: الاتصال خامل أو منقطع
+            reason = watchdog.result()
+            reaped_connections.inc(reason=reason)
+            if self.sender is not None:
+                await self.sender.close(status.WS_1001_GOING_AWAY, reason)
+            raise WebSocketDisconnect(status.WS_1001_GOING_AWAY, reason)
+        finally:
+            for task in (receiver, watchdog):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(*(task for task in (receiver, watchdog) if task), return_exceptions=True)
+            await self.aclose()
+
+    async def _receive_loop(self):
+        """استلام الرسائل ومعالجتها حتى قطع الاتصال"""
+        while True:
+            data = await self.protocol.receive(self.websocket)
+            self.last_seen = time.monotonic()
+            if self.connection is not None:
+                self.connection.touch()
+            await self._dispatch(data)
+
+    async def _watchdog(self) -> str:
+        """
+        إرسال ping دورياً ومراقبة الخمول
+
+        Returns:
+            سبب إغلاق الاتصال (idle أو lost)
+        """
+        while True:
+            await asyncio.sleep(min(self.ping_interval, self.idle_timeout or self.ping_interval))
+            if self.sender is not None and self.sender.closed:
+                return "lost"
+            if self.idle_timeout and time.monotonic() - self.last_seen >= self.idle_timeout:
+                return "idle"
+            ping = self.protocol.encode({"type": "ping"})
+            if self.sender is not None:
+                self.sender.send_nowait(ping)
+            else:
+                try:
+                    await asyncio.wait_for(self.protocol.send(self.websocket, ping), self.ping_interval)
+                except Exception:
+                    return "lost"
+
+    async def aclose(self):
+        """إلغاء جميع الطلبات الجارية وانتظار انتهائها"""
+        tasks = list(self._tasks.values()) + list(self._fields.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def in_flight(self) -> int:
+        """عدد الطلبات الجارية (بما فيها التحديثات الحية المؤجلة)"""
+        return len(self._tasks) + len(self._fields)
+
+    async def _dispatch(self, data: Frame):
+        """تحليل رسالة واحدة وبدء معالجتها أو إلغاء طلب"""
+        try:
+            request = self.protocol.decode(data)
+        except ValueError:
+            await self.send({"error": f"Invalid {self.protocol.codec.label} format"})
+            return
+
+        if not isinstance(request, dict):
+            await self.send({"error": "Invalid request format"})
+            return
+
+        request_id = request.get("id")
+        # المعرّف مفتاح في قاموس الطلبات الجارية: قيمة غير قابلة للتجزئة توقف حلقة القراءة
+        if not isinstance(request_id, (str, int, type(None))):
+            await self.send({"error": "Invalid request id", "status": "error"})
+            return
+
+        if request.get("type") == "pong":
+            return
+        if request.get("type") == "ping":
+            await self._write({"type": "pong"})
+            return
+
+        if request.get("type") == "cancel":
+            await self._cancel(request_id)
+            return
+
+        if request.get("field") is not None:
+            await self._submit_live(request)
+            return
+
+        if self.in_flight >= self.max_in_flight:
+            await self.send({"error": "Too many requests in flight", "status": "error"}, request_id)
+            return
+
+        if request_id is not None and request_id in self._tasks:
+            await self.send({"error": "Duplicate request id", "status": "error"}, request_id)
+            return
+
+        # الطلبات بدون معرّف تُنفذ أيضاً لكن لا يمكن إلغاؤها
+        key = request_id if request_id is not None else object()
+        task = asyncio.ensure_future(self._execute(request))
+        # الإزالة عند الانتهاء تشمل المهام الملغاة قبل بدء تنفيذها
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        self._tasks[key] = task
+
+    async def _submit_live(self, request: Dict[str, Any]):
+        """جدولة تحديث كتابة حي وإلغاء التحديث السابق للحقل نفسه"""
+        field, revision = request["field"], request.get("revision")
+        if not isinstance(field, (str, int)) or not isinstance(revision, (int, float, type(None))):
+            await self.send({"error": "Invalid request format", "status": "error"})
+            return
+
+        latest = self._revisions.get(field)
+        if revision is not None and latest is not None and revision <= latest:
+            # تحديث متأخر وصل بعد مراجعة أحدث
+            live_updates.inc(result="stale")
+            return
+
+        # الحقول الحية تُحسب من الطلبات الجارية، فلا يمكن لعميل إضافة حقول بلا حد
+        previous = self._fields.pop(field, None)
+        if previous is not None:
+            previous.cancel()
+            live_updates.inc(result="superseded")
+        elif self.in_flight >= self.max_in_flight:
+            await self._write({**_echo(request), "error": "Too many requests in flight", "status": "error"})
+            return
+        if revision is not None:
+            self._revisions[field] = revision
+
+        now = time.monotonic()
+        since = self._pending_since.setdefault(field, now)
+        delay = min(self.debounce, max(0.0, since + self.debounce_max_wait - now))
+
+        task = asyncio.ensure_future(self._execute_live(field, request, delay))
+        task.add_done_callback(lambda done: self._forget_field(field, done))
+        self._fields[field] = task
+
+    def _forget_field(self, field: Any, task: asyncio.Task):
+        """حذف حالة الحقل بعد انتهاء آخر تحديث له (ما لم يحل محله تحديث أحدث)"""
+        if self._fields.get(field) is not task:
+            return
+        del self._fields[field]
+        self._revisions.pop(field, None)
+        self._pending_since.pop(field, None)
+
+    async def _execute_live(self, field: Any, request: Dict[str, Any], delay: float):
+        """انتظار فترة الهدوء ثم ترجمة آخر تحديث للحقل"""
+        await asyncio.sleep(delay)
+        self._pending_since.pop(field, None)
+        await self._execute(request)
+        live_updates.inc(result="translated")
+
+    async def _execute(self, request: Dict[str, Any]):
+        """تنفيذ طلب واحد وإرسال خطأ عام إذا فشل المعالج"""
+        echo = _echo(request)
+
+        async def reply(payload: Dict[str, Any]):
+            await self._write({**echo, **self.protocol.trim(payload)})
+
+        try:
+            await self.handler(request, reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # تفاصيل الخطأ (المزود أو قاعدة البيانات) تبقى في السجل ولا تُرسل للعميل
+            logger.exception("WebSocket request failed")
+            try:
+                await reply({"error": "Request failed", "status": "error"})
+            except Exception:
+                pass
+
+    async def _cancel(self, request_id: Any):
+        """إلغاء طلب جارٍ حسب معرّفه"""
+        task = self._tasks.get(request_id) if request_id is not None else None
+        if task is None:
+            await self.send({"error": "Unknown request id", "status": "error"}, request_id)
+            return
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await self.send({"status": "cancelled"}, request_id)
@@ -0,0 +1,191 @@
+# ترميز رسائل WebSocket: JSON افتراضياً أو MessagePack بمفاتيح رقمية يُتفق عليه عند الاتصال
+
+import json
+import logging
+from typing import Any, Dict, Optional, Union
+from fastapi import WebSocket, WebSocketDisconnect
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# إطار كما يُرسل عبر المقبس
+Frame = Union[str, bytes]
+
+# بادئة البروتوكولات الفرعية (Sec-WebSocket-Protocol)، مثل:
+# "mh.translate.v1.msgpack" أو "mh.translate.v1.msgpack+noecho" أو "mh.translate.v1.json+noecho"
+SUBPROTOCOL_PREFIX = "mh.translate.v1."
+
+# أرقام المفاتيح في إطارات MessagePack (ثابتة: لا تُغير أرقام المفاتيح الموجودة، أضف أرقاماً جديدة فقط)
+FIELD_TAGS = {
+    "id": 0,
+    "type": 1,
+    "status": 2,
+    "error": 3,
+    "text": 4,
+    "target_language": 5,
+    "source_language": 6,
+    "translated_text": 7,
+    "original_text": 8,
+    "delta": 9,
+    "stream": 10,
+    "field": 11,
+    "revision": 12,
+    "detected_language": 13,
+    "language_name": 14,
+}
+TAG_FIELDS = {tag: field for field, tag in FIELD_TAGS.items()}
+
+# مفاتيح الرد التي تكرر نص العميل وتُحذف في وضع noecho
+ECHOED_TEXT_KEYS = ("original_text", "text")
+
+negotiated_protocols = metrics_registry.counter(
+    "websocket_protocols_total",
+    "WebSocket connections by negotiated frame format and whether replies echo the input text.",
+    ("format", "echo"))
+
+
+class JsonCodec:
+    """إطارات نصية JSON (الافتراضي للعملاء القدامى)"""
+
+    name = "json"
+    label = "JSON"
+    binary = False
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        # UTF-8 بدلاً من \uXXXX: النص العربي أصغر بثلاث مرات تقريباً ويبقى JSON صالحاً للعملاء القدامى
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    def decode(self, data: Frame) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """إطارات ثنائية MessagePack تُستبدل فيها المفاتيح المعروفة بأرقام FIELD_TAGS"""
+
+    name = "msgpack"
+    label = "MessagePack"
+    binary = True
+
+    def __init__(self):
+        import msgpack
+        self._msgpack = msgpack
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        return self._msgpack.packb({FIELD_TAGS.get(key, key): value for key, value in payload.items()},
+                                   use_bin_type=True)
+
+    def decode(self, data: Frame) -> Any:
+        # الإطارات النصية تُقرأ كـ JSON (مفيد للتجربة اليدوية)
+        if isinstance(data, str):
+            return json.loads(data)
+        try:
+            message = self._msgpack.unpackb(data, raw=False, strict_map_key=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack frame: {e}") from e
+        if isinstance(message, dict):
+            return {TAG_FIELDS.get(key, key): value for key, value in message.items()}
+        return message
+
+
+# صيغ الإطارات المدعومة حسب اسمها في البروتوكول الفرعي
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+class WireProtocol:
+    """صيغة الإطارات وخيار تكرار النص المتفق عليهما لاتصال واحد"""
+
+    def __init__(self, codec, echo: bool = True, subprotocol: Optional[str] = None):
+        """
+        تهيئة البروتوكول
+
+        Args:
+            codec: مُرمّز الإطارات
+            echo: إعادة نص العميل في الردود (original_text وtext)
+            subprotocol: البروتوكول الفرعي الذي يُرد به عند قبول الاتصال
+        """
+        self.codec = codec
+        self.echo = echo
+        self.subprotocol = subprotocol
+
+    def encode(self, payload: Dict[str, Any]) -> Frame:
+        """ترميز إطار"""
+        return self.codec.encode(payload)
+
+    def decode(self, data: Frame) -> Any:
+        """
+        فك ترميز إطار من العميل
+
+        Raises:
+            ValueError إذا كان الإطار غير صالح
+        """
+        return self.codec.decode(data)
+
+    def trim(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """حذف النص المكرر من رد في وضع noecho"""
+        if self.echo:
+            return payload
+        return {key: value for key, value in payload.items() if key not in ECHOED_TEXT_KEYS}
+
+    async def receive(self, websocket: WebSocket) -> Frame:
+        """
+        استلام إطار من العميل
+
+        Raises:
+            WebSocketDisconnect عند قطع الاتصال
+        """
+        if not self.codec.binary:
+            return await websocket.receive_text()
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        if message.get("bytes") is not None:
+            return message["bytes"]
+        return message.get("text") or ""
+
+    @staticmethod
+    async def send(websocket: WebSocket, frame: Frame):
+        """إرسال إطار نصي أو ثنائي حسب نوعه"""
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+
+# البروتوكول الافتراضي: JSON مع تكرار النص
+DEFAULT_PROTOCOL = WireProtocol(JsonCodec())
+
+
+def negotiate_protocol(websocket: WebSocket) -> WireProtocol:
+    """
+    اختيار البروتوكول من البروتوكولات الفرعية التي عرضها العميل
+
+    يُختار أول بروتوكول معروف بترتيب تفضيل العميل؛ ويُتجاوز MessagePack إذا
+    لم تكن المكتبة مثبتة. العملاء الذين لا يعرضون بروتوكولاً يحصلون على JSON.
+
+    Args:
+        websocket: اتصال WebSocket لم يُقبل بعد
+
+    Returns:
+        البروتوكول المتفق عليه
+    """
+    protocol = DEFAULT_PROTOCOL
+    for name in websocket.scope.get("subprotocols") or []:
+        if not name.startswith(SUBPROTOCOL_PREFIX):
+            continue
+        codec_name, _, option = name[len(SUBPROTOCOL_PREFIX):].partition("+")
+        factory = CODECS.get(codec_name)
+        if factory is None or option not in ("", "noecho"):
+            continue
+        try:
+            codec = factory()
+        except ImportError as e:
+            logger.warning(f"WebSocket frame format {codec_name} unavailable: {e}")
+            continue
+        protocol = WireProtocol(codec, echo=option != "noecho", subprotocol=name)
+        break
+
+    negotiated_protocols.inc(format=protocol.codec.name, echo=str(protocol.echo).lower())
+    return protocol
@@ -0,0 +1,205 @@
+# طوابير الإرسال لاتصالات WebSocket مع كاتب مستقل لكل اتصال
+
+import asyncio
+import logging
+import weakref
+from collections import deque
+from typing import Callable, Optional, Union
+from fastapi import WebSocket, status
+from app.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# سياسات التعامل مع العميل البطيء عند امتلاء طابوره
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "disconnect")
+
+dropped_messages = metrics_registry.counter(
+    "websocket_send_dropped_total",
+    "Outbound WebSocket messages dropped, by reason.",
+    ("reason",))
+
+slow_consumer_disconnects = metrics_registry.counter(
+    "websocket_slow_consumer_disconnects_total",
+    "Connections closed because their outbound queue was full.")
+
+# مهلة إغلاق الاتصال بالثواني
+CLOSE_TIMEOUT = 5
+
+# جميع طوابير الإرسال المفتوحة (لجمع عمق الطوابير)
+_open_senders: "weakref.WeakSet[WebSocketSender]" = weakref.WeakSet()
+
+
+def _size(message: Union[str, bytes]) -> int:
+    """حجم الرسالة بالبايت كما تُرسل"""
+    return len(message) if isinstance(message, bytes) else len(message.encode("utf-8"))
+
+
+class WebSocketSender:
+    """
+    طابور إرسال محدود لاتصال WebSocket واحد يفرغه كاتب خاص به
+
+    الإرسال إلى الطابور لا ينتظر الشبكة، فلا يؤخر عميل بطيء التسليم إلى
+    الآخرين، ولا يوقف خطأ اتصال منقطع البث.
+    """
+
+    def __init__(self, websocket: WebSocket, max_size: int = None, policy: str = None,
+                 on_close: Optional[Callable[[], None]] = None):
+        """
+        تهيئة طابور الإرسال
+
+        Args:
+            websocket: اتصال WebSocket مقبول
+            max_size: الحد الأقصى لعدد الرسائل المنتظرة
+            policy: سياسة العميل البطيء (drop_oldest أو disconnect)
+            on_close: دالة تُستدعى مرة واحدة عند إغلاق الطابور
+        """
+        self.websocket = websocket
+        self.max_size = max_size or settings.websocket_send_queue_size
+        self.policy = policy or settings.websocket_slow_consumer_policy
+        if self.policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.policy}")
+        self.on_close = on_close
+        self.closed = False
+        self._queue: deque = deque()
+        self.buffered_bytes = 0
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._writer: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Task] = None
+
+    def start(self):
+        """بدء كاتب الاتصال"""
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._drain())
+            _open_senders.add(self)
+
+    @property
+    def depth(self) -> int:
+        """عدد الرسائل المنتظرة"""
+        return len(self._queue)
+
+    def send_nowait(self, message: Union[str, bytes]) -> bool:
+        """
+        إضافة رسالة إلى الطابور دون انتظار (للبث)
+
+        Args:
+            message: نص الرسالة أو إطار ثنائي
+
+        Returns:
+            True إذا أُضيفت الرسالة
+        """
+        if self.closed:
+            dropped_messages.inc(reason="closed")
+            return False
+
+        if len(self._queue) >= self.max_size:
+            if self.policy == "disconnect":
+                slow_consumer_disconnects.inc()
+                dropped_messages.inc(reason="disconnect")
+                self.stop()
+                self._closing = asyncio.ensure_future(
+                    self._close_socket(status.WS_1013_TRY_AGAIN_LATER, "Slow consumer"))
+                return False
+            self.buffered_bytes -= _size(self._queue.popleft())
+            dropped_messages.inc(reason="drop_oldest")
+
+        self._queue.append(message)
+        self.buffered_bytes += _size(message)
+        self._ready.set()
+        if len(self._queue) >= self.max_size:
+            self._space.clear()
+        return True
+
+    async def send(self, message: Union[str, bytes]) -> bool:
+        """
+        إضافة رسالة بعد انتظار مساحة في الطابور (لردود الطلبات التي لا يجوز إسقاطها)
+
+        Args:
+            message: نص الرسالة أو إطار ثنائي
+
+        Returns:
+            True إذا أُضيفت الرسالة
+        """
+        while not self.closed and len(self._queue) >= self.max_size:
+            await self._space.wait()
+        return self.send_nowait(message)
+
+    async def close(self, code: int = None, reason: str = None):
+        """
+        إغلاق الطابور وإيقاف الكاتب، وإغلاق الاتصال إذا حُدد رمز
+
+        Args:
+            code: رمز إغلاق WebSocket (None لعدم إغلاق الاتصال)
+            reason: سبب الإغلاق
+        """
+        self.stop()
+        if code is not None:
+            await self._close_socket(code, reason)
+
+    def stop(self):
+        """إغلاق الطابور وإلغاء الكاتب دون إغلاق الاتصال"""
+        self._shutdown()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    async def _close_socket(self, code: int, reason: str):
+        """إغلاق اتصال WebSocket مع تجاهل الاتصالات المنقطعة"""
+        try:
+            # اتصال نصف مفتوح قد لا يكتمل إغلاقه أبداً
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"WebSocket close failed: {e}")
+
+    def _shutdown(self):
+        """تعليم الطابور كمغلق وإيقاظ المنتظرين"""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self.buffered_bytes = 0
+        self._ready.set()
+        self._space.set()
+        _open_senders.discard(self)
+        if self.on_close is not None:
+            try:
+                self.on_close()
+            except Exception as e:
+                logger.error(f"WebSocket sender close callback error: {e}")
+
+    async def _drain(self):
+        """إرسال رسائل الطابور بالترتيب حتى الإغلاق"""
+        while not self.closed:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            message = self._queue.popleft()
+            self.buffered_bytes -= _size(message)
+            self._space.set()
+            try:
+                if isinstance(message, bytes):
+                    await self.websocket.send_bytes(message)
+                else:
+                    await self.websocket.send_text(message)
+            except Exception as e:
+                # اتصال منقطع: إيقاف هذا الكاتب فقط
+                logger.debug(f"WebSocket send failed: {e}")
+                self._shutdown()
+
+
+def _collect_sender_metrics():
+    """عدد الاتصالات وعمق طوابير الإرسال"""
+    depths = [sender.depth for sender in list(_open_senders)]
+    return [
+        ("websocket_open_connections", "gauge", "WebSocket connections with an outbound queue.",
+         [({}, len(depths))]),
+        ("websocket_send_queue_depth", "gauge", "Messages waiting in all outbound queues.",
+         [({}, sum(depths))]),
+        ("websocket_send_queue_max_depth", "gauge", "Deepest outbound queue.",
+         [({}, max(depths, default=0))]),
+    ]
+
+
+metrics_registry.register_collector(_collect_sender_metrics)
@@ -8,7 +8,7 @@ from app.core.locale_middleware import (
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 import time
 import uvicorn
@@ -17,7 +17,13 @@ from app.config import settings
 from app.api.api_v1.api import api_router
 from app.core import initial_data
 from app.core.logging import setup_logging
-from app.core.database import create_tables
+from app.core.database import RequestSessionMiddleware, create_tables, dispose_async_engine
+from app.core.content_pretranslation import pretranslation_worker
+from app.core.metrics import metrics_registry
+from app.core.presence import presence_registry
+from app.core.loop_monitor import loop_lag_monitor
+from app.core.group_rooms import group_rooms
+from app.core.biomarker_partitions import biomarker_retention_job
 
 # إعداد التسجيل
 setup_logging()
@@ -39,6 +45,71 @@ def on_startup():
     # Development fallback: create tables if enabled
     if settings.auto_create_db:
         create_tables()
+    # تشغيل عامل الترجمة المسبقة للمحتوى المنشور
+    if settings.pretranslation_enabled:
+        pretranslation_worker.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """
+    يتم تنفيذ هذه الدالة عند إيقاف التطبيق.
+    """
+    pretranslation_worker.stop(timeout=5)
+
+
+@app.on_event("startup")
+async def start_presence():
+    """بدء نبض هذه العملية والاستماع لرسائل WebSocket من العمليات الأخرى"""
+    await presence_registry.start()
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """بدء قياس تأخر حلقة الأحداث"""
+    loop_lag_monitor.start()
+
+
+@app.on_event("startup")
+async def start_group_rooms():
+    """بدء حفظ رسائل غرف المجموعات على دفعات"""
+    group_rooms.start()
+
+
+@app.on_event("startup")
+async def start_biomarker_retention():
+    """بدء صيانة أقسام المؤشرات الحيوية الشهرية ومدة الاحتفاظ بها"""
+    biomarker_retention_job.start()
+
+
+@app.on_event("shutdown")
+async def stop_group_rooms():
+    """حفظ رسائل الغرف المتبقية قبل إيقاف العملية"""
+    await group_rooms.stop()
+
+
+@app.on_event("shutdown")
+async def stop_presence():
+    """حذف اتصالات هذه العملية من سجل الحضور"""
+    await presence_registry.stop()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    """إيقاف قياس تأخر حلقة الأحداث"""
+    await loop_lag_monitor.stop()
+
+
+@app.on_event("shutdown")
+async def stop_biomarker_retention():
+    """إيقاف صيانة أقسام المؤشرات الحيوية"""
+    await biomarker_retention_job.stop()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """إغلاق اتصالات المحرك غير المتزامن"""
+    await dispose_async_engine()
 
 # Middleware لتسجيل مدة معالجة الطلب
 
@@ -77,6 +148,10 @@ app.add_middleware(LocaleMiddleware)
 app.add_middleware(LocaleConsentMiddleware)
 app.add_middleware(LocaleRedirectMiddleware)
 
+# جلسة قاعدة بيانات واحدة لكل طلب يتشاركها وسطاء اللغة ونقاط النهاية؛
+# تُضاف أخيراً لتكون الوسيط الخارجي الذي يغلق الجلسة بعد انتهاء الجميع
+app.add_middleware(RequestSessionMiddleware)
+
 # إضافة المسارات الثابتة
 import os
 static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "static")
@@ -93,6 +168,15 @@ templates = Jinja2Templates(directory=templates_dir)
 async def root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    مؤشرات التطبيق بتنسيق Prometheus النصي
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # تضمين مسارات API
 app.include_router(api_router, prefix=settings.api_prefix)
 
@@ -113,5 +197,6 @@ if __name__ == "__main__":
         host="192.168.1.7",
         port=8000,
         reload=settings.debug,
-        log_level="info"
+        log_level="info",
+        ws_per_message_deflate=settings.websocket_per_message_deflate
     )
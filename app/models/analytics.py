@@ -1,14 +1,23 @@
 # نماذج التحليلات
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Boolean, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, ForeignKey, Float, Boolean, JSON, Index, Sequence
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
+# تسلسل معرفات المؤشرات الحيوية مشترك بين كل الأقسام الشهرية
+BIOMARKER_ID_SEQUENCE = Sequence("digital_biomarkers_id_seq")
+
 
 class MoodEntry(Base):
     __tablename__ = "mood_entries"
+    # فهرس (user_id, الزمن) لاستعلامات السجل حسب نطاق تاريخ؛ الأعمدة المضمّنة
+    # تجعل استعلامات الرسوم البيانية مسحاً من الفهرس فقط في PostgreSQL
+    __table_args__ = (
+        Index("ix_mood_entries_user_id_created_at", "user_id", "created_at",
+              postgresql_include=["mood_score"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -24,6 +33,10 @@ class MoodEntry(Base):
 
 class SleepEntry(Base):
     __tablename__ = "sleep_entries"
+    __table_args__ = (
+        Index("ix_sleep_entries_user_id_created_at", "user_id", "created_at",
+              postgresql_include=["sleep_duration", "sleep_quality"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -40,6 +53,10 @@ class SleepEntry(Base):
 
 class ActivityEntry(Base):
     __tablename__ = "activity_entries"
+    __table_args__ = (
+        Index("ix_activity_entries_user_id_created_at", "user_id", "created_at",
+              postgresql_include=["duration", "intensity"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -55,14 +72,23 @@ class ActivityEntry(Base):
 
 class DigitalBiomarker(Base):
     __tablename__ = "digital_biomarkers"
-
-    id = Column(Integer, primary_key=True, index=True)
+    # في PostgreSQL الجدول مقسم شهرياً حسب timestamp (انظر app/core/biomarker_partitions.py)،
+    # لذا مفتاح التقسيم جزء من المفتاح الأساسي. في SQLite تُخزن القراءات في جداول شهرية
+    # منفصلة ولا يُستخدم هذا الجدول.
+    __table_args__ = (
+        Index("ix_digital_biomarkers_user_id_timestamp", "user_id", "timestamp",
+              postgresql_include=["biomarker_type", "value"]),
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
+    )
+
+    id = Column(BigInteger, BIOMARKER_ID_SEQUENCE, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     # typing_speed, sleep_pattern, activity_pattern, إلخ
     biomarker_type = Column(String, nullable=False)
     value = Column(Float, nullable=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    metadata = Column(String, nullable=True)  # JSON
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    # اسم الخاصية metadata محجوز في SQLAlchemy، فيبقى اسم العمود ويتغير اسم الخاصية
+    biomarker_metadata = Column("metadata", String, nullable=True)  # JSON
 
     # العلاقات
     user = relationship("User", back_populates="digital_biomarkers")
@@ -87,6 +113,10 @@ class LifeInflectionPoint(Base):
 
 class WellnessScore(Base):
     __tablename__ = "wellness_scores"
+    __table_args__ = (
+        Index("ix_wellness_scores_user_id_date", "user_id", "date",
+              postgresql_include=["score"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -101,6 +131,7 @@ class WellnessScore(Base):
 
 class Insight(Base):
     __tablename__ = "insights"
+    __table_args__ = (Index("ix_insights_user_id_created_at", "user_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
 # نماذج المحتوى
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -174,11 +174,16 @@ class GroupMembership(Base):
 
 class GroupPost(Base):
     __tablename__ = "group_posts"
+    __table_args__ = (
+        # رقم تسلسل الرسالة في غرفة المجموعة الحية (فريد لكل مجموعة)
+        UniqueConstraint("group_id", "sequence", name="uq_group_posts_group_sequence"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("support_groups.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
+    sequence = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # العلاقات
@@ -271,3 +276,23 @@ class ModuleCompletion(Base):
     # العلاقات
     user = relationship("User")
     module = relationship("ProgramModule", back_populates="completions")
+
+
+class ContentTranslation(Base):
+    __tablename__ = "content_translations"
+    __table_args__ = (
+        UniqueConstraint("content_type", "content_id", "locale",
+                         name="uq_content_translations_content_locale"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # article, meditation, exercise, program, program_module
+    content_type = Column(String, nullable=False)
+    content_id = Column(Integer, nullable=False)
+    locale = Column(String(10), nullable=False)
+    source_locale = Column(String(10), nullable=True)
+    # بصمة الحقول الأصلية لتجنب إعادة ترجمة محتوى لم يتغير
+    source_hash = Column(String(64), nullable=False)
+    fields = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -258,6 +258,7 @@ class GroupPostCreate(GroupPostBase):
 
 class GroupPostInDBBase(GroupPostBase):
     id: int
+    sequence: Optional[int] = None
     created_at: datetime
 
     class Config:
@@ -0,0 +1,134 @@
+"""Benchmark: event-loop lag of async endpoints using the sync vs the async DB session.
+
+Runs the consent lookup done on every /language request from `async def`
+handlers, first with the sync Session (what the endpoints did before: the
+query runs on the event loop) and then with AsyncSession from get_async_db
+(the query is awaited). Reports throughput, request latency and the event-loop
+lag measured by EventLoopLagMonitor while the requests run.
+
+The default database is a temporary SQLite file (aiosqlite for the async
+path) whose language_consents table has no index on user_id, like the model,
+so each lookup is a table scan. Point --database-url at PostgreSQL to measure
+psycopg2 vs asyncpg instead.
+
+    python scripts/bench_async_db.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import InstrumentedAsyncQueuePool, async_database_url, engine_options  # noqa: E402
+from app.core.loop_monitor import EventLoopLagMonitor  # noqa: E402
+
+CONSENT_QUERY = text("SELECT consent_given, preferred_locale, locale_source FROM language_consents "
+                     "WHERE user_id = :user_id LIMIT 1")
+
+
+def create_table(database_url: str, rows: int):
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS language_consents"))
+        connection.execute(text("CREATE TABLE language_consents (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                                "consent_given BOOLEAN, preferred_locale VARCHAR, locale_source VARCHAR)"))
+        connection.execute(text("INSERT INTO language_consents (id, user_id, consent_given, preferred_locale, "
+                                "locale_source) VALUES (:id, :id, true, 'ar', 'manual')"),
+                           [{"id": user_id} for user_id in range(rows)])
+    engine.dispose()
+
+
+async def run(handler, requests: int, concurrency: int, users: int) -> dict:
+    monitor = EventLoopLagMonitor(interval=0.005)
+    monitor.start()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await handler(index * 7919 % users)
+            latencies.append(time.perf_counter() - start)
+
+    # مهلة ليأخذ المراقب قياساته الأولى
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await asyncio.gather(*(request(index) for index in range(requests)))
+    elapsed = time.perf_counter() - start
+    # مهلة ليسجل المراقب استيقاظه المتأخر إذا حُجبت الحلقة حتى نهاية الطلبات
+    await asyncio.sleep(0.05)
+    lags = list(monitor._recent)
+    await monitor.stop()
+
+    latencies.sort()
+    return {
+        "requests_per_second": requests / elapsed,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "loop_lag_mean_ms": statistics.mean(lags) * 1000 if lags else 0.0,
+        "loop_lag_max_ms": monitor.max_lag * 1000,
+    }
+
+
+async def bench(database_url: str, requests: int, concurrency: int, users: int) -> dict:
+    engine = create_engine(database_url, **engine_options(database_url))
+    session_factory = sessionmaker(bind=engine)
+    async_url = async_database_url(database_url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, InstrumentedAsyncQueuePool))
+    async_session_factory = async_sessionmaker(async_engine)
+
+    async def sync_session_handler(user_id: int):
+        # async def + Session: الاستعلام يعمل على حلقة الأحداث نفسها
+        with session_factory() as db:
+            db.execute(CONSENT_QUERY, {"user_id": user_id}).first()
+
+    async def async_session_handler(user_id: int):
+        async with async_session_factory() as db:
+            (await db.execute(CONSENT_QUERY, {"user_id": user_id})).first()
+
+    results = {}
+    for name, handler in (("sync Session", sync_session_handler), ("AsyncSession", async_session_handler)):
+        await handler(0)
+        results[name] = await run(handler, requests, concurrency, users)
+
+    engine.dispose()
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="sync database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=200000, help="rows in language_consents")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        create_table(database_url, args.rows)
+        results = asyncio.run(bench(database_url, args.requests, args.concurrency, args.rows))
+
+    print(f"{'session':<14}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'lag mean ms':>13}{'lag max ms':>12}")
+    for name, result in results.items():
+        print(f"{name:<14}{result['requests_per_second']:>9.0f}{result['latency_p50_ms']:>9.1f}"
+              f"{result['latency_p99_ms']:>9.1f}{result['loop_lag_mean_ms']:>13.1f}{result['loop_lag_max_ms']:>12.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: accuracy and latency of the local language detector.
+
+Runs LanguageDetector over a labelled set of held-out sentences (none of them
+appear in app/core/language_samples.py) and reports:
+
+  * accuracy over all inputs and over inputs above the confidence threshold,
+  * the share of inputs that would fall back to the LLM,
+  * per-call latency percentiles and batch throughput.
+
+    python scripts/bench_language_detector.py --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.core.language_detector import language_detector  # noqa: E402
+
+HELD_OUT = [
+    ("en", "I have been feeling anxious lately and I cannot sleep well at night."),
+    ("fr", "Je me sens anxieux ces derniers temps et je n'arrive pas à bien dormir la nuit."),
+    ("es", "Últimamente me siento ansioso y no puedo dormir bien por la noche."),
+    ("de", "In letzter Zeit fühle ich mich ängstlich und kann nachts nicht gut schlafen."),
+    ("it", "Ultimamente mi sento ansioso e non riesco a dormire bene la notte."),
+    ("pt", "Ultimamente tenho me sentido ansioso e não consigo dormir bem à noite."),
+    ("nl", "De laatste tijd voel ik me angstig en kan ik 's nachts niet goed slapen."),
+    ("sv", "Den senaste tiden har jag känt mig orolig och kan inte sova bra på natten."),
+    ("da", "På det seneste har jeg følt mig urolig og kan ikke sove godt om natten."),
+    ("no", "I det siste har jeg følt meg urolig og klarer ikke å sove godt om natten."),
+    ("fi", "Olen viime aikoina tuntenut itseni ahdistuneeksi enkä saa nukuttua kunnolla öisin."),
+    ("pl", "Ostatnio czuję niepokój i nie mogę dobrze spać w nocy."),
+    ("cs", "V poslední době se cítím úzkostně a v noci nemohu dobře spát."),
+    ("sk", "V poslednom čase sa cítim úzkostne a v noci nemôžem dobre spať."),
+    ("sl", "Zadnje čase se počutim tesnobno in ponoči ne morem dobro spati."),
+    ("hr", "U posljednje vrijeme osjećam tjeskobu i ne mogu dobro spavati noću."),
+    ("hu", "Mostanában szorongok, és éjszaka nem tudok jól aludni."),
+    ("ro", "În ultima vreme mă simt anxios și nu pot dormi bine noaptea."),
+    ("et", "Viimasel ajal tunnen end ärevana ega suuda öösel hästi magada."),
+    ("lv", "Pēdējā laikā jūtos nemierīgs un naktī nevaru labi gulēt."),
+    ("lt", "Pastaruoju metu jaučiu nerimą ir naktį negaliu gerai miegoti."),
+    ("tr", "Son zamanlarda kendimi endişeli hissediyorum ve geceleri iyi uyuyamıyorum."),
+    ("az", "Son vaxtlar özümü narahat hiss edirəm və gecələr yaxşı yata bilmirəm."),
+    ("vi", "Gần đây tôi cảm thấy lo lắng và không thể ngủ ngon vào ban đêm."),
+    ("id", "Akhir-akhir ini saya merasa cemas dan tidak bisa tidur nyenyak di malam hari."),
+    ("tl", "Nitong mga nakaraang araw ay nababalisa ako at hindi ako makatulog nang maayos sa gabi."),
+    ("sw", "Hivi karibuni nimekuwa na wasiwasi na siwezi kulala vizuri usiku."),
+    ("af", "Die afgelope tyd voel ek angstig en kan ek nie snags goed slaap nie."),
+    ("ca", "Últimament em sento ansiós i no puc dormir bé a la nit."),
+    ("eu", "Azkenaldian urduri sentitzen naiz eta ezin dut gauez ondo lo egin."),
+    ("cy", "Yn ddiweddar rydw i wedi bod yn teimlo'n bryderus ac ni allaf gysgu'n dda yn y nos."),
+    ("is", "Undanfarið hef ég verið kvíðinn og get ekki sofið vel á nóttunni."),
+    ("sq", "Kohët e fundit ndihem i shqetësuar dhe nuk mund të fle mirë natën."),
+    ("ru", "В последнее время я чувствую тревогу и не могу нормально спать по ночам."),
+    ("uk", "Останнім часом я відчуваю тривогу і не можу добре спати вночі."),
+    ("bg", "Напоследък се чувствам тревожен и не мога да спя добре през нощта."),
+    ("sr", "У последње време осећам анксиозност и не могу добро да спавам ноћу."),
+    ("kk", "Соңғы кездері мен өзімді мазасыз сезінемін және түнде жақсы ұйықтай алмаймын."),
+    ("ar", "أشعر بالقلق في الآونة الأخيرة ولا أستطيع النوم جيداً في الليل."),
+    ("fa", "این روزها احساس اضطراب می‌کنم و شب‌ها نمی‌توانم خوب بخوابم."),
+    ("ur", "آج کل میں بےچینی محسوس کرتا ہوں اور رات کو ٹھیک سے سو نہیں پاتا۔"),
+    ("hi", "आजकल मुझे चिंता महसूस होती है और मैं रात को ठीक से सो नहीं पाता।"),
+    ("mr", "अलीकडे मला चिंता वाटते आणि मला रात्री नीट झोप लागत नाही."),
+    ("ne", "आजकल म चिन्तित महसुस गर्छु र राति राम्रोसँग सुत्न सक्दिन।"),
+    ("zh", "最近我感到很焦虑，晚上睡不好。"),
+    ("ja", "最近不安を感じていて、夜よく眠れません。"),
+    ("ko", "요즘 불안하고 밤에 잠을 잘 못 자요."),
+    ("th", "ช่วงนี้ฉันรู้สึกกังวลและนอนไม่ค่อยหลับในตอนกลางคืน"),
+    ("he", "לאחרונה אני מרגיש חרד ואני לא מצליח לישון טוב בלילה."),
+    ("hy", "Վերջերս ես անհանգստություն եմ զգում և գիշերը չեմ կարողանում լավ քնել։"),
+    ("ka", "ბოლო დროს შფოთვას ვგრძნობ და ღამით კარგად ვერ ვიძინებ."),
+    ("am", "በቅርቡ ጭንቀት ይሰማኛል እና ማታ በደንብ መተኛት አልችልም።"),
+    ("bn", "ইদানীং আমি উদ্বিগ্ন বোধ করছি এবং রাতে ভালো ঘুমাতে পারছি না।"),
+    ("ta", "சமீபகாலமாக நான் பதட்டமாக உணர்கிறேன், இரவில் நன்றாக தூங்க முடியவில்லை."),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200,
+                        help="عدد مرات تكرار مجموعة الاختبار لقياس الزمن")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    threshold = settings.language_detection_min_confidence
+    correct = confident = confident_correct = 0
+    for expected, text in HELD_OUT:
+        detected, confidence = language_detector.detect(text)
+        correct += detected == expected
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += detected == expected
+        if args.verbose or detected != expected:
+            print(f"  {expected} -> {detected} ({confidence:.2f})")
+
+    total = len(HELD_OUT)
+    print(f"inputs={total} languages={len({lang for lang, _ in HELD_OUT})} "
+          f"threshold={threshold}")
+    print(f"accuracy (all)        {correct / total:.1%}")
+    print(f"accuracy (confident)  {confident_correct / max(confident, 1):.1%}")
+    print(f"LLM fallback rate     {(total - confident) / total:.1%}")
+
+    texts = [text for _, text in HELD_OUT]
+    latencies = []
+    for _ in range(args.repeat):
+        for text in texts:
+            start = time.perf_counter()
+            language_detector.detect(text)
+            latencies.append(time.perf_counter() - start)
+    print(f"latency p50={percentile(latencies, 50) * 1e6:.0f}us "
+          f"p99={percentile(latencies, 99) * 1e6:.0f}us")
+
+    batch = texts * args.repeat
+    start = time.perf_counter()
+    language_detector.detect_batch(batch)
+    elapsed = time.perf_counter() - start
+    print(f"batch throughput      {len(batch) / elapsed:,.0f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: cross-request micro-batching of real-time translation traffic.
+
+Simulates N concurrent WebSocket clients, each sending short messages with
+random think time, against a mock LLM whose latency grows slightly with the
+batch size and which only serves a limited number of requests in parallel
+(like a provider concurrency / rate limit). Compares one LLM call per message
+with TranslationMicroBatcher, reporting throughput and latency percentiles.
+
+    python scripts/bench_micro_batcher.py --clients 1000 --messages 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.translation_batcher import TranslationMicroBatcher  # noqa: E402
+
+
+class MockLLM:
+    """نموذج لغوي وهمي بزمن استجابة وعدد محدود من الطلبات المتزامنة"""
+
+    def __init__(self, base_latency: float, per_item_latency: float, concurrency: int):
+        self.base_latency = base_latency
+        self.per_item_latency = per_item_latency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.calls = 0
+
+    async def translate_batch(self, texts, target_locale, source_locale=None):
+        async with self.semaphore:
+            self.calls += 1
+            await asyncio.sleep(self.base_latency + self.per_item_latency * len(texts))
+            return [f"[{target_locale}] {text}" for text in texts]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_clients(translate, clients: int, messages: int, think_ms: int, targets):
+    latencies = []
+
+    async def client(client_id: int):
+        rng = random.Random(client_id)
+        target = targets[client_id % len(targets)]
+        for n in range(messages):
+            await asyncio.sleep(rng.uniform(0, think_ms) / 1000)
+            start = time.perf_counter()
+            await translate(f"hello from {client_id} #{n}", target, "en")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label: str, latencies, elapsed: float, calls: int):
+    print(f"{label:<10} requests={len(latencies):<6} llm_calls={calls:<6} "
+          f"throughput={len(latencies) / elapsed:8.1f} req/s  "
+          f"p50={percentile(latencies, 50) * 1000:7.1f}ms  "
+          f"p99={percentile(latencies, 99) * 1000:7.1f}ms")
+
+
+async def main(args):
+    targets = args.targets.split(",")
+
+    llm = MockLLM(args.latency / 1000, args.per_item / 1000, args.llm_concurrency)
+
+    async def unbatched(text, target, source):
+        return (await llm.translate_batch([text], target, source))[0]
+
+    latencies, elapsed = await run_clients(
+        unbatched, args.clients, args.messages, args.think_ms, targets)
+    report("unbatched", latencies, elapsed, llm.calls)
+
+    llm = MockLLM(args.latency / 1000, args.per_item / 1000, args.llm_concurrency)
+    batcher = TranslationMicroBatcher(
+        translate_batch=llm.translate_batch,
+        window_ms=args.window_ms,
+        max_items=args.max_items,
+    )
+    latencies, elapsed = await run_clients(
+        batcher.translate, args.clients, args.messages, args.think_ms, targets)
+    report("batched", latencies, elapsed, llm.calls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--think-ms", type=int, default=200,
+                        help="أقصى وقت انتظار عشوائي بين رسائل العميل")
+    parser.add_argument("--latency", type=float, default=300,
+                        help="زمن الاستجابة الأساسي للنموذج بالمللي ثانية")
+    parser.add_argument("--per-item", type=float, default=5,
+                        help="زمن إضافي لكل عنصر في الدفعة بالمللي ثانية")
+    parser.add_argument("--llm-concurrency", type=int, default=50)
+    parser.add_argument("--window-ms", type=int, default=20)
+    parser.add_argument("--max-items", type=int, default=32)
+    parser.add_argument("--targets", default="ar,fr,es")
+    asyncio.run(main(parser.parse_args()))
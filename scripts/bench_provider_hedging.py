@@ -0,0 +1,92 @@
+"""Benchmark: tail latency of hedged vs. single-provider translation calls.
+
+Two fake providers with a log-normal latency and a small share of stalled
+requests (the long tail seen on real LLM APIs) serve interactive requests
+from a thread pool. Compares always using the preferred provider with
+ProviderRouter hedging, which fires a second provider after the primary's
+p95 delay and keeps the first answer.
+
+    python scripts/bench_provider_hedging.py --requests 400 --stall-rate 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.translation_providers import CompletionResult, FakeProvider, ProviderRouter  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "I feel anxious today."}]
+
+
+class TailLatencyProvider(FakeProvider):
+    """مزود وهمي بزمن استجابة لوغاريتمي طبيعي ونسبة من الطلبات المتعثرة"""
+
+    def __init__(self, name, median, stall_rate, stall_latency, seed):
+        super().__init__(name, seed=seed)
+        self.median = median
+        self.stall_rate = stall_rate
+        self.stall_latency = stall_latency
+
+    def complete(self, messages, max_tokens, temperature=0.1):
+        with self._lock:
+            self.calls += 1
+            stalled = self._random.random() < self.stall_rate
+            latency = self.median * self._random.lognormvariate(0, 0.3)
+        time.sleep(self.stall_latency if stalled else latency)
+        return CompletionResult(messages[-1]["content"], None, self.name)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(router, requests, concurrency, hedge):
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        router.complete(MESSAGES, 50, hedge=hedge)
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--median-ms", type=float, default=80)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    def make_router():
+        providers = [
+            TailLatencyProvider(name, args.median_ms / 1000, args.stall_rate,
+                                args.stall_ms / 1000, seed)
+            for seed, name in enumerate(("primary", "secondary"))
+        ]
+        return ProviderRouter(providers, hedge_default_delay=args.median_ms * 3 / 1000)
+
+    for label, hedge in (("single provider", False), ("hedged", True)):
+        router = make_router()
+        # تسخين: جمع عينات لحساب النسبة المئوية 95
+        run(router, 40, args.concurrency, hedge=False)
+        latencies = run(router, args.requests, args.concurrency, hedge)
+        calls = sum(provider.calls for provider in router.providers)
+        stats = router.get_stats()
+        print(f"{label:16s} p50={percentile(latencies, 50) * 1000:6.0f}ms "
+              f"p95={percentile(latencies, 95) * 1000:6.0f}ms "
+              f"p99={percentile(latencies, 99) * 1000:6.0f}ms "
+              f"calls={calls} hedges={stats['hedges_fired']} won={stats['hedges_won']}")
+
+
+if __name__ == "__main__":
+    main()
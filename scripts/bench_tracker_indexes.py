@@ -0,0 +1,186 @@
+"""Benchmark: query plans of tracker date-range queries before and after the composite indexes.
+
+Loads synthetic rows into a copy of mood_entries (in its own schema on
+PostgreSQL), runs the tracker query
+
+  SELECT created_at, mood_score FROM mood_entries
+  WHERE user_id = :user_id AND created_at >= :start AND created_at < :end
+  ORDER BY created_at
+
+for a sample of users, then creates the index defined by migration
+0001_tracker_time_series_indexes and runs the same queries again. Reports the
+plan node, heap fetches, buffers and execution time from
+EXPLAIN (ANALYZE, BUFFERS). After VACUUM the plan should be an Index Only Scan
+with zero heap fetches.
+
+    python scripts/bench_tracker_indexes.py --database-url postgresql://user:pw@localhost/bench --rows 10000000
+
+SQLite works for a quick local check (EXPLAIN QUERY PLAN reports
+"USING COVERING INDEX"), e.g. --database-url sqlite:///bench.db --rows 1000000.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATION = os.path.join(ROOT, "alembic", "versions", "0001_tracker_time_series_indexes.py")
+SCHEMA = "bench_tracker_indexes"
+TABLE = "mood_entries"
+
+QUERY = text(f"SELECT created_at, mood_score FROM {TABLE} "
+             "WHERE user_id = :user_id AND created_at >= :start AND created_at < :end ORDER BY created_at")
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("tracker_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def create_postgresql(connection, rows: int, users: int):
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    connection.execute(text(f"SET search_path TO {SCHEMA}"))
+    connection.execute(text(f"CREATE TABLE {TABLE} (id BIGSERIAL PRIMARY KEY, user_id INTEGER NOT NULL, "
+                            "mood_score INTEGER NOT NULL, emotion VARCHAR, notes TEXT, triggers VARCHAR, "
+                            "created_at TIMESTAMPTZ NOT NULL)"))
+    # صفوف بترتيب الإدخال (لا بترتيب المستخدم) كما في جدول حقيقي
+    connection.execute(text(
+        f"INSERT INTO {TABLE} (user_id, mood_score, emotion, notes, created_at) "
+        "SELECT 1 + (g * 7919) % :users, 1 + g % 10, 'calm', repeat('n', 60), "
+        "now() - (:rows - g) * interval '1 second' * (365 * 86400.0 / :rows) "
+        "FROM generate_series(1, :rows) AS g"), {"rows": rows, "users": users})
+    connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def create_sqlite(connection, rows: int, users: int):
+    connection.execute(text("PRAGMA journal_mode = OFF"))
+    connection.execute(text("PRAGMA synchronous = OFF"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    connection.execute(text(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                            "mood_score INTEGER NOT NULL, emotion VARCHAR, notes TEXT, triggers VARCHAR, "
+                            "created_at TIMESTAMP NOT NULL)"))
+    end = datetime.now(timezone.utc)
+    step = 365 * 86400 / rows
+    for offset in range(0, rows, 100000):
+        connection.execute(
+            text(f"INSERT INTO {TABLE} (user_id, mood_score, emotion, notes, created_at) "
+                 "VALUES (:user_id, :mood_score, 'calm', :notes, :created_at)"),
+            [{"user_id": 1 + (g * 7919) % users, "mood_score": 1 + g % 10, "notes": "n" * 60,
+              "created_at": (end - timedelta(seconds=(rows - g) * step)).isoformat()}
+             for g in range(offset + 1, min(rows, offset + 100000) + 1)])
+    connection.execute(text(f"ANALYZE {TABLE}"))
+
+
+def create_index(connection, migration, postgresql: bool):
+    for table, columns, include in migration.TRACKER_INDEXES:
+        if table != TABLE:
+            continue
+        name = migration.index_name(table, columns)
+        if postgresql:
+            connection.execute(text(f"CREATE INDEX {name} ON {TABLE} ({', '.join(columns)}) "
+                                    f"INCLUDE ({', '.join(include)})"))
+            connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+        else:
+            # SQLite لا يدعم INCLUDE: الأعمدة المضمّنة تُلحق بالمفتاح ليصبح الفهرس مغطياً
+            connection.execute(text(f"CREATE INDEX {name} ON {TABLE} ({', '.join(columns + include)})"))
+            connection.execute(text(f"ANALYZE {TABLE}"))
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain_postgresql(connection, params: dict) -> dict:
+    plan = connection.execute(text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + QUERY.text), params).scalar()[0]
+    scan = next(node for node in plan_nodes(plan["Plan"]) if "Scan" in node["Node Type"])
+    return {
+        "plan": scan["Node Type"],
+        "heap_fetches": scan.get("Heap Fetches"),
+        "buffers": plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get("Shared Read Blocks", 0),
+        "rows": plan["Plan"]["Actual Rows"],
+        "ms": plan["Execution Time"],
+    }
+
+
+def explain_sqlite(connection, params: dict) -> dict:
+    detail = " / ".join(row[-1] for row in connection.execute(text("EXPLAIN QUERY PLAN " + QUERY.text), params))
+    start = time.perf_counter()
+    found = len(connection.execute(QUERY, params).all())
+    return {"plan": detail, "heap_fetches": None, "buffers": None, "rows": found,
+            "ms": (time.perf_counter() - start) * 1000}
+
+
+def measure(connection, explain, samples: list) -> dict:
+    results = [explain(connection, params) for params in samples]
+    return {
+        "plan": results[0]["plan"],
+        "heap_fetches": results[0]["heap_fetches"],
+        "buffers_median": statistics.median(r["buffers"] for r in results) if results[0]["buffers"] is not None else None,
+        "rows_median": statistics.median(r["rows"] for r in results),
+        "ms_median": statistics.median(r["ms"] for r in results),
+        "ms_max": max(r["ms"] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="PostgreSQL (or SQLite for a quick check)")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=50, help="users queried per phase")
+    parser.add_argument("--days", type=int, default=30, help="length of the queried date range")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark table")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    postgresql = engine.dialect.name == "postgresql"
+    migration = load_migration()
+    rng = random.Random(0)
+    end = datetime.now(timezone.utc) - timedelta(days=rng.randrange(30, 300))
+    samples = [{"user_id": 1 + rng.randrange(args.users), "start": end - timedelta(days=args.days), "end": end}
+               for _ in range(args.samples)]
+    if not postgresql:
+        samples = [{**params, "start": params["start"].isoformat(), "end": params["end"].isoformat()}
+                   for params in samples]
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        start = time.perf_counter()
+        (create_postgresql if postgresql else create_sqlite)(connection, args.rows, args.users)
+        print(f"loaded {args.rows:,} rows for {args.users:,} users in {time.perf_counter() - start:.0f}s")
+
+        explain = explain_postgresql if postgresql else explain_sqlite
+        results = {"without index": measure(connection, explain, samples)}
+        start = time.perf_counter()
+        create_index(connection, migration, postgresql)
+        print(f"created index in {time.perf_counter() - start:.0f}s")
+        results["with index"] = measure(connection, explain, samples)
+
+        if postgresql and not args.keep:
+            connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    for phase, result in results.items():
+        print(f"\n{phase}: {result['plan']}")
+        print(f"  rows/query {result['rows_median']:.0f}  median {result['ms_median']:.2f} ms  "
+              f"max {result['ms_max']:.2f} ms  heap fetches {result['heap_fetches']}  "
+              f"buffers {result['buffers_median']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
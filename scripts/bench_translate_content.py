@@ -0,0 +1,123 @@
+"""Benchmark: provider calls and wall-clock time of AutoTranslator.translate_content.
+
+Builds a representative program (title/description/content plus N modules,
+each with exercises), swaps the OpenAI client for a fake one with a fixed
+round-trip latency, and compares:
+
+  * sequential  - the previous behaviour: every field translated one after
+                  another, each call detecting the source language itself.
+  * fan-out     - translate_content: one detection per document and the
+                  flattened fields translated as deduplicated segments.
+
+No network access or API key is needed.
+
+    python scripts/bench_translate_content.py --modules 10 --latency 0.2
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.core.auto_translator import AutoTranslator, TRANSLATABLE_FIELDS, NESTED_FIELDS  # noqa: E402
+from app.core.llm_scheduler import LLMScheduler  # noqa: E402
+from app.core.translation_memory import TranslationMemory  # noqa: E402
+from app.core.translation_providers import OpenAIProvider, ProviderRouter  # noqa: E402
+
+
+class FakeChatClient:
+    """عميل وهمي متوافق مع واجهة OpenAI يحسب عدد الاستدعاءات"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, max_tokens, temperature, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if max_tokens <= 10:
+            reply = "en"
+        else:
+            reply = f"[translated] {messages[-1]['content']}"
+        return SimpleNamespace(choices=[SimpleNamespace(
+            message=SimpleNamespace(content=reply))])
+
+
+def build_program(modules: int, exercises: int) -> dict:
+    """إنشاء برنامج تمثيلي للاختبار"""
+    return {
+        "title": "Managing anxiety",
+        "description": "An eight week program for managing everyday anxiety.",
+        "content": "This program combines psychoeducation with daily practice.",
+        "modules": [
+            {
+                "title": f"Module {m}",
+                "description": f"What you will learn in module {m}.",
+                "content": f"Module {m} walks through a core skill step by step.",
+                "summary": f"Key points of module {m}.",
+                "exercises": [
+                    {
+                        "title": f"Exercise {m}.{e}",
+                        "instructions": f"Practice skill {m}.{e} for ten minutes.",
+                    }
+                    for e in range(exercises)
+                ],
+            }
+            for m in range(modules)
+        ],
+    }
+
+
+def sequential_translate(translator: AutoTranslator, content: dict, target: str):
+    """الترجمة التسلسلية السابقة: حقل تلو الآخر مع كشف اللغة لكل حقل"""
+    for field in TRANSLATABLE_FIELDS:
+        if field in content:
+            translator.translate_text(content[field], target)
+    for field in NESTED_FIELDS:
+        for item in content.get(field, []):
+            sequential_translate(translator, item, target)
+
+
+def run(label: str, fn, client: FakeChatClient):
+    client.calls = 0
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} calls={client.calls:<5} wall={elapsed:.2f}s")
+    return client.calls, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--exercises", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="زمن الاستجابة الوهمي لكل استدعاء بالثواني")
+    parser.add_argument("--target", default="ar")
+    args = parser.parse_args()
+
+    client = FakeChatClient(args.latency)
+    translator = AutoTranslator(ProviderRouter([OpenAIProvider(client=client)]), TranslationMemory())
+    # حدود معدل واسعة حتى لا يؤثر المجدول على القياس
+    translator.scheduler = LLMScheduler(requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9)
+    program = build_program(args.modules, args.exercises)
+
+    print(f"modules={args.modules} exercises/module={args.exercises} "
+          f"latency={args.latency}s concurrency={settings.translation_max_concurrency}")
+    run("sequential", lambda: sequential_translate(
+        translator, program, args.target), client)
+    run("fan-out", lambda: translator.translate_content(
+        program, args.target), client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Benchmark: throughput and latency percentiles of the translation endpoints.
+
+Drives a running API (normally pointed at scripts/mock_openai_server.py via
+OPENAI_BASE_URL so no API key or network is needed) with concurrent clients
+and reports requests/s, p50/p95/p99 latency and errors per scenario:
+
+  translate           GET  /translations/translate
+  batch               POST /auto-translate/batch
+  content             POST /auto-translate/content
+  ws-translate        WS   /websocket/translate (one request/response at a time)
+  ws-translate-stream WS   /websocket/translate with "stream": true (also time to first delta)
+  ws-detect           WS   /websocket/detect-language
+
+Texts are drawn from a pool of --unique-texts strings so repeated requests
+exercise deduplication and caching. With --mock-url the provider calls and
+tokens per scenario are read from the mock's /stats. --json writes the
+results for comparison against a previous baseline.
+
+    python scripts/mock_openai_server.py --median-ms 400 &
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn app.main:app --port 8000 &
+    python scripts/bench_translation_endpoints.py --user-id 1 --mock-url http://127.0.0.1:8100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+SCENARIOS = ("translate", "batch", "content", "ws-translate", "ws-translate-stream", "ws-detect")
+
+SENTENCES = [
+    "I have been feeling anxious before work most mornings.",
+    "Take a slow breath in for four seconds and out for six.",
+    "Write down three things that went well today.",
+    "It is normal to feel tired after a difficult conversation.",
+    "Try to keep the same bedtime every night this week.",
+    "Notice the thought, name it, and let it pass.",
+    "Reach out to someone you trust when things feel heavy.",
+    "Small steps still count as progress.",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def text_pool(size: int) -> list:
+    """مجموعة نصوص الاختبار (تتكرر الطلبات عندما يكون الحجم صغيراً)"""
+    count = len(SENTENCES)
+    return [SENTENCES[index % count] if index < count else f"{SENTENCES[index % count]} ({index // count})"
+            for index in range(size)]
+
+
+class Result:
+    """نتائج سيناريو واحد"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = []
+        self.first_delta = []
+        self.errors = 0
+        self.elapsed = 0.0
+        self.provider = {}
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        summary = {
+            "scenario": self.name,
+            "requests": count + self.errors,
+            "errors": self.errors,
+            "throughput_rps": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 1),
+        }
+        if self.first_delta:
+            summary["first_delta_p50_ms"] = round(percentile(self.first_delta, 50) * 1000, 1)
+            summary["first_delta_p95_ms"] = round(percentile(self.first_delta, 95) * 1000, 1)
+        summary.update(self.provider)
+        return summary
+
+
+async def run_http(name: str, client: httpx.AsyncClient, args, token: str, texts: list) -> Result:
+    """تشغيل سيناريو HTTP بعدد ثابت من العملاء المتزامنين"""
+    result = Result(name)
+    rng = random.Random(args.seed)
+    remaining = iter(range(args.requests))
+
+    def build_request():
+        params = {"target_language": args.target, "source_language": args.source, "token": token}
+        if name == "translate":
+            return client.build_request("GET", "/translations/translate",
+                                        params={**params, "text": rng.choice(texts)})
+        if name == "batch":
+            return client.build_request("POST", "/auto-translate/batch", params=params,
+                                        json=rng.sample(texts, min(args.batch_size, len(texts))))
+        content = {
+            "title": rng.choice(texts),
+            "content": " ".join(rng.sample(texts, min(4, len(texts)))),
+            "modules": [{"title": rng.choice(texts), "description": rng.choice(texts)}
+                        for _ in range(3)],
+        }
+        return client.build_request("POST", "/auto-translate/content", params=params, json=content)
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.send(build_request())
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run_websocket(name: str, args, token: str, texts: list) -> Result:
+    """تشغيل سيناريو WebSocket: اتصال لكل عميل وطلب واحد في كل مرة"""
+    import websockets
+
+    result = Result(name)
+    rng = random.Random(args.seed)
+    ws_base = args.base_url.replace("http://", "ws://").replace("https://", "wss://")
+    remaining = iter(range(args.requests))
+
+    if name == "ws-detect":
+        url, headers = f"{ws_base}{args.api_prefix}/websocket/detect-language?token={token}", {}
+    else:
+        url, headers = f"{ws_base}{args.api_prefix}/websocket/translate", {"Authorization": f"Bearer {token}"}
+
+    async def worker():
+        try:
+            connection = await websockets.connect(url, additional_headers=headers)
+        except Exception:
+            for _ in remaining:
+                result.errors += 1
+            return
+        async with connection:
+            for _ in remaining:
+                message = {"text": rng.choice(texts)}
+                if name != "ws-detect":
+                    message.update(target_language=args.target, source_language=args.source,
+                                   stream=name == "ws-translate-stream")
+                start = time.perf_counter()
+                await connection.send(json.dumps(message))
+                first = None
+                while True:
+                    reply = json.loads(await connection.recv())
+                    if reply.get("status") == "partial":
+                        first = first or time.perf_counter() - start
+                        continue
+                    break
+                if reply.get("status") == "success":
+                    result.latencies.append(time.perf_counter() - start)
+                    if first is not None:
+                        result.first_delta.append(first)
+                else:
+                    result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def mock_stats(mock: httpx.AsyncClient, reset: bool = False) -> dict:
+    if reset:
+        await mock.post("/stats/reset")
+        return {}
+    return (await mock.get("/stats")).json()
+
+
+def create_token(user_id: int) -> str:
+    """رمز JWT بنفس مفتاح التطبيق (يجب أن يكون المستخدم موجوداً لنقاط النهاية التي تتحقق منه)"""
+    from app.core.security import create_access_token
+    return create_access_token(user_id)
+
+
+async def main_async(args):
+    token = args.token or create_token(args.user_id)
+    texts = text_pool(args.unique_texts)
+    results = []
+
+    async with httpx.AsyncClient(base_url=f"{args.base_url}{args.api_prefix}", timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        mock = httpx.AsyncClient(base_url=args.mock_url, timeout=10) if args.mock_url else None
+        for name in args.scenarios:
+            if mock:
+                await mock_stats(mock, reset=True)
+            if name.startswith("ws-"):
+                result = await run_websocket(name, args, token, texts)
+            else:
+                result = await run_http(name, client, args, token, texts)
+            if mock:
+                stats = await mock_stats(mock)
+                result.provider = {
+                    "provider_calls": stats["requests"],
+                    "provider_tokens": stats["prompt_tokens"] + stats["completion_tokens"],
+                }
+            results.append(result.summary())
+        if mock:
+            await mock.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--token", help="رمز JWT جاهز")
+    parser.add_argument("--user-id", type=int, default=1, help="إنشاء رمز JWT لهذا المستخدم")
+    parser.add_argument("--mock-url", help="عنوان الخادم الوهمي لقراءة عدد استدعاءات المزود")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=200, help="عدد الطلبات لكل سيناريو")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--unique-texts", type=int, default=50)
+    parser.add_argument("--source", default="en")
+    parser.add_argument("--target", default="ar")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    for summary in results:
+        print("  ".join(f"{key}={value}" for key, value in summary.items()))
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"args": vars(args), "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
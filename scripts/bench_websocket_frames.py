@@ -0,0 +1,123 @@
+"""Benchmark: bytes on the wire and serialization CPU of WebSocket frame formats.
+
+Encodes the replies the translation sockets send (short phrase, paragraph and
+long article, plus a stream of partial deltas) with every negotiable protocol:
+
+  json-ascii      the previous encoding (json.dumps defaults, ASCII escapes)
+  json            default for old clients, echoes original_text
+  json+noecho     JSON without the echoed input
+  msgpack         MessagePack with integer field tags
+  msgpack+noecho  MessagePack without the echoed input
+
+and reports per-message bytes before and after permessage-deflate (a
+per-connection deflate stream with context takeover, as negotiated by default
+by uvicorn's websockets implementation) and the encode + decode time.
+
+    python scripts/bench_websocket_frames.py --repeat 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.websocket_protocol import CODECS, WireProtocol  # noqa: E402
+
+PROTOCOLS = ("json-ascii", "json", "json+noecho", "msgpack", "msgpack+noecho")
+
+SENTENCE = ("I have been feeling anxious before work most mornings, so I try to take a slow "
+            "breath in for four seconds and out for six. ")
+TRANSLATED = ("أشعر بالقلق قبل العمل معظم الصباحات، لذلك أحاول أن آخذ نفساً بطيئاً "
+              "لأربع ثوانٍ وأخرجه في ست. ")
+
+SIZES = {"phrase": 1, "paragraph": 5, "article": 40}
+
+
+def replies(size: int, request_id: int) -> list:
+    """ردود ترجمة واحدة: نهائي فقط، أو أجزاء البث ثم النهائي"""
+    text, translated = (SENTENCE * size).strip(), (TRANSLATED * size).strip()
+    final = {"id": request_id, "original_text": text, "translated_text": translated,
+             "source_language": "en", "target_language": "ar", "status": "success"}
+    deltas = [{"id": request_id, "delta": word + " ", "status": "partial"} for word in translated.split()]
+    return [final], deltas + [final]
+
+
+class AsciiJsonCodec:
+    """الترميز السابق: json.dumps بالإعدادات الافتراضية"""
+
+    def encode(self, payload):
+        return json.dumps(payload)
+
+    def decode(self, data):
+        return json.loads(data)
+
+
+def create_protocol(name: str) -> WireProtocol:
+    if name == "json-ascii":
+        return WireProtocol(AsciiJsonCodec())
+    codec_name, _, option = name.partition("+")
+    return WireProtocol(CODECS[codec_name](), echo=option != "noecho")
+
+
+def deflated_size(frames: list) -> int:
+    """حجم الإطارات بعد permessage-deflate مع الاحتفاظ بالسياق بين الرسائل"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    total = 0
+    for frame in frames:
+        data = frame if isinstance(frame, bytes) else frame.encode("utf-8")
+        # RFC 7692: تُحذف اللاحقة 00 00 ff ff من كل رسالة
+        total += len(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+    return total
+
+
+def measure(protocol: WireProtocol, messages: list, repeat: int) -> dict:
+    payloads = [protocol.trim(message) for message in messages]
+    frames = [protocol.encode(payload) for payload in payloads]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            protocol.decode(protocol.encode(payload))
+    elapsed = time.perf_counter() - start
+    count = len(messages)
+    return {
+        "bytes": sum(len(frame if isinstance(frame, bytes) else frame.encode("utf-8")) for frame in frames) / count,
+        "deflated": deflated_size(frames) / count,
+        "cpu_us": elapsed / (repeat * count) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000,
+                        help="encode/decode rounds per message for the CPU timing")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for size_name, size in SIZES.items():
+        single, streamed = replies(size, 42)
+        for mode, messages in (("final", single), ("stream", streamed)):
+            repeat = max(1, args.repeat // len(messages))
+            print(f"\n{size_name} / {mode} ({len(messages)} messages)")
+            print(f"  {'protocol':<16}{'bytes/msg':>11}{'deflated':>11}{'encode+decode':>16}")
+            for name in PROTOCOLS:
+                try:
+                    result = measure(create_protocol(name), messages, repeat)
+                except ImportError as e:
+                    print(f"  {name:<16}unavailable ({e})")
+                    continue
+                print(f"  {name:<16}{result['bytes']:>11.0f}{result['deflated']:>11.0f}"
+                      f"{result['cpu_us']:>14.2f}us")
+                results.append({"size": size_name, "mode": mode, "protocol": name, **result})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Load test: how many concurrent translation sockets one worker sustains.
+
+Opens --clients authenticated sockets (ramped at --connect-rate per second) to
+/websocket/translate, /realtime/translate or both, waits until all are open,
+then has every socket send translation requests at --rate messages per second
+(Poisson arrivals, pipelined with request ids) for --duration seconds, and
+reports:
+
+  * connect latency percentiles and failed connects,
+  * message round-trip percentiles, errors, timeouts and the achieved rate,
+  * server memory per connection (process_resident_memory_bytes from /metrics
+    before and after opening the sockets, divided by the sockets opened),
+  * server event-loop lag (event_loop_lag_seconds during the ramp and the
+    steady phase), and the harness's own loop lag: when that is high the
+    harness, not the server, is the bottleneck.
+
+Run one worker against the mock LLM so the numbers describe the app itself:
+
+    python scripts/mock_openai_server.py --median-ms 400 &
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 WEBSOCKET_MAX_CONNECTIONS_PER_USER=100000 \\
+        uvicorn app.main:app --port 8000 --workers 1 &
+    python scripts/load_websockets.py --clients 2000 --rate 0.2 --duration 60 --json baseline.json
+
+/websocket/translate loads each user from the database, so users
+--first-user-id .. --first-user-id + --users - 1 must exist. Thousands of
+sockets need a higher open-file limit (ulimit -n) on both sides.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+ENDPOINTS = ("websocket", "realtime", "mixed")
+
+SENTENCES = [
+    "I have been feeling anxious before work most mornings.",
+    "Take a slow breath in for four seconds and out for six.",
+    "Write down three things that went well today.",
+    "It is normal to feel tired after a difficult conversation.",
+    "Try to keep the same bedtime every night this week.",
+    "Notice the thought, name it, and let it pass.",
+]
+
+LE_LABEL = re.compile(r'le="([^"]+)"')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def raise_open_file_limit():
+    """رفع حد الملفات المفتوحة إلى الحد الأقصى المسموح (يونكس فقط)"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+def create_token(user_id: int) -> str:
+    """رمز JWT بنفس مفتاح التطبيق"""
+    from app.core.security import create_access_token
+    return create_access_token(user_id)
+
+
+def parse_metrics(text: str) -> dict:
+    """قراءة مؤشرات Prometheus النصية إلى قاموس {السلسلة: القيمة}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, _, value = line.rpartition(" ")
+        try:
+            samples[series] = float(value)
+        except ValueError:
+            continue
+    return samples
+
+
+def histogram_quantile(before: dict, after: dict, name: str, quantile: float):
+    """تقدير مئين مدرج تكراري من الفرق بين قراءتين (الحد الأعلى للفئة)"""
+    buckets = []
+    for series, value in after.items():
+        if series.startswith(f"{name}_bucket"):
+            match = LE_LABEL.search(series)
+            if match:
+                buckets.append((float(match.group(1)), value - before.get(series, 0.0)))
+    buckets.sort()
+    total = buckets[-1][1] if buckets else 0
+    if not total:
+        return None
+    for bound, count in buckets:
+        if count >= quantile * total:
+            return bound
+    return buckets[-1][0]
+
+
+class Stats:
+    """نتائج التشغيل"""
+
+    def __init__(self):
+        self.connect = []
+        self.connect_errors = 0
+        self.rtt = []
+        self.sent = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.harness_lag = []
+
+
+class Client:
+    """مقبس واحد يرسل طلبات ترجمة بمعدل ثابت ويقيس زمن الرد"""
+
+    def __init__(self, index: int, url: str, headers: dict, endpoint: str, args, stats: Stats):
+        self.index = index
+        self.url = url
+        self.headers = headers
+        self.endpoint = endpoint
+        self.args = args
+        self.stats = stats
+        self.rng = random.Random(args.seed + index)
+        self.pending = {}
+        self.ids = itertools.count(1)
+
+    async def connect(self):
+        import websockets
+
+        await asyncio.sleep(self.index / self.args.connect_rate)
+        start = time.perf_counter()
+        try:
+            self.connection = await websockets.connect(
+                self.url, additional_headers=self.headers, open_timeout=self.args.timeout,
+                ping_interval=None, max_queue=None)
+        except Exception:
+            self.connection = None
+            self.stats.connect_errors += 1
+            return
+        self.stats.connect.append(time.perf_counter() - start)
+        self.reader = asyncio.ensure_future(self._read())
+
+    def request(self) -> dict:
+        message = {"id": next(self.ids), "text": self.rng.choice(SENTENCES), "stream": self.args.stream}
+        if self.endpoint == "websocket":
+            message.update(target_language=self.args.target, source_language=self.args.source)
+        return message
+
+    async def run(self, stop: asyncio.Event):
+        """إرسال الطلبات حتى انتهاء المدة ثم انتظار الردود المتبقية"""
+        if self.connection is None:
+            return
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), self.rng.expovariate(self.args.rate))
+                break
+            except asyncio.TimeoutError:
+                pass
+            message = self.request()
+            self.pending[message["id"]] = time.perf_counter()
+            try:
+                await self.connection.send(json.dumps(message))
+            except Exception:
+                self.stats.dropped += 1
+                return
+            self.stats.sent += 1
+
+        deadline = time.perf_counter() + self.args.timeout
+        while self.pending and time.perf_counter() < deadline and not self.reader.done():
+            await asyncio.sleep(0.05)
+        self.stats.timeouts += len(self.pending)
+
+    async def close(self):
+        if self.connection is None:
+            return
+        self.reader.cancel()
+        await asyncio.gather(self.reader, return_exceptions=True)
+        await self.connection.close()
+
+    async def _read(self):
+        try:
+            async for frame in self.connection:
+                reply = json.loads(frame)
+                if reply.get("type") == "ping":
+                    # الخادم يغلق المقابس الخاملة؛ الرد يبقيها مفتوحة بين الرسائل
+                    await self.connection.send(json.dumps({"type": "pong"}))
+                    continue
+                if reply.get("status") == "partial":
+                    continue
+                sent_at = self.pending.pop(reply.get("id"), None)
+                if sent_at is None:
+                    continue
+                if reply.get("status") == "success":
+                    self.stats.rtt.append(time.perf_counter() - sent_at)
+                else:
+                    self.stats.errors += 1
+        except Exception:
+            # اتصال أغلقه الخادم (خمول أو حد الاتصالات أو عميل بطيء)
+            self.stats.dropped += 1
+
+
+async def measure_harness_lag(stop: asyncio.Event, stats: Stats, interval: float = 0.1):
+    """تأخر حلقة أحداث أداة الاختبار نفسها"""
+    while not stop.is_set():
+        expected = time.monotonic() + interval
+        await asyncio.sleep(interval)
+        stats.harness_lag.append(max(0.0, time.monotonic() - expected))
+
+
+async def main_async(args) -> dict:
+    stats = Stats()
+    ws_base = args.base_url.replace("http://", "ws://").replace("https://", "wss://")
+    tokens = {}
+    clients = []
+    for index in range(args.clients):
+        user_id = args.first_user_id + index % args.users
+        if user_id not in tokens:
+            tokens[user_id] = args.token or create_token(user_id)
+        endpoint = args.endpoint
+        if endpoint == "mixed":
+            endpoint = ENDPOINTS[index % 2]
+        if endpoint == "websocket":
+            url = f"{ws_base}{args.api_prefix}/websocket/translate"
+            headers = {"Authorization": f"Bearer {tokens[user_id]}"}
+        else:
+            url, headers = f"{ws_base}{args.api_prefix}/realtime/translate?token={tokens[user_id]}", {}
+        clients.append(Client(index, url, headers, endpoint, args, stats))
+
+    done = asyncio.Event()
+    harness = asyncio.ensure_future(measure_harness_lag(done, stats))
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as http:
+        async def scrape():
+            return parse_metrics((await http.get("/metrics")).text)
+
+        idle = await scrape()
+        ramp_start = time.perf_counter()
+        await asyncio.gather(*(client.connect() for client in clients))
+        ramp_seconds = time.perf_counter() - ramp_start
+        await asyncio.sleep(1)
+        connected = await scrape()
+
+        stop = asyncio.Event()
+        steady_start = time.perf_counter()
+        runners = asyncio.gather(*(client.run(stop) for client in clients))
+        await asyncio.sleep(args.duration)
+        stop.set()
+        steady_seconds = time.perf_counter() - steady_start
+        steady = await scrape()
+        await runners
+        await asyncio.gather(*(client.close() for client in clients))
+    done.set()
+    await harness
+
+    opened = len(stats.connect)
+    memory_before = idle.get("process_resident_memory_bytes")
+    memory_after = connected.get("process_resident_memory_bytes")
+    per_connection = ((memory_after - memory_before) / opened
+                      if opened and memory_before is not None and memory_after is not None else None)
+
+    def lag(before, after, quantile):
+        value = histogram_quantile(before, after, "event_loop_lag_seconds", quantile)
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        "clients": args.clients,
+        "connected": opened,
+        "connect_errors": stats.connect_errors,
+        "connect_p50_ms": round(percentile(stats.connect, 50) * 1000, 1),
+        "connect_p99_ms": round(percentile(stats.connect, 99) * 1000, 1),
+        "ramp_seconds": round(ramp_seconds, 1),
+        "server_connections": sum(value for series, value in connected.items()
+                                  if series.startswith("websocket_connections{")),
+        "memory_per_connection_kb": None if per_connection is None else round(per_connection / 1024, 1),
+        "messages_sent": stats.sent,
+        "messages_per_second": round(stats.sent / steady_seconds, 1) if steady_seconds else 0.0,
+        "rtt_p50_ms": round(percentile(stats.rtt, 50) * 1000, 1),
+        "rtt_p95_ms": round(percentile(stats.rtt, 95) * 1000, 1),
+        "rtt_p99_ms": round(percentile(stats.rtt, 99) * 1000, 1),
+        "errors": stats.errors,
+        "timeouts": stats.timeouts,
+        "dropped_sockets": stats.dropped,
+        "server_loop_lag_ramp_p99_ms": lag(idle, connected, 0.99),
+        "server_loop_lag_steady_p50_ms": lag(connected, steady, 0.5),
+        "server_loop_lag_steady_p99_ms": lag(connected, steady, 0.99),
+        "server_loop_lag_max_ms": round(steady.get("event_loop_lag_max_seconds", 0.0) * 1000, 1),
+        "harness_loop_lag_p99_ms": round(percentile(stats.harness_lag, 99) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--endpoint", default="mixed", choices=ENDPOINTS)
+    parser.add_argument("--clients", type=int, default=1000, help="عدد المقابس المتزامنة")
+    parser.add_argument("--connect-rate", type=float, default=200, help="المقابس الجديدة في الثانية")
+    parser.add_argument("--rate", type=float, default=0.2, help="الرسائل في الثانية لكل مقبس")
+    parser.add_argument("--duration", type=float, default=60, help="مدة المرحلة الثابتة بالثواني")
+    parser.add_argument("--stream", action="store_true", help="طلب الترجمة المتدفقة")
+    parser.add_argument("--token", help="رمز JWT جاهز لجميع المقابس")
+    parser.add_argument("--first-user-id", type=int, default=1)
+    parser.add_argument("--users", type=int, default=1, help="توزيع المقابس على هذا العدد من المستخدمين")
+    parser.add_argument("--source", default="en")
+    parser.add_argument("--target", default="ar")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args()
+
+    limit = raise_open_file_limit()
+    if limit is not None and limit < args.clients + 100:
+        print(f"warning: open-file limit {limit} is below --clients {args.clients}", file=sys.stderr)
+
+    summary = asyncio.run(main_async(args))
+    print("  ".join(f"{key}={value}" for key, value in summary.items()))
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"args": vars(args), "results": summary}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Local OpenAI-compatible chat-completions mock for load-testing the translation stack.
+
+Serves POST /v1/chat/completions (plain and streaming) with a log-normal
+round-trip latency, per-output-token generation time, injected errors and a
+requests/tokens-per-minute limit that answers 429 with Retry-After, like the
+real API. Replies mimic the translator's prompts: batch JSON payloads come
+back with every item's text prefixed, language detection (max_tokens <= 10)
+returns "en", anything else is echoed with a prefix.
+
+    python scripts/mock_openai_server.py --port 8100 --median-ms 400 --error-rate 0.01 --rpm 3500
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn app.main:app
+
+GET /stats returns request, error and rate-limit counters; POST /stats/reset
+clears them between benchmark runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+
+from app.core.llm_scheduler import TokenBucket  # noqa: E402
+
+REPLY_PREFIX = "[mock] "
+
+
+class MockConfig:
+    """إعدادات الخادم الوهمي"""
+
+    def __init__(self, median_ms: float = 400, sigma: float = 0.5, per_token_ms: float = 10,
+                 error_rate: float = 0.0, error_status: int = 500, rpm: int = 0, tpm: int = 0,
+                 chunk_chars: int = 8, seed: int = 0):
+        self.median = median_ms / 1000
+        self.sigma = sigma
+        self.per_token = per_token_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rpm = rpm
+        self.tpm = tpm
+        self.chunk_chars = chunk_chars
+        self.seed = seed
+
+
+def estimate_tokens(text: str) -> int:
+    """تقدير تقريبي لعدد الرموز (نفس تقدير المترجم الآلي)"""
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def build_reply(messages: list, max_tokens: int) -> str:
+    """رد يحاكي ترجمة النموذج حسب شكل الطلب"""
+    if max_tokens <= 10:
+        return "en"
+    content = messages[-1].get("content", "") if messages else ""
+    if content.startswith('{"items"'):
+        try:
+            items = json.loads(content)["items"]
+            return json.dumps({"items": [
+                {"id": item["id"], "text": REPLY_PREFIX + item["text"]} for item in items
+            ]}, ensure_ascii=False)
+        except (ValueError, KeyError, TypeError):
+            pass
+    return REPLY_PREFIX + content
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    """إنشاء تطبيق الخادم الوهمي"""
+    app = FastAPI(title="Mock OpenAI")
+    rng = random.Random(config.seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0,
+             "prompt_tokens": 0, "completion_tokens": 0}
+    request_bucket = TokenBucket(config.rpm, config.rpm / 60) if config.rpm else None
+    token_bucket = TokenBucket(config.tpm, config.tpm / 60) if config.tpm else None
+
+    def rate_limited(tokens: int):
+        """مدة الانتظار المطلوبة إذا تجاوز الطلب الحد، أو None"""
+        now = time.monotonic()
+        with lock:
+            waits = []
+            if request_bucket:
+                waits.append(request_bucket.wait_time(1, now))
+            if token_bucket:
+                waits.append(token_bucket.wait_time(min(tokens, config.tpm), now))
+            wait = max(waits, default=0.0)
+            if wait > 0:
+                stats["rate_limited"] += 1
+                return wait
+            if request_bucket:
+                request_bucket.consume(1)
+            if token_bucket:
+                token_bucket.consume(min(tokens, config.tpm))
+            return None
+
+    def error_response(status_code: int, message: str, headers: dict = None):
+        return JSONResponse(
+            {"error": {"message": message, "type": "mock_error", "code": status_code}},
+            status_code=status_code, headers=headers)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        max_tokens = int(body.get("max_tokens") or 256)
+        model = body.get("model", "mock")
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+
+        with lock:
+            stats["requests"] += 1
+            latency = config.median * rng.lognormvariate(0, config.sigma)
+            failed = rng.random() < config.error_rate
+
+        wait = rate_limited(prompt_tokens + max_tokens)
+        if wait is not None:
+            return error_response(429, "Rate limit reached", {
+                "retry-after": f"{wait:.3f}",
+                "retry-after-ms": str(int(wait * 1000)),
+            })
+
+        await asyncio.sleep(latency)
+        if failed:
+            with lock:
+                stats["errors"] += 1
+            return error_response(config.error_status, "Injected error")
+
+        reply = build_reply(messages, max_tokens)
+        completion_tokens = estimate_tokens(reply)
+        with lock:
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            with lock:
+                stats["streams"] += 1
+
+            async def events():
+                step = max(1, config.chunk_chars)
+                for index in range(0, len(reply), step):
+                    piece = reply[index:index + step]
+                    await asyncio.sleep(estimate_tokens(piece) * config.per_token)
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                             "model": model, "choices": [{"index": 0, "delta": {"content": piece},
+                                                          "finish_reason": None}]}
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                done = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(completion_tokens * config.per_token)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        with lock:
+            return dict(stats)
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        with lock:
+            for key in stats:
+                stats[key] = 0
+        return {"status": "ok"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--median-ms", type=float, default=400,
+                        help="الوسيط لزمن الاستجابة قبل أول رمز")
+    parser.add_argument("--sigma", type=float, default=0.5,
+                        help="انحراف التوزيع اللوغاريتمي الطبيعي لزمن الاستجابة")
+    parser.add_argument("--per-token-ms", type=float, default=10,
+                        help="زمن توليد كل رمز في الرد")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--rpm", type=int, default=0, help="حد الطلبات في الدقيقة (0 بلا حد)")
+    parser.add_argument("--tpm", type=int, default=0, help="حد الرموز في الدقيقة (0 بلا حد)")
+    parser.add_argument("--chunk-chars", type=int, default=8, help="عدد الأحرف في كل جزء من البث")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = MockConfig(args.median_ms, args.sigma, args.per_token_ms, args.error_rate,
+                        args.error_status, args.rpm, args.tpm, args.chunk_chars, args.seed)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()